@@ -1,17 +1,57 @@
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator
+
 from fastapi import FastAPI
+from fastapi.openapi.utils import get_openapi
 
-from src import router
+from src import executor, manifest, router
+from src.timing import TimingMiddleware
 
 PREFIX = "/advent-of-code"
 
+
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    # Import the remaining days in the background, first hits import on demand
+    manifest.warm_up()
+
+    # Warm process pool for the CPU-heavy solvers
+    await executor.start()
+
+    yield
+
+    executor.shutdown()
+
+
 app = FastAPI(
     openapi_url=f"{PREFIX}/openapi.json",
     docs_url=f"{PREFIX}/docs",
     redoc_url=f"{PREFIX}/redoc",
+    lifespan=lifespan,
 )
 
+app.add_middleware(TimingMiddleware)
+
 app.include_router(router, prefix=PREFIX)
 
+# Each day's router is imported on its first request
+app.routes.extend(manifest.mounts(PREFIX))
+
+
+def openapi() -> dict[str, Any]:
+    # Docs need every day's routes, which means importing every day
+    if not app.openapi_schema:
+        app.openapi_schema = get_openapi(
+            title=app.title,
+            version=app.version,
+            routes=app.routes + manifest.routes(PREFIX),
+        )
+
+    return app.openapi_schema
+
+
+app.openapi = openapi
+
 
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,160 @@
+"""
+The `distinct` engine against the reference one, on duplicate-heavy inputs of the days scoring each line on its own.
+
+Documents are `--size` lines drawn from fewer generated ones (see `benchmarks.generators`),
+`--distinct` being the fraction of them that differ, e.g. 0.01 for every line repeated about 100 times.
+
+    python -m benchmarks.distinct [--filter 2023/day-12] [--size 10000] [--distinct 1 --distinct 0.01]
+        [--repeat N] [--seed N] [--json report.json]
+"""
+
+import argparse
+import json
+import platform
+import random
+import sys
+from pathlib import Path
+from typing import Any, Callable
+
+from benchmarks import generators, solvers
+
+from src import engines
+from src.manifest import Day
+
+ENGINE = "distinct"
+
+# The days with a `distinct` engine, and how to number a line where they're numbered
+DAYS: dict[Day, Callable[[int, str], str] | None] = {
+    Day(year=2022, day=2): None,
+    Day(year=2022, day=4): None,
+    Day(year=2023, day=1): None,
+    Day(year=2023, day=2): lambda number, line: (
+        f"Game {number}:{line.partition(':')[2]}"
+    ),
+    Day(year=2023, day=12): None,
+}
+
+
+def duplicated(day: Day, size: int, distinct: int, seed: int = 0) -> dict[str, Any]:
+    """The day's generated arguments, with a document of `size` lines only `distinct` of which differ."""
+    arguments = generators.generate(day, distinct, seed)
+    rng = random.Random(f"{day.year}/{day.day}/{size}/{distinct}/{seed}")
+
+    # Every line at least once, so there are exactly `distinct` of them
+    document = [*arguments["document"]]
+    document += rng.choices(document, k=max(size - len(document), 0))
+    rng.shuffle(document)
+
+    number = DAYS[day]
+
+    if number is not None:
+        document = [number(index + 1, line) for index, line in enumerate(document)]
+
+    return {**arguments, "document": document}
+
+
+def compare(
+    day: Day,
+    part: int,
+    size: int,
+    fraction: float,
+    repeat: int,
+    seed: int,
+) -> dict[str, float]:
+    route = solvers.find_route(day, part)
+    assert route is not None
+
+    parameters = {parameter.name for parameter in route.dependant.body_params}
+    arguments = duplicated(day, size, max(round(size * fraction), 1), seed)
+    medians: dict[str, float] = {}
+    answers: dict[str, Any] = {}
+
+    for engine in (engines.REFERENCE, ENGINE):
+        case = solvers.Case(
+            day=day,
+            part=part,
+            route=route,
+            arguments={
+                key: value for key, value in arguments.items() if key in parameters
+            },
+            expected=None,
+            label=f"size-{size}-distinct-{fraction:g}",
+            engine=engine,
+        )
+
+        with solvers.uncached():
+            answers[engine] = solvers.solve_direct(case)
+            measurement = solvers.measure(
+                case,
+                lambda: solvers.solve_direct(case),
+                repeat,
+                memory=False,
+            )
+
+        medians[engine] = measurement.median
+
+    if answers[ENGINE] != answers[engines.REFERENCE]:
+        raise AssertionError(
+            f"{day.prefix}/part-{part}: {answers[ENGINE]!r} != {answers[engines.REFERENCE]!r}"
+        )
+
+    return medians
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--filter", default="*")
+    parser.add_argument("--size", type=int, default=10000)
+    parser.add_argument("--distinct", type=float, action="append", default=None)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", type=Path, default=None)
+    args = parser.parse_args()
+
+    fractions = args.distinct or [1.0, 0.1, 0.01]
+    results: dict[str, dict[str, float]] = {}
+
+    for day in DAYS:
+        for part in (1, 2):
+            name = f"{day.year}/day-{day.day}/part-{part}"
+
+            if not solvers.matches(name, args.filter):
+                continue
+
+            for fraction in fractions:
+                medians = compare(
+                    day, part, args.size, fraction, args.repeat, args.seed
+                )
+                speedup = medians[engines.REFERENCE] / medians[ENGINE]
+
+                results[f"{name}/distinct-{fraction:g}"] = {
+                    **medians,
+                    "speedup": speedup,
+                }
+
+                print(
+                    f"{name:<24} distinct {fraction:<6g}"
+                    f"  reference {medians[engines.REFERENCE] * 1000:9.1f} ms"
+                    f"  {ENGINE} {medians[ENGINE] * 1000:9.1f} ms"
+                    f"  {speedup:6.2f}x",
+                    flush=True,
+                )
+
+    if args.json is not None:
+        args.json.write_text(
+            json.dumps(
+                {
+                    "python": sys.version.split()[0],
+                    "platform": platform.platform(),
+                    "size": args.size,
+                    "repeat": args.repeat,
+                    "seed": args.seed,
+                    "results": results,
+                },
+                indent=4,
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
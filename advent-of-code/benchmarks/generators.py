@@ -0,0 +1,920 @@
+"""
+Reproducible puzzle inputs of any size, for seeing how solvers scale past the checked-in inputs.
+
+Each day's generator takes a seeded `random.Random` and a `size`, and returns the arguments of the day's routes
+(the document, plus any other parameters such as `steps`), valid for every part the day has.
+`size` grows the input linearly: about `size` lines or records, or `size` cells for grids.
+
+    generate(Day(year=2023, day=24), size=3000, seed=1)
+"""
+
+import itertools
+import math
+import random
+import string
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterator
+
+from src.manifest import Day
+
+Arguments = dict[str, Any]
+
+
+@dataclass(frozen=True)
+class Generator:
+    generate: Callable[[random.Random, int], Arguments]
+    # The smallest size worth timing, about the checked-in input's
+    start: int
+    # Exponents inherent to the puzzle rather than the solver (e.g. every pair of hailstones), by part
+    exponents: dict[int, float] = field(default_factory=dict)
+
+
+GENERATORS: dict[Day, Generator] = {}
+
+
+def generator(
+    year: int,
+    day: int,
+    start: int,
+    exponents: dict[int, float] | None = None,
+) -> Callable[
+    [Callable[[random.Random, int], Arguments]],
+    Callable[[random.Random, int], Arguments],
+]:
+    def register(
+        func: Callable[[random.Random, int], Arguments],
+    ) -> Callable[[random.Random, int], Arguments]:
+        GENERATORS[Day(year=year, day=day)] = Generator(func, start, exponents or {})
+
+        return func
+
+    return register
+
+
+def generate(day: Day, size: int, seed: int = 0) -> Arguments:
+    """The same arguments every time for the same day, size and seed."""
+    return GENERATORS[day].generate(
+        random.Random(f"{day.year}/{day.day}/{size}/{seed}"),
+        size,
+    )
+
+
+def side(size: int, minimum: int = 3) -> int:
+    # Grids are square, `size` is their cell count
+    return max(math.isqrt(size), minimum)
+
+
+def names(rng: random.Random, count: int, length: int = 3) -> list[str]:
+    # Distinct lowercase names, longer ones only if there aren't enough
+    while 26**length < count * 2:
+        length += 1
+
+    found: set[str] = set()
+
+    while len(found) < count:
+        found.add("".join(rng.choices(string.ascii_lowercase, k=length)))
+
+    return sorted(found, key=lambda _: rng.random())
+
+
+def spanning_tree(
+    rng: random.Random,
+    width: int,
+    height: int,
+    coverage: float = 1.0,
+) -> dict[tuple[int, int], set[tuple[int, int]]]:
+    """A random tree over (some of) a `width` by `height` grid of nodes, each node's neighbours in it."""
+    start = (rng.randrange(width), rng.randrange(height))
+    tree: dict[tuple[int, int], set[tuple[int, int]]] = {start: set()}
+    frontier = [(start, neighbour) for neighbour in around(start, width, height)]
+
+    while frontier and len(tree) < max(width * height * coverage, 1):
+        node, neighbour = frontier.pop(rng.randrange(len(frontier)))
+
+        if neighbour in tree:
+            continue
+
+        tree[node].add(neighbour)
+        tree[neighbour] = {node}
+        frontier += [(neighbour, other) for other in around(neighbour, width, height)]
+
+    return tree
+
+
+def around(node: tuple[int, int], width: int, height: int) -> Iterator[tuple[int, int]]:
+    x, y = node
+
+    for other_x, other_y in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+        if 0 <= other_x < width and 0 <= other_y < height:
+            yield other_x, other_y
+
+
+def tree_loop(
+    rng: random.Random,
+    width: int,
+    height: int,
+    coverage: float = 1.0,
+) -> list[tuple[int, int]]:
+    """
+    A simple closed loop of cells in a `2 * width` by `2 * height` grid, in order.
+    Each tree node is a 2x2 block of cells, and the loop is the tree's outline.
+    """
+    tree = spanning_tree(rng, width, height, coverage)
+    links: dict[tuple[int, int], list[tuple[int, int]]] = defaultdict(list)
+
+    def link(first: tuple[int, int], second: tuple[int, int]) -> None:
+        links[first].append(second)
+        links[second].append(first)
+
+    for (x, y), neighbours in tree.items():
+        left, top = 2 * x, 2 * y
+
+        # Across to the neighbour's block, or around this block's own side
+        if (x + 1, y) in neighbours:
+            link((left + 1, top), (left + 2, top))
+            link((left + 1, top + 1), (left + 2, top + 1))
+        else:
+            link((left + 1, top), (left + 1, top + 1))
+
+        if (x, y + 1) in neighbours:
+            link((left, top + 1), (left, top + 2))
+            link((left + 1, top + 1), (left + 1, top + 2))
+        else:
+            link((left, top + 1), (left + 1, top + 1))
+
+        if (x - 1, y) not in neighbours:
+            link((left, top), (left, top + 1))
+
+        if (x, y - 1) not in neighbours:
+            link((left, top), (left + 1, top))
+
+    # The top-left cell is always a corner, going right then around
+    start = min(links, key=lambda cell: (cell[1], cell[0]))
+    loop = [start]
+    previous, current = start, max(links[start])
+
+    while current != start:
+        loop.append(current)
+        previous, current = (
+            current,
+            next(cell for cell in links[current] if cell != previous),
+        )
+
+    return loop
+
+
+def runs(loop: list[tuple[int, int]]) -> list[tuple[str, int, int]]:
+    """The loop as straight runs: each run's direction and the x or y it ends at."""
+    found: list[tuple[str, int, int]] = []
+
+    for (x, y), (next_x, next_y) in zip(loop, loop[1:] + loop[:1]):
+        direction = {(1, 0): "R", (-1, 0): "L", (0, 1): "D", (0, -1): "U"}[
+            (next_x - x, next_y - y)
+        ]
+
+        if found and found[-1][0] == direction:
+            found.pop()
+
+        found.append((direction, next_x, next_y))
+
+    return found
+
+
+@generator(2022, 1, start=2000)
+def year_2022_day_1(rng: random.Random, size: int) -> Arguments:
+    """`size` lines of Calories, a handful per Elf."""
+    document: list[str] = []
+
+    while len(document) < size:
+        document += [str(rng.randint(1000, 9999)) for _ in range(rng.randint(1, 6))]
+        document.append("")
+
+    return {"document": document[:-1]}
+
+
+@generator(2022, 2, start=2500)
+def year_2022_day_2(rng: random.Random, size: int) -> Arguments:
+    """`size` rounds."""
+    return {
+        "document": [f"{rng.choice('ABC')} {rng.choice('XYZ')}" for _ in range(size)]
+    }
+
+
+@generator(2022, 3, start=300)
+def year_2022_day_3(rng: random.Random, size: int) -> Arguments:
+    """`size` rucksacks, in groups of three sharing a badge."""
+    items = string.ascii_letters
+    document: list[str] = []
+
+    for _ in range(math.ceil(size / 3)):
+        badge = rng.choice(items)
+
+        for _ in range(3):
+            # The badge, and an item in both compartments
+            half = rng.randint(4, 20)
+            shared = rng.choice(items)
+            first = [shared, badge, *rng.choices(items, k=half - 2)]
+            second = [shared, *rng.choices(items, k=half - 1)]
+            rng.shuffle(first)
+            rng.shuffle(second)
+
+            document.append("".join(first + second))
+
+    return {"document": document}
+
+
+@generator(2022, 4, start=1000)
+def year_2022_day_4(rng: random.Random, size: int) -> Arguments:
+    """`size` pairs of section assignments."""
+    document: list[str] = []
+
+    for _ in range(size):
+        first = sorted(rng.choices(range(1, 100), k=2))
+        second = sorted(rng.choices(range(1, 100), k=2))
+
+        document.append(f"{first[0]}-{first[1]},{second[0]}-{second[1]}")
+
+    return {"document": document}
+
+
+@generator(2022, 5, start=500)
+def year_2022_day_5(rng: random.Random, size: int) -> Arguments:
+    """`size` moves between nine stacks, none of them ever emptied."""
+    stacks = {
+        str(key): rng.choices(string.ascii_uppercase, k=rng.randint(2, 8))
+        for key in range(1, 10)
+    }
+    heights = {key: len(stack) for key, stack in stacks.items()}
+    document: list[str] = []
+
+    for _ in range(size):
+        start = rng.choice([key for key, height in heights.items() if height > 1])
+        end = rng.choice([key for key in heights if key != start])
+        count = rng.randint(1, heights[start] - 1)
+
+        heights[start] -= count
+        heights[end] += count
+        document.append(f"move {count} from {start} to {end}")
+
+    return {"stacks": stacks, "document": document}
+
+
+@generator(2022, 6, start=4000)
+def year_2022_day_6(rng: random.Random, size: int) -> Arguments:
+    """`size` characters, with both markers at the very end."""
+    marker = rng.sample(string.ascii_lowercase[3:], k=14)
+
+    return {"document": "".join(rng.choices("abc", k=max(size - 14, 0)) + marker)}
+
+
+@generator(2022, 7, start=1000)
+def year_2022_day_7(rng: random.Random, size: int) -> Arguments:
+    """About `size` lines of terminal output exploring a random directory tree."""
+    document: list[str] = ["$ cd /"]
+    lines = 1
+
+    def explore(depth: int) -> None:
+        nonlocal lines
+
+        directories = [
+            f"{name}{index}"
+            for index, name in enumerate(
+                names(rng, rng.randint(0, 3) if depth < 12 else 0)
+            )
+        ]
+        files = [
+            f"{rng.randint(1000, 300000)} {name}.{rng.choice(['txt', 'dat', 'log'])}"
+            for name in names(rng, rng.randint(1, 5))
+        ]
+
+        document.append("$ ls")
+        document.extend(f"dir {name}" for name in directories)
+        document.extend(files)
+        lines += 1 + len(directories) + len(files)
+
+        for name in directories:
+            if lines >= size:
+                break
+
+            document.append(f"$ cd {name}")
+            explore(depth + 1)
+            document.append("$ cd ..")
+
+    # The root directory is explored again until the output's long enough
+    while lines < size:
+        explore(0)
+        document.append("$ cd /")
+
+    return {"document": document}
+
+
+@generator(2023, 1, start=1000)
+def year_2023_day_1(rng: random.Random, size: int) -> Arguments:
+    """`size` lines of calibration values, some digits spelled out."""
+    words = ["one", "two", "three", "four", "five", "six", "seven", "eight", "nine"]
+    document: list[str] = []
+
+    for _ in range(size):
+        pieces = [rng.choice(string.digits[1:])]
+
+        for _ in range(rng.randint(1, 8)):
+            pieces.append(
+                rng.choice(
+                    [
+                        rng.choice(string.digits[1:]),
+                        rng.choice(words),
+                        "".join(
+                            rng.choices(string.ascii_lowercase, k=rng.randint(1, 4))
+                        ),
+                    ]
+                )
+            )
+
+        rng.shuffle(pieces)
+        document.append("".join(pieces))
+
+    return {"document": document}
+
+
+@generator(2023, 2, start=100)
+def year_2023_day_2(rng: random.Random, size: int) -> Arguments:
+    """`size` games of a few draws each."""
+    document: list[str] = []
+
+    for game in range(1, size + 1):
+        draws = []
+
+        for _ in range(rng.randint(3, 6)):
+            colors = rng.sample(["red", "green", "blue"], k=rng.randint(1, 3))
+            draws.append(", ".join(f"{rng.randint(1, 16)} {color}" for color in colors))
+
+        document.append(f"Game {game}: {'; '.join(draws)}")
+
+    return {"document": document, "red": 12, "green": 13, "blue": 14}
+
+
+@generator(2023, 3, start=140 * 140)
+def year_2023_day_3(rng: random.Random, size: int) -> Arguments:
+    """A square engine schematic of `size` cells."""
+    width = side(size)
+    document: list[str] = []
+
+    for _ in range(width):
+        row = ""
+
+        while len(row) < width:
+            roll = rng.random()
+
+            if roll < 0.1:
+                row += str(rng.randint(1, 999)) + "."
+            elif roll < 0.14:
+                row += rng.choice("*#+$/@%=&-")
+            else:
+                row += "."
+
+        document.append(row[:width])
+
+    return {"document": document}
+
+
+@generator(2023, 4, start=200)
+def year_2023_day_4(rng: random.Random, size: int) -> Arguments:
+    """`size` scratchcards, never winning copies of cards past the end."""
+    document: list[str] = []
+
+    for card in range(1, size + 1):
+        numbers = rng.sample(range(1, 100), k=35)
+        winning = numbers[:10]
+        # Mostly a few matches, or the copies grow beyond all reason
+        matches = min(rng.randint(0, 10), rng.randint(0, 10), size - card)
+        mine = winning[:matches] + numbers[10 : 35 - matches]
+        rng.shuffle(mine)
+
+        document.append(
+            f"Card {card:>3}: {' '.join(f'{number:>2}' for number in winning)}"
+            f" | {' '.join(f'{number:>2}' for number in mine)}"
+        )
+
+    return {"document": document}
+
+
+@generator(2023, 5, start=200)
+def year_2023_day_5(rng: random.Random, size: int) -> Arguments:
+    """Ten seed ranges, and `size` ranges split between the seven maps."""
+    steps = ["seed", "soil", "fertilizer", "water", "light", "temperature", "humidity"]
+    document: list[str] = []
+
+    for source, destination in zip(steps, steps[1:] + ["location"]):
+        if document:
+            document.append("")
+
+        document.append(f"{source}-to-{destination} map:")
+
+        # Source ranges never overlap, and leave some gaps that map to themselves
+        cuts = sorted(rng.sample(range(2**32), k=max(size // 7, 1) + 1))
+
+        for start, end in zip(cuts, cuts[1:]):
+            if rng.random() < 0.9:
+                document.append(f"{rng.randrange(2**32)} {start} {end - start}")
+
+    seeds: list[int] = []
+
+    for _ in range(10):
+        seeds += [rng.randrange(2**32 - 2**29), rng.randint(10**7, 2**29)]
+
+    return {"document": document, "seeds": seeds}
+
+
+@generator(2023, 6, start=100)
+def year_2023_day_6(rng: random.Random, size: int) -> Arguments:
+    """`size` races, and one long race for part 2."""
+    times = [rng.randint(20, 100) for _ in range(size)]
+    distances = [rng.randint(time, time**2 // 4 - 1) for time in times]
+    time = rng.randint(10**7, 10**8) * size
+
+    return {
+        "times": times,
+        "distances": distances,
+        "time": time,
+        "distance": rng.randint(time, time**2 // 4 - 1),
+    }
+
+
+@generator(2023, 7, start=1000)
+def year_2023_day_7(rng: random.Random, size: int) -> Arguments:
+    """`size` hands and their bids."""
+    return {
+        "document": [
+            f"{''.join(rng.choices('23456789TJQKA', k=5))} {rng.randint(1, 1000)}"
+            for _ in range(size)
+        ]
+    }
+
+
+@generator(2023, 8, start=800)
+def year_2023_day_8(rng: random.Random, size: int) -> Arguments:
+    """
+    `size` nodes in six loops, `AAA` to `ZZZ` being one of them.
+    Each loop reaches its `Z` node after a multiple of its length, as the puzzle's input does.
+    """
+    instructions = "".join(rng.choices("LR", k=rng.randint(50, 300)))
+    inner = [name.upper() for name in names(rng, 2 * size + 60) if name[-1] not in "az"]
+    document: list[str] = []
+
+    for ghost in range(6):
+        start, end = (
+            ("AAA", "ZZZ") if ghost == 0 else (f"{ghost}{ghost}A", f"{ghost}{ghost}Z")
+        )
+        length = max(size // 6, 2) + rng.randint(0, 5)
+        path = [start, *(inner.pop() for _ in range(length - 2)), end]
+
+        # Left or right doesn't matter, every node has one way on
+        for node, next_node in zip(path, path[1:]):
+            document.append(f"{node} = ({next_node}, {next_node})")
+
+        document.append(f"{end} = ({path[1]}, {path[1]})")
+
+    rng.shuffle(document)
+
+    return {"instructions": instructions, "document": document}
+
+
+@generator(2023, 9, start=200)
+def year_2023_day_9(rng: random.Random, size: int) -> Arguments:
+    """`size` histories, each a polynomial's first 21 values."""
+    document: list[str] = []
+
+    for _ in range(size):
+        coefficients = [rng.randint(-5, 5) for _ in range(rng.randint(2, 7))]
+        values = [
+            sum(
+                coefficient * x**power for power, coefficient in enumerate(coefficients)
+            )
+            for x in range(21)
+        ]
+
+        document.append(" ".join(map(str, values)))
+
+    return {"document": document}
+
+
+@generator(2023, 10, start=140 * 140)
+def year_2023_day_10(rng: random.Random, size: int) -> Arguments:
+    """A square field of pipes with `size` cells, the loop through `S` filling most of it."""
+    width = side(size, minimum=6)
+    loop = tree_loop(rng, width // 2 - 1, width // 2 - 1, coverage=0.7)
+    pipes = {
+        frozenset(((0, -1), (0, 1))): "|",
+        frozenset(((-1, 0), (1, 0))): "-",
+        frozenset(((0, -1), (1, 0))): "L",
+        frozenset(((0, -1), (-1, 0))): "J",
+        frozenset(((0, 1), (-1, 0))): "7",
+        frozenset(((0, 1), (1, 0))): "F",
+    }
+
+    # Junk pipes everywhere else, one cell in so the loop's cells aren't all on the edge
+    rows = [rng.choices("|-LJ7F..", k=width) for _ in range(width)]
+
+    for previous, (x, y), following in zip(
+        loop[-1:] + loop[:-1], loop, loop[1:] + loop[:1]
+    ):
+        offsets = frozenset(
+            (other_x - x, other_y - y) for other_x, other_y in (previous, following)
+        )
+        rows[y + 1][x + 1] = pipes[offsets]
+
+    # `S` is the loop's top-left corner, nothing else around it may lead in
+    x, y = loop[0]
+    rows[y + 1][x + 1] = "S"
+    rows[y][x + 1] = "."
+    rows[y + 1][x] = "."
+
+    return {"document": ["".join(row) for row in rows]}
+
+
+@generator(2023, 11, start=140 * 140, exponents={1: 2.0, 2: 2.0})
+def year_2023_day_11(rng: random.Random, size: int) -> Arguments:
+    """A square image of `size` cells, with every pair of galaxies measured."""
+    width = side(size)
+    empty_rows = set(rng.sample(range(width), k=width // 10))
+    empty_columns = set(rng.sample(range(width), k=width // 10))
+
+    return {
+        "document": [
+            "".join(
+                "#"
+                if y not in empty_rows
+                and x not in empty_columns
+                and rng.random() < 0.02
+                else "."
+                for x in range(width)
+            )
+            for y in range(width)
+        ]
+    }
+
+
+@generator(2023, 12, start=1000)
+def year_2023_day_12(rng: random.Random, size: int) -> Arguments:
+    """`size` rows of springs, each from a real arrangement with half its springs unknown."""
+    document: list[str] = []
+
+    for _ in range(size):
+        counts = [rng.randint(1, 5) for _ in range(rng.randint(1, 5))]
+        groups = ["#" * count + "." * rng.randint(1, 2) for count in counts]
+        springs = (
+            "." * rng.randint(0, 2) + "".join(groups)[:-1] + "." * rng.randint(0, 2)
+        )
+        springs = "".join("?" if rng.random() < 0.5 else spring for spring in springs)
+
+        document.append(f"{springs} {','.join(map(str, counts))}")
+
+    return {"document": document}
+
+
+@generator(2023, 13, start=100)
+def year_2023_day_13(rng: random.Random, size: int) -> Arguments:
+    """
+    `size` patterns, each reflected across a column, and across a row but for a single smudge.
+    """
+    document: list[str] = []
+
+    for _ in range(size):
+        width = rng.randint(5, 17)
+        height = rng.randint(5, 17)
+        row = rng.randint(1, height - 1)
+
+        # Columns mirrored across `column`, leaving some free for the smudge
+        column = rng.randint(1, (width - 1) // 2)
+        halves: list[list[str]] = []
+
+        for _ in range(max(row, height - row)):
+            left = rng.choices("#.", k=column)
+            halves.append(left + left[::-1] + rng.choices("#.", k=width - 2 * column))
+
+        # Rows mirrored across `row`
+        rows = [list(cells) for cells in halves[:row][::-1] + halves[: height - row]]
+
+        # The smudge, in a reflected row and a column the column reflection doesn't cover
+        reflected = min(row, height - row)
+        smudged = rows[rng.randrange(row - reflected, row + reflected)]
+        smudge = rng.randrange(2 * column, width)
+        smudged[smudge] = "#" if smudged[smudge] == "." else "."
+
+        if document:
+            document.append("")
+
+        document += ["".join(cells) for cells in rows]
+
+    return {"document": document}
+
+
+@generator(2023, 14, start=100 * 100)
+def year_2023_day_14(rng: random.Random, size: int) -> Arguments:
+    """A square platform of `size` cells."""
+    width = side(size)
+
+    return {
+        "document": [
+            "".join(rng.choices(".O#", weights=[65, 20, 15], k=width))
+            for _ in range(width)
+        ]
+    }
+
+
+@generator(2023, 15, start=4000)
+def year_2023_day_15(rng: random.Random, size: int) -> Arguments:
+    """`size` steps over a quarter as many labels."""
+    labels = names(rng, max(size // 4, 1), length=2)
+    steps = [
+        f"{label}-" if rng.random() < 0.2 else f"{label}={rng.randint(1, 9)}"
+        for label in rng.choices(labels, k=size)
+    ]
+
+    return {"document": steps}
+
+
+@generator(2023, 16, start=110 * 110)
+def year_2023_day_16(rng: random.Random, size: int) -> Arguments:
+    """A square contraption of `size` cells."""
+    width = side(size)
+
+    return {
+        "document": [
+            "".join(rng.choices(".\\/|-", weights=[90, 3, 3, 2, 2], k=width))
+            for _ in range(width)
+        ]
+    }
+
+
+@generator(2023, 17, start=140 * 140)
+def year_2023_day_17(rng: random.Random, size: int) -> Arguments:
+    """A square city of `size` blocks."""
+    width = side(size)
+
+    return {
+        "document": [
+            "".join(rng.choices(string.digits[1:], k=width)) for _ in range(width)
+        ]
+    }
+
+
+@generator(2023, 18, start=700)
+def year_2023_day_18(rng: random.Random, size: int) -> Arguments:
+    """
+    About `size` instructions digging a simple loop.
+    The colors dig the same shape, scaled up, so both parts' loops are simple too.
+    """
+    width = max(math.isqrt(size) // 2, 2)
+    loop = runs(tree_loop(rng, width, width))
+
+    # Spread the grid's lines out, by a little for part 1 and a lot for part 2
+    small = list(itertools.accumulate(rng.choices(range(1, 10), k=4 * width)))
+    large = list(
+        itertools.accumulate(rng.choices(range(1, 0xFFFFF // (2 * width)), k=4 * width))
+    )
+
+    document: list[str] = []
+    x, y = loop[-1][1:]
+
+    for direction, next_x, next_y in loop:
+        if direction in "LR":
+            distance = abs(small[next_x] - small[x])
+            color = abs(large[next_x] - large[x])
+        else:
+            distance = abs(small[next_y] - small[y])
+            color = abs(large[next_y] - large[y])
+
+        document.append(
+            f"{direction} {distance} (#{color:05x}{'RDLU'.index(direction)})"
+        )
+        x, y = next_x, next_y
+
+    return {"document": document}
+
+
+@generator(2023, 19, start=800)
+def year_2023_day_19(rng: random.Random, size: int) -> Arguments:
+    """About `size` lines: a tree of workflows from `in`, and a quarter as many parts."""
+    workflows = max(size * 3 // 4, 1)
+    keys = ["in", *(name for name in names(rng, workflows) if name != "in")][:workflows]
+    targets = iter(keys[1:])
+    document: list[str] = []
+
+    for key in keys:
+        rules: list[str] = []
+
+        for _ in range(rng.randint(1, 3)):
+            target = next(targets, None) or rng.choice("AR")
+            rating = rng.choice("xmas")
+            operator = rng.choice("<>")
+
+            rules.append(f"{rating}{operator}{rng.randint(1, 4000)}:{target}")
+
+        rules.append(next(targets, None) or rng.choice("AR"))
+        document.append(f"{key}{{{','.join(rules)}}}")
+
+    document.append("")
+
+    for _ in range(max(size // 4, 1)):
+        ratings = [f"{rating}={rng.randint(1, 4000)}" for rating in "xmas"]
+        document.append(f"{{{','.join(ratings)}}}")
+
+    return {"document": document}
+
+
+@generator(2023, 20, start=60)
+def year_2023_day_20(rng: random.Random, size: int) -> Arguments:
+    """
+    About `size` modules: 12-bit counters of flip-flops, each resetting at its own (odd) count,
+    feeding `kh` and then `rx`, as the puzzle's input does.
+    """
+    counters = max(size // 14, 1)
+    modules = iter(names(rng, counters * 14))
+    broadcasts: list[str] = []
+    document: list[str] = []
+    inverters: list[str] = []
+
+    for _ in range(counters):
+        bits = [next(modules) for _ in range(12)]
+        hub = next(modules)
+        inverter = next(modules)
+        resets = rng.randrange(2**11 + 1, 2**12, 2)
+
+        broadcasts.append(bits[0])
+        inverters.append(inverter)
+
+        for index, bit in enumerate(bits):
+            outputs = bits[index + 1 : index + 2]
+
+            # The hub watches the bits set in the count, and sets the rest once it's reached
+            if resets >> index & 1:
+                outputs.append(hub)
+
+            document.append(f"%{bit} -> {', '.join(outputs)}")
+
+        clears = [bit for index, bit in enumerate(bits) if not resets >> index & 1]
+        document.append(f"&{hub} -> {', '.join([*clears, bits[0], inverter])}")
+        document.append(f"&{inverter} -> kh")
+
+    document.append(f"broadcaster -> {', '.join(broadcasts)}")
+    document.append("&kh -> rx")
+    rng.shuffle(document)
+
+    return {"document": document}
+
+
+@generator(2023, 21, start=131 * 131)
+def year_2023_day_21(rng: random.Random, size: int) -> Arguments:
+    """A square garden of `size` plots, `S` in the middle and enough steps to reach the edge."""
+    width = side(size) | 1
+    middle = width // 2
+    rows = [rng.choices(".#", weights=[90, 10], k=width) for _ in range(width)]
+
+    # The middle row and column are clear, as in the puzzle's input
+    for index in range(width):
+        rows[middle][index] = "."
+        rows[index][middle] = "."
+
+    rows[middle][middle] = "S"
+
+    return {"document": ["".join(row) for row in rows], "steps": middle}
+
+
+# The towers grow taller on the same area, so each brick topples about as many as there are
+@generator(2023, 22, start=1300, exponents={2: 2.0})
+def year_2023_day_22(rng: random.Random, size: int) -> Arguments:
+    """`size` bricks over a 10x10 area, scattered about four bricks per level before they fall."""
+    document: list[str] = []
+    occupied: set[tuple[int, int, int]] = set()
+
+    while len(document) < size:
+        x, y, z = (
+            rng.randrange(10),
+            rng.randrange(10),
+            rng.randint(1, max(size // 4, 10)),
+        )
+        length = rng.randint(0, 3)
+        end = [
+            (min(x + length, 9), y, z),
+            (x, min(y + length, 9), z),
+            (x, y, z + length),
+        ][rng.randrange(3)]
+
+        cubes = set(
+            itertools.product(
+                range(x, end[0] + 1), range(y, end[1] + 1), range(z, end[2] + 1)
+            )
+        )
+
+        # Bricks never start out overlapping
+        if cubes & occupied:
+            continue
+
+        occupied |= cubes
+        document.append(f"{x},{y},{z}~{end[0]},{end[1]},{end[2]}")
+
+    return {"document": document}
+
+
+@generator(2023, 23, start=20 * 20, exponents={1: math.inf, 2: math.inf})
+def year_2023_day_23(rng: random.Random, size: int) -> Arguments:
+    """
+    A square map of about `size` tiles: a grid of junctions joined by straight trails,
+    the slopes leading down and right, as the puzzle's input's do.
+    Every path is walked, so the time grows exponentially with the size.
+    """
+    spacing = 6
+    junctions = max(side(size) // spacing, 2)
+    width = (junctions - 1) * spacing + 3
+    rows = [["#"] * width for _ in range(width)]
+
+    def trail(x: int, y: int, x_offset: int, y_offset: int) -> None:
+        slope = ">" if x_offset else "v"
+
+        for step in range(1, spacing):
+            tile = slope if step in (1, spacing - 1) else "."
+            rows[y + y_offset * step][x + x_offset * step] = tile
+
+    for row in range(junctions):
+        for column in range(junctions):
+            x, y = 1 + column * spacing, 1 + row * spacing
+            rows[y][x] = "."
+
+            # Some trails are missing, but there's always a way on down or right
+            right = column < junctions - 1 and (
+                row == junctions - 1 or rng.random() < 0.8
+            )
+            down = row < junctions - 1 and (
+                not right or column == junctions - 1 or rng.random() < 0.8
+            )
+
+            if right:
+                trail(x, y, 1, 0)
+
+            if down:
+                trail(x, y, 0, 1)
+
+    rows[0][1] = "."
+    rows[-1][-2] = "."
+
+    return {"document": ["".join(row) for row in rows]}
+
+
+@generator(2023, 24, start=300, exponents={1: 2.0})
+def year_2023_day_24(rng: random.Random, size: int) -> Arguments:
+    """`size` hailstones, all hit by one thrown rock, and every pair of their paths crossed."""
+    rock = [rng.randint(2 * 10**14, 4 * 10**14) for _ in range(3)]
+    throw = [rng.randint(-300, 300) for _ in range(3)]
+    times = rng.sample(range(10**10, 3 * 10**11), k=size)
+    document: list[str] = []
+
+    for time in times:
+        velocity = [
+            rng.choice([value for value in range(-300, 301) if value not in (0, speed)])
+            for speed in throw
+        ]
+        start = [
+            position + time * (speed - value)
+            for position, speed, value in zip(rock, throw, velocity)
+        ]
+
+        document.append(
+            f"{', '.join(map(str, start))} @ {', '.join(map(str, velocity))}"
+        )
+
+    return {
+        "document": document,
+        "lower": 2 * 10**14,
+        "upper": 4 * 10**14,
+    }
+
+
+@generator(2023, 25, start=1500)
+def year_2023_day_25(rng: random.Random, size: int) -> Arguments:
+    """`size` components in two groups, only three wires apart."""
+    components = names(rng, max(size, 10))
+    middle = len(components) // 2
+    wires: list[tuple[str, str]] = []
+
+    for group in (components[:middle], components[middle:]):
+        # Every component is wired to four before it, so only the three wires between groups are a cut
+        for index, component in enumerate(group[1:], start=1):
+            for other in rng.sample(group[:index], k=min(index, 4)):
+                wires.append((component, other))
+
+    for _ in range(3):
+        wires.append((rng.choice(components[:middle]), rng.choice(components[middle:])))
+
+    connections: dict[str, list[str]] = defaultdict(list)
+
+    for first, second in wires:
+        connections[first].append(second)
+
+    return {
+        "document": [
+            f"{component}: {' '.join(others)}"
+            for component, others in connections.items()
+        ]
+    }
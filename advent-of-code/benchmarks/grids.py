@@ -0,0 +1,155 @@
+"""
+Memory and speed of a `dict[Coordinate, str]` grid against `Grid2D`, on the 2023 grid days' puzzle inputs.
+
+Each representation is built from the input, then every cell's in-bounds neighbours are visited once,
+the access pattern of the days' searches and flood fills.
+
+    python -m benchmarks.grids [--repeat N] [--json report.json]
+"""
+
+import argparse
+import json
+import statistics
+import time
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable
+
+from src.utils import DIRECTIONS, Grid2D
+
+TESTS = Path(__file__).parent.parent / "tests"
+
+DAYS = [10, 14, 16, 17, 21, 23]
+
+
+@dataclass(frozen=True)
+class Coordinate:
+    # What the days used before `Grid2D`
+    x: int
+    y: int
+
+
+def build_dict(lines: list[str]) -> dict[Coordinate, str]:
+    grid: dict[Coordinate, str] = {}
+
+    for y, line in enumerate(lines):
+        for x, character in enumerate(line):
+            grid[Coordinate(x=x, y=y)] = character
+
+    return grid
+
+
+def visit_dict(grid: dict[Coordinate, str]) -> int:
+    visited = 0
+
+    for coordinate in grid:
+        for x_offset, y_offset in DIRECTIONS:
+            neighbour = Coordinate(x=coordinate.x + x_offset, y=coordinate.y + y_offset)
+
+            if neighbour in grid:
+                visited += 1
+
+    return visited
+
+
+def build_array(lines: list[str]) -> Grid2D:
+    return Grid2D.from_lines(lines)
+
+
+def visit_array(grid: Grid2D) -> int:
+    visited = 0
+
+    for index in range(len(grid)):
+        for _ in grid.neighbours(index):
+            visited += 1
+
+    return visited
+
+
+# Name -> (build, visit every neighbour)
+GRIDS: dict[str, tuple[Callable[[list[str]], Any], Callable[[Any], int]]] = {
+    "dict": (build_dict, visit_dict),
+    "Grid2D": (build_array, visit_array),
+}
+
+
+def measure(
+    build: Callable[[list[str]], Any],
+    visit: Callable[[Any], int],
+    lines: list[str],
+    repeat: int,
+) -> dict[str, float]:
+    builds: list[float] = []
+    visits: list[float] = []
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        grid = build(lines)
+        middle = time.perf_counter()
+        visit(grid)
+        end = time.perf_counter()
+
+        builds.append(middle - start)
+        visits.append(end - middle)
+
+    return {"build": statistics.median(builds), "visit": statistics.median(visits)}
+
+
+def memory(
+    build: Callable[[list[str]], Any],
+    visit: Callable[[Any], int],
+    lines: list[str],
+) -> dict[str, int]:
+    """The built grid's size, and the peak once its neighbours are visited (`Grid2D` caches its links)."""
+    tracemalloc.start()
+
+    try:
+        grid = build(lines)
+        size = tracemalloc.get_traced_memory()[0]
+        visit(grid)
+
+        return {"size": size, "peak": tracemalloc.get_traced_memory()[1]}
+    finally:
+        tracemalloc.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", type=Path, default=None)
+    args = parser.parse_args()
+
+    report: dict[str, dict[str, Any]] = {}
+
+    for day in DAYS:
+        lines = (TESTS / f"year_2023/day_{day}/input.txt").read_text().splitlines()
+        name = f"2023/day-{day}"
+
+        # Both have to agree before the numbers mean anything
+        assert len({visit(build(lines)) for build, visit in GRIDS.values()}) == 1
+
+        report[name] = {
+            grid: {
+                **measure(build, visit, lines, args.repeat),
+                **memory(build, visit, lines),
+            }
+            for grid, (build, visit) in GRIDS.items()
+        }
+
+        for grid, measurement in report[name].items():
+            print(
+                f"{name:<12} {grid:<7}"
+                f"  build {measurement['build'] * 1000:7.1f} ms"
+                f"  visit {measurement['visit'] * 1000:7.1f} ms"
+                f"  size {measurement['size'] / 2**10:8.1f} KiB"
+                f"  peak {measurement['peak'] / 2**10:8.1f} KiB",
+                flush=True,
+            )
+
+    if args.json is not None:
+        args.json.write_text(json.dumps(report, indent=4))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Startup cost of the app and of each day module.
+
+Every measurement runs in a fresh interpreter so shared dependencies (numpy, z3, etc.)
+are charged to each module that needs them, the way a cold start would see them.
+
+    python -m benchmarks.imports [--repeat N] [--json report.json]
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+from src.manifest import DAYS
+
+ROOT = Path(__file__).parent.parent
+
+MEASURE = """
+import importlib, time
+{prelude}
+start = time.perf_counter()
+importlib.import_module({module!r})
+print(time.perf_counter() - start)
+"""
+
+
+def measure(module: str, repeat: int, prelude: str = "") -> float:
+    timings: list[float] = []
+
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", MEASURE.format(module=module, prelude=prelude)],
+            cwd=ROOT,
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+
+        timings.append(float(output))
+
+    return statistics.median(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", type=Path, default=None)
+    args = parser.parse_args()
+
+    report: dict[str, float] = {
+        "fastapi": measure("fastapi", args.repeat),
+        "app": measure("app", args.repeat, prelude="import fastapi"),
+    }
+
+    # Framework imports are paid once by the app, charge days for their own imports
+    for day in DAYS:
+        report[day.module] = measure(day.module, args.repeat, prelude="import src")
+
+    width = max(len(name) for name in report)
+
+    for name, seconds in report.items():
+        print(f"{name:<{width}}  {seconds * 1000:8.1f} ms")
+
+    if args.json is not None:
+        args.json.write_text(json.dumps(report, indent=4))
+
+
+if __name__ == "__main__":
+    main()
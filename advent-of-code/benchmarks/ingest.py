@@ -0,0 +1,112 @@
+"""
+Request overhead of each way of sending a document, before any solving happens.
+
+Every mode posts the same generated document to a route that only counts its lines,
+so the timings are the cost of transport, parsing and validation alone.
+
+    python -m benchmarks.ingest [--lines N] [--repeat N] [--json report.json]
+"""
+
+import argparse
+import gzip
+import json
+import random
+import statistics
+import string
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+from fastapi import APIRouter, Body, FastAPI
+from fastapi.testclient import TestClient
+
+from src.ingest import DocumentRoute
+
+router = APIRouter(route_class=DocumentRoute)
+
+
+@router.post("/count")
+async def count(document: list[str] = Body(..., embed=True)) -> int:
+    return len(document)
+
+
+def generate(lines: int, width: int = 64, seed: int = 0) -> str:
+    letters = string.ascii_letters + string.digits
+    generator = random.Random(seed)
+
+    return "\n".join("".join(generator.choices(letters, k=width)) for _ in range(lines))
+
+
+def modes(text: str) -> dict[str, dict[str, Any]]:
+    data = text.encode()
+
+    return {
+        "json": {
+            "content": json.dumps({"document": text.splitlines()}).encode(),
+            "headers": {"Content-Type": "application/json"},
+        },
+        "json+gzip": {
+            "content": gzip.compress(
+                json.dumps({"document": text.splitlines()}).encode()
+            ),
+            "headers": {"Content-Type": "application/json", "Content-Encoding": "gzip"},
+        },
+        "text": {
+            "content": data,
+            "headers": {"Content-Type": "text/plain"},
+        },
+        "text+gzip": {
+            "content": gzip.compress(data),
+            "headers": {"Content-Type": "text/plain", "Content-Encoding": "gzip"},
+        },
+        "multipart": {
+            "files": {"document": ("input.txt", data)},
+        },
+    }
+
+
+def measure(request: Callable[[], Any], repeat: int) -> float:
+    timings: list[float] = []
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        request()
+        timings.append(time.perf_counter() - start)
+
+    return statistics.median(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--lines", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", type=Path, default=None)
+    args = parser.parse_args()
+
+    app = FastAPI()
+    app.include_router(router)
+    test_client = TestClient(app)
+
+    text = generate(args.lines)
+    report: dict[str, float] = {}
+
+    for name, kwargs in modes(text).items():
+
+        def request() -> None:
+            response = test_client.post("/count", **kwargs)
+
+            assert response.json() == args.lines
+
+        report[name] = measure(request, args.repeat)
+
+    width = max(len(name) for name in report)
+
+    for name, seconds in report.items():
+        print(f"{name:<{width}}  {seconds * 1000:8.1f} ms")
+
+    if args.json is not None:
+        args.json.write_text(json.dumps(report, indent=4))
+
+
+if __name__ == "__main__":
+    main()
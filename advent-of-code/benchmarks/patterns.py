@@ -0,0 +1,152 @@
+"""
+Speed of `PatternMatcher` against searching for every pattern with `str.find`/`str.rfind`,
+finding the first and last "digit" of 2023 day 1 part 2 in longer and longer lines.
+
+Lines are filler that can't spell a digit, with a few digits or spelled out ones placed at random,
+so how far in the first and last ones are varies as it would in real lines.
+
+    python -m benchmarks.patterns [--length 100 --length 100000] [--lines N] [--repeat N] [--json report.json]
+"""
+
+import argparse
+import functools
+import json
+import random
+import statistics
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+from src.utils import PatternMatcher
+from src.year_2023.day_1 import VALID_DIGIT_TO_NUM
+
+# None of the letters of a spelled out digit, so filler never spells one by accident
+FILLER = "abcdjklmpqyz"
+
+
+def reduce_lfind(a: str, b: str, line: str) -> str:
+    # What the day used before `PatternMatcher`
+    position_a = line.find(a)
+    position_b = line.find(b)
+
+    if position_a == -1:
+        return b
+
+    if position_b == -1:
+        return a
+
+    if position_a < position_b:
+        return a
+
+    return b
+
+
+def reduce_rfind(a: str, b: str, line: str) -> str:
+    position_a = line.rfind(a)
+    position_b = line.rfind(b)
+
+    if position_a == -1:
+        return b
+
+    if position_b == -1:
+        return a
+
+    if position_a > position_b:
+        return a
+
+    return b
+
+
+def digits_find(line: str) -> tuple[int, int]:
+    first = functools.reduce(lambda a, b: reduce_lfind(a, b, line), VALID_DIGIT_TO_NUM)
+    last = functools.reduce(lambda a, b: reduce_rfind(a, b, line), VALID_DIGIT_TO_NUM)
+
+    return VALID_DIGIT_TO_NUM[first], VALID_DIGIT_TO_NUM[last]
+
+
+MATCHER = PatternMatcher(VALID_DIGIT_TO_NUM)
+
+
+def digits_matcher(line: str) -> tuple[int, int]:
+    _, first = MATCHER.first(line)  # type: ignore[misc]
+    _, last = MATCHER.last(line)  # type: ignore[misc]
+
+    return first, last
+
+
+def lines(rng: random.Random, length: int, count: int) -> list[str]:
+    digits = list(VALID_DIGIT_TO_NUM)
+    found: list[str] = []
+
+    for _ in range(count):
+        line = rng.choices(FILLER, k=length)
+
+        for _ in range(rng.randint(1, 4)):
+            line.insert(rng.randrange(len(line) + 1), rng.choice(digits))
+
+        found.append("".join(line))
+
+    return found
+
+
+def measure(
+    find: Callable[[str], tuple[int, int]], text: list[str], repeat: int
+) -> float:
+    timings: list[float] = []
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+
+        for line in text:
+            find(line)
+
+        timings.append(time.perf_counter() - start)
+
+    return statistics.median(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--length", type=int, action="append", default=None)
+    parser.add_argument("--lines", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", type=Path, default=None)
+    args = parser.parse_args()
+
+    results: dict[int, dict[str, Any]] = {}
+
+    for length in args.length or [10, 100, 1000, 10000, 100000]:
+        rng = random.Random(f"{length}/{args.seed}")
+        # About the same number of characters for every length
+        text = lines(rng, length, max(args.lines * 100 // length, 1))
+
+        if [digits_find(line) for line in text] != [
+            digits_matcher(line) for line in text
+        ]:
+            raise AssertionError(f"Different digits for lines of {length} characters")
+
+        find = measure(digits_find, text, args.repeat)
+        matcher = measure(digits_matcher, text, args.repeat)
+
+        results[length] = {
+            "lines": len(text),
+            "find": find,
+            "matcher": matcher,
+            "speedup": find / matcher,
+        }
+
+        print(
+            f"length {length:>8} x {len(text):>6} lines"
+            f"  find {find * 1000:9.2f} ms"
+            f"  matcher {matcher * 1000:9.2f} ms"
+            f"  {find / matcher:7.2f}x",
+            flush=True,
+        )
+
+    if args.json is not None:
+        args.json.write_text(json.dumps({"results": results}, indent=4))
+
+
+if __name__ == "__main__":
+    main()
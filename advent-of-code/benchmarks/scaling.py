@@ -0,0 +1,241 @@
+"""
+How every solver's time grows with its input, on generated inputs up to 1000x the checked-in ones.
+
+Each part is solved directly (the undecorated solver, no cache or pool) on inputs from `benchmarks.generators`,
+starting about the checked-in input's size and growing by `--factor` for up to `--steps` sizes,
+stopping early once a solve takes longer than `--budget` seconds.
+The slope of log(time) against log(size) is the empirical exponent: 1 is linear, 2 quadratic.
+Parts growing faster than the puzzle itself needs (by more than `--tolerance`) are flagged.
+Days with several engines are scaled once per engine.
+
+    python -m benchmarks.scaling [--filter 2023/day-24 | '2023/*/part-2'] [--engine reference|fast]
+        [--factor 2] [--steps 11] [--budget 5] [--repeat N] [--seed N] [--tolerance 0.25] [--json report.json]
+"""
+
+import argparse
+import json
+import math
+import platform
+import statistics
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterator
+
+from benchmarks import generators, solvers
+from benchmarks.generators import Generator
+
+from src import engines, manifest
+
+# Faster solves are mostly noise, so they're left out of the fit
+MINIMUM_SECONDS = 0.001
+
+
+@dataclass
+class Scaling:
+    name: str
+    # What the puzzle needs, e.g. 2 for every pair of hailstones
+    expected: float
+    sizes: list[int] = field(default_factory=list)
+    seconds: list[float] = field(default_factory=list)
+
+    @property
+    def exponent(self) -> float | None:
+        points = [
+            (math.log(size), math.log(seconds))
+            for size, seconds in zip(self.sizes, self.seconds)
+            if seconds >= MINIMUM_SECONDS
+        ]
+
+        if len(points) < 2:
+            return None
+
+        return slope(points)
+
+    def flagged(self, tolerance: float) -> bool:
+        exponent = self.exponent
+
+        return exponent is not None and exponent > self.expected + tolerance
+
+
+def slope(points: list[tuple[float, float]]) -> float:
+    """Least squares slope through `points`."""
+    mean_x = statistics.fmean(x for x, _ in points)
+    mean_y = statistics.fmean(y for _, y in points)
+
+    covariance = sum((x - mean_x) * (y - mean_y) for x, y in points)
+    variance = sum((x - mean_x) ** 2 for x, _ in points)
+
+    return covariance / variance
+
+
+def parts(
+    pattern: str,
+    engine_names: list[str] | None = None,
+) -> Iterator[tuple[manifest.Day, int, str, Generator]]:
+    for day, generator in generators.GENERATORS.items():
+        for part in (1, 2):
+            name = f"{day.year}/day-{day.day}/part-{part}"
+            route = solvers.find_route(day, part)
+
+            if route is None or not solvers.matches(name, pattern):
+                continue
+
+            for engine in solvers.route_engines(route):
+                if engine_names is None or engine in engine_names:
+                    yield day, part, engine, generator
+
+
+def case(
+    day: manifest.Day,
+    part: int,
+    size: int,
+    seed: int,
+    engine: str = engines.REFERENCE,
+) -> solvers.Case:
+    route = solvers.find_route(day, part)
+    assert route is not None
+
+    # Generators give every part's arguments, each part takes its own
+    parameters = {parameter.name for parameter in route.dependant.body_params}
+    arguments = generators.generate(day, size, seed)
+
+    return solvers.Case(
+        day=day,
+        part=part,
+        route=route,
+        arguments={key: value for key, value in arguments.items() if key in parameters},
+        expected=None,
+        label=f"size-{size}",
+        engine=engine,
+    )
+
+
+def scale(
+    day: manifest.Day,
+    part: int,
+    engine: str,
+    generator: Generator,
+    factor: float,
+    steps: int,
+    budget: float,
+    repeat: int,
+    seed: int,
+) -> Scaling:
+    name = f"{day.year}/day-{day.day}/part-{part}"
+
+    scaling = Scaling(
+        name=name if engine == engines.REFERENCE else f"{name}@{engine}",
+        expected=generator.exponents.get(part, 1.0),
+    )
+
+    with solvers.uncached():
+        for step in range(steps):
+            size = round(generator.start * factor**step)
+            current = case(day, part, size, seed, engine)
+
+            measurement = solvers.measure(
+                current,
+                lambda: solvers.solve_direct(current),
+                repeat,
+                memory=False,
+            )
+
+            scaling.sizes.append(size)
+            scaling.seconds.append(measurement.median)
+
+            print(
+                f"{scaling.name:<32} size {size:>10}"
+                f"  {measurement.median * 1000:10.1f} ms",
+                flush=True,
+            )
+
+            if measurement.median > budget:
+                break
+
+    return scaling
+
+
+def report(
+    results: list[Scaling],
+    tolerance: float,
+    repeat: int,
+    seed: int,
+) -> dict[str, Any]:
+    return {
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "repeat": repeat,
+        "seed": seed,
+        "results": {
+            scaling.name: {
+                "sizes": scaling.sizes,
+                "seconds": scaling.seconds,
+                "exponent": scaling.exponent,
+                # Unbounded (exponential) puzzles have no expected exponent
+                "expected": scaling.expected
+                if math.isfinite(scaling.expected)
+                else None,
+                "flagged": scaling.flagged(tolerance),
+            }
+            for scaling in results
+        },
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--filter", default="*")
+    parser.add_argument("--engine", action="append", default=None)
+    parser.add_argument("--factor", type=float, default=2.0)
+    parser.add_argument("--steps", type=int, default=11)
+    parser.add_argument("--budget", type=float, default=5.0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--json", type=Path, default=None)
+    args = parser.parse_args()
+
+    results: list[Scaling] = []
+
+    for day, part, engine, generator in parts(args.filter, args.engine):
+        scaling = scale(
+            day,
+            part,
+            engine,
+            generator,
+            args.factor,
+            args.steps,
+            args.budget,
+            args.repeat,
+            args.seed,
+        )
+        results.append(scaling)
+
+        exponent = scaling.exponent
+        fitted = "too fast to fit" if exponent is None else f"n^{exponent:.2f}"
+        flag = "  SUPER-LINEAR" if scaling.flagged(args.tolerance) else ""
+
+        print(f"{scaling.name:<32} {fitted}{flag}", flush=True)
+
+    if args.json is not None:
+        args.json.write_text(
+            json.dumps(
+                report(results, args.tolerance, args.repeat, args.seed), indent=4
+            )
+        )
+
+    flagged = [scaling for scaling in results if scaling.flagged(args.tolerance)]
+
+    for scaling in flagged:
+        print(
+            f"Super-linear: {scaling.name} grows as n^{scaling.exponent:.2f},"
+            f" expected n^{scaling.expected:.2f}"
+        )
+
+    if flagged:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,367 @@
+"""
+Wall time and peak memory of every solver on the checked-in puzzle inputs.
+
+Cases come from the day tests' parameters (only the `input.txt` rows, or rows without a file),
+so a new day's test is benchmarked without listing it here.
+Days with several engines (see `src.engines`) get a case per engine, named with an `@engine` suffix
+besides the reference one.
+Each case is solved directly (the undecorated solver, no cache or pool)
+and through the app with the `TestClient` (validation, serialization, etc. included).
+
+    python -m benchmarks.solvers [--filter 2023/day-1 | '2023/*/part-2'] [--mode direct|http]
+        [--engine reference|fast] [--repeat N] [--json report.json] [--baseline report.json] [--threshold 0.2]
+"""
+
+import argparse
+import contextlib
+import copy
+import fnmatch
+import importlib
+import inspect
+import json
+import math
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+from app import PREFIX, app
+from fastapi.routing import APIRoute
+from fastapi.testclient import TestClient
+
+from src import cache, engines, executor, manifest
+from src.cache import ResultCache
+from src.executor import run_coroutine
+from src.ingest import DocumentRoute
+from src.manifest import Day
+
+MODES = ["direct", "http"]
+
+# Parameters a test passes inline, rather than through its parameters
+INLINE_ARGUMENTS: dict[tuple[Day, int], dict[str, Any]] = {
+    (Day(year=2023, day=2), 1): {"red": 12, "green": 13, "blue": 14},
+}
+
+
+@dataclass
+class Case:
+    day: Day
+    part: int
+    route: APIRoute
+    arguments: dict[str, Any]
+    expected: Any
+    label: str
+    engine: str = engines.REFERENCE
+
+    @property
+    def path(self) -> str:
+        return f"{self.day.prefix}/part-{self.part}"
+
+    @property
+    def name(self) -> str:
+        name = f"{self.day.year}/day-{self.day.day}/part-{self.part}/{self.label}"
+
+        # Reference cases keep their names, so older reports still compare
+        if self.engine != engines.REFERENCE:
+            name = f"{name}@{self.engine}"
+
+        return name
+
+
+@dataclass
+class Measurement:
+    min: float
+    median: float
+    p95: float
+    peak_memory: int | None = None
+
+
+def find_route(day: Day, part: int) -> DocumentRoute | None:
+    for route in manifest.load(day).routes:
+        if isinstance(route, DocumentRoute) and route.path == f"/part-{part}":
+            return route
+
+    return None
+
+
+def route_engines(route: APIRoute) -> list[str]:
+    return engines.supported(route.endpoint)
+
+
+def day_cases(day: Day) -> Iterator[Case]:
+    tests = importlib.import_module(f"tests.year_{day.year}.day_{day.day}.test")
+    directory = Path(tests.__file__).parent
+
+    for name, test in inspect.getmembers(tests, inspect.isfunction):
+        if not name.startswith("test_part_"):
+            continue
+
+        part = int(name.removeprefix("test_part_"))
+        route = find_route(day, part)
+
+        if route is None:
+            continue
+
+        parameters = {field.name: field for field in route.dependant.body_params}
+
+        for mark in getattr(test, "pytestmark", []):
+            if mark.name != "parametrize":
+                continue
+
+            names = [name.strip() for name in mark.args[0].split(",")]
+
+            for index, values in enumerate(mark.args[1]):
+                row = dict(zip(names, values))
+                filename = row.pop("filename", None)
+
+                # Examples are for correctness, only benchmark the real inputs
+                if filename is not None and filename != "input.txt":
+                    continue
+
+                arguments = {
+                    **INLINE_ARGUMENTS.get((day, part), {}),
+                    **{key: row.pop(key) for key in list(row) if key in parameters},
+                }
+
+                if filename is not None:
+                    text = (directory / filename).read_text()
+                    # Split and joined as the route does an uploaded document
+                    arguments["document"] = route.document_value(text.splitlines())
+
+                for engine in route_engines(route):
+                    yield Case(
+                        day=day,
+                        part=part,
+                        route=route,
+                        arguments=arguments,
+                        expected=next(iter(row.values()), None),
+                        label=filename or f"#{index}",
+                        engine=engine,
+                    )
+
+
+def matches(name: str, pattern: str) -> bool:
+    # Patterns are globs, matching whole path segments (`2023/day-2` isn't day 20)
+    return fnmatch.fnmatch(name, pattern) or fnmatch.fnmatch(
+        name, f"{pattern.rstrip('/')}/*"
+    )
+
+
+def cases(pattern: str = "*", engine_names: list[str] | None = None) -> list[Case]:
+    return [
+        case
+        for day in manifest.DAYS
+        for case in day_cases(day)
+        if matches(case.name.partition("@")[0], pattern)
+        and (engine_names is None or case.engine in engine_names)
+    ]
+
+
+@contextlib.contextmanager
+def uncached() -> Iterator[None]:
+    # Every repetition has to actually solve, and parse
+    results = executor.results
+    parsed = cache.parsed
+    executor.results = ResultCache(size=0)
+    cache.parsed = ResultCache(size=0)
+
+    try:
+        yield
+    finally:
+        executor.results = results
+        cache.parsed = parsed
+
+
+def solve_direct(case: Case) -> Any:
+    solver = inspect.unwrap(case.route.endpoint)
+
+    # Some solvers mutate their arguments
+    with engines.using(case.engine):
+        return run_coroutine(solver(**copy.deepcopy(case.arguments)))
+
+
+def solve_http(case: Case, test_client: TestClient) -> Any:
+    response = test_client.post(
+        case.path.removeprefix("/"),
+        json={**case.arguments, "engine": case.engine},
+    )
+    response.raise_for_status()
+
+    return response.json()
+
+
+def percentile(timings: list[float], percent: float) -> float:
+    # Nearest rank, so a handful of repetitions still gives one of the timings
+    ordered = sorted(timings)
+
+    return ordered[max(math.ceil(len(ordered) * percent / 100) - 1, 0)]
+
+
+def peak_memory(solve: Callable[[], Any]) -> int:
+    # Tracing slows everything down, so it gets its own untimed run
+    tracemalloc.start()
+
+    try:
+        solve()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def measure(
+    case: Case,
+    solve: Callable[[], Any],
+    repeat: int,
+    memory: bool = True,
+) -> Measurement:
+    timings: list[float] = []
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        answer = solve()
+        timings.append(time.perf_counter() - start)
+
+        if case.expected is not None and answer != case.expected:
+            raise AssertionError(f"{case.name}: {answer!r} != {case.expected!r}")
+
+    return Measurement(
+        min=min(timings),
+        median=statistics.median(timings),
+        p95=percentile(timings, 95),
+        peak_memory=peak_memory(solve) if memory else None,
+    )
+
+
+def run(
+    case: Case,
+    modes: list[str],
+    repeat: int,
+    memory: bool = True,
+) -> dict[str, Measurement]:
+    measurements: dict[str, Measurement] = {}
+
+    with uncached():
+        if "direct" in modes:
+            measurements["direct"] = measure(
+                case,
+                lambda: solve_direct(case),
+                repeat,
+                memory,
+            )
+
+        if "http" in modes:
+            test_client = TestClient(app=app, base_url=f"http://testserver{PREFIX}")
+
+            # The first request pays for lazily importing the day
+            solve_http(case, test_client)
+
+            measurements["http"] = measure(
+                case,
+                lambda: solve_http(case, test_client),
+                repeat,
+                memory,
+            )
+
+    return measurements
+
+
+def report(
+    results: dict[str, dict[str, Measurement]],
+    repeat: int,
+) -> dict[str, Any]:
+    return {
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "repeat": repeat,
+        "results": {
+            name: {mode: vars(measurement) for mode, measurement in modes.items()}
+            for name, modes in results.items()
+        },
+    }
+
+
+def regressions(
+    current: dict[str, Any],
+    baseline: dict[str, Any],
+    threshold: float,
+) -> list[str]:
+    """Cases whose median is more than `threshold` (a fraction) slower than the baseline."""
+    found: list[str] = []
+
+    for name, modes in current["results"].items():
+        for mode, measurement in modes.items():
+            previous = baseline["results"].get(name, {}).get(mode)
+
+            if previous is None:
+                continue
+
+            ratio = measurement["median"] / previous["median"]
+
+            if ratio > 1 + threshold:
+                found.append(
+                    f"{name} ({mode}): {previous['median'] * 1000:.1f} ms"
+                    f" -> {measurement['median'] * 1000:.1f} ms ({ratio:.2f}x)"
+                )
+
+    return found
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--filter", default="*")
+    parser.add_argument("--mode", choices=MODES, action="append", default=None)
+    parser.add_argument("--engine", action="append", default=None)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--memory", action=argparse.BooleanOptionalAction, default=True)
+    parser.add_argument("--json", type=Path, default=None)
+    parser.add_argument("--baseline", type=Path, default=None)
+    parser.add_argument("--threshold", type=float, default=0.2)
+    args = parser.parse_args()
+
+    modes = args.mode or MODES
+    results: dict[str, dict[str, Measurement]] = {}
+
+    for case in cases(args.filter, args.engine):
+        results[case.name] = run(case, modes, args.repeat, args.memory)
+
+        for mode, measurement in results[case.name].items():
+            memory = (
+                f"{measurement.peak_memory / 2**20:8.1f} MiB"
+                if measurement.peak_memory is not None
+                else ""
+            )
+
+            print(
+                f"{case.name:<48} {mode:<6}"
+                f"  min {measurement.min * 1000:9.1f} ms"
+                f"  median {measurement.median * 1000:9.1f} ms"
+                f"  p95 {measurement.p95 * 1000:9.1f} ms"
+                f"  {memory}",
+                flush=True,
+            )
+
+    current = report(results, args.repeat)
+
+    if args.json is not None:
+        args.json.write_text(json.dumps(current, indent=4))
+
+    if args.baseline is not None:
+        found = regressions(
+            current,
+            json.loads(args.baseline.read_text()),
+            args.threshold,
+        )
+
+        for regression in found:
+            print(f"Regression: {regression}")
+
+        if found:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+import json
+import os
+from pathlib import Path
+from typing import Any, Iterator
+
+import pytest
+from benchmarks import solvers
+
+# Benchmarks are slow, and only meaningful on their own (`-n 0`), so they're opt-in
+BENCHMARK = os.environ.get("AOC_BENCHMARK", "0") == "1"
+
+REPEAT = int(os.environ.get("AOC_BENCHMARK_REPEAT", "5"))
+REPORT = os.environ.get("AOC_BENCHMARK_REPORT")
+BASELINE = os.environ.get("AOC_BENCHMARK_BASELINE")
+THRESHOLD = float(os.environ.get("AOC_BENCHMARK_THRESHOLD", "0.2"))
+
+CASES = solvers.cases(os.environ.get("AOC_BENCHMARK_FILTER", "*")) if BENCHMARK else []
+
+pytestmark = pytest.mark.skipif(
+    not BENCHMARK,
+    reason="Set AOC_BENCHMARK=1 to run the benchmarks",
+)
+
+
+@pytest.fixture(scope="module")
+def results() -> Iterator[dict[str, dict[str, solvers.Measurement]]]:
+    results: dict[str, dict[str, solvers.Measurement]] = {}
+
+    yield results
+
+    if REPORT is not None:
+        Path(REPORT).write_text(json.dumps(solvers.report(results, REPEAT), indent=4))
+
+
+@pytest.mark.parametrize("case", CASES, ids=[case.name for case in CASES])
+def test_benchmark(
+    case: solvers.Case,
+    results: dict[str, dict[str, solvers.Measurement]],
+) -> None:
+    # Wrong answers fail inside the measurement
+    results[case.name] = solvers.run(case, solvers.MODES, REPEAT)
+
+    if BASELINE is not None:
+        baseline: dict[str, Any] = json.loads(Path(BASELINE).read_text())
+        current = solvers.report({case.name: results[case.name]}, REPEAT)
+
+        assert not solvers.regressions(current, baseline, THRESHOLD)
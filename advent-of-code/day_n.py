@@ -1,12 +1,16 @@
 from fastapi import APIRouter, Body
 
-router = APIRouter(tags=["20XX - Day N: Title"])
+from src.executor import solver
+from src.ingest import DocumentRoute
+
+router = APIRouter(tags=["20XX - Day N: Title"], route_class=DocumentRoute)
 
 
 DOCUMENT_EXAMPLE = []
 
 
 @router.post("/part-1")
+@solver()
 async def year_20xx_day_n_part_1(
     document: list[str] = Body(
         ...,
@@ -23,6 +27,7 @@ async def year_20xx_day_n_part_1(
 
 
 @router.post("/part-2")
+@solver()
 async def year_20xx_day_n_part_2(
     document: list[str] = Body(
         ...,
@@ -1,8 +1,12 @@
 from fastapi import APIRouter
 
-from . import year_2022, year_2023
+from . import batch, cache, inputs, jobs, metrics, timing
 
 router = APIRouter()
 
-router.include_router(year_2023.router, prefix="/2023")
-router.include_router(year_2022.router, prefix="/2022")
+router.include_router(batch.router, prefix="/batch")
+router.include_router(cache.router, prefix="/cache")
+router.include_router(inputs.router, prefix="/inputs")
+router.include_router(jobs.router, prefix="/jobs")
+router.include_router(metrics.router, prefix="/metrics")
+router.include_router(timing.router, prefix="/timing")
@@ -0,0 +1,195 @@
+import asyncio
+import contextlib
+import math
+import os
+import resource
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import AsyncIterator, Iterator
+
+from fastapi import HTTPException
+
+
+@dataclass(frozen=True)
+class CostClass:
+    # Solves running at once, `0` is unlimited
+    concurrency: int
+    # Solves waiting for their turn, any more are turned away
+    queue: int
+    # CPU seconds a pooled solve may use before it's stopped, `0` is unlimited
+    cpu_seconds: int
+
+
+def route_concurrency(value: str) -> dict[str, int]:
+    # e.g. "year_2023_day_22_part_2=1,year_2023_day_25_part_1=1"
+    limits: dict[str, int] = {}
+
+    for item in filter(None, value.split(",")):
+        name, _, limit = item.partition("=")
+        limits[name.strip()] = int(limit)
+
+    return limits
+
+
+COST_CLASSES: dict[str, CostClass] = {
+    "light": CostClass(
+        concurrency=0,
+        queue=0,
+        cpu_seconds=int(os.environ.get("AOC_LIGHT_CPU_SECONDS", "0")),
+    ),
+    # Parts that saturate a core for seconds, capped so they can't starve the light ones
+    "heavy": CostClass(
+        concurrency=int(
+            os.environ.get(
+                "AOC_HEAVY_CONCURRENCY", str(max((os.cpu_count() or 1) // 2, 1))
+            )
+        ),
+        queue=int(os.environ.get("AOC_HEAVY_QUEUE", "8")),
+        cpu_seconds=int(os.environ.get("AOC_HEAVY_CPU_SECONDS", "300")),
+    ),
+}
+
+# Caps for single routes by solver name, on top of their cost class
+ROUTE_CONCURRENCY = route_concurrency(os.environ.get("AOC_ROUTE_CONCURRENCY", ""))
+
+
+class Limiter:
+    """
+    At most `concurrency` solves at once, with up to `queue` more waiting their turn in order.
+    Any more are turned away with a 429, and a `Retry-After` guessed from how long solves take.
+    """
+
+    def __init__(self, name: str, concurrency: int, queue: int) -> None:
+        self.name = name
+        self.concurrency = concurrency
+        self.queue = queue
+
+        self.running = 0
+        self.waiters: deque[asyncio.Future[None]] = deque()
+        self.rejected = 0
+
+        # For the average solve time
+        self.seconds = 0.0
+        self.count = 0
+
+    @property
+    def waiting(self) -> int:
+        return len(self.waiters)
+
+    def retry_after(self) -> int:
+        average = self.seconds / self.count if self.count else 1.0
+
+        # Everyone already waiting goes first
+        return max(math.ceil(average * (self.waiting + 1) / self.concurrency), 1)
+
+    async def acquire(self) -> None:
+        if self.running < self.concurrency and not self.waiters:
+            self.running += 1
+            return
+
+        if self.waiting >= self.queue:
+            self.rejected += 1
+
+            raise HTTPException(
+                status_code=429,
+                detail=f"Too many {self.name} solves, try again later",
+                headers={"Retry-After": str(self.retry_after())},
+            )
+
+        waiter = asyncio.get_running_loop().create_future()
+        self.waiters.append(waiter)
+
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Handed a slot just as we gave up, pass it on
+                self.release()
+            else:
+                self.waiters.remove(waiter)
+
+            raise
+
+    def release(self) -> None:
+        # A finished solve hands its slot straight to the next in line
+        while self.waiters:
+            waiter = self.waiters.popleft()
+
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+
+        self.running -= 1
+
+    @contextlib.asynccontextmanager
+    async def admit(self) -> AsyncIterator[None]:
+        await self.acquire()
+        start = time.perf_counter()
+
+        try:
+            yield
+        finally:
+            self.seconds += time.perf_counter() - start
+            self.count += 1
+            self.release()
+
+
+limiters: dict[str, Limiter] = {}
+
+
+def limiters_for(cost: str, name: str, concurrency: int | None = None) -> list[Limiter]:
+    """The limiters a solve has to get through, the route's own (if it has a cap) then its cost class'."""
+    found: list[Limiter] = []
+
+    concurrency = ROUTE_CONCURRENCY.get(name, concurrency)
+    cost_class = COST_CLASSES[cost]
+
+    if concurrency:
+        found.append(
+            limiters.setdefault(name, Limiter(name, concurrency, cost_class.queue))
+        )
+
+    if cost_class.concurrency:
+        found.append(
+            limiters.setdefault(
+                cost, Limiter(cost, cost_class.concurrency, cost_class.queue)
+            )
+        )
+
+    return found
+
+
+class CPUBudgetExceeded(Exception):
+    pass
+
+
+def exceeded(signum: int, frame: object) -> None:
+    raise CPUBudgetExceeded
+
+
+@contextlib.contextmanager
+def cpu_budget(seconds: int) -> Iterator[None]:
+    """
+    Stop the block (with `CPUBudgetExceeded`) once this process has used `seconds` more CPU time.
+    Needs `exceeded` as the `SIGXCPU` handler, so only pool workers set a budget.
+    """
+    if seconds <= 0:
+        yield
+        return
+
+    soft, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+
+    # The limit is on the process' total CPU time, in whole seconds
+    limit = math.ceil(usage.ru_utime + usage.ru_stime + seconds)
+
+    if hard != resource.RLIM_INFINITY:
+        limit = min(limit, hard)
+
+    resource.setrlimit(resource.RLIMIT_CPU, (limit, hard))
+
+    try:
+        yield
+    finally:
+        resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
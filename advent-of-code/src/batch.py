@@ -0,0 +1,205 @@
+import asyncio
+import json
+import logging
+import time
+from typing import Any, AsyncIterator
+
+from fastapi import APIRouter, Body, HTTPException
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+
+from src import manifest
+from src.ingest import DocumentRoute, load_input
+from src.manifest import Day
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(tags=["Batch"])
+
+
+class Job(BaseModel):
+    year: int
+    day: int
+    part: int
+    # Either the document itself, the name of one of the batch's shared documents, or a registered input's id
+    document: list[str] | str | None = None
+    input: str | None = None
+    input_id: str | None = None
+    # Any other parameters of the part, e.g. `steps`
+    arguments: dict[str, Any] = Field(default_factory=dict)
+
+
+class Batch(BaseModel):
+    documents: dict[str, list[str]] = Field(default_factory=dict)
+    jobs: list[Job]
+
+
+BATCH_EXAMPLE = {
+    "documents": {
+        "day-1": ["1abc2", "pqr3stu8vwx", "a1b2c3d4e5f", "treb7uchet"],
+    },
+    "jobs": [
+        {"year": 2023, "day": 1, "part": 1, "input": "day-1"},
+        {"year": 2023, "day": 1, "part": 2, "input": "day-1"},
+        {
+            "year": 2023,
+            "day": 6,
+            "part": 2,
+            "arguments": {"time": 71530, "distance": 940200},
+        },
+    ],
+}
+
+
+async def find_route(job: Job) -> DocumentRoute:
+    day = Day(year=job.year, day=job.day)
+
+    if day not in manifest.LAZY_ROUTERS:
+        raise HTTPException(
+            status_code=404, detail=f"Unknown day: {job.year} day {job.day}"
+        )
+
+    # Same as the lazy router, don't block other jobs while importing a day
+    day_router = await asyncio.to_thread(manifest.load, day)
+
+    for route in day_router.routes:
+        if isinstance(route, DocumentRoute) and route.path == f"/part-{job.part}":
+            return route
+
+    raise HTTPException(
+        status_code=404,
+        detail=f"Unknown part: {job.year} day {job.day} part {job.part}",
+    )
+
+
+def job_arguments(
+    job: Job, route: DocumentRoute, documents: dict[str, list[str]]
+) -> dict[str, Any]:
+    """Validate the job's arguments against the route's body parameters, like FastAPI does."""
+    values = dict(job.arguments)
+
+    if job.input is not None:
+        if job.input not in documents:
+            raise HTTPException(status_code=404, detail=f"Unknown input: {job.input}")
+
+        values["document"] = documents[job.input]
+
+    elif job.input_id is not None:
+        # Split and joined as the route does a registered input
+        values["document"] = route.document_value(load_input(job.input_id))
+
+    elif job.document is not None:
+        values["document"] = job.document
+
+    arguments: dict[str, Any] = {}
+    errors: list[Any] = []
+
+    for field in route.dependant.body_params:
+        if field.name not in values:
+            if field.required:
+                errors.append(
+                    {
+                        "type": "missing",
+                        "loc": ("body", field.name),
+                        "msg": "Field required",
+                        "input": None,
+                    }
+                )
+            else:
+                arguments[field.name] = field.get_default()
+
+            continue
+
+        # A document for a part that takes a single string is joined back into one
+        value = values[field.name]
+
+        if (
+            field.name == "document"
+            and field.field_info.annotation is str
+            and isinstance(value, list)
+        ):
+            value = "\n".join(value)
+
+        # Validation copies the document, so parts that mutate it can share the same input
+        arguments[field.name], field_errors = field.validate(
+            value, loc=("body", field.name)
+        )
+        errors.extend(field_errors or [])
+
+    if errors:
+        raise HTTPException(status_code=422, detail=jsonable_encoder(errors))
+
+    return arguments
+
+
+async def run(index: int, job: Job, documents: dict[str, list[str]]) -> dict[str, Any]:
+    outcome: dict[str, Any] = {
+        "index": index,
+        "year": job.year,
+        "day": job.day,
+        "part": job.part,
+    }
+
+    start = time.perf_counter()
+
+    try:
+        route = await find_route(job)
+        outcome["result"] = jsonable_encoder(
+            await route.endpoint(**job_arguments(job, route, documents))
+        )
+
+    except HTTPException as exception:
+        outcome["error"] = {
+            "status_code": exception.status_code,
+            "detail": exception.detail,
+        }
+
+    except Exception:
+        logger.exception(
+            "Batch job %d (%d day %d part %d) failed",
+            index,
+            job.year,
+            job.day,
+            job.part,
+        )
+        outcome["error"] = {
+            "status_code": 500,
+            "detail": "Internal Server Error",
+        }
+
+    outcome["seconds"] = time.perf_counter() - start
+
+    return outcome
+
+
+async def stream(batch: Batch) -> AsyncIterator[str]:
+    tasks = [
+        asyncio.create_task(run(index, job, batch.documents))
+        for index, job in enumerate(batch.jobs)
+    ]
+
+    try:
+        for task in asyncio.as_completed(tasks):
+            yield json.dumps(await task) + "\n"
+
+    finally:
+        # The client went away, stop whatever is still waiting
+        for task in tasks:
+            task.cancel()
+
+
+@router.post("")
+async def batch_solve(
+    batch: Batch = Body(
+        ...,
+        examples=[BATCH_EXAMPLE],
+    ),
+) -> StreamingResponse:
+    """
+    Solve many parts in one request.
+    Jobs run concurrently (CPU-heavy parts in the process pool),
+    and each result is streamed back as a line of NDJSON as soon as it's done, in completion order.
+    Jobs can share a document by naming one of the batch's `documents` as their `input`.
+    """
+    return StreamingResponse(stream(batch), media_type="application/x-ndjson")
@@ -0,0 +1,351 @@
+import contextlib
+import contextvars
+import functools
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Iterator, TypeVar
+
+from fastapi import APIRouter
+
+from src.timing import span
+
+T = TypeVar("T")
+
+router = APIRouter(tags=["Cache"])
+
+# Number of results kept in memory, `0` disables the in-memory tier
+CACHE_SIZE = int(os.environ.get("AOC_CACHE_SIZE", "1024"))
+
+# SQLite database for the persistent tier, unset disables the persistent tier
+CACHE_PATH = os.environ.get("AOC_CACHE_PATH")
+
+# Number of parsed documents kept in memory (per process), `0` disables it
+PARSED_CACHE_SIZE = int(os.environ.get("AOC_PARSED_CACHE_SIZE", "64"))
+
+# Results each memoized function keeps (per process, or per solve if it's scoped), `0` is unbounded
+MEMO_SIZE = int(os.environ.get("AOC_MEMO_SIZE", "65536"))
+
+MISSING = object()
+
+
+def cache_key(route: str, kwargs: dict[str, Any]) -> str:
+    # Validated arguments are the normalized request body
+    # Whitespace, key order, etc. in the raw body don't change the key
+    body = json.dumps(kwargs, sort_keys=True, separators=(",", ":"))
+
+    return f"{route}:{hashlib.sha256(body.encode()).hexdigest()}"
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.disk_hits + self.misses
+
+        if not lookups:
+            return 0.0
+
+        return (self.hits + self.disk_hits) / lookups
+
+
+class DiskCache:
+    def __init__(self, path: str) -> None:
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+
+        with self.lock, self.connection:
+            # Multiple workers can share the same database
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, value TEXT)"
+            )
+
+    def get(self, key: str) -> Any:
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT value FROM results WHERE key = ?", (key,)
+            ).fetchone()
+
+        if row is None:
+            return MISSING
+
+        return json.loads(row[0])
+
+    def put(self, key: str, value: Any) -> None:
+        with self.lock, self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO results (key, value) VALUES (?, ?)",
+                (key, json.dumps(value)),
+            )
+
+    def clear(self) -> None:
+        with self.lock, self.connection:
+            self.connection.execute("DELETE FROM results")
+
+    def __len__(self) -> int:
+        with self.lock:
+            return self.connection.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+
+class ResultCache:
+    def __init__(self, size: int, path: str | None = None) -> None:
+        self.size = size
+        self.memory: OrderedDict[str, Any] = OrderedDict()
+        self.disk = DiskCache(path) if path else None
+        self.stats = CacheStats()
+
+    def get(self, key: str) -> Any:
+        if key in self.memory:
+            self.memory.move_to_end(key)
+            self.stats.hits += 1
+
+            return self.memory[key]
+
+        if self.disk is not None:
+            value = self.disk.get(key)
+
+            if value is not MISSING:
+                self.stats.disk_hits += 1
+                self._remember(key, value)
+
+                return value
+
+        self.stats.misses += 1
+
+        return MISSING
+
+    def put(self, key: str, value: Any) -> None:
+        self._remember(key, value)
+
+        if self.disk is not None:
+            self.disk.put(key, value)
+
+    def clear(self) -> None:
+        self.memory.clear()
+        self.stats = CacheStats()
+
+        if self.disk is not None:
+            self.disk.clear()
+
+    def _remember(self, key: str, value: Any) -> None:
+        if self.size <= 0:
+            return
+
+        self.memory[key] = value
+        self.memory.move_to_end(key)
+
+        # Evict the least recently used results
+        while len(self.memory) > self.size:
+            self.memory.popitem(last=False)
+
+
+results = ResultCache(size=CACHE_SIZE, path=CACHE_PATH)
+
+parsed = ResultCache(size=PARSED_CACHE_SIZE)
+
+
+@dataclass
+class MemoStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    # Most results held at once
+    peak: int = 0
+
+    def merge(self, other: "MemoStats") -> None:
+        self.hits += other.hits
+        self.misses += other.misses
+        self.evictions += other.evictions
+        self.peak = max(self.peak, other.peak)
+
+
+@dataclass
+class MemoScope:
+    # Scoped functions' results, by function
+    tables: dict[str, "functools._lru_cache_wrapper[Any]"] = field(default_factory=dict)
+    # Lookups of the scopes inside this one, then of the whole scope once it's finished
+    stats: dict[str, MemoStats] = field(default_factory=dict)
+
+
+_memo_scope: contextvars.ContextVar[MemoScope | None] = contextvars.ContextVar(
+    "memo_scope", default=None
+)
+
+# Memoized functions by name, and the lookups of finished scopes (including pool workers' solves)
+memos: dict[str, "Memo"] = {}
+memo_stats: dict[str, MemoStats] = {}
+
+
+def table_stats(table: "functools._lru_cache_wrapper[Any]") -> MemoStats:
+    info = table.cache_info()
+
+    # Every miss adds a result, those no longer there were evicted
+    return MemoStats(
+        hits=info.hits,
+        misses=info.misses,
+        evictions=info.misses - info.currsize,
+        peak=info.currsize,
+    )
+
+
+class Memo:
+    """
+    A function's results, in `functools.lru_cache` tables of at most `size`.
+    Scoped functions get a table for each `memo_scope` (every solve is one), dropped with it,
+    the others one for the life of the process.
+    """
+
+    def __init__(self, func: Callable[..., Any], size: int, scoped: bool) -> None:
+        self.func = func
+        self.name = f"{func.__module__}.{func.__qualname__}"
+        self.size = size
+        self.scoped = scoped
+        self.table = self.new_table()
+
+        memos[self.name] = self
+
+    def new_table(self) -> "functools._lru_cache_wrapper[Any]":
+        return functools.lru_cache(maxsize=self.size or None)(self.func)
+
+    def scope_table(self, scope: MemoScope) -> "functools._lru_cache_wrapper[Any]":
+        table = scope.tables.get(self.name)
+
+        if table is None:
+            table = scope.tables[self.name] = self.new_table()
+
+        return table
+
+    @property
+    def stats(self) -> MemoStats:
+        # Finished scopes' lookups, and the process table's
+        stats = MemoStats()
+        stats.merge(memo_stats.get(self.name, MemoStats()))
+        stats.merge(table_stats(self.table))
+
+        return stats
+
+    def clear(self) -> None:
+        self.table.cache_clear()
+
+
+def memoize(
+    size: int | None = None,
+    scoped: bool = False,
+) -> Callable[[Callable[..., T]], Callable[..., T]]:
+    """
+    Memoize a solver's helper, like `functools.cache` but bounded and counted (see `/metrics`).
+    Helpers whose results are only any use for one input should be `scoped`,
+    so they're dropped once the solve is done.
+    """
+
+    def decorator(func: Callable[..., T]) -> Callable[..., T]:
+        memo = Memo(func, MEMO_SIZE if size is None else size, scoped)
+        name = memo.name
+
+        # Called a lot, in the hottest loops, so it's kept to the bare minimum
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> T:
+            scope = _memo_scope.get()
+
+            if scope is None or not scoped:
+                return memo.table(*args, **kwargs)
+
+            table = scope.tables.get(name)
+
+            if table is None:
+                table = memo.scope_table(scope)
+
+            return table(*args, **kwargs)
+
+        wrapper.memo = memo  # type: ignore[attr-defined]
+
+        return wrapper
+
+    return decorator
+
+
+@contextlib.contextmanager
+def memo_scope() -> Iterator[MemoScope]:
+    """Keep scoped functions' results for the block, then drop them and count its lookups."""
+    scope = MemoScope()
+    token = _memo_scope.set(scope)
+
+    try:
+        yield scope
+    finally:
+        _memo_scope.reset(token)
+
+        for name, table in scope.tables.items():
+            scope.stats.setdefault(name, MemoStats()).merge(table_stats(table))
+
+        scope.tables.clear()
+        merge_memo_stats(scope.stats)
+
+
+def merge_memo_stats(stats: dict[str, MemoStats]) -> None:
+    # Into the enclosing scope if there is one, so nested scopes are counted once
+    scope = _memo_scope.get()
+    totals = memo_stats if scope is None else scope.stats
+
+    for name, memo in stats.items():
+        totals.setdefault(name, MemoStats()).merge(memo)
+
+
+def parser(func: Callable[..., T]) -> Callable[..., T]:
+    """
+    Mark a day's parse step.
+    Parsed documents are kept in memory, so the parts of a day requested one after the other
+    only parse their document once. Every caller shares the parsed object, so parts must never mutate it.
+    """
+    route = f"{func.__module__}.{func.__name__}"
+
+    @functools.wraps(func)
+    def wrapper(*args: Any) -> T:
+        # Not worth hashing the document for a disabled cache (e.g. when benchmarking)
+        if parsed.size <= 0:
+            with span("parse"):
+                return func(*args)
+
+        key = cache_key(route, {"args": args})
+        value = parsed.get(key)
+
+        if value is MISSING:
+            with span("parse"):
+                value = func(*args)
+
+            parsed.put(key, value)
+
+        return value
+
+    return wrapper
+
+
+@router.get("")
+async def cache_stats() -> dict[str, int | float]:
+    return {
+        **asdict(results.stats),
+        "hit_rate": results.stats.hit_rate,
+        "size": len(results.memory),
+        "max_size": results.size,
+        "disk_size": len(results.disk) if results.disk is not None else 0,
+        "parsed_size": len(parsed.memory),
+        "memo_size": sum(memo.table.cache_info().currsize for memo in memos.values()),
+    }
+
+
+@router.delete("")
+async def cache_clear() -> None:
+    results.clear()
+    parsed.clear()
+
+    for memo in memos.values():
+        memo.clear()
@@ -0,0 +1,234 @@
+"""
+Solve a day's part directly on a file, without the app: no HTTP, JSON, cache or process pool.
+
+The file is memory-mapped and each line decoded only when the solver reads it.
+Prints the answer, how long parsing and solving took, and the peak memory of a solve.
+
+    python -m src 2023/day-21/part-1 input.txt [--argument steps=64] [--engine fast]
+        [--repeat N] [--no-memory] [--profile]
+"""
+
+import argparse
+import contextlib
+import inspect
+import re
+import statistics
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Sequence
+
+from src import cache, engines, manifest, timing
+from src.cache import ResultCache
+from src.executor import max_rss, run_coroutine
+from src.ingest import DocumentRoute, map_lines, parse_value
+from src.manifest import Day
+
+# e.g. `2023/day-21/part-1`, or just `2023/21/1`
+TARGET = re.compile(r"^(\d{4})/(?:day-)?(\d+)/(?:part-)?(\d+|both)$")
+
+
+class UsageError(Exception):
+    pass
+
+
+@dataclass
+class Run:
+    answer: Any
+    seconds: float
+    parse: float
+
+    @property
+    def solve(self) -> float:
+        return self.seconds - self.parse
+
+
+def find_route(target: str) -> DocumentRoute:
+    match = TARGET.match(target)
+
+    if match is None:
+        raise UsageError(f"Expected YEAR/DAY/PART (e.g. 2023/day-1/part-2): {target}")
+
+    year, number, part = match.groups()
+    day = Day(year=int(year), day=int(number))
+
+    if day not in manifest.LAZY_ROUTERS:
+        raise UsageError(f"Unknown day: {year} day {number}")
+
+    path = "/both" if part == "both" else f"/part-{part}"
+
+    for route in manifest.load(day).routes:
+        if isinstance(route, DocumentRoute) and route.path == path:
+            return route
+
+    raise UsageError(f"Unknown part: {year} day {number} part {part}")
+
+
+def route_arguments(
+    route: DocumentRoute,
+    document: Sequence[str],
+    values: dict[str, str],
+) -> dict[str, Any]:
+    """The solver's arguments, the other parameters validated the way FastAPI would."""
+    arguments: dict[str, Any] = {}
+
+    for field in route.dependant.body_params:
+        if field.name == "engine":
+            # Picked with `--engine` instead
+            continue
+
+        elif field.name == "document":
+            # Split and joined as the route does an uploaded document
+            arguments["document"] = route.document_value(document)
+
+        elif field.name in values:
+            value, errors = field.validate(
+                parse_value(values[field.name]), loc=("argument", field.name)
+            )
+
+            if errors:
+                raise UsageError(f"Invalid argument {field.name}: {values[field.name]}")
+
+            arguments[field.name] = value
+
+        elif field.required:
+            raise UsageError(f"Missing argument: --argument {field.name}=...")
+
+        else:
+            arguments[field.name] = field.get_default()
+
+    unknown = values.keys() - arguments.keys()
+
+    if unknown:
+        raise UsageError(f"Unknown arguments: {', '.join(sorted(unknown))}")
+
+    return arguments
+
+
+def solve(
+    solver: Callable[..., Any],
+    arguments: dict[str, Any],
+    engine: str,
+    profile: bool = False,
+) -> tuple[Any, timing.Timings]:
+    # Parsed documents aren't kept, every run parses again
+    parsed = cache.parsed
+    cache.parsed = ResultCache(size=0)
+
+    try:
+        with timing.collect(profile=profile) as timings, engines.using(engine):
+            with cache.memo_scope():
+                answer = run_coroutine(solver(**arguments))
+    finally:
+        cache.parsed = parsed
+
+    return answer, timings
+
+
+def run(solver: Callable[..., Any], arguments: dict[str, Any], engine: str) -> Run:
+    start = time.perf_counter()
+    answer, timings = solve(solver, arguments, engine)
+
+    return Run(
+        answer=answer,
+        seconds=time.perf_counter() - start,
+        parse=timings.spans.get("parse", 0.0),
+    )
+
+
+def peak_memory(
+    solver: Callable[..., Any], arguments: dict[str, Any], engine: str
+) -> int:
+    # Tracing slows everything down, so it gets its own untimed run
+    tracemalloc.start()
+
+    try:
+        solve(solver, arguments, engine)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def milliseconds(timings: list[float]) -> str:
+    return (
+        f"min {min(timings) * 1000:10.2f} ms"
+        f"  median {statistics.median(timings) * 1000:10.2f} ms"
+    )
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m src", description=__doc__.strip().splitlines()[0]
+    )
+    parser.add_argument("target", help="YEAR/DAY/PART, e.g. 2023/day-1/part-2")
+    parser.add_argument("path", type=Path, help="Puzzle input")
+    parser.add_argument(
+        "--argument",
+        action="append",
+        default=[],
+        metavar="NAME=VALUE",
+        help="Another parameter of the part, as JSON (or a bare string)",
+    )
+    parser.add_argument("--engine", default=engines.REFERENCE)
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--memory", action=argparse.BooleanOptionalAction, default=True)
+    parser.add_argument("--profile", action="store_true")
+    args = parser.parse_args(argv)
+
+    try:
+        route = find_route(args.target)
+        # The undecorated solver, so there's nothing but the solve itself to measure
+        solver = inspect.unwrap(route.endpoint)
+        available = engines.supported(solver)
+
+        if args.engine not in available:
+            raise UsageError(
+                f"Unknown engine: {args.engine}, expected one of {', '.join(available)}"
+            )
+
+        values = dict(argument.partition("=")[::2] for argument in args.argument)
+    except UsageError as error:
+        parser.error(str(error))
+
+    with contextlib.ExitStack() as stack:
+        try:
+            document = stack.enter_context(map_lines(args.path))
+        except OSError as error:
+            parser.error(f"Can't read {args.path}: {error.strerror or error}")
+
+        try:
+            arguments = route_arguments(route, document, values)
+        except UsageError as error:
+            parser.error(str(error))
+
+        runs = [run(solver, arguments, args.engine) for _ in range(args.repeat)]
+
+        if any(current.answer != runs[0].answer for current in runs):
+            sys.exit(f"Answers differ between runs: {[run.answer for run in runs]}")
+
+        print(runs[0].answer)
+        print(f"parse   {milliseconds([current.parse for current in runs])}")
+        print(f"solve   {milliseconds([current.solve for current in runs])}")
+        print(f"total   {milliseconds([current.seconds for current in runs])}")
+
+        if args.memory:
+            traced = peak_memory(solver, arguments, args.engine)
+
+            print(
+                f"memory  peak {traced / 2**20:10.2f} MiB"
+                f"  max RSS {max_rss() / 2**20:10.2f} MiB"
+            )
+
+        if args.profile:
+            _, timings = solve(solver, arguments, args.engine, profile=True)
+            profile = timing.Profile(
+                id=0,
+                path=args.target,
+                seconds=timings.seconds,
+                cpu=timings.cpu,
+                stats=timings.profiles,
+            )
+
+            print(profile.text())
@@ -0,0 +1,95 @@
+import contextlib
+import contextvars
+import functools
+import inspect
+from typing import Any, Callable, Generic, Iterator, TypeVar
+
+T = TypeVar("T")
+
+# The straightforward implementation every other engine is checked against
+REFERENCE = "reference"
+
+_engine: contextvars.ContextVar[str] = contextvars.ContextVar(
+    "engine", default=REFERENCE
+)
+
+# Module -> function name -> engine name -> implementation
+registry: dict[str, dict[str, dict[str, Callable[..., Any]]]] = {}
+
+
+class Engines(Generic[T]):
+    """
+    A function with other named implementations besides its reference one.
+    Calls go to the implementation of the current engine (see `using`), or the reference one
+    if the function doesn't have that engine.
+    """
+
+    def __init__(self, func: Callable[..., T]) -> None:
+        functools.update_wrapper(self, func)
+
+        self.implementations = registry.setdefault(func.__module__, {}).setdefault(
+            func.__name__, {}
+        )
+        self.implementations[REFERENCE] = func
+
+    def __call__(self, *args: Any, **kwargs: Any) -> T:
+        implementation = self.implementations.get(
+            _engine.get(), self.implementations[REFERENCE]
+        )
+
+        return implementation(*args, **kwargs)
+
+    def register(self, name: str) -> Callable[[Callable[..., T]], Callable[..., T]]:
+        def decorator(func: Callable[..., T]) -> Callable[..., T]:
+            self.implementations[name] = func
+
+            return func
+
+        return decorator
+
+
+def dispatch(func: Callable[..., T]) -> Engines[T]:
+    """
+    Mark a day's function (a part, or its parse step) as the reference engine,
+    so other engines can be registered for it with `@func.register("fast")`.
+    Engines that parse differently need their own parse step too, registered on the day's `parse`.
+    """
+    return Engines(func)
+
+
+def current() -> str:
+    return _engine.get()
+
+
+@contextlib.contextmanager
+def using(name: str) -> Iterator[None]:
+    """Run the block (e.g. a solve) with every dispatching function using the `name` engine."""
+    token = _engine.set(name)
+
+    try:
+        yield
+    finally:
+        _engine.reset(token)
+
+
+def supported(func: Callable[..., Any]) -> list[str]:
+    """
+    The engines of every dispatching function `func` calls by name (e.g. a route's parse step and part),
+    the reference first. An engine only some of them have would leave the rest on the reference one.
+    """
+    # A route's own code, rather than its decorators'
+    func = inspect.unwrap(func)
+    dispatched = [
+        value
+        for name in func.__code__.co_names
+        if isinstance(value := func.__globals__.get(name), Engines)
+    ]
+
+    if not dispatched:
+        return [REFERENCE]
+
+    names = set.intersection(
+        *(set(function.implementations) for function in dispatched)
+    )
+
+    return [REFERENCE, *sorted(names - {REFERENCE})]
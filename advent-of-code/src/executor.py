@@ -0,0 +1,356 @@
+import asyncio
+import contextlib
+import functools
+import importlib
+import inspect
+import multiprocessing
+import os
+import resource
+import signal
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Coroutine, Literal, NamedTuple
+
+from fastapi import Body, HTTPException
+
+from src import admission, engines, manifest, progress, timing
+from src.cache import (
+    MISSING,
+    MemoStats,
+    cache_key,
+    memo_scope,
+    merge_memo_stats,
+    results,
+)
+from src.ingest import InputReference, input_reference
+from src.timing import Timings
+
+# `0` workers disables the pool entirely and every solver runs inline
+EXECUTOR_WORKERS = int(os.environ.get("AOC_EXECUTOR_WORKERS", str(os.cpu_count() or 1)))
+
+# Recycle workers periodically so long-lived processes don't accumulate memory
+EXECUTOR_MAX_TASKS_PER_CHILD = int(
+    os.environ.get("AOC_EXECUTOR_MAX_TASKS_PER_CHILD", "100")
+)
+
+Solver = Callable[..., Coroutine[Any, Any, Any]]
+
+_executor: ProcessPoolExecutor | None = None
+
+# Offloaded solves submitted to the pool and not finished yet
+_in_flight = 0
+
+# Solves running right now by cache key, identical requests wait on these
+_solving: dict[str, "asyncio.Task[Any]"] = {}
+
+# Solves saved by waiting on an identical one that was already running
+_coalesced = 0
+
+# Peak RSS (in bytes) last reported by each worker
+_worker_max_rss: dict[int, int] = {}
+
+# Workers report job progress over this queue, a thread hands it to the job
+_progress_queue: "multiprocessing.Queue[Any] | None" = None
+_progress_thread: threading.Thread | None = None
+
+
+class Solved(NamedTuple):
+    result: Any
+    timings: Timings
+    pid: int
+    max_rss: int
+    memo_stats: dict[str, MemoStats]
+
+
+def max_rss() -> int:
+    # Peak RSS of this process, `ru_maxrss` is in kilobytes except on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    return rss if sys.platform == "darwin" else rss * 1024
+
+
+def run_coroutine(coroutine: Coroutine[Any, Any, Any]) -> Any:
+    """Run a coroutine that never awaits to completion, without an event loop."""
+    try:
+        coroutine.send(None)
+    except StopIteration as stop:
+        return stop.value
+
+    coroutine.close()
+    raise RuntimeError("Solvers must not await, they run outside of an event loop")
+
+
+def _initialize(progress_queue: "multiprocessing.Queue[Any]") -> None:
+    progress._queue = progress_queue
+
+    # Solves over their CPU budget are stopped with an exception
+    signal.signal(signal.SIGXCPU, admission.exceeded)
+
+    # Pay for importing every solver (and numpy, z3, etc.) once per worker
+    manifest.load_all()
+
+
+def _forward_progress(progress_queue: "multiprocessing.Queue[Any]") -> None:
+    while (item := progress_queue.get()) is not None:
+        progress.publish(*item)
+
+
+def _warm() -> tuple[int, int]:
+    return os.getpid(), max_rss()
+
+
+def _solve(
+    module: str,
+    name: str,
+    kwargs: dict[str, Any],
+    profile: bool = False,
+    job: str | None = None,
+    cpu_seconds: int = 0,
+) -> Solved:
+    # The module attribute is the decorated solver, unwrap it to get the original
+    solver = inspect.unwrap(getattr(importlib.import_module(module), name))
+
+    kwargs = {
+        key: value.load() if isinstance(value, InputReference) else value
+        for key, value in kwargs.items()
+    }
+    engine = kwargs.pop("engine", engines.REFERENCE)
+
+    # Spans, CPU time, profiles and memo lookups don't cross processes on their own, send them back
+    with timing.collect(profile=profile) as timings, progress.tracking(job):
+        with admission.cpu_budget(cpu_seconds), engines.using(engine):
+            with memo_scope() as scope:
+                result = run_coroutine(solver(**kwargs))
+
+    return Solved(result, timings, os.getpid(), max_rss(), scope.stats)
+
+
+async def start(
+    workers: int | None = None,
+    max_tasks_per_child: int | None = None,
+) -> None:
+    global _executor, _progress_queue, _progress_thread
+
+    workers = EXECUTOR_WORKERS if workers is None else workers
+    max_tasks_per_child = max_tasks_per_child or EXECUTOR_MAX_TASKS_PER_CHILD
+
+    if _executor is not None or workers <= 0:
+        return
+
+    # Recycling workers needs "spawn", the queue has to come from the same context
+    context = multiprocessing.get_context("spawn")
+
+    _progress_queue = context.Queue()
+    _progress_thread = threading.Thread(
+        target=_forward_progress, args=(_progress_queue,), daemon=True
+    )
+    _progress_thread.start()
+
+    _executor = ProcessPoolExecutor(
+        max_workers=workers,
+        max_tasks_per_child=max_tasks_per_child,
+        mp_context=context,
+        initializer=_initialize,
+        initargs=(_progress_queue,),
+    )
+
+    # Spin every worker up now, rather than on the first heavy request
+    loop = asyncio.get_running_loop()
+
+    for pid, rss in await asyncio.gather(
+        *[loop.run_in_executor(_executor, _warm) for _ in range(workers)]
+    ):
+        _worker_max_rss[pid] = rss
+
+
+def shutdown() -> None:
+    global _executor, _progress_queue, _progress_thread
+
+    if _executor is None:
+        return
+
+    _executor.shutdown(wait=True, cancel_futures=True)
+    _executor = None
+    _worker_max_rss.clear()
+
+    # Workers are gone, stop forwarding their progress
+    _progress_queue.put(None)
+    _progress_thread.join()
+    _progress_queue.close()
+    _progress_queue = _progress_thread = None
+
+
+def is_running() -> bool:
+    return _executor is not None
+
+
+def workers() -> int:
+    return _executor._max_workers if _executor is not None else 0
+
+
+def in_flight() -> int:
+    return _in_flight
+
+
+def coalesced() -> int:
+    return _coalesced
+
+
+def worker_max_rss() -> dict[int, int]:
+    if _executor is None:
+        return {}
+
+    # Recycled workers are gone, only report the live ones
+    live = _executor._processes or {}
+
+    return {pid: rss for pid, rss in _worker_max_rss.items() if pid in live}
+
+
+def solver(
+    *,
+    offload: bool = False,
+    cache: bool = True,
+    cost: str = "light",
+    concurrency: int | None = None,
+) -> Callable[[Solver], Solver]:
+    """
+    Mark a route as a solver.
+    CPU-heavy solvers should set `offload`, which runs them in the process pool
+    (when it's running) so they don't block the event loop for other requests.
+    Results are cached by the route and its normalized arguments unless `cache` is unset,
+    and identical requests arriving while the first is still solving wait for its result.
+    `cost` names the route's cost class (see `src.admission`), which caps how many of its solves run at once
+    and how much CPU time each may use in the pool. `concurrency` caps the route on its own too.
+    Every route takes an `engine` too, picking between the implementations of the day's functions it calls (see `src.engines`).
+    """
+
+    def decorator(func: Solver) -> Solver:
+        route = f"{func.__module__}.{func.__name__}"
+        names = engines.supported(func)
+
+        async def dispatch(**kwargs: Any) -> Any:
+            limiters = admission.limiters_for(cost, func.__name__, concurrency)
+
+            if not limiters:
+                return await run(**kwargs)
+
+            async with contextlib.AsyncExitStack() as stack:
+                with timing.span("queue"):
+                    for limiter in limiters:
+                        await stack.enter_async_context(limiter.admit())
+
+                return await run(**kwargs)
+
+        async def run(**kwargs: Any) -> Any:
+            global _in_flight
+
+            if not offload or _executor is None:
+                engine = kwargs.pop("engine", engines.REFERENCE)
+
+                with engines.using(engine), memo_scope():
+                    return await func(**kwargs)
+
+            loop = asyncio.get_running_loop()
+            timings = timing.current()
+
+            # Workers read registered inputs themselves, rather than unpickling every line
+            reference = input_reference(kwargs.get("document"))
+
+            if reference is not None:
+                kwargs = {**kwargs, "document": reference}
+
+            _in_flight += 1
+
+            try:
+                solved = await loop.run_in_executor(
+                    _executor,
+                    _solve,
+                    func.__module__,
+                    func.__name__,
+                    kwargs,
+                    timings is not None and timings.profile,
+                    progress.current(),
+                    admission.COST_CLASSES[cost].cpu_seconds,
+                )
+            except admission.CPUBudgetExceeded:
+                raise HTTPException(
+                    status_code=503,
+                    detail="Solve stopped, it went over its CPU time budget",
+                )
+            finally:
+                _in_flight -= 1
+
+            _worker_max_rss[solved.pid] = solved.max_rss
+            merge_memo_stats(solved.memo_stats)
+
+            if timings is not None:
+                timings.merge(solved.timings)
+
+            return solved.result
+
+        async def solve_once(key: str, kwargs: dict[str, Any]) -> Any:
+            global _coalesced
+
+            loop = asyncio.get_running_loop()
+            task = _solving.get(key)
+
+            if task is not None and task.get_loop() is loop:
+                _coalesced += 1
+
+                with timing.span("coalesced"):
+                    return await asyncio.shield(task)
+
+            async def solve() -> Any:
+                result = await dispatch(**kwargs)
+                results.put(key, result)
+
+                return result
+
+            # A task of its own, so the solve outlives the request that started it if that's cancelled
+            task = loop.create_task(solve())
+            _solving[key] = task
+
+            task.add_done_callback(
+                lambda _: _solving.pop(key) if _solving.get(key) is task else None
+            )
+
+            with timing.span("solve"):
+                return await asyncio.shield(task)
+
+        @functools.wraps(func)
+        async def wrapper(**kwargs: Any) -> Any:
+            timing.observe_document(kwargs.get("document"))
+
+            if not cache:
+                with timing.span("solve"):
+                    return await dispatch(**kwargs)
+
+            # Arguments can be mutated while solving, key them up front
+            key = cache_key(route, kwargs)
+            result = results.get(key)
+
+            if result is MISSING:
+                result = await solve_once(key, kwargs)
+
+            return result
+
+        # The day's engines are known by now, its parts are defined before its routes
+        signature = inspect.signature(func)
+        engine = inspect.Parameter(
+            "engine",
+            inspect.Parameter.KEYWORD_ONLY,
+            default=Body(
+                engines.REFERENCE,
+                embed=True,
+                description="Implementation to solve with, all of them give the same answer",
+            ),
+            annotation=Literal[tuple(names)],
+        )
+        wrapper.__signature__ = signature.replace(  # type: ignore[attr-defined]
+            parameters=[*signature.parameters.values(), engine]
+        )
+
+        return wrapper
+
+    return decorator
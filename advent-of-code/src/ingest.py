@@ -0,0 +1,640 @@
+import array
+import contextlib
+import contextvars
+import email.message
+import hashlib
+import json
+import mmap
+import os
+import re
+import tempfile
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    Coroutine,
+    Iterator,
+    Protocol,
+    Sequence,
+    overload,
+)
+
+from fastapi import HTTPException, Request, Response
+from fastapi._compat import ModelField
+from fastapi.exceptions import RequestValidationError
+from fastapi.routing import APIRoute
+from starlette.datastructures import UploadFile
+
+from src.cache import MISSING, ResultCache
+from src.timing import span
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+CHUNK_SIZE = 1024 * 1024
+
+TEXT_CONTENT_TYPES = {
+    "text/plain",
+    "application/octet-stream",
+}
+
+# Upload content types that are compressed themselves, rather than with `Content-Encoding`
+COMPRESSED_CONTENT_TYPES: dict[str, str] = {
+    "application/gzip": "gzip",
+    "application/x-gzip": "gzip",
+    "application/zstd": "zstd",
+}
+
+COMPRESSED_SUFFIXES: dict[str, str] = {
+    ".gz": "gzip",
+    ".zst": "zstd",
+}
+
+# Directory registered inputs are stored in, named by the SHA-256 of their content
+INPUTS_PATH = Path(
+    os.environ.get("AOC_INPUTS_PATH", Path(tempfile.gettempdir()) / "aoc-inputs")
+)
+
+# Registered inputs kept split into lines in memory, per process
+INPUTS_CACHE_SIZE = int(os.environ.get("AOC_INPUTS_CACHE_SIZE", "16"))
+
+INPUT_ID = re.compile(r"^[0-9a-f]{64}$")
+
+# What decompressing a body that isn't what its encoding says raises
+DECOMPRESSION_ERRORS: tuple[type[Exception], ...] = (zlib.error,)
+
+if zstandard is not None:
+    DECOMPRESSION_ERRORS += (zstandard.ZstdError,)
+
+loaded_inputs = ResultCache(size=INPUTS_CACHE_SIZE)
+
+# The registered input the current request's document came from
+_current_input: contextvars.ContextVar[tuple[str, list[str]] | None] = (
+    contextvars.ContextVar("current_input", default=None)
+)
+
+
+class Decompressor(Protocol):
+    def decompress(self, data: bytes) -> bytes:
+        ...
+
+
+class Identity:
+    def decompress(self, data: bytes) -> bytes:
+        return data
+
+
+class Checked:
+    """A decompressor whose errors are the body's fault, a 400 rather than a 500."""
+
+    def __init__(self, stream: Decompressor, encoding: str) -> None:
+        self.stream = stream
+        self.encoding = encoding
+
+    def decompress(self, data: bytes) -> bytes:
+        try:
+            return self.stream.decompress(data)
+        except DECOMPRESSION_ERRORS as error:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Invalid {self.encoding} body: {error}",
+            ) from error
+
+
+def decompressor(encoding: str) -> Decompressor:
+    match encoding.strip().lower():
+        case "" | "identity":
+            return Identity()
+
+        case "gzip" | "x-gzip":
+            return Checked(zlib.decompressobj(wbits=16 + zlib.MAX_WBITS), "gzip")
+
+        case "deflate":
+            return Checked(zlib.decompressobj(), "deflate")
+
+        case "zstd" if zstandard is not None:
+            return Checked(
+                zstandard.ZstdDecompressor().decompressobj(read_across_frames=True),
+                "zstd",
+            )
+
+        case _:
+            raise HTTPException(
+                status_code=415,
+                detail=f"Unsupported content encoding: {encoding}",
+            )
+
+
+def decode(data: bytes, charset: str) -> str:
+    try:
+        return data.decode(charset)
+    except UnicodeDecodeError as error:
+        raise HTTPException(
+            status_code=400, detail=f"Body isn't valid {charset}: {error}"
+        ) from error
+
+
+def split_items(data: bytes, charset: str, separator: str) -> list[str]:
+    if separator == "\n":
+        return decode(data, charset).splitlines()
+
+    # Documents of one long line, e.g. comma separated steps, split on the separator instead
+    return decode(data, charset).replace("\r", "").replace("\n", "").split(separator)
+
+
+def split_document(text: str, separator: str = "\n") -> list[str]:
+    """A whole document's items, split as `iter_line_batches` would split it streamed."""
+    if separator == "\n":
+        return text.splitlines()
+
+    items = split_items(text.encode(), "utf-8", separator)
+
+    # A trailing separator ends the last item rather than starting another, as a newline would
+    if not items[-1]:
+        items.pop()
+
+    return items
+
+
+async def iter_line_batches(
+    chunks: AsyncIterable[bytes],
+    encoding: str = "identity",
+    charset: str = "utf-8",
+    separator: str = "\n",
+) -> AsyncIterator[list[str]]:
+    """
+    Yield the lines of a (possibly compressed) byte stream, one batch per chunk.
+    Chunks are split on the last newline (or `separator`), partial lines carry over to the next chunk.
+    """
+    stream = decompressor(encoding)
+
+    try:
+        delimiter = separator.encode(charset)
+    except LookupError as error:
+        raise HTTPException(
+            status_code=415, detail=f"Unsupported charset: {charset}"
+        ) from error
+
+    pending = b""
+
+    async for chunk in chunks:
+        pending += stream.decompress(chunk)
+
+        end = pending.rfind(delimiter)
+
+        if end >= 0:
+            # Newlines are kept for `splitlines`, which handles `\r\n` too
+            cut = end + 1 if separator == "\n" else end
+
+            yield split_items(pending[:cut], charset, separator)
+            pending = pending[end + len(delimiter) :]
+
+    # Only a trailing newline left after the last separator isn't an item
+    if pending and (separator == "\n" or pending.strip()):
+        yield split_items(pending, charset, separator)
+
+
+async def iter_lines(
+    chunks: AsyncIterable[bytes],
+    encoding: str = "identity",
+    charset: str = "utf-8",
+) -> AsyncIterator[str]:
+    async for batch in iter_line_batches(chunks, encoding, charset):
+        for line in batch:
+            yield line
+
+
+async def read_lines(
+    chunks: AsyncIterable[bytes],
+    encoding: str = "identity",
+    charset: str = "utf-8",
+) -> list[str]:
+    lines: list[str] = []
+
+    async for batch in iter_line_batches(chunks, encoding, charset):
+        lines.extend(batch)
+
+    return lines
+
+
+async def iter_upload(upload: UploadFile) -> AsyncIterator[bytes]:
+    while chunk := await upload.read(CHUNK_SIZE):
+        yield chunk
+
+
+def upload_encoding(upload: UploadFile) -> str:
+    if encoding := upload.headers.get("content-encoding"):
+        return encoding
+
+    if upload.content_type in COMPRESSED_CONTENT_TYPES:
+        return COMPRESSED_CONTENT_TYPES[upload.content_type]
+
+    for suffix, encoding in COMPRESSED_SUFFIXES.items():
+        if (upload.filename or "").endswith(suffix):
+            return encoding
+
+    return "identity"
+
+
+def input_path(input_id: str) -> Path:
+    if not INPUT_ID.match(input_id) or not (INPUTS_PATH / input_id).exists():
+        raise HTTPException(status_code=404, detail=f"Unknown input: {input_id}")
+
+    return INPUTS_PATH / input_id
+
+
+def count_path(path: Path) -> Path:
+    # Next to the input, `INPUT_ID` doesn't match it so it's never listed as one
+    return path.with_suffix(".lines")
+
+
+def register_input(lines: list[str]) -> str:
+    """Store a document, once however often it's registered, and return its id."""
+    # Every line ends in a newline, so trailing empty lines are read back too
+    data = "".join(f"{line}\n" for line in lines).encode()
+    input_id = hashlib.sha256(data).hexdigest()
+    path = INPUTS_PATH / input_id
+
+    if not path.exists():
+        INPUTS_PATH.mkdir(parents=True, exist_ok=True)
+
+        # Readers never see a partly written input, or one without its line count
+        for target, content in (
+            (count_path(path), str(len(lines)).encode()),
+            (path, data),
+        ):
+            temporary = target.with_suffix(f"{target.suffix}.{os.getpid()}.tmp")
+            temporary.write_bytes(content)
+            temporary.replace(target)
+
+    return input_id
+
+
+def input_line_count(input_id: str) -> int:
+    """How many lines a registered input has, counted once when it was registered."""
+    path = input_path(input_id)
+
+    try:
+        return int(count_path(path).read_text())
+    except FileNotFoundError:
+        # Registered before counts were kept, the newlines are counted without decoding anything
+        with map_lines(path) as lines:
+            return len(lines)
+
+
+def delete_input(input_id: str) -> None:
+    path = input_path(input_id)
+    path.unlink()
+    count_path(path).unlink(missing_ok=True)
+
+    loaded_inputs.memory.pop(input_id, None)
+
+
+def read_input_file(path: Path) -> list[str]:
+    """
+    A registered input's lines, the same list for every request reading it.
+    Routes' documents are copies once FastAPI's validated them, anything else handing it to a solver
+    copies it first, since some solvers mutate their document.
+    """
+    lines = loaded_inputs.get(path.name)
+
+    if lines is MISSING:
+        # Decoded a line at a time straight from the mapped file, which every process shares
+        with map_lines(path) as mapped:
+            lines = list(mapped)
+
+        loaded_inputs.put(path.name, lines)
+
+    return lines
+
+
+def load_input(input_id: str) -> list[str]:
+    return read_input_file(input_path(input_id))
+
+
+class MappedLines(Sequence[str]):
+    """
+    The lines of a memory-mapped file, each one decoded only when it's read.
+    Only where the lines end is kept, so the file's never all in memory as strings.
+    Solvers only ever read their document, so it stands in for the `list[str]` they take.
+    """
+
+    def __init__(self, mapped: "mmap.mmap | bytes", charset: str = "utf-8") -> None:
+        self.mapped = mapped
+        self.charset = charset
+        self.ends = array.array("q")
+
+        start = 0
+
+        while (end := mapped.find(b"\n", start)) >= 0:
+            self.ends.append(end)
+            start = end + 1
+
+        # The last line doesn't need a newline
+        if start < len(mapped):
+            self.ends.append(len(mapped))
+
+    def line(self, index: int) -> str:
+        start = self.ends[index - 1] + 1 if index else 0
+
+        return self.mapped[start : self.ends[index]].decode(self.charset).rstrip("\r")
+
+    @overload
+    def __getitem__(self, index: int) -> str:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[str]:
+        ...
+
+    def __getitem__(self, index: int | slice) -> str | list[str]:
+        if isinstance(index, slice):
+            return [self.line(line) for line in range(*index.indices(len(self)))]
+
+        if index < 0:
+            index += len(self)
+
+        if not 0 <= index < len(self):
+            raise IndexError("line index out of range")
+
+        return self.line(index)
+
+    def __len__(self) -> int:
+        return len(self.ends)
+
+    def __iter__(self) -> Iterator[str]:
+        for index in range(len(self)):
+            yield self.line(index)
+
+
+@contextlib.contextmanager
+def map_lines(path: Path, charset: str = "utf-8") -> Iterator[MappedLines]:
+    """A file's lines, decoded as they're read from the mapped file."""
+    with open(path, "rb") as file:
+        # Empty files can't be mapped
+        if os.fstat(file.fileno()).st_size == 0:
+            yield MappedLines(b"", charset)
+            return
+
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield MappedLines(mapped, charset)
+
+
+@dataclass(frozen=True)
+class InputReference:
+    """A registered input sent to a pool worker by id, rather than pickled line by line."""
+
+    # The worker may not share the main process' `INPUTS_PATH` setting
+    path: Path
+    joined: bool
+
+    def load(self) -> list[str] | str:
+        lines = read_input_file(self.path)
+
+        # Handed straight to the solver, which may mutate it
+        return "\n".join(lines) if self.joined else list(lines)
+
+
+def input_reference(document: Any) -> InputReference | None:
+    """A reference to the registered input `document` came from, if it's unchanged."""
+    current = _current_input.get()
+
+    if current is None:
+        return None
+
+    input_id, lines = current
+
+    if isinstance(document, str) and document == "\n".join(lines):
+        return InputReference(INPUTS_PATH / input_id, joined=True)
+
+    if document == lines:
+        return InputReference(INPUTS_PATH / input_id, joined=False)
+
+    return None
+
+
+def parse_value(value: str) -> Any:
+    # Non-document parameters are JSON values, bare strings are allowed too
+    try:
+        return json.loads(value)
+    except json.JSONDecodeError:
+        return value
+
+
+class ParsedRequest(Request):
+    """A request with an already parsed body, presented to FastAPI as JSON."""
+
+    def __init__(self, request: Request, parsed: dict[str, Any]) -> None:
+        headers = [
+            (key, value)
+            for key, value in request.scope["headers"]
+            if key not in (b"content-type", b"content-encoding", b"content-length")
+        ]
+        headers.append((b"content-type", b"application/json"))
+
+        super().__init__({**request.scope, "headers": headers}, request.receive)
+
+        self.parsed = parsed
+
+    async def body(self) -> bytes:
+        # FastAPI only checks the raw body isn't empty before asking for the JSON
+        return b"{}"
+
+    async def json(self) -> Any:
+        return self.parsed
+
+
+class DocumentRoute(APIRoute):
+    """
+    Route that accepts the document as a raw `text/plain` body or a multipart file upload,
+    besides the usual JSON body. Any body can be gzip/zstd-compressed.
+    Other parameters are read from the query string (or other multipart fields) as JSON.
+    An `input_id` query parameter names a registered input to use as the document instead.
+    """
+
+    # What separates the document's items, for days whose document is one long line
+    separator = "\n"
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+
+        if self.document is not None:
+            self.openapi_extra = {
+                "requestBody": {
+                    "content": {
+                        "text/plain": {"schema": {"type": "string"}},
+                        "multipart/form-data": {
+                            "schema": {
+                                "type": "object",
+                                "properties": {
+                                    "document": {"type": "string", "format": "binary"},
+                                },
+                            },
+                        },
+                    },
+                },
+                **(self.openapi_extra or {}),
+            }
+
+    @property
+    def document(self) -> ModelField | None:
+        # The route handler is built while `APIRoute.__init__` runs, after the dependant
+        return next(
+            (field for field in self.dependant.body_params if field.name == "document"),
+            None,
+        )
+
+    @property
+    def parameters(self) -> set[str]:
+        return {field.name for field in self.dependant.body_params}
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        handler = super().get_route_handler()
+
+        if self.document is None:
+            return handler
+
+        async def route_handler(request: Request) -> Response:
+            content_type = email.message.Message()
+            content_type["content-type"] = request.headers.get(
+                "content-type", "application/json"
+            )
+            encoding = request.headers.get("content-encoding", "identity")
+
+            if "input_id" in request.query_params:
+                read = self.read_input(request, request.query_params["input_id"])
+
+                with span("read"):
+                    parsed = await read
+
+                return await handler(ParsedRequest(request, parsed))
+
+            match content_type.get_content_type():
+                case "application/json" if encoding == "identity":
+                    return await handler(request)
+
+                case "application/json":
+                    read = self.read_json(request, encoding)
+
+                case "multipart/form-data":
+                    read = self.read_multipart(request)
+
+                case value if value in TEXT_CONTENT_TYPES:
+                    read = self.read_text(
+                        request,
+                        encoding,
+                        content_type.get_content_charset("utf-8"),
+                    )
+
+                case value if value in COMPRESSED_CONTENT_TYPES:
+                    read = self.read_text(
+                        request,
+                        COMPRESSED_CONTENT_TYPES[value],
+                        content_type.get_content_charset("utf-8"),
+                    )
+
+                case _:
+                    return await handler(request)
+
+            with span("read"):
+                parsed = await read
+
+            return await handler(ParsedRequest(request, parsed))
+
+        return route_handler
+
+    def document_value(self, lines: Sequence[str]) -> Sequence[str] | str:
+        """The document parameter for the body's lines, split on the route's separator."""
+        if self.separator != "\n":
+            lines = split_document("\n".join(lines), self.separator)
+
+        # A few days take the document as one string rather than lines
+        if self.document.field_info.annotation is str:
+            return "\n".join(lines)
+
+        return lines
+
+    def query_values(self, request: Request) -> dict[str, Any]:
+        return {
+            key: parse_value(value)
+            for key, value in request.query_params.items()
+            if key in self.parameters
+        }
+
+    async def read_input(self, request: Request, input_id: str) -> dict[str, Any]:
+        lines = load_input(input_id)
+        _current_input.set((input_id, lines))
+
+        # Other parameters can still come in a JSON body
+        body = await request.body()
+        json_body = request.headers.get("content-type", "").startswith(
+            "application/json"
+        )
+        parsed = json.loads(body) if body and json_body else {}
+
+        return {
+            **self.query_values(request),
+            **parsed,
+            "document": self.document_value(lines),
+        }
+
+    async def read_json(self, request: Request, encoding: str) -> dict[str, Any]:
+        stream = decompressor(encoding)
+        chunks = [stream.decompress(chunk) async for chunk in request.stream()]
+
+        try:
+            return json.loads(b"".join(chunks))
+        except json.JSONDecodeError as error:
+            # As FastAPI answers an uncompressed body that isn't JSON
+            raise RequestValidationError(
+                [
+                    {
+                        "type": "json_invalid",
+                        "loc": ("body", error.pos),
+                        "msg": "JSON decode error",
+                        "input": {},
+                        "ctx": {"error": error.msg},
+                    }
+                ],
+                body=error.doc,
+            ) from error
+        except UnicodeDecodeError as error:
+            raise HTTPException(
+                status_code=400, detail="There was an error parsing the body"
+            ) from error
+
+    async def read_text(
+        self,
+        request: Request,
+        encoding: str,
+        charset: str,
+    ) -> dict[str, Any]:
+        lines = await read_lines(request.stream(), encoding, charset)
+
+        return {
+            **self.query_values(request),
+            "document": self.document_value(lines),
+        }
+
+    async def read_multipart(self, request: Request) -> dict[str, Any]:
+        parsed = self.query_values(request)
+
+        async with request.form() as form:
+            for key, value in form.items():
+                if key == "document" and isinstance(value, UploadFile):
+                    lines = await read_lines(iter_upload(value), upload_encoding(value))
+                    parsed[key] = self.document_value(lines)
+
+                elif key == "document":
+                    parsed[key] = self.document_value(value.splitlines())
+
+                elif key in self.parameters:
+                    parsed[key] = parse_value(value)
+
+        return parsed
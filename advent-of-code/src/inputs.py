@@ -0,0 +1,60 @@
+from typing import Any
+
+from fastapi import APIRouter, Body
+
+from src import ingest
+from src.ingest import (
+    INPUT_ID,
+    DocumentRoute,
+    delete_input,
+    input_line_count,
+    input_path,
+    register_input,
+)
+
+router = APIRouter(tags=["Inputs"], route_class=DocumentRoute)
+
+
+def describe(input_id: str) -> dict[str, Any]:
+    return {
+        "id": input_id,
+        "bytes": input_path(input_id).stat().st_size,
+        "lines": input_line_count(input_id),
+    }
+
+
+@router.post("", status_code=201)
+async def input_register(
+    document: list[str] = Body(
+        ...,
+        embed=True,
+        examples=[["1abc2", "pqr3stu8vwx"]],
+    ),
+) -> dict[str, Any]:
+    """
+    Store a document once, to solve with by id (`?input_id=...` on any day's route) from then on.
+    Inputs are stored by their content, so registering the same document again returns the same id.
+    """
+    return describe(register_input(document))
+
+
+@router.get("")
+async def input_list() -> list[dict[str, Any]]:
+    if not ingest.INPUTS_PATH.exists():
+        return []
+
+    return [
+        describe(path.name)
+        for path in sorted(ingest.INPUTS_PATH.iterdir())
+        if INPUT_ID.match(path.name)
+    ]
+
+
+@router.get("/{input_id}")
+async def input_info(input_id: str) -> dict[str, Any]:
+    return describe(input_id)
+
+
+@router.delete("/{input_id}")
+async def input_delete(input_id: str) -> None:
+    delete_input(input_id)
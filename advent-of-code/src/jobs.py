@@ -0,0 +1,274 @@
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator
+
+from fastapi import APIRouter, Body, HTTPException
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from fastapi.routing import APIRoute
+
+from src import progress
+from src.batch import Job, find_route, job_arguments
+from src.progress import Counters
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(tags=["Jobs"])
+
+# Jobs solving at once, the rest wait their turn in submission order
+JOB_CONCURRENCY = int(os.environ.get("AOC_JOB_CONCURRENCY", "2"))
+
+# Finished jobs kept around for polling, the oldest are dropped first
+JOBS_KEPT = int(os.environ.get("AOC_JOBS_KEPT", "1024"))
+
+FINISHED = {"done", "failed", "cancelled"}
+
+JOB_EXAMPLE = {
+    "year": 2023,
+    "day": 6,
+    "part": 2,
+    "arguments": {"time": 71530, "distance": 940200},
+}
+
+
+@dataclass
+class JobState:
+    id: str
+    job: Job
+    route: APIRoute
+    arguments: dict[str, Any]
+
+    # queued -> running -> done, failed or cancelled
+    status: str = "queued"
+    progress: Counters = field(default_factory=dict)
+    result: Any = None
+    error: dict[str, Any] | None = None
+
+    submitted: float = field(default_factory=time.time)
+    started: float | None = None
+    finished: float | None = None
+
+    task: asyncio.Task[None] | None = None
+    # One queue of snapshots per event stream
+    listeners: list[asyncio.Queue[dict[str, Any]]] = field(default_factory=list)
+
+    def snapshot(self) -> dict[str, Any]:
+        snapshot: dict[str, Any] = {
+            "id": self.id,
+            "year": self.job.year,
+            "day": self.job.day,
+            "part": self.job.part,
+            "status": self.status,
+            "progress": self.progress,
+            "submitted": self.submitted,
+            "started": self.started,
+            "finished": self.finished,
+        }
+
+        if self.status == "done":
+            snapshot["result"] = self.result
+
+        if self.error is not None:
+            snapshot["error"] = self.error
+
+        return snapshot
+
+    def notify(self) -> None:
+        snapshot = self.snapshot()
+
+        for listener in self.listeners:
+            listener.put_nowait(snapshot)
+
+    def update(self, counters: Counters) -> None:
+        # Late reports from a cancelled solve don't matter anymore
+        if self.status != "running":
+            return
+
+        self.progress = counters
+        self.notify()
+
+    def finish(self, status: str) -> None:
+        self.status = status
+        self.finished = time.time()
+        self.notify()
+
+
+jobs: OrderedDict[str, JobState] = OrderedDict()
+
+_pending: deque[JobState] = deque()
+_running = 0
+
+
+async def run(state: JobState) -> None:
+    global _running
+
+    loop = asyncio.get_running_loop()
+    thread = threading.get_ident()
+
+    def on_progress(counters: Counters) -> None:
+        # Inline solves report from the event loop itself, pooled ones from the forwarding thread
+        if threading.get_ident() == thread:
+            state.update(counters)
+        else:
+            loop.call_soon_threadsafe(state.update, counters)
+
+    progress.subscribe(state.id, on_progress)
+
+    state.status = "running"
+    state.started = time.time()
+    state.notify()
+
+    try:
+        with progress.tracking(state.id):
+            result = await state.route.endpoint(**state.arguments)
+
+        state.result = jsonable_encoder(result)
+        state.finish("done")
+
+    except asyncio.CancelledError:
+        state.finish("cancelled")
+
+    except HTTPException as exception:
+        state.error = {
+            "status_code": exception.status_code,
+            "detail": exception.detail,
+        }
+        state.finish("failed")
+
+    except Exception as exception:
+        logger.exception(
+            "Job %s (%d day %d part %d) failed",
+            state.id,
+            state.job.year,
+            state.job.day,
+            state.job.part,
+        )
+        # Which exception, its traceback is only logged
+        state.error = {
+            "status_code": 500,
+            "detail": "Internal Server Error",
+            "exception": type(exception).__name__,
+        }
+        state.finish("failed")
+
+    finally:
+        progress.unsubscribe(state.id)
+
+        _running -= 1
+        schedule()
+
+
+def schedule() -> None:
+    global _running
+
+    while _pending and _running < JOB_CONCURRENCY:
+        state = _pending.popleft()
+
+        _running += 1
+        state.task = asyncio.create_task(run(state))
+
+
+def evict() -> None:
+    finished = [job_id for job_id, state in jobs.items() if state.status in FINISHED]
+
+    for job_id in finished[: max(len(jobs) - JOBS_KEPT, 0)]:
+        del jobs[job_id]
+
+
+def find_job(job_id: str) -> JobState:
+    if job_id not in jobs:
+        raise HTTPException(status_code=404, detail=f"Unknown job: {job_id}")
+
+    return jobs[job_id]
+
+
+async def events(state: JobState) -> AsyncIterator[str]:
+    listener: asyncio.Queue[dict[str, Any]] = asyncio.Queue()
+    state.listeners.append(listener)
+
+    try:
+        snapshot = state.snapshot()
+
+        while True:
+            event = "done" if snapshot["status"] in FINISHED else "progress"
+
+            yield f"event: {event}\ndata: {json.dumps(snapshot)}\n\n"
+
+            if event == "done":
+                return
+
+            snapshot = await listener.get()
+
+    finally:
+        state.listeners.remove(listener)
+
+
+@router.post("", status_code=202)
+async def job_submit(
+    job: Job = Body(
+        ...,
+        examples=[JOB_EXAMPLE],
+    ),
+) -> dict[str, Any]:
+    """
+    Solve a part in the background, for solves that take longer than a request should.
+    Returns the job straight away, poll it by `id` (or follow its events) for progress and the result.
+    """
+    route = await find_route(job)
+
+    # Bad arguments fail now, rather than as a failed job
+    state = JobState(
+        id=uuid.uuid4().hex,
+        job=job,
+        route=route,
+        arguments=job_arguments(job, route, {}),
+    )
+
+    jobs[state.id] = state
+    evict()
+
+    _pending.append(state)
+    schedule()
+
+    return state.snapshot()
+
+
+@router.get("")
+async def job_list() -> list[dict[str, Any]]:
+    return [state.snapshot() for state in jobs.values()]
+
+
+@router.get("/{job_id}")
+async def job_status(job_id: str) -> dict[str, Any]:
+    return find_job(job_id).snapshot()
+
+
+@router.get("/{job_id}/events")
+async def job_events(job_id: str) -> StreamingResponse:
+    """Server-sent events of the job's status and progress, until it's finished."""
+    return StreamingResponse(events(find_job(job_id)), media_type="text/event-stream")
+
+
+@router.delete("/{job_id}")
+async def job_cancel(job_id: str) -> dict[str, Any]:
+    """
+    Cancel a queued or running job.
+    A solve already running in the process pool still runs to completion there, its result is dropped.
+    """
+    state = find_job(job_id)
+
+    if state.status == "queued":
+        _pending.remove(state)
+        state.finish("cancelled")
+
+    elif state.task is not None and state.status == "running":
+        state.task.cancel()
+
+    return state.snapshot()
@@ -0,0 +1,91 @@
+import asyncio
+import importlib
+import os
+import threading
+from dataclasses import dataclass
+
+from fastapi import APIRouter
+from starlette.routing import BaseRoute, Mount
+from starlette.types import Receive, Scope, Send
+
+# Import every day in a background thread after startup, rather than on first hit
+WARM_UP = os.environ.get("AOC_WARM_UP", "1") == "1"
+
+
+@dataclass(frozen=True)
+class Day:
+    year: int
+    day: int
+
+    @property
+    def module(self) -> str:
+        return f"src.year_{self.year}.day_{self.day}"
+
+    @property
+    def prefix(self) -> str:
+        return f"/{self.year}/day-{self.day}"
+
+
+DAYS: list[Day] = [
+    *[Day(year=2023, day=day) for day in range(1, 26)],
+    *[Day(year=2022, day=day) for day in range(1, 8)],
+]
+
+
+class LazyRouter:
+    """ASGI app that imports a day's module (and its router) on the first request."""
+
+    def __init__(self, day: Day) -> None:
+        self.day = day
+        self.router: APIRouter | None = None
+        self.lock = threading.Lock()
+
+    def load(self) -> APIRouter:
+        with self.lock:
+            if self.router is None:
+                self.router = importlib.import_module(self.day.module).router
+
+        return self.router
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        router = self.router
+
+        if router is None:
+            # Don't block other requests while importing numpy, z3, etc.
+            router = await asyncio.to_thread(self.load)
+
+        await router(scope, receive, send)
+
+
+LAZY_ROUTERS: dict[Day, LazyRouter] = {day: LazyRouter(day) for day in DAYS}
+
+
+def load(day: Day) -> APIRouter:
+    return LAZY_ROUTERS[day].load()
+
+
+def load_all() -> None:
+    for day in DAYS:
+        load(day)
+
+
+def warm_up() -> None:
+    if WARM_UP:
+        threading.Thread(target=load_all, name="warm-up", daemon=True).start()
+
+
+def mounts(prefix: str) -> list[Mount]:
+    return [
+        Mount(f"{prefix}{day.prefix}", app=lazy_router)
+        for day, lazy_router in LAZY_ROUTERS.items()
+    ]
+
+
+def routes(prefix: str) -> list[BaseRoute]:
+    # Full routes for every day, forces every day to be imported
+    router = APIRouter()
+
+    for day in DAYS:
+        router.include_router(load(day), prefix=f"{prefix}{day.prefix}")
+
+    return router.routes
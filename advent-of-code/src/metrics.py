@@ -0,0 +1,221 @@
+import os
+from dataclasses import dataclass, field
+from typing import Iterator
+
+from fastapi import APIRouter, Response
+
+from src import admission, cache, executor, jobs, timing
+from src.timing import BUCKETS
+
+router = APIRouter(tags=["Metrics"])
+
+# Starlette adds the charset
+CONTENT_TYPE = "text/plain; version=0.0.4"
+
+Labels = dict[str, str | int]
+
+
+def escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+@dataclass
+class Metric:
+    name: str
+    type: str
+    help: str
+    samples: list[tuple[str, Labels, float]] = field(default_factory=list)
+
+    def add(self, value: float, suffix: str = "", **labels: str | int) -> None:
+        self.samples.append((suffix, labels, value))
+
+    def lines(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} {self.type}"
+
+        for suffix, labels, value in self.samples:
+            rendered = ",".join(
+                f'{key}="{escape(str(label))}"' for key, label in labels.items()
+            )
+
+            if rendered:
+                yield f"{self.name}{suffix}{{{rendered}}} {value}"
+            else:
+                yield f"{self.name}{suffix} {value}"
+
+
+def route_metrics() -> list[Metric]:
+    requests = Metric("aoc_requests_total", "counter", "Requests by route and status")
+    latency = Metric(
+        "aoc_request_duration_seconds", "histogram", "Request latency by route"
+    )
+    cpu = Metric(
+        "aoc_request_cpu_seconds_total",
+        "counter",
+        "CPU time spent on requests, including pool workers",
+    )
+    input_bytes = Metric(
+        "aoc_input_bytes_total", "counter", "Request body bytes (as sent) by route"
+    )
+    input_lines = Metric(
+        "aoc_input_lines_total", "counter", "Document lines received by route"
+    )
+
+    for path, stats in timing.route_stats.items():
+        for status, count in sorted(stats.statuses.items()):
+            requests.add(count, route=path, status=status)
+
+        # Histogram buckets are cumulative
+        total = 0
+
+        for bound, count in zip([*map(str, BUCKETS), "+Inf"], stats.buckets):
+            total += count
+            latency.add(total, "_bucket", route=path, le=bound)
+
+        latency.add(stats.seconds, "_sum", route=path)
+        latency.add(stats.count, "_count", route=path)
+
+        cpu.add(stats.cpu, route=path)
+        input_bytes.add(stats.bytes, route=path)
+        input_lines.add(stats.lines, route=path)
+
+    return [requests, latency, cpu, input_bytes, input_lines]
+
+
+def cache_metrics() -> list[Metric]:
+    lookups = Metric(
+        "aoc_cache_lookups_total", "counter", "Result cache lookups by outcome"
+    )
+    lookups.add(cache.results.stats.hits, result="hit")
+    lookups.add(cache.results.stats.disk_hits, result="disk_hit")
+    lookups.add(cache.results.stats.misses, result="miss")
+
+    hit_rate = Metric("aoc_cache_hit_rate", "gauge", "Result cache hit rate")
+    hit_rate.add(cache.results.stats.hit_rate)
+
+    size = Metric("aoc_cache_size", "gauge", "Results in the in-memory cache")
+    size.add(len(cache.results.memory))
+
+    return [lookups, hit_rate, size]
+
+
+def memo_metrics() -> list[Metric]:
+    lookups = Metric(
+        "aoc_memo_lookups_total",
+        "counter",
+        "Memoized function lookups by function and outcome, including pool workers",
+    )
+    evictions = Metric(
+        "aoc_memo_evictions_total",
+        "counter",
+        "Memoized results evicted to stay under the size limit",
+    )
+    peak = Metric(
+        "aoc_memo_peak_entries",
+        "gauge",
+        "Most results a memoized function held at once, in a process or a solve",
+    )
+    entries = Metric(
+        "aoc_memo_entries",
+        "gauge",
+        "Results held for the life of the process by memoized functions",
+    )
+
+    for name in sorted(cache.memos.keys() | cache.memo_stats.keys()):
+        memo = cache.memos.get(name)
+        # Functions only pool workers have imported have only their solves' lookups
+        stats = memo.stats if memo is not None else cache.memo_stats[name]
+
+        lookups.add(stats.hits, function=name, result="hit")
+        lookups.add(stats.misses, function=name, result="miss")
+        evictions.add(stats.evictions, function=name)
+        peak.add(stats.peak, function=name)
+
+        if memo is not None:
+            entries.add(memo.table.cache_info().currsize, function=name)
+
+    return [lookups, evictions, peak, entries]
+
+
+def executor_metrics() -> list[Metric]:
+    workers = Metric("aoc_executor_workers", "gauge", "Process pool size")
+    workers.add(executor.workers())
+
+    in_flight = Metric(
+        "aoc_executor_in_flight", "gauge", "Offloaded solves submitted and not finished"
+    )
+    in_flight.add(executor.in_flight())
+
+    queued = Metric(
+        "aoc_executor_queue_depth",
+        "gauge",
+        "Offloaded solves waiting for a free worker",
+    )
+    queued.add(max(executor.in_flight() - executor.workers(), 0))
+
+    coalesced = Metric(
+        "aoc_solves_coalesced_total",
+        "counter",
+        "Solves saved by waiting on an identical one already running",
+    )
+    coalesced.add(executor.coalesced())
+
+    max_rss = Metric(
+        "aoc_process_max_rss_bytes", "gauge", "Peak resident memory by process"
+    )
+    max_rss.add(executor.max_rss(), process="main", pid=os.getpid())
+
+    for pid, rss in sorted(executor.worker_max_rss().items()):
+        max_rss.add(rss, process="worker", pid=pid)
+
+    return [workers, in_flight, queued, coalesced, max_rss]
+
+
+def admission_metrics() -> list[Metric]:
+    running = Metric(
+        "aoc_admission_running", "gauge", "Solves running under a concurrency limit"
+    )
+    waiting = Metric(
+        "aoc_admission_waiting", "gauge", "Solves waiting for a concurrency limit"
+    )
+    rejected = Metric(
+        "aoc_admission_rejected_total",
+        "counter",
+        "Solves turned away with a 429 because the wait queue was full",
+    )
+
+    for name, limiter in sorted(admission.limiters.items()):
+        running.add(limiter.running, limiter=name)
+        waiting.add(limiter.waiting, limiter=name)
+        rejected.add(limiter.rejected, limiter=name)
+
+    return [running, waiting, rejected]
+
+
+def job_metrics() -> list[Metric]:
+    states = Metric("aoc_jobs", "gauge", "Background jobs by status")
+
+    for status in ["queued", "running", *sorted(jobs.FINISHED)]:
+        states.add(
+            sum(state.status == status for state in jobs.jobs.values()),
+            status=status,
+        )
+
+    return [states]
+
+
+@router.get("", response_class=Response)
+async def metrics() -> Response:
+    """Prometheus text exposition of request, cache, memo, process pool, admission and job metrics."""
+    metrics = [
+        *route_metrics(),
+        *cache_metrics(),
+        *memo_metrics(),
+        *executor_metrics(),
+        *admission_metrics(),
+        *job_metrics(),
+    ]
+
+    body = "\n".join(line for metric in metrics for line in metric.lines())
+
+    return Response(content=f"{body}\n", media_type=CONTENT_TYPE)
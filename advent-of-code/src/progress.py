@@ -0,0 +1,74 @@
+import contextlib
+import contextvars
+import time
+from multiprocessing.queues import Queue
+from typing import Any, Callable, Iterator
+
+# Minimum seconds between two reports of the same job, the rest are dropped
+PROGRESS_INTERVAL = 0.1
+
+Counters = dict[str, int | float]
+
+_job: contextvars.ContextVar[str | None] = contextvars.ContextVar("job", default=None)
+
+# Only set in pool workers, where reports go back to the main process over it
+_queue: "Queue[Any] | None" = None
+
+# Main process only, job id -> callback for its counters
+_subscribers: dict[str, Callable[[Counters], None]] = {}
+
+_last_reported: dict[str, float] = {}
+
+
+def current() -> str | None:
+    return _job.get()
+
+
+@contextlib.contextmanager
+def tracking(job: str | None) -> Iterator[None]:
+    """Attribute any `report` calls in the block (e.g. a solve) to `job`."""
+    token = _job.set(job)
+
+    try:
+        yield
+    finally:
+        _job.reset(token)
+        _last_reported.pop(job, None)
+
+
+def report(**counters: int | float) -> None:
+    """
+    Report how far along a solver is, e.g. `report(bricks=index, total=len(bricks))`.
+    Only solves running as a job are tracked, elsewhere this does (next to) nothing.
+    """
+    job = _job.get()
+
+    if job is None:
+        return
+
+    now = time.monotonic()
+
+    if now - _last_reported.get(job, 0.0) < PROGRESS_INTERVAL:
+        return
+
+    _last_reported[job] = now
+
+    if _queue is not None:
+        _queue.put((job, counters))
+    else:
+        publish(job, counters)
+
+
+def publish(job: str, counters: Counters) -> None:
+    callback = _subscribers.get(job)
+
+    if callback is not None:
+        callback(counters)
+
+
+def subscribe(job: str, callback: Callable[[Counters], None]) -> None:
+    _subscribers[job] = callback
+
+
+def unsubscribe(job: str) -> None:
+    _subscribers.pop(job, None)
@@ -0,0 +1,101 @@
+import asyncio
+import email.message
+import functools
+import inspect
+from typing import Any, AsyncIterator, Callable, Coroutine, Iterator
+
+from fastapi import Request
+
+from src import timing
+from src.executor import run_coroutine
+from src.ingest import iter_line_batches
+
+StreamSolver = Callable[..., Coroutine[Any, Any, Any]]
+
+# Streaming routes take the raw document as their body, their other parameters from the query string
+OPENAPI_EXTRA: dict[str, Any] = {
+    "requestBody": {
+        "required": True,
+        "content": {"text/plain": {"schema": {"type": "string"}}},
+    },
+}
+
+
+def iter_blocking(
+    batches: AsyncIterator[list[str]],
+    loop: asyncio.AbstractEventLoop,
+) -> Iterator[str]:
+    """
+    The lines of `batches` for a solver running in another thread,
+    each batch read on the event loop only once the solver's done with the last one.
+    """
+
+    async def next_batch() -> list[str] | None:
+        return await anext(batches, None)
+
+    while True:
+        batch = asyncio.run_coroutine_threadsafe(next_batch(), loop).result()
+
+        if batch is None:
+            return
+
+        timing.observe_document(batch)
+
+        yield from batch
+
+
+def streaming(separator: str = "\n") -> Callable[[StreamSolver], StreamSolver]:
+    """
+    Mark a solver that goes through its document once, a line at a time, as a streaming route.
+    It takes the document as `lines`, an iterator over the request body's lines as they arrive
+    (`separator` splits documents of one long line instead), so any size of input is solved
+    in constant memory, starting before the upload has finished.
+    Solves aren't cached or offloaded, the document's never all there to key or send them by.
+    """
+
+    def decorator(func: StreamSolver) -> StreamSolver:
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        async def wrapper(request: Request, **kwargs: Any) -> Any:
+            content_type = email.message.Message()
+            content_type["content-type"] = request.headers.get(
+                "content-type", "text/plain"
+            )
+
+            batches = iter_line_batches(
+                request.stream(),
+                request.headers.get("content-encoding", "identity"),
+                content_type.get_content_charset("utf-8"),
+                separator,
+            )
+            lines = iter_blocking(batches, asyncio.get_running_loop())
+
+            try:
+                # The solver blocks on the body's next chunk, so it runs in a thread of its own
+                with timing.span("solve"):
+                    return await asyncio.to_thread(
+                        lambda: run_coroutine(func(lines=lines, **kwargs))
+                    )
+            finally:
+                await batches.aclose()
+
+        # FastAPI injects the request, rather than reading a `lines` parameter
+        wrapper.__signature__ = signature.replace(  # type: ignore[attr-defined]
+            parameters=[
+                inspect.Parameter(
+                    "request",
+                    inspect.Parameter.POSITIONAL_OR_KEYWORD,
+                    annotation=Request,
+                ),
+                *(
+                    parameter
+                    for parameter in signature.parameters.values()
+                    if parameter.name != "lines"
+                ),
+            ]
+        )
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,346 @@
+import bisect
+import contextlib
+import contextvars
+import cProfile
+import io
+import itertools
+import os
+import pstats
+import resource
+import time
+from dataclasses import dataclass, field
+from typing import Any, Iterator
+
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+router = APIRouter(tags=["Timing"])
+
+# Keep a profile of the slowest N requests, `0` disables profiling
+PROFILE_SLOWEST = int(os.environ.get("AOC_PROFILE_SLOWEST", "0"))
+
+# Upper bounds (in seconds) of the latency histogram buckets, the last bucket is unbounded
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Linux can measure a single thread, elsewhere this is the whole process
+RUSAGE = getattr(resource, "RUSAGE_THREAD", resource.RUSAGE_SELF)
+
+
+def cpu_time() -> float:
+    usage = resource.getrusage(RUSAGE)
+
+    return usage.ru_utime + usage.ru_stime
+
+
+@dataclass
+class Timings:
+    """Spans, CPU time and profiles collected while handling one request (or one offloaded solve)."""
+
+    spans: dict[str, float] = field(default_factory=dict)
+    seconds: float = 0.0
+    cpu: float = 0.0
+    profile: bool = False
+    # Input size, raw (possibly compressed) body bytes and document lines
+    bytes: int = 0
+    lines: int = 0
+    # Raw `cProfile` stats, one per process that worked on the request
+    profiles: list[dict[Any, Any]] = field(default_factory=list)
+
+    def add(self, name: str, seconds: float) -> None:
+        self.spans[name] = self.spans.get(name, 0.0) + seconds
+
+    def merge(self, other: "Timings") -> None:
+        for name, seconds in other.spans.items():
+            self.add(name, seconds)
+
+        self.cpu += other.cpu
+        self.profiles.extend(other.profiles)
+
+    def server_timing(self, total: float) -> str:
+        metrics = [
+            f"{name};dur={seconds * 1000:.3f}" for name, seconds in self.spans.items()
+        ]
+        metrics.append(f"total;dur={total * 1000:.3f}")
+
+        return ", ".join(metrics)
+
+
+_timings: contextvars.ContextVar[Timings | None] = contextvars.ContextVar(
+    "timings", default=None
+)
+
+# Only one `cProfile` profiler can run at a time
+_profiling = False
+
+
+def current() -> Timings | None:
+    return _timings.get()
+
+
+@contextlib.contextmanager
+def span(name: str) -> Iterator[None]:
+    """
+    Time a block, e.g. `with span("parse"): ...`.
+    Spans with the same name add up, and are reported in the request's `Server-Timing` header.
+    Outside of a request this does nothing.
+    """
+    timings = _timings.get()
+    start = time.perf_counter()
+
+    try:
+        yield
+    finally:
+        if timings is not None:
+            timings.add(name, time.perf_counter() - start)
+
+
+def observe_document(document: Any) -> None:
+    timings = _timings.get()
+
+    if timings is None:
+        return
+
+    if isinstance(document, str):
+        timings.lines += document.count("\n") + 1
+    elif isinstance(document, list):
+        timings.lines += len(document)
+
+
+@contextlib.contextmanager
+def collect(profile: bool = False) -> Iterator[Timings]:
+    global _profiling
+
+    timings = Timings()
+    token = _timings.set(timings)
+
+    profiler: cProfile.Profile | None = None
+
+    if profile and not _profiling:
+        _profiling = timings.profile = True
+        profiler = cProfile.Profile()
+        profiler.enable()
+
+    start = time.perf_counter()
+    cpu = cpu_time()
+
+    try:
+        yield timings
+    finally:
+        timings.seconds = time.perf_counter() - start
+        timings.cpu += cpu_time() - cpu
+
+        if profiler is not None:
+            profiler.disable()
+            profiler.create_stats()
+            timings.profiles.append(profiler.stats)
+            _profiling = False
+
+        _timings.reset(token)
+
+
+@dataclass
+class RouteStats:
+    count: int = 0
+    seconds: float = 0.0
+    cpu: float = 0.0
+    bytes: int = 0
+    lines: int = 0
+    buckets: list[int] = field(default_factory=lambda: [0] * (len(BUCKETS) + 1))
+    statuses: dict[int, int] = field(default_factory=dict)
+
+    def observe(self, timings: Timings, status: int) -> None:
+        self.count += 1
+        self.seconds += timings.seconds
+        self.cpu += timings.cpu
+        self.bytes += timings.bytes
+        self.lines += timings.lines
+        self.buckets[bisect.bisect_left(BUCKETS, timings.seconds)] += 1
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+
+
+@dataclass
+class Profile:
+    id: int
+    path: str
+    seconds: float
+    cpu: float
+    stats: list[dict[Any, Any]]
+
+    def text(self, limit: int = 50) -> str:
+        output = io.StringIO()
+        combined = pstats.Stats(RawStats(self.stats[0]), stream=output)
+
+        for stats in self.stats[1:]:
+            combined.add(RawStats(stats))
+
+        combined.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(limit)
+
+        return output.getvalue()
+
+
+class RawStats:
+    """Already collected `cProfile` stats, in the shape `pstats.Stats` loads them from."""
+
+    def __init__(self, stats: dict[Any, Any]) -> None:
+        self.stats = stats
+
+    def create_stats(self) -> None:
+        pass
+
+
+class SlowestProfiles:
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self.profiles: list[Profile] = []
+        self.ids = itertools.count(1)
+
+    def qualifies(self, seconds: float) -> bool:
+        return len(self.profiles) < self.size or seconds > self.profiles[-1].seconds
+
+    def add(self, path: str, timings: Timings) -> None:
+        if not timings.profiles or not self.qualifies(timings.seconds):
+            return
+
+        self.profiles.append(
+            Profile(
+                id=next(self.ids),
+                path=path,
+                seconds=timings.seconds,
+                cpu=timings.cpu,
+                stats=timings.profiles,
+            )
+        )
+        self.profiles.sort(key=lambda profile: profile.seconds, reverse=True)
+
+        del self.profiles[self.size :]
+
+    def resize(self, size: int) -> None:
+        self.size = size
+
+        del self.profiles[self.size :]
+
+    def clear(self) -> None:
+        self.profiles.clear()
+
+
+# Stats by route template (`/advent-of-code/inputs/{input_id}`), paths matching no route share one
+route_stats: dict[str, RouteStats] = {}
+
+UNMATCHED = "unmatched"
+
+profiles = SlowestProfiles(size=PROFILE_SLOWEST)
+
+
+class TimingMiddleware:
+    """
+    Times every request, adds a `Server-Timing` header with its spans,
+    and aggregates latency, CPU time and input size per route.
+    CPU time is the event loop thread's plus any pool worker's, so concurrent requests blur it.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        # Mounts rewrite the scope's path on the way down
+        path = scope["path"]
+        root_path = scope.get("root_path", "")
+        start = time.perf_counter()
+        status = 500
+
+        async def receive_with_size() -> Message:
+            message = await receive()
+
+            if message["type"] == "http.request":
+                timings.bytes += len(message.get("body", b""))
+
+            return message
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status
+
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "Server-Timing",
+                    timings.server_timing(time.perf_counter() - start),
+                )
+
+            await send(message)
+
+        try:
+            with collect(profile=profiles.size > 0) as timings:
+                await self.app(scope, receive_with_size, send_with_timing)
+
+        finally:
+            route = scope.get("route")
+
+            # By template rather than path, so ids and unknown paths can't grow the stats forever
+            if route is not None:
+                # Mounts (the days) add their prefix to the root path
+                mount = scope.get("root_path", "")[len(root_path) :]
+                template = f"{mount}{route.path_format}"
+
+                profiles.add(path, timings)
+            else:
+                template = UNMATCHED
+
+            route_stats.setdefault(template, RouteStats()).observe(timings, status)
+
+
+@router.get("")
+async def timing_stats() -> dict[str, dict[str, Any]]:
+    return {
+        path: {
+            "count": stats.count,
+            "seconds": stats.seconds,
+            "cpu": stats.cpu,
+            "mean": stats.seconds / stats.count,
+            "bytes": stats.bytes,
+            "lines": stats.lines,
+            "statuses": stats.statuses,
+            "buckets": dict(zip([*map(str, BUCKETS), "+Inf"], stats.buckets)),
+        }
+        for path, stats in route_stats.items()
+    }
+
+
+@router.delete("")
+async def timing_clear() -> None:
+    route_stats.clear()
+    profiles.clear()
+
+
+@router.get("/profiles")
+async def timing_profiles() -> list[dict[str, Any]]:
+    return [
+        {
+            "id": profile.id,
+            "path": profile.path,
+            "seconds": profile.seconds,
+            "cpu": profile.cpu,
+        }
+        for profile in profiles.profiles
+    ]
+
+
+@router.put("/profiles")
+async def timing_profiles_resize(slowest: int = Query(..., ge=0)) -> None:
+    """Profile every request and keep the `slowest` N, `0` switches profiling off."""
+    profiles.resize(slowest)
+
+
+@router.get("/profiles/{profile_id}", response_class=PlainTextResponse)
+async def timing_profile(profile_id: int, limit: int = 50) -> str:
+    for profile in profiles.profiles:
+        if profile.id == profile_id:
+            return profile.text(limit)
+
+    raise HTTPException(status_code=404, detail=f"Unknown profile: {profile_id}")
@@ -1,39 +1,331 @@
-from typing import Any, Iterator
+import re
+from array import array
+from collections import Counter, deque
+from functools import cached_property
+from typing import Any, Callable, Generic, Iterable, Iterator, Mapping, TypeVar
 
+import numpy as np
 
-def reduce_lfind(a: str, b: str, line: str) -> str:
-    position_a = line.find(a)
-    position_b = line.find(b)
+T = TypeVar("T")
 
-    if position_a == -1:
-        return b
 
-    if position_b == -1:
-        return a
+class Automaton(Generic[T]):
+    """
+    An Aho–Corasick automaton over some patterns, each with a value.
+    Stepping it along a string a character at a time, its state says the longest pattern
+    ending at that character (if any), whichever patterns ended before it.
+    """
 
-    if position_a < position_b:
-        return a
+    def __init__(self, patterns: Mapping[str, T]) -> None:
+        # A trie of the patterns, state 0 is the empty prefix
+        transitions: list[dict[str, int]] = [{}]
+        self.values: list[T | None] = [None]
+        # The longest pattern ending in each state, 0 for none
+        self.lengths: list[int] = [0]
 
-    return b
+        for pattern, value in patterns.items():
+            if not pattern:
+                raise ValueError("Patterns can't be empty")
 
+            state = 0
 
-def reduce_rfind(a: str, b: str, line: str) -> str:
-    position_a = line.rfind(a)
-    position_b = line.rfind(b)
+            for character in pattern:
+                if character not in transitions[state]:
+                    transitions[state][character] = len(transitions)
+                    transitions.append({})
+                    self.values.append(None)
+                    self.lengths.append(0)
 
-    if position_a == -1:
-        return b
+                state = transitions[state][character]
 
-    if position_b == -1:
-        return a
+            self.values[state] = value
+            self.lengths[state] = len(pattern)
 
-    if position_a > position_b:
-        return a
+        self.longest = max(self.lengths)
 
-    return b
+        # Back at the start, nothing happens until a character starting a pattern,
+        # which a regular expression finds far quicker than stepping there
+        self.starts = re.compile(
+            "[" + "".join(re.escape(character) for character in transitions[0]) + "]"
+        )
+
+        # Breadth first, so a state's failure (its longest proper suffix that's a prefix
+        # of a pattern) is always a shallower state that's already complete
+        self.transitions = [dict(following) for following in transitions]
+        failures = [0] * len(transitions)
+        queue = deque(transitions[0].values())
+
+        while queue:
+            state = queue.popleft()
+            failure = failures[state]
+
+            for character, following in transitions[state].items():
+                failures[following] = self.transitions[failure].get(character, 0)
+                queue.append(following)
+
+            # Characters the state doesn't continue with go where its failure goes
+            self.transitions[state] = {
+                **self.transitions[failure],
+                **transitions[state],
+            }
+
+            # Patterns ending in the failure end here too, though only if none longer does
+            if not self.lengths[state]:
+                self.values[state] = self.values[failure]
+                self.lengths[state] = self.lengths[failure]
+
+
+class PatternMatcher(Generic[T]):
+    """
+    Find the first or last of several patterns in a string, scanning it once rather than once per pattern.
+    Matches are ordered by where they start, like `str.find` and `str.rfind`,
+    the longest pattern winning between matches starting at the same character.
+    """
+
+    def __init__(self, patterns: Mapping[str, T]) -> None:
+        self.forward = Automaton(patterns)
+        # The last match is the first one in the reversed string
+        self.backward = Automaton(
+            {pattern[::-1]: value for pattern, value in patterns.items()}
+        )
+
+    def first(self, text: str) -> tuple[int, T] | None:
+        """Where the first match starts and its pattern's value, or `None` without any."""
+        transitions = self.forward.transitions
+        lengths = self.forward.lengths
+        longest = self.forward.longest
+        starts = self.forward.starts
+
+        state = 0
+        index = 0
+        best = -1
+        best_state = 0
+
+        while index < len(text):
+            if not state:
+                found = starts.search(text, index)
+
+                if found is None:
+                    break
+
+                index = found.start()
+
+            # Matches ending from here on start after the best one
+            if best_state and index - longest >= best:
+                break
+
+            state = transitions[state].get(text[index], 0)
+            length = lengths[state]
+
+            # Starting where the best one does, it's longer
+            if length and (not best_state or index - length + 1 <= best):
+                best = index - length + 1
+                best_state = state
+
+            index += 1
+
+        if not best_state:
+            return None
+
+        return best, self.forward.values[best_state]  # type: ignore[return-value]
+
+    def last(self, text: str) -> tuple[int, T] | None:
+        """Where the last match starts and its pattern's value, or `None` without any."""
+        transitions = self.backward.transitions
+        lengths = self.backward.lengths
+        starts = self.backward.starts
+
+        # The first match in the reversed text is the one starting last
+        reversed_text = text[::-1]
+        state = 0
+        index = 0
+
+        while index < len(reversed_text):
+            if not state:
+                found = starts.search(reversed_text, index)
+
+                if found is None:
+                    break
+
+                index = found.start()
+
+            state = transitions[state].get(reversed_text[index], 0)
+
+            if lengths[state]:
+                return len(text) - 1 - index, self.backward.values[state]  # type: ignore[return-value]
+
+            index += 1
+
+        return None
 
 
 def chunks(data: list[Any], size: int) -> Iterator[list[Any]]:
     """Yield successive chunks from data."""
     for i in range(0, len(data), size):
         yield data[i : i + size]
+
+
+def distinct(
+    lines: Iterable[str],
+    parse: Callable[[Iterable[str]], Iterable[T]],
+) -> tuple[tuple[T, int], ...]:
+    """
+    Each distinct line parsed once, with how many times it occurs, in the order first seen.
+    Days that score every line on its own only need to multiply each line's score by its count.
+    """
+    counts = Counter(lines)
+
+    return tuple(zip(parse(counts), counts.values()))
+
+
+# Up, right, down, left, as (x, y) offsets. A direction is an index into this
+DIRECTIONS: tuple[tuple[int, int], ...] = ((0, -1), (1, 0), (0, 1), (-1, 0))
+
+UP, RIGHT, DOWN, LEFT = range(4)
+
+
+def ascii_digits(data: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Each byte of a `uint8` array as a digit, and whether it's an ASCII digit at all."""
+    # Bytes below "0" wrap around past 9
+    digits = data - ord("0")
+
+    return digits, digits < 10
+
+
+def digit_values(
+    digits: np.ndarray, starts: np.ndarray, ends: np.ndarray
+) -> np.ndarray:
+    """
+    The numbers (as `int64`) the runs of `digits` from each start to its end (one past its last digit) spell,
+    each digit times its place in its number, summed by number.
+    """
+    if not len(starts):
+        return np.zeros(0, dtype=np.int64)
+
+    lengths = ends - starts
+    # Where each run's digits start among all of them
+    firsts = np.cumsum(lengths) - lengths
+    positions = np.arange(lengths.sum()) + np.repeat(starts - firsts, lengths)
+    places = 10 ** (np.repeat(ends - 1, lengths) - positions)
+
+    return np.add.reduceat(digits[positions].astype(np.int64) * places, firsts)
+
+
+def reverse(direction: int) -> int:
+    return (direction + 2) % 4
+
+
+class Grid2D:
+    """
+    A rectangular grid of one-byte cells (e.g. puzzle input characters), stored row by row in a flat `bytearray`.
+    Cells are addressed by their integer index, `y * width + x`, so a neighbour is a fixed offset away.
+    """
+
+    def __init__(self, cells: bytearray, width: int) -> None:
+        if width <= 0 or len(cells) % width:
+            raise ValueError(f"{len(cells)} cells can't be split into rows of {width}")
+
+        self.cells = cells
+        self.width = width
+        self.height = len(cells) // width
+
+        # How far away the next cell is in each direction
+        self.offsets = tuple(x + y * width for x, y in DIRECTIONS)
+
+    @classmethod
+    def from_lines(cls, lines: Iterable[str]) -> "Grid2D":
+        rows = [line.encode("ascii") for line in lines]
+
+        return cls(bytearray().join(rows), len(rows[0]) if rows else 0)
+
+    @classmethod
+    def filled(cls, width: int, height: int, value: str) -> "Grid2D":
+        return cls(bytearray(value.encode("ascii") * (width * height)), width)
+
+    def __len__(self) -> int:
+        return len(self.cells)
+
+    def __getitem__(self, index: int) -> str:
+        return chr(self.cells[index])
+
+    def __setitem__(self, index: int, value: str) -> None:
+        self.cells[index] = ord(value)
+
+    def __eq__(self, other: object) -> bool:
+        return (
+            isinstance(other, Grid2D)
+            and self.width == other.width
+            and self.cells == other.cells
+        )
+
+    def __repr__(self) -> str:
+        return f"Grid2D(width={self.width}, height={self.height})"
+
+    def copy(self) -> "Grid2D":
+        return Grid2D(self.cells.copy(), self.width)
+
+    def index(self, x: int, y: int) -> int:
+        return y * self.width + x
+
+    def position(self, index: int) -> tuple[int, int]:
+        y, x = divmod(index, self.width)
+
+        return x, y
+
+    def contains(self, x: int, y: int) -> bool:
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def find(self, value: str) -> int:
+        """Index of the first cell holding `value`, `-1` if there isn't one."""
+        return self.cells.find(ord(value))
+
+    def step(self, index: int, direction: int) -> int:
+        """Index of the next cell in `direction`, `-1` off the edge of the grid."""
+        return self.links[4 * index + direction]
+
+    def neighbours(self, index: int) -> Iterator[int]:
+        for neighbour in self.links[4 * index : 4 * index + 4]:
+            if neighbour >= 0:
+                yield neighbour
+
+    @cached_property
+    def links(self) -> "array[int]":
+        """
+        Every cell's next cell in each direction (`-1` off the edge), worked out once.
+        Cell `index`'s next cell in `direction` is at `4 * index + direction`, four machine ints a cell.
+        """
+        size, width = len(self.cells), self.width
+        edge = array("i", [-1])
+        links = edge * (4 * size)
+
+        for direction, offset in enumerate(self.offsets):
+            steps = array("i", range(offset, size + offset))
+
+            # Cells on the edge the step goes off have nowhere to go
+            if direction == UP:
+                steps[:width] = edge * width
+            elif direction == RIGHT:
+                steps[width - 1 :: width] = edge * self.height
+            elif direction == DOWN:
+                steps[size - width :] = edge * width
+            elif direction == LEFT:
+                steps[::width] = edge * self.height
+
+            links[direction::4] = steps
+
+        return links
+
+    def row(self, y: int) -> bytearray:
+        return self.cells[y * self.width : (y + 1) * self.width]
+
+    def column(self, x: int) -> bytearray:
+        return self.cells[x :: self.width]
+
+    def set_row(self, y: int, values: bytes) -> None:
+        self.cells[y * self.width : (y + 1) * self.width] = values
+
+    def set_column(self, x: int, values: bytes) -> None:
+        self.cells[x :: self.width] = values
+
+    def lines(self) -> list[str]:
+        return [self.row(y).decode("ascii") for y in range(self.height)]
@@ -1,6 +1,14 @@
+import heapq
+from typing import Iterable, Iterator
+
 from fastapi import APIRouter, Body
 
-router = APIRouter(tags=["2022 - Day 1: Calorie Counting"])
+from src.cache import parser
+from src.executor import solver
+from src.ingest import DocumentRoute
+from src.streaming import OPENAPI_EXTRA, streaming
+
+router = APIRouter(tags=["2022 - Day 1: Calorie Counting"], route_class=DocumentRoute)
 
 
 DOCUMENT_EXAMPLE = [
@@ -21,7 +29,41 @@ DOCUMENT_EXAMPLE = [
 ]
 
 
+def calories(lines: Iterable[str]) -> Iterator[int]:
+    """Each Elf's total, as soon as their last line's read."""
+    running_total = 0
+
+    for line in lines:
+        if line:
+            # Add to the running total
+            running_total += int(line)
+
+        else:
+            # Reset the running total
+            yield running_total
+            running_total = 0
+
+    # Make sure to catch the last running total
+    yield running_total
+
+
+@parser
+def parse(document: list[str]) -> tuple[int, ...]:
+    """Total Calories carried by each Elf."""
+    return tuple(calories(document))
+
+
+def part_1(totals: Iterable[int]) -> int:
+    return max(totals)
+
+
+def part_2(totals: Iterable[int]) -> int:
+    # Sum the top three values
+    return sum(heapq.nlargest(3, totals))
+
+
 @router.post("/part-1")
+@solver()
 async def year_2022_day_1_part_1(
     document: list[str] = Body(
         ...,
@@ -80,26 +122,11 @@ async def year_2022_day_1_part_1(
     Find the Elf carrying the most Calories.
     **How many total Calories is that Elf carrying?**
     """
-    running_total = 0
-    max_total = 0
-
-    for line in document:
-        if line:
-            # Add to the running total
-            running_total += int(line)
-
-        else:
-            # Reset the running total
-            max_total = max(max_total, running_total)
-            running_total = 0
-
-    # Make sure to catch the last running total
-    max_total = max(max_total, running_total)
-
-    return max_total
+    return part_1(parse(document))
 
 
 @router.post("/part-2")
+@solver()
 async def year_2022_day_1_part_2(
     document: list[str] = Body(
         ...,
@@ -119,23 +146,33 @@ async def year_2022_day_1_part_2(
     Find the top three Elves carrying the most Calories.
     **How many Calories are those Elves carrying in total?**
     """
-    running_total = 0
-    totals: list[int] = []
+    return part_2(parse(document))
 
-    for line in document:
-        if line:
-            # Add to the running total
-            running_total += int(line)
 
-        else:
-            # Reset the running total
-            totals.append(running_total)
-            running_total = 0
+@router.post("/both")
+@solver()
+async def year_2022_day_1_both(
+    document: list[str] = Body(
+        ...,
+        embed=True,
+        examples=[DOCUMENT_EXAMPLE],
+    ),
+) -> dict[str, int]:
+    """Both parts, parsing the document once."""
+    totals = parse(document)
 
-    # Make sure to catch the last running total
-    totals.append(running_total)
+    return {"part_1": part_1(totals), "part_2": part_2(totals)}
+
+
+@router.post("/part-1/stream", openapi_extra=OPENAPI_EXTRA)
+@streaming()
+async def year_2022_day_1_part_1_stream(lines: Iterator[str]) -> int:
+    """Part 1, solved a line at a time as the document's uploaded."""
+    return part_1(calories(lines))
 
-    # Sort and sum the top three values
-    totals.sort(reverse=True)
 
-    return sum(totals[:3])
+@router.post("/part-2/stream", openapi_extra=OPENAPI_EXTRA)
+@streaming()
+async def year_2022_day_1_part_2_stream(lines: Iterator[str]) -> int:
+    """Part 2, solved a line at a time as the document's uploaded."""
+    return part_2(calories(lines))
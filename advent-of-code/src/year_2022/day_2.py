@@ -1,8 +1,19 @@
 from enum import StrEnum
+from typing import Iterable, Iterator
 
 from fastapi import APIRouter, Body
 
-router = APIRouter(tags=["2022 - Day 2: Rock Paper Scissors"])
+from src import engines
+from src.cache import parser
+from src.executor import solver
+from src.ingest import DocumentRoute
+from src.streaming import OPENAPI_EXTRA, streaming
+from src.utils import distinct
+
+router = APIRouter(
+    tags=["2022 - Day 2: Rock Paper Scissors"],
+    route_class=DocumentRoute,
+)
 
 
 DOCUMENT_EXAMPLE = [
@@ -79,7 +90,91 @@ HAND_OUTCOME_TO_HAND: dict[tuple[Hand, Outcome], Hand] = {
 }
 
 
+def rounds(lines: Iterable[str]) -> Iterator[tuple[Hand, str]]:
+    for line in lines:
+        other_character, character = line.split(" ")
+
+        yield CHARACTER_TO_HAND[other_character], character
+
+
+@engines.dispatch
+@parser
+def parse(document: list[str]) -> tuple[tuple[Hand, str], ...]:
+    """The opponent's hand and the (still ambiguous) second column of each round."""
+    return tuple(rounds(document))
+
+
+@parse.register("distinct")
+@parser
+def parse_distinct(document: list[str]) -> tuple[tuple[tuple[Hand, str], int], ...]:
+    """Each distinct round, and how many times it's played."""
+    return distinct(document, rounds)
+
+
+def score_1(other_hand: Hand, my_character: str) -> int:
+    my_hand = CHARACTER_TO_HAND[my_character]
+
+    outcome = HANDS_TO_OUTCOME[(other_hand, my_hand)]
+    outcome_score = OUTCOME_TO_SCORE[outcome]
+
+    hand_score = HAND_TO_SCORE[my_hand]
+
+    return outcome_score + hand_score
+
+
+def score_2(other_hand: Hand, outcome_character: str) -> int:
+    outcome = CHARACTER_TO_OUTCOME[outcome_character]
+
+    outcome_score = OUTCOME_TO_SCORE[outcome]
+
+    my_hand = HAND_OUTCOME_TO_HAND[(other_hand, outcome)]
+    hand_score = HAND_TO_SCORE[my_hand]
+
+    return outcome_score + hand_score
+
+
+@engines.dispatch
+def part_1(rounds: Iterable[tuple[Hand, str]]) -> int:
+    total = 0
+
+    for other_hand, my_character in rounds:
+        total += score_1(other_hand, my_character)
+
+    return total
+
+
+@part_1.register("distinct")
+def part_1_distinct(rounds: Iterable[tuple[tuple[Hand, str], int]]) -> int:
+    total = 0
+
+    for (other_hand, my_character), count in rounds:
+        total += score_1(other_hand, my_character) * count
+
+    return total
+
+
+@engines.dispatch
+def part_2(rounds: Iterable[tuple[Hand, str]]) -> int:
+    total = 0
+
+    for other_hand, outcome_character in rounds:
+        total += score_2(other_hand, outcome_character)
+
+    return total
+
+
+@part_2.register("distinct")
+def part_2_distinct(rounds: Iterable[tuple[tuple[Hand, str], int]]) -> int:
+    total = 0
+
+    for (other_hand, outcome_character), count in rounds:
+        total += score_2(other_hand, outcome_character) * count
+
+    return total
+
+
 @router.post("/part-1")
+@solver()
 async def year_2022_day_2_part_1(
     document: list[str] = Body(
         ...,
@@ -127,26 +222,11 @@ async def year_2022_day_2_part_1(
 
     **What would your total score be if everything goes exactly according to your strategy guide?**
     """
-    total = 0
-
-    for line in document:
-        other_character, my_character = line.split(" ")
-
-        other_hand = CHARACTER_TO_HAND[other_character]
-        my_hand = CHARACTER_TO_HAND[my_character]
-
-        outcome = HANDS_TO_OUTCOME[(other_hand, my_hand)]
-        outcome_score = OUTCOME_TO_SCORE[outcome]
-
-        hand_score = HAND_TO_SCORE[my_hand]
-
-        total += outcome_score
-        total += hand_score
-
-    return total
+    return part_1(parse(document))
 
 
 @router.post("/part-2")
+@solver()
 async def year_2022_day_2_part_2(
     document: list[str] = Body(
         ...,
@@ -169,20 +249,33 @@ async def year_2022_day_2_part_2(
 
     Following the Elf's instructions for the second column, **what would your total score be if everything goes exactly according to your strategy guide?**
     """
-    total = 0
+    return part_2(parse(document))
 
-    for line in document:
-        other_character, outcome_character = line.split(" ")
 
-        other_hand = CHARACTER_TO_HAND[other_character]
-        outcome = CHARACTER_TO_OUTCOME[outcome_character]
+@router.post("/both")
+@solver()
+async def year_2022_day_2_both(
+    document: list[str] = Body(
+        ...,
+        embed=True,
+        examples=[DOCUMENT_EXAMPLE],
+    ),
+) -> dict[str, int]:
+    """Both parts, parsing the document once."""
+    rounds = parse(document)
 
-        outcome_score = OUTCOME_TO_SCORE[outcome]
+    return {"part_1": part_1(rounds), "part_2": part_2(rounds)}
 
-        my_hand = HAND_OUTCOME_TO_HAND[(other_hand, outcome)]
-        hand_score = HAND_TO_SCORE[my_hand]
 
-        total += outcome_score
-        total += hand_score
+@router.post("/part-1/stream", openapi_extra=OPENAPI_EXTRA)
+@streaming()
+async def year_2022_day_2_part_1_stream(lines: Iterator[str]) -> int:
+    """Part 1, solved a line at a time as the document's uploaded."""
+    return part_1(rounds(lines))
 
-    return total
+
+@router.post("/part-2/stream", openapi_extra=OPENAPI_EXTRA)
+@streaming()
+async def year_2022_day_2_part_2_stream(lines: Iterator[str]) -> int:
+    """Part 2, solved a line at a time as the document's uploaded."""
+    return part_2(rounds(lines))
@@ -2,9 +2,14 @@ import string
 
 from fastapi import APIRouter, Body
 
+from src.executor import solver
+from src.ingest import DocumentRoute
 from src.utils import chunks
 
-router = APIRouter(tags=["2022 - Day 3: Rucksack Reorganization"])
+router = APIRouter(
+    tags=["2022 - Day 3: Rucksack Reorganization"],
+    route_class=DocumentRoute,
+)
 
 DOCUMENT_EXAMPLE = [
     "vJrwpWtwJgWrhcsFMMfFFhFp",
@@ -21,7 +26,43 @@ ITEM_TO_PRIORITY: dict[str, int] = {
 }
 
 
+def part_1(rucksacks: list[str]) -> int:
+    total = 0
+
+    for line in rucksacks:
+        first_compartment = line[: len(line) // 2]
+        second_compartment = line[len(line) // 2 :]
+
+        # Find the one duplicate item
+        duplicate_item: str | None = None
+
+        for item in first_compartment:
+            if item in second_compartment:
+                duplicate_item = item
+
+        # Total up the priority
+        total += ITEM_TO_PRIORITY[duplicate_item]
+
+    return total
+
+
+def part_2(rucksacks: list[str]) -> int:
+    total = 0
+
+    for line_1, line_2, line_3 in chunks(rucksacks, 3):
+        # Convert each line to a set of items and get the intersections
+        duplicates = set(line_1).intersection((set(line_2))).intersection((set(line_3)))
+
+        badge = duplicates.pop()
+
+        # Total up the priority
+        total += ITEM_TO_PRIORITY[badge]
+
+    return total
+
+
 @router.post("/part-1")
+@solver()
 async def year_2022_day_3_part_1(
     document: list[str] = Body(
         ...,
@@ -70,26 +111,11 @@ async def year_2022_day_3_part_1(
     Find the item type that appears in both compartments of each rucksack.
     **What is the sum of the priorities of those item types?**
     """
-    total = 0
-
-    for line in document:
-        first_compartment = line[: len(line) // 2]
-        second_compartment = line[len(line) // 2 :]
-
-        # Find the one duplicate item
-        duplicate_item: str | None = None
-
-        for item in first_compartment:
-            if item in second_compartment:
-                duplicate_item = item
-
-        # Total up the priority
-        total += ITEM_TO_PRIORITY[duplicate_item]
-
-    return total
+    return part_1(document)
 
 
 @router.post("/part-2")
+@solver()
 async def year_2022_day_3_part_2(
     document: list[str] = Body(
         ...,
@@ -137,15 +163,17 @@ async def year_2022_day_3_part_2(
     Find the item type that corresponds to the badges of each three-Elf group.
     **What is the sum of the priorities of those item types?**
     """
-    total = 0
-
-    for line_1, line_2, line_3 in chunks(document, 3):
-        # Convert each line to a set of items and get the intersections
-        duplicates = set(line_1).intersection((set(line_2))).intersection((set(line_3)))
+    return part_2(document)
 
-        badge = duplicates.pop()
 
-        # Total up the priority
-        total += ITEM_TO_PRIORITY[badge]
-
-    return total
+@router.post("/both")
+@solver()
+async def year_2022_day_3_both(
+    document: list[str] = Body(
+        ...,
+        embed=True,
+        examples=[DOCUMENT_EXAMPLE],
+    ),
+) -> dict[str, int]:
+    """Both parts in one request."""
+    return {"part_1": part_1(document), "part_2": part_2(document)}
@@ -1,6 +1,15 @@
+from typing import Iterable, Iterator
+
 from fastapi import APIRouter, Body
 
-router = APIRouter(tags=["2022 - Day 4: Camp Cleanup"])
+from src import engines
+from src.cache import parser
+from src.executor import solver
+from src.ingest import DocumentRoute
+from src.streaming import OPENAPI_EXTRA, streaming
+from src.utils import distinct
+
+router = APIRouter(tags=["2022 - Day 4: Camp Cleanup"], route_class=DocumentRoute)
 
 
 DOCUMENT_EXAMPLE = [
@@ -13,7 +22,103 @@ DOCUMENT_EXAMPLE = [
 ]
 
 
+Assignment = tuple[int, int]
+
+
+def pairs(lines: Iterable[str]) -> Iterator[tuple[Assignment, Assignment]]:
+    for line in lines:
+        assignment_left, assignment_right = line.split(",")
+
+        # Parse the left assignment
+        assignment_left_start, assignment_left_end = assignment_left.split("-")
+
+        # Parse the right assignment
+        assignment_right_start, assignment_right_end = assignment_right.split("-")
+
+        yield (
+            (int(assignment_left_start), int(assignment_left_end)),
+            (int(assignment_right_start), int(assignment_right_end)),
+        )
+
+
+@engines.dispatch
+@parser
+def parse(document: list[str]) -> tuple[tuple[Assignment, Assignment], ...]:
+    """The (inclusive) section ranges assigned to each pair of Elves."""
+    return tuple(pairs(document))
+
+
+@parse.register("distinct")
+@parser
+def parse_distinct(
+    document: list[str],
+) -> tuple[tuple[tuple[Assignment, Assignment], int], ...]:
+    """Each distinct pair of assignments, and how many pairs of Elves have it."""
+    return distinct(document, pairs)
+
+
+def contains(left: Assignment, right: Assignment) -> bool:
+    (left_start, left_end), (right_start, right_end) = left, right
+
+    return (left_start <= right_start and right_end <= left_end) or (
+        right_start <= left_start and left_end <= right_end
+    )
+
+
+def overlaps(left: Assignment, right: Assignment) -> bool:
+    (left_start, left_end), (right_start, right_end) = left, right
+
+    return left_start <= right_end and right_start <= left_end
+
+
+@engines.dispatch
+def part_1(pairs: Iterable[tuple[Assignment, Assignment]]) -> int:
+    total = 0
+
+    for left, right in pairs:
+        # Check for assignment containment
+        if contains(left, right):
+            total += 1
+
+    return total
+
+
+@part_1.register("distinct")
+def part_1_distinct(pairs: Iterable[tuple[tuple[Assignment, Assignment], int]]) -> int:
+    total = 0
+
+    for (left, right), count in pairs:
+        if contains(left, right):
+            total += count
+
+    return total
+
+
+@engines.dispatch
+def part_2(pairs: Iterable[tuple[Assignment, Assignment]]) -> int:
+    total = 0
+
+    for left, right in pairs:
+        # Check for assignment overlap
+        if overlaps(left, right):
+            total += 1
+
+    return total
+
+
+@part_2.register("distinct")
+def part_2_distinct(pairs: Iterable[tuple[tuple[Assignment, Assignment], int]]) -> int:
+    total = 0
+
+    for (left, right), count in pairs:
+        if overlaps(left, right):
+            total += count
+
+    return total
+
+
 @router.post("/part-1")
+@solver()
 async def year_2022_day_4_part_1(
     document: list[str] = Body(
         ...,
@@ -75,35 +180,11 @@ async def year_2022_day_4_part_1(
 
     **In how many assignment pairs does one range fully contain the other?**
     """
-    total = 0
-
-    for line in document:
-        assignment_left, assignment_right = line.split(",")
-
-        # Parse the left assignment
-        assignment_left_start = int(assignment_left.split("-")[0])
-        assignment_left_end = int(assignment_left.split("-")[1])
-
-        assignment_left_all = set(range(assignment_left_start, assignment_left_end + 1))
-
-        # Parse the right assignment
-        assignment_right_start = int(assignment_right.split("-")[0])
-        assignment_right_end = int(assignment_right.split("-")[1])
-
-        assignment_right_all = set(
-            range(assignment_right_start, assignment_right_end + 1)
-        )
-
-        # Check for assignment containment
-        if assignment_left_all.issubset(
-            assignment_right_all
-        ) or assignment_right_all.issubset(assignment_left_all):
-            total += 1
-
-    return total
+    return part_1(parse(document))
 
 
 @router.post("/part-2")
+@solver()
 async def year_2022_day_4_part_2(
     document: list[str] = Body(
         ...,
@@ -126,27 +207,33 @@ async def year_2022_day_4_part_2(
 
     **In how many assignment pairs do the ranges overlap?**
     """
-    total = 0
+    return part_2(parse(document))
 
-    for line in document:
-        assignment_left, assignment_right = line.split(",")
 
-        # Parse the left assignment
-        assignment_left_start = int(assignment_left.split("-")[0])
-        assignment_left_end = int(assignment_left.split("-")[1])
+@router.post("/both")
+@solver()
+async def year_2022_day_4_both(
+    document: list[str] = Body(
+        ...,
+        embed=True,
+        examples=[DOCUMENT_EXAMPLE],
+    ),
+) -> dict[str, int]:
+    """Both parts, parsing the document once."""
+    pairs = parse(document)
 
-        assignment_left_all = set(range(assignment_left_start, assignment_left_end + 1))
+    return {"part_1": part_1(pairs), "part_2": part_2(pairs)}
 
-        # Parse the right assignment
-        assignment_right_start = int(assignment_right.split("-")[0])
-        assignment_right_end = int(assignment_right.split("-")[1])
 
-        assignment_right_all = set(
-            range(assignment_right_start, assignment_right_end + 1)
-        )
+@router.post("/part-1/stream", openapi_extra=OPENAPI_EXTRA)
+@streaming()
+async def year_2022_day_4_part_1_stream(lines: Iterator[str]) -> int:
+    """Part 1, solved a line at a time as the document's uploaded."""
+    return part_1(pairs(lines))
 
-        # Check for assignment containment
-        if assignment_left_all.intersection(assignment_right_all):
-            total += 1
 
-    return total
+@router.post("/part-2/stream", openapi_extra=OPENAPI_EXTRA)
+@streaming()
+async def year_2022_day_4_part_2_stream(lines: Iterator[str]) -> int:
+    """Part 2, solved a line at a time as the document's uploaded."""
+    return part_2(pairs(lines))
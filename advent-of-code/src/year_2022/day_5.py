@@ -2,7 +2,11 @@ import re
 
 from fastapi import APIRouter, Body
 
-router = APIRouter(tags=["2022 - Day 5: Supply Stacks"])
+from src.cache import parser
+from src.executor import solver
+from src.ingest import DocumentRoute
+
+router = APIRouter(tags=["2022 - Day 5: Supply Stacks"], route_class=DocumentRoute)
 
 
 STACK_EXAMPLE = {
@@ -19,7 +23,67 @@ DOCUMENT_EXAMPLE = [
 ]
 
 
+Move = tuple[int, str, str]
+
+
+@parser
+def parse(document: list[str]) -> tuple[Move, ...]:
+    """Each move's crate count, start stack and end stack."""
+    moves: list[Move] = []
+
+    for line in document:
+        match = re.search(r"move (\d+) from (\d+) to (\d+)", line)
+
+        count, start, end = match.groups()
+        moves.append((int(count), start, end))
+
+    return tuple(moves)
+
+
+def top_crates(stacks: dict[str, list[str]]) -> str:
+    # A few extra checks to preserve ordering
+    stack_keys = [int(key) for key in stacks.keys()]
+    stack_keys.sort()
+
+    # Pull the top crate from each stack and create a message
+    message = ""
+
+    for key in stack_keys:
+        crate = stacks[str(key)][0]
+        message += crate
+
+    return message
+
+
+def part_1(stacks: dict[str, list[str]], moves: tuple[Move, ...]) -> str:
+    # Moves are applied to a copy, so both parts can start from the same stacks
+    stacks = {key: list(stack) for key, stack in stacks.items()}
+
+    for count, start, end in moves:
+        for _ in range(count):
+            # Remove from start
+            crate = stacks[start].pop(0)
+            stacks[end].insert(0, crate)
+
+    return top_crates(stacks)
+
+
+def part_2(stacks: dict[str, list[str]], moves: tuple[Move, ...]) -> str:
+    stacks = {key: list(stack) for key, stack in stacks.items()}
+
+    for count, start, end in moves:
+        # Pull off the top `count` crates
+        crates = stacks[start][:count]
+        stacks[start] = stacks[start][count:]
+
+        # Add crates to the new stack
+        stacks[end] = crates + stacks[end]
+
+    return top_crates(stacks)
+
+
 @router.post("/part-1")
+@solver()
 async def year_2022_day_5_part_1(
     stacks: dict[str, list[str]] = Body(
         ...,
@@ -109,32 +173,11 @@ async def year_2022_day_5_part_1(
 
     **After the rearrangement procedure completes, what crate ends up on top of each stack?**
     """
-
-    for line in document:
-        match = re.search(r"move (\d+) from (\d+) to (\d+)", line)
-
-        count, start, end = match.groups()
-
-        for _ in range(int(count)):
-            # Remove from start
-            crate = stacks[start].pop(0)
-            stacks[end].insert(0, crate)
-
-    # A few extra checks to preserve ordering
-    stack_keys = [int(key) for key in stacks.keys()]
-    stack_keys.sort()
-
-    # Pull the top crate from each stack and create a message
-    message = ""
-
-    for key in stack_keys:
-        crate = stacks[str(key)][0]
-        message += crate
-
-    return message
+    return part_1(stacks, parse(document))
 
 
 @router.post("/part-2")
+@solver()
 async def year_2022_day_5_part_2(
     stacks: dict[str, list[str]] = Body(
         ...,
@@ -206,28 +249,22 @@ async def year_2022_day_5_part_2(
     Before the rearrangement process finishes, update your simulation so that the Elves know where they should stand to be ready to unload the final supplies.
     **After the rearrangement procedure completes, what crate ends up on top of each stack?**
     """
+    return part_2(stacks, parse(document))
 
-    for line in document:
-        match = re.search(r"move (\d+) from (\d+) to (\d+)", line)
-
-        count, start, end = match.groups()
-
-        # Pull off the top `count` crates
-        crates = stacks[start][: int(count)]
-        stacks[start] = stacks[start][int(count) :]
 
-        # Add crates to the new stack
-        stacks[end] = crates + stacks[end]
-
-    # A few extra checks to preserve ordering
-    stack_keys = [int(key) for key in stacks.keys()]
-    stack_keys.sort()
-
-    # Pull the top crate from each stack and create a message
-    message = ""
-
-    for key in stack_keys:
-        crate = stacks[str(key)][0]
-        message += crate
+@router.post("/both")
+@solver()
+async def year_2022_day_5_both(
+    stacks: dict[str, list[str]] = Body(
+        ...,
+        examples=[STACK_EXAMPLE],
+    ),
+    document: list[str] = Body(
+        ...,
+        examples=[DOCUMENT_EXAMPLE],
+    ),
+) -> dict[str, str]:
+    """Both parts, parsing the document once."""
+    moves = parse(document)
 
-    return message
+    return {"part_1": part_1(stacks, moves), "part_2": part_2(stacks, moves)}
@@ -1,12 +1,32 @@
 from fastapi import APIRouter, Body
 
-router = APIRouter(tags=["2022 - Day 6: Tuning Trouble"])
+from src.executor import solver
+from src.ingest import DocumentRoute
+
+router = APIRouter(tags=["2022 - Day 6: Tuning Trouble"], route_class=DocumentRoute)
 
 
 DOCUMENT_EXAMPLE = "mjqjpqmgbljsphdztnvjfqwrcgsmlb"
 
 
+def first_marker(signal: str, buffer_size: int) -> int | None:
+    for start in range(0, len(signal) - buffer_size):
+        if len(set(list(signal[start : start + buffer_size]))) == buffer_size:
+            return start + buffer_size
+
+    return None
+
+
+def part_1(signal: str) -> int | None:
+    return first_marker(signal, 4)
+
+
+def part_2(signal: str) -> int | None:
+    return first_marker(signal, 14)
+
+
 @router.post("/part-1")
+@solver()
 async def year_2022_day_6_part_1(
     document: str = Body(
         ...,
@@ -54,14 +74,11 @@ async def year_2022_day_6_part_1(
 
     **How many characters need to be processed before the first start-of-packet marker is detected?**
     """
-    buffer_size = 4
-
-    for start in range(0, len(document) - buffer_size):
-        if len(set(list(document[start : start + buffer_size]))) == buffer_size:
-            return start + buffer_size
+    return part_1(document)
 
 
 @router.post("/part-2")
+@solver()
 async def year_2022_day_6_part_2(
     document: str = Body(
         ...,
@@ -85,8 +102,17 @@ async def year_2022_day_6_part_2(
 
     **How many characters need to be processed before the first start-of-message marker is detected?**
     """
-    buffer_size = 14
+    return part_2(document)
 
-    for start in range(0, len(document) - buffer_size):
-        if len(set(list(document[start : start + buffer_size]))) == buffer_size:
-            return start + buffer_size
+
+@router.post("/both")
+@solver()
+async def year_2022_day_6_both(
+    document: str = Body(
+        ...,
+        embed=True,
+        examples=[DOCUMENT_EXAMPLE],
+    ),
+) -> dict[str, int | None]:
+    """Both parts in one request."""
+    return {"part_1": part_1(document), "part_2": part_2(document)}
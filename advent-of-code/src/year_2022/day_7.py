@@ -3,7 +3,14 @@ from dataclasses import dataclass, field
 
 from fastapi import APIRouter, Body
 
-router = APIRouter(tags=["2022 - Day 7: No Space Left On Device"])
+from src.cache import parser
+from src.executor import solver
+from src.ingest import DocumentRoute
+
+router = APIRouter(
+    tags=["2022 - Day 7: No Space Left On Device"],
+    route_class=DocumentRoute,
+)
 
 
 DOCUMENT_EXAMPLE = [
@@ -146,7 +153,50 @@ class Filesystem:
         return self.root_directory.directories_smaller_than(size)
 
 
+@parser
+def parse(document: list[str]) -> tuple[int, ...]:
+    """Every directory's size, the root directory first."""
+    root = Directory(name="/")
+    filesystem = Filesystem(
+        root_directory=root,
+        current_directory=root,
+    )
+
+    for line in document:
+        filesystem.feed_line(line)
+
+    # `Filesystem.all_directories` lists some directories more than once
+    directories = [root]
+
+    for directory in directories:
+        directories += directory.directories.values()
+
+    return tuple(directory.size for directory in directories)
+
+
+def part_1(sizes: tuple[int, ...]) -> int:
+    root_size, *directory_sizes = sizes
+
+    assert root_size > 100000
+
+    return sum([size for size in directory_sizes if size <= 100000])
+
+
+def part_2(sizes: tuple[int, ...]) -> int:
+    total_disk_size = 70000000
+    needed_unused_disk_size = 30000000
+
+    # Basic math to get the minimum disk size needed to be freed
+    occupied_disk_size = sizes[0]
+    unused_disk_size = total_disk_size - occupied_disk_size
+    minimum_disk_size_needed = needed_unused_disk_size - unused_disk_size
+
+    # Get the smallest directory that's over (or equal to) the minimum free size
+    return min(size for size in sizes if size >= minimum_disk_size_needed)
+
+
 @router.post("/part-1")
+@solver()
 async def year_2022_day_7_part_1(
     document: list[str] = Body(
         ...,
@@ -252,21 +302,11 @@ async def year_2022_day_7_part_1(
     Find all of the directories with a total size of at most 100000.
     **What is the sum of the total sizes of those directories?**
     """
-    root = Directory(name="/")
-    filesystem = Filesystem(
-        root_directory=root,
-        current_directory=root,
-    )
-
-    for line in document:
-        filesystem.feed_line(line)
-
-    return sum(
-        [directory.size for directory in filesystem.directories_smaller_than(100000)]
-    )
+    return part_1(parse(document))
 
 
 @router.post("/part-2")
+@solver()
 async def year_2022_day_7_part_2(
     document: list[str] = Body(
         ...,
@@ -298,27 +338,19 @@ async def year_2022_day_7_part_2(
     Find the smallest directory that, if deleted, would free up enough space on the filesystem to run the update.
     **What is the total size of that directory?**
     """
-    total_disk_size = 70000000
-    needed_unused_disk_size = 30000000
-
-    root = Directory(name="/")
-    filesystem = Filesystem(
-        root_directory=root,
-        current_directory=root,
-    )
-
-    for line in document:
-        filesystem.feed_line(line)
+    return part_2(parse(document))
 
-    # Basic math to get the minimum disk size needed to be freed
-    occupied_disk_size = filesystem.size
-    unused_disk_size = total_disk_size - occupied_disk_size
-    minimum_disk_size_needed = needed_unused_disk_size - unused_disk_size
 
-    # Iterate over all directories, ordered by size (ascending)
-    # Get the smallest directory that's over (or equal to) the minimum free size
-    directories = sorted(filesystem.all_directories, key=lambda x: x.size)
+@router.post("/both")
+@solver()
+async def year_2022_day_7_both(
+    document: list[str] = Body(
+        ...,
+        embed=True,
+        examples=[DOCUMENT_EXAMPLE],
+    ),
+) -> dict[str, int]:
+    """Both parts, parsing the document once."""
+    sizes = parse(document)
 
-    for directory in directories:
-        if directory.size >= minimum_disk_size_needed:
-            return directory.size
+    return {"part_1": part_1(sizes), "part_2": part_2(sizes)}
@@ -1,10 +1,15 @@
-import functools
+from typing import Iterable, Iterator, Sequence
 
+import numpy as np
 from fastapi import APIRouter, Body
 
-from src.utils import reduce_lfind, reduce_rfind
+from src import engines
+from src.executor import solver
+from src.ingest import DocumentRoute
+from src.streaming import OPENAPI_EXTRA, streaming
+from src.utils import PatternMatcher, ascii_digits, chunks, distinct
 
-router = APIRouter(tags=["2023 - Day 1: Trebuchet?!"])
+router = APIRouter(tags=["2023 - Day 1: Trebuchet?!"], route_class=DocumentRoute)
 
 
 DOCUMENT_EXAMPLE = [
@@ -14,8 +19,80 @@ DOCUMENT_EXAMPLE = [
     "treb7uchet",
 ]
 
+# Lines the numpy engine handles at once, bounding the memory of its arrays
+NUMPY_CHUNK_LINES = 1 << 18
+
+
+def calibration_value(line: str) -> int:
+    # Remove all non-numeric characters from the string
+    numerics = [character for character in line if character.isnumeric()]
+
+    # Combine first and last digits
+    return int(f"{numerics[0]}{numerics[-1]}")
+
+
+@engines.dispatch
+def part_1(document: Iterable[str]) -> int:
+    total = 0
+
+    for line in document:
+        total += calibration_value(line)
+
+    return total
+
+
+@part_1.register("distinct")
+def part_1_distinct(document: Iterable[str]) -> int:
+    total = 0
+
+    for line, count in distinct(document, iter):
+        total += calibration_value(line) * count
+
+    return total
+
+
+def calibration_total(lines: Sequence[str]) -> int:
+    """
+    The sum of the lines' calibration values, without any work per character in Python.
+    The lines are one byte buffer, searched for every newline and digit at once,
+    each line's first and last digits being the first after its start and the last before its end.
+    Only ASCII digits count.
+    """
+    if not lines:
+        return 0
+
+    data = np.frombuffer(("\n".join(lines) + "\n").encode(), dtype=np.uint8)
+
+    ends = np.flatnonzero(data == ord("\n"))
+    starts = np.concatenate(([0], ends[:-1] + 1))
+    values, is_digit = ascii_digits(data)
+    digits = np.flatnonzero(is_digit)
+
+    # Indexes into `digits` of each line's first digit, and its last (the one before the next line's)
+    firsts = np.searchsorted(digits, starts)
+    lasts = np.searchsorted(digits, ends) - 1
+
+    if np.any(firsts > lasts):
+        raise ValueError("Every line needs a digit")
+
+    first_digits = values[digits[firsts]].astype(np.int64)
+    last_digits = values[digits[lasts]].astype(np.int64)
+
+    return int(first_digits.sum()) * 10 + int(last_digits.sum())
+
+
+@part_1.register("numpy")
+def part_1_numpy(document: Sequence[str]) -> int:
+    total = 0
+
+    for lines in chunks(document, NUMPY_CHUNK_LINES):
+        total += calibration_total(lines)
+
+    return total
+
 
 @router.post("/part-1")
+@solver()
 async def year_2023_day_1_part_1(
     document: list[str] = Body(
         ...,
@@ -62,16 +139,7 @@ async def year_2023_day_1_part_1(
     Consider your entire calibration document.
     **What is the sum of all of the calibration values?**
     """
-    total = 0
-
-    for line in document:
-        # Remove all non-numeric characters from the string
-        numerics = [character for character in line if character.isnumeric()]
-
-        # Combine first and last digits, add to total
-        total += int(f"{numerics[0]}{numerics[-1]}")
-
-    return total
+    return part_1(document)
 
 
 VALID_DIGIT_TO_NUM: dict[str, int] = {
@@ -95,10 +163,41 @@ VALID_DIGIT_TO_NUM: dict[str, int] = {
     "nine": 9,
 }
 
-VALID_DIGITS = VALID_DIGIT_TO_NUM.keys()
+# Built once for every line, rather than searching each line for every "digit"
+VALID_DIGITS = PatternMatcher(VALID_DIGIT_TO_NUM)
+
+
+def spelled_calibration_value(line: str) -> int:
+    # Find the earliest and latest "digits", scanning in from either end
+    _, first = VALID_DIGITS.first(line)  # type: ignore[misc]
+    _, last = VALID_DIGITS.last(line)  # type: ignore[misc]
+
+    # Combine first and last digits
+    return int(f"{first}{last}")
+
+
+@engines.dispatch
+def part_2(document: Iterable[str]) -> int:
+    total = 0
+
+    for line in document:
+        total += spelled_calibration_value(line)
+
+    return total
+
+
+@part_2.register("distinct")
+def part_2_distinct(document: Iterable[str]) -> int:
+    total = 0
+
+    for line, count in distinct(document, iter):
+        total += spelled_calibration_value(line) * count
+
+    return total
 
 
 @router.post("/part-2")
+@solver()
 async def year_2023_day_1_part_2(
     document: list[str] = Body(
         ...,
@@ -129,21 +228,31 @@ async def year_2023_day_1_part_2(
 
     **What is the sum of all of the calibration values?**
     """
-    total = 0
+    return part_2(document)
 
-    for line in document:
-        # Find the earliest "digit"
-        first_digit = functools.reduce(
-            lambda a, b: reduce_lfind(a, b, line), VALID_DIGITS
-        )
-        last_digit = functools.reduce(
-            lambda a, b: reduce_rfind(a, b, line), VALID_DIGITS
-        )
 
-        first = VALID_DIGIT_TO_NUM[first_digit]
-        last = VALID_DIGIT_TO_NUM[last_digit]
+@router.post("/both")
+@solver()
+async def year_2023_day_1_both(
+    document: list[str] = Body(
+        ...,
+        embed=True,
+        examples=[DOCUMENT_EXAMPLE],
+    ),
+) -> dict[str, int]:
+    """Both parts in one request."""
+    return {"part_1": part_1(document), "part_2": part_2(document)}
 
-        # Combine first and last digits, add to total
-        total += int(f"{first}{last}")
 
-    return total
+@router.post("/part-1/stream", openapi_extra=OPENAPI_EXTRA)
+@streaming()
+async def year_2023_day_1_part_1_stream(lines: Iterator[str]) -> int:
+    """Part 1, solved a line at a time as the document's uploaded."""
+    return part_1(lines)
+
+
+@router.post("/part-2/stream", openapi_extra=OPENAPI_EXTRA)
+@streaming()
+async def year_2023_day_1_part_2_stream(lines: Iterator[str]) -> int:
+    """Part 2, solved a line at a time as the document's uploaded."""
+    return part_2(lines)
@@ -1,8 +1,13 @@
-from dataclasses import dataclass, field
+from dataclasses import dataclass
 
 from fastapi import APIRouter, Body
 
-router = APIRouter(tags=["2023 - Day 10: Title"])
+from src.cache import parser
+from src.executor import solver
+from src.ingest import DocumentRoute
+from src.utils import DOWN, LEFT, RIGHT, UP, Grid2D
+
+router = APIRouter(tags=["2023 - Day 10: Title"], route_class=DocumentRoute)
 
 
 DOCUMENT_EXAMPLE = [
@@ -14,255 +19,158 @@ DOCUMENT_EXAMPLE = [
 ]
 
 
-OPEN_CHARACTER = "\033[94m█\033[0m"
-ENCLOSED_CHARACTER = "\033[31m█\033[0m"
-
-
-@dataclass
-class Position:
-    x: int
-    y: int
-
-
-# (character, x-offset, y-offset) -> (x-offset, y-offset)
-OFFSET_MAP: dict[tuple[str, int, int], Position] = {
-    ("|", 0, 1): Position(x=0, y=1),
-    ("|", 0, -1): Position(x=0, y=-1),
-    ("-", 1, 0): Position(x=1, y=0),
-    ("-", -1, 0): Position(x=-1, y=0),
-    ("L", 0, 1): Position(x=1, y=0),
-    ("L", -1, 0): Position(x=0, y=-1),
-    ("J", 1, 0): Position(x=0, y=-1),
-    ("J", 0, 1): Position(x=-1, y=0),
-    ("7", 1, 0): Position(x=0, y=1),
-    ("7", 0, -1): Position(x=-1, y=0),
-    ("F", -1, 0): Position(x=0, y=1),
-    ("F", 0, -1): Position(x=1, y=0),
+OPEN_CHARACTER = "O"
+ENCLOSED_CHARACTER = "I"
+
+OPEN = ord(OPEN_CHARACTER)
+ENCLOSED = ord(ENCLOSED_CHARACTER)
+
+# (character, direction moved into it) -> direction to move out of it
+OFFSET_MAP: dict[tuple[int, int], int] = {
+    (ord("|"), DOWN): DOWN,
+    (ord("|"), UP): UP,
+    (ord("-"), RIGHT): RIGHT,
+    (ord("-"), LEFT): LEFT,
+    (ord("L"), DOWN): RIGHT,
+    (ord("L"), LEFT): UP,
+    (ord("J"), RIGHT): UP,
+    (ord("J"), DOWN): LEFT,
+    (ord("7"), RIGHT): DOWN,
+    (ord("7"), UP): LEFT,
+    (ord("F"), LEFT): DOWN,
+    (ord("F"), UP): RIGHT,
 }
 
-EXPAND_MAP: dict[str, tuple[list[str], list[str], list[str]]] = {
-    OPEN_CHARACTER: (
-        [OPEN_CHARACTER, OPEN_CHARACTER, OPEN_CHARACTER],
-        [OPEN_CHARACTER, OPEN_CHARACTER, OPEN_CHARACTER],
-        [OPEN_CHARACTER, OPEN_CHARACTER, OPEN_CHARACTER],
-    ),
-    ENCLOSED_CHARACTER: (
-        [ENCLOSED_CHARACTER, ENCLOSED_CHARACTER, ENCLOSED_CHARACTER],
-        [ENCLOSED_CHARACTER, ENCLOSED_CHARACTER, ENCLOSED_CHARACTER],
-        [ENCLOSED_CHARACTER, ENCLOSED_CHARACTER, ENCLOSED_CHARACTER],
-    ),
-    "S": (
-        ["S", "S", "S"],
-        ["S", "S", "S"],
-        ["S", "S", "S"],
-    ),
-    "|": (
-        [ENCLOSED_CHARACTER, "|", ENCLOSED_CHARACTER],
-        [ENCLOSED_CHARACTER, "|", ENCLOSED_CHARACTER],
-        [ENCLOSED_CHARACTER, "|", ENCLOSED_CHARACTER],
-    ),
-    "-": (
-        [ENCLOSED_CHARACTER, ENCLOSED_CHARACTER, ENCLOSED_CHARACTER],
-        ["-", "-", "-"],
-        [ENCLOSED_CHARACTER, ENCLOSED_CHARACTER, ENCLOSED_CHARACTER],
-    ),
-    "L": (
-        [ENCLOSED_CHARACTER, "|", ENCLOSED_CHARACTER],
-        [ENCLOSED_CHARACTER, "L", "-"],
-        [ENCLOSED_CHARACTER, ENCLOSED_CHARACTER, ENCLOSED_CHARACTER],
-    ),
-    "J": (
-        [ENCLOSED_CHARACTER, "|", ENCLOSED_CHARACTER],
-        ["-", "J", ENCLOSED_CHARACTER],
-        [ENCLOSED_CHARACTER, ENCLOSED_CHARACTER, ENCLOSED_CHARACTER],
-    ),
-    "7": (
-        [ENCLOSED_CHARACTER, ENCLOSED_CHARACTER, ENCLOSED_CHARACTER],
-        ["-", "7", ENCLOSED_CHARACTER],
-        [ENCLOSED_CHARACTER, "|", ENCLOSED_CHARACTER],
-    ),
-    "F": (
-        [ENCLOSED_CHARACTER, ENCLOSED_CHARACTER, ENCLOSED_CHARACTER],
-        [ENCLOSED_CHARACTER, "F", "-"],
-        [ENCLOSED_CHARACTER, "|", ENCLOSED_CHARACTER],
-    ),
+EXPAND_MAP: dict[str, tuple[str, str, str]] = {
+    OPEN_CHARACTER: ("OOO", "OOO", "OOO"),
+    ENCLOSED_CHARACTER: ("III", "III", "III"),
+    "S": ("SSS", "SSS", "SSS"),
+    "|": ("I|I", "I|I", "I|I"),
+    "-": ("III", "---", "III"),
+    "L": ("I|I", "IL-", "III"),
+    "J": ("I|I", "-JI", "III"),
+    "7": ("III", "-7I", "I|I"),
+    "F": ("III", "IF-", "I|I"),
 }
 
+# Each character's rows of 3x3 tiles, by expanded row
+EXPANDED_ROWS: tuple[dict[int, bytes], ...] = tuple(
+    {
+        ord(character): rows[row].encode("ascii")
+        for character, rows in EXPAND_MAP.items()
+    }
+    for row in range(3)
+)
 
-@dataclass
-class Map:
-    start: Position
-    current: Position
-
-    positions: list[Position]
-    characters: list[list[str]]
-
-    expanded_characters: list[list[str]] = field(default_factory=list)
-
-    def get_character(self, x: int, y: int) -> str | None:
-        if 0 <= x < len(self.characters[0]) and 0 <= y <= len(self.characters):
-            return self.characters[y][x]
-
-        return None
-
-    def run(self) -> int:
-        steps = 0
-
-        # Move one position manually
-        next_offset: Position | None = None
-
-        for x_offset, y_offset in [(0, 1), (0, -1), (1, 0), (-1, 0)]:
-            next_character = self.get_character(
-                x=self.current.x + x_offset,
-                y=self.current.y + y_offset,
-            )
-
-            if OFFSET_MAP.get((next_character, x_offset, y_offset)):
-                next_offset = OFFSET_MAP[(next_character, x_offset, y_offset)]
-                self.current = Position(
-                    x=self.current.x + x_offset, y=self.current.y + y_offset
-                )
 
-                steps += 1
+def trace(grid: Grid2D, start: int) -> list[int]:
+    """Every position of the loop, starting at `S`."""
+    positions = [start]
 
-                break
+    # Move one position manually
+    for direction in (DOWN, UP, RIGHT, LEFT):
+        current = grid.step(start, direction)
 
-        while self.current != self.start:
-            # Get the character at the next position
-            next_character = self.get_character(
-                x=self.current.x + next_offset.x,
-                y=self.current.y + next_offset.y,
-            )
+        if current >= 0 and (grid.cells[current], direction) in OFFSET_MAP:
+            break
 
-            self.positions.append(self.current)
-            self.current = Position(
-                x=self.current.x + next_offset.x, y=self.current.y + next_offset.y
-            )
+    while current != start:
+        positions.append(current)
+        direction = OFFSET_MAP.get((grid.cells[current], direction), direction)
+        current = grid.step(current, direction)
 
-            steps += 1
+    return positions
 
-            next_offset = OFFSET_MAP.get((next_character, next_offset.x, next_offset.y))
 
-        return steps // 2
+def cleanup(grid: Grid2D, loop: set[int]) -> Grid2D:
+    """Everything that isn't the loop, open on the edges and enclosed (for now) inside."""
+    cleaned = grid.copy()
 
-    def is_in_loop(self, x: int, y: int) -> bool:
-        for position in self.positions:
-            if position.x == x and position.y == y:
-                return True
+    for index in range(len(cleaned)):
+        if index in loop:
+            continue
 
-        return False
+        x, y = cleaned.position(index)
 
-    def get_enclosed_positions(self) -> int:
-        enclosed = 0
+        if x in (0, cleaned.width - 1) or y in (0, cleaned.height - 1):
+            cleaned.cells[index] = OPEN
 
-        for y_index in range(len(self.characters)):
-            for x_index in range(len(self.characters[0])):
-                if not self.is_in_loop(x_index, y_index):
-                    crosses = 0
+        else:
+            cleaned.cells[index] = ENCLOSED
 
-                    # Offset by 0.5 to account for corners, points, etc.
-                    y_position = y_index + 0.5
+    return cleaned
 
-                    # For each point pair in the loop, see if we intersect it
-                    for p_index in range(len(self.positions) - 1):
-                        a = self.positions[p_index]
-                        b = self.positions[p_index + 1]
 
-                        if a.y == b.y:
-                            continue
+def expand(grid: Grid2D) -> Grid2D:
+    """3x the grid, so the gaps between pipes are tiles too."""
+    cells = bytearray()
 
-                        if a.y > y_position > b.y or a.y < y_position < b.y:
-                            if a.x > x_index and b.x > x_index:
-                                crosses += 1
+    for y in range(grid.height):
+        row = grid.row(y)
 
-                    if crosses % 2 == 1:
-                        self.characters[y_index][x_index] = ENCLOSED_CHARACTER
-                        enclosed += 1
+        for expanded_rows in EXPANDED_ROWS:
+            cells += b"".join(expanded_rows[character] for character in row)
 
-        return enclosed
+    return Grid2D(cells, grid.width * 3)
 
-    def cleanup(self) -> None:
-        for y_index in range(len(self.characters)):
-            for x_index in range(len(self.characters[0])):
-                if not self.is_in_loop(x_index, y_index):
-                    if y_index == 0:
-                        self.characters[y_index][x_index] = OPEN_CHARACTER
 
-                    elif y_index == len(self.characters) - 1:
-                        self.characters[y_index][x_index] = OPEN_CHARACTER
+def flood_fill(grid: Grid2D) -> None:
+    cells = grid.cells
+    links = grid.links
 
-                    elif x_index == 0:
-                        self.characters[y_index][x_index] = OPEN_CHARACTER
+    # Fill positions to check with initial data of all Os
+    positions_to_check = [
+        index for index, character in enumerate(cells) if character == OPEN
+    ]
 
-                    elif x_index == len(self.characters[0]) - 1:
-                        self.characters[y_index][x_index] = OPEN_CHARACTER
+    while positions_to_check:
+        index = positions_to_check.pop()
 
-                    else:
-                        self.characters[y_index][x_index] = ENCLOSED_CHARACTER
+        for neighbour in links[4 * index : 4 * index + 4]:
+            if neighbour >= 0 and cells[neighbour] == ENCLOSED:
+                cells[neighbour] = OPEN
+                positions_to_check.append(neighbour)
 
-    def expand(self) -> None:
-        # 3x the height of characters
-        self.expanded_characters = [[] for _ in range(len(self.characters) * 3)]
 
-        for y_index in range(len(self.characters)):
-            for x_index in range(len(self.characters[0])):
-                character = self.characters[y_index][x_index]
+@dataclass(frozen=True)
+class Loop:
+    grid: Grid2D
+    # Every position of the loop, starting at `S`
+    positions: tuple[int, ...]
+    farthest: int
 
-                first_line, second_line, third_line = EXPAND_MAP[character]
 
-                self.expanded_characters[y_index * 3] += first_line
-                self.expanded_characters[y_index * 3 + 1] += second_line
-                self.expanded_characters[y_index * 3 + 2] += third_line
+@parser
+def parse(document: list[str]) -> Loop:
+    """The pipes, and the loop through `S` traced once."""
+    grid = Grid2D.from_lines(document)
+    positions = trace(grid, grid.find("S"))
 
-    def flood_fill(self) -> None:
-        # {(x, y)}
-        positions_to_check: set[tuple[int, int]] = set()
-
-        # Fill positions to check with initial data of all Os
-        for y_index in range(len(self.expanded_characters)):
-            for x_index in range(len(self.expanded_characters[0])):
-                character = self.expanded_characters[y_index][x_index]
-
-                if character == OPEN_CHARACTER:
-                    positions_to_check.add((x_index, y_index))
-
-        while positions_to_check:
-            x_index, y_index = positions_to_check.pop()
-
-            # Check in cardinal directions
-            for x_offset, y_offset in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-                try:
-                    character = self.expanded_characters[y_index + y_offset][
-                        x_index + x_offset
-                    ]
+    return Loop(
+        grid=grid,
+        positions=tuple(positions),
+        farthest=len(positions) // 2,
+    )
 
-                    if character == ENCLOSED_CHARACTER:
-                        self.expanded_characters[y_index + y_offset][
-                            x_index + x_offset
-                        ] = OPEN_CHARACTER
-                        positions_to_check.add((x_index + x_offset, y_index + y_offset))
-                except IndexError:
-                    pass
 
-    def shrink(self) -> None:
-        for y_index in range(0, len(self.expanded_characters), 3):
-            for x_index in range(0, len(self.expanded_characters[0]), 3):
-                # Get the center of each 3x3 grid
-                character = self.expanded_characters[y_index - 2][x_index - 2]
-                self.characters[y_index // 3 - 1][x_index // 3 - 1] = character
+def part_1(loop: Loop) -> int:
+    return loop.farthest
 
-    def count(self, character: str) -> int:
-        total = 0
 
-        for y_index in range(len(self.characters)):
-            for x_index in range(len(self.characters[0])):
-                if self.characters[y_index][x_index] == character:
-                    total += 1
+def part_2(loop: Loop) -> int:
+    expanded = expand(cleanup(loop.grid, set(loop.positions)))
+    flood_fill(expanded)
 
-        return total
+    # Whatever the center of each 3x3 tile is left as
+    return sum(
+        expanded.cells[expanded.index(x * 3 + 1, y * 3 + 1)] == ENCLOSED
+        for y in range(loop.grid.height)
+        for x in range(loop.grid.width)
+    )
 
 
 @router.post("/part-1")
+@solver()
 async def year_2023_day_10_part_1(
     document: list[str] = Body(
         ...,
@@ -270,28 +178,11 @@ async def year_2023_day_10_part_1(
         examples=[DOCUMENT_EXAMPLE],
     ),
 ) -> int:
-    character_map: list[list[str]] = []
-
-    position = Position(x=0, y=0)
-
-    for y_index, line in enumerate(document):
-        character_map.append(list(line))
-
-        for x_index, character in enumerate(line):
-            if character == "S":
-                position = Position(x=x_index, y=y_index)
-
-    pipe_map = Map(
-        start=position,
-        current=position,
-        positions=[position],
-        characters=character_map,
-    )
-
-    return pipe_map.run()
+    return part_1(parse(document))
 
 
 @router.post("/part-2")
+@solver(offload=True)
 async def year_2023_day_10_part_2(
     document: list[str] = Body(
         ...,
@@ -299,28 +190,19 @@ async def year_2023_day_10_part_2(
         examples=[DOCUMENT_EXAMPLE],
     ),
 ) -> int:
-    character_map: list[list[str]] = []
-
-    position = Position(x=0, y=0)
-
-    for y_index, line in enumerate(document):
-        character_map.append(list(line))
+    return part_2(parse(document))
 
-        for x_index, character in enumerate(line):
-            if character == "S":
-                position = Position(x=x_index, y=y_index)
-
-    pipe_map = Map(
-        start=position,
-        current=position,
-        positions=[position],
-        characters=character_map,
-    )
 
-    pipe_map.run()
-    pipe_map.cleanup()
-    pipe_map.expand()
-    pipe_map.flood_fill()
-    pipe_map.shrink()
+@router.post("/both")
+@solver(offload=True)
+async def year_2023_day_10_both(
+    document: list[str] = Body(
+        ...,
+        embed=True,
+        examples=[DOCUMENT_EXAMPLE],
+    ),
+) -> dict[str, int]:
+    """Both parts, parsing the document once."""
+    loop = parse(document)
 
-    return pipe_map.count(ENCLOSED_CHARACTER)
+    return {"part_1": part_1(loop), "part_2": part_2(loop)}
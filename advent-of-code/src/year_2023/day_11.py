@@ -1,9 +1,15 @@
-from dataclasses import dataclass, field
+import bisect
+from dataclasses import dataclass, field, replace
 from itertools import combinations
 
 from fastapi import APIRouter, Body
 
-router = APIRouter(tags=["2023 - Day 11: Cosmic Expansion"])
+from src import engines
+from src.cache import parser
+from src.executor import solver
+from src.ingest import DocumentRoute
+
+router = APIRouter(tags=["2023 - Day 11: Cosmic Expansion"], route_class=DocumentRoute)
 
 
 DOCUMENT_EXAMPLE = [
@@ -25,9 +31,6 @@ class Grid:
     space: list[list[str]]
     displacement: int
     galaxies: list[tuple[int, int]] = field(default_factory=list)
-    galaxy_combos: list[tuple[tuple[int, int], tuple[int, int]]] = field(
-        default_factory=list
-    )
 
     rows_displaced: list[int] = field(default_factory=list)
     columns_displaced: list[int] = field(default_factory=list)
@@ -54,13 +57,10 @@ class Grid:
                 if character == "#":
                     self.galaxies.append((x_index, y_index))
 
-        for galaxy_combo in combinations(self.galaxies, 2):
-            self.galaxy_combos.append(galaxy_combo)
-
     def calculate_galaxy_combo_distances(self) -> int:
         total_distance = 0
 
-        for galaxy_a, galaxy_b in self.galaxy_combos:
+        for galaxy_a, galaxy_b in combinations(self.galaxies, 2):
             x_displacements = 0
             y_displacements = 0
 
@@ -87,7 +87,64 @@ class Grid:
         return total_distance
 
 
+@parser
+def parse(document: list[str]) -> Grid:
+    """The galaxies and the empty rows and columns, not yet expanded."""
+    grid = Grid(
+        space=[list(line) for line in document],
+        displacement=1,
+    )
+
+    grid.expand()
+
+    grid.pair_galaxies()
+
+    return grid
+
+
+def expanded_distances(grid: Grid, displacement: int) -> int:
+    """
+    The same sum without going through every pair: the distances along each axis add up separately,
+    and with the galaxies' expanded positions sorted, each one is that far from every galaxy before it.
+    """
+    total = 0
+
+    for axis, empty in ((0, grid.columns_displaced), (1, grid.rows_displaced)):
+        positions = sorted(
+            galaxy[axis] + (displacement - 1) * bisect.bisect_left(empty, galaxy[axis])
+            for galaxy in grid.galaxies
+        )
+        before = 0
+
+        for index, position in enumerate(positions):
+            total += position * index - before
+            before += position
+
+    return total
+
+
+@engines.dispatch
+def part_1(grid: Grid) -> int:
+    return replace(grid, displacement=2).calculate_galaxy_combo_distances()
+
+
+@part_1.register("fast")
+def part_1_fast(grid: Grid) -> int:
+    return expanded_distances(grid, 2)
+
+
+@engines.dispatch
+def part_2(grid: Grid) -> int:
+    return replace(grid, displacement=1000000).calculate_galaxy_combo_distances()
+
+
+@part_2.register("fast")
+def part_2_fast(grid: Grid) -> int:
+    return expanded_distances(grid, 1000000)
+
+
 @router.post("/part-1")
+@solver(offload=True)
 async def year_2023_day_11_part_1(
     document: list[str] = Body(
         ...,
@@ -213,19 +270,11 @@ async def year_2023_day_11_part_1(
     Expand the universe, then find the length of the shortest path between every pair of galaxies.
     **What is the sum of these lengths?**
     """
-    grid = Grid(
-        space=[list(line) for line in document],
-        displacement=2,
-    )
-
-    grid.expand()
-
-    grid.pair_galaxies()
-
-    return grid.calculate_galaxy_combo_distances()
+    return part_1(parse(document))
 
 
 @router.post("/part-2")
+@solver(offload=True)
 async def year_2023_day_11_part_2(
     document: list[str] = Body(
         ...,
@@ -246,13 +295,19 @@ async def year_2023_day_11_part_2(
     Starting with the same initial image, expand the universe according to these new rules, then find the length of the shortest path between every pair of galaxies.
     **What is the sum of these lengths?**
     """
-    grid = Grid(
-        space=[list(line) for line in document],
-        displacement=1000000,
-    )
+    return part_2(parse(document))
 
-    grid.expand()
 
-    grid.pair_galaxies()
+@router.post("/both")
+@solver(offload=True)
+async def year_2023_day_11_both(
+    document: list[str] = Body(
+        ...,
+        embed=True,
+        examples=[DOCUMENT_EXAMPLE],
+    ),
+) -> dict[str, int]:
+    """Both parts, parsing the document once."""
+    grid = parse(document)
 
-    return grid.calculate_galaxy_combo_distances()
+    return {"part_1": part_1(grid), "part_2": part_2(grid)}
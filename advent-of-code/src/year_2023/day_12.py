@@ -1,8 +1,14 @@
-from functools import cache
+from typing import Iterable, Iterator
 
 from fastapi import APIRouter, Body
 
-router = APIRouter(tags=["2023 - Day 12: Hot Springs"])
+from src import engines
+from src.cache import memoize, parser
+from src.executor import solver
+from src.ingest import DocumentRoute
+from src.utils import distinct
+
+router = APIRouter(tags=["2023 - Day 12: Hot Springs"], route_class=DocumentRoute)
 
 
 DOCUMENT_EXAMPLE = [
@@ -15,7 +21,8 @@ DOCUMENT_EXAMPLE = [
 ]
 
 
-@cache
+# Only the one input's rows share arrangements
+@memoize(scoped=True)
 def count_arrangements(springs: str, counts: tuple[int]) -> int:
     # Base cases
     # Valid arranements only exist for no springs and no counts left
@@ -65,7 +72,77 @@ def count_arrangements(springs: str, counts: tuple[int]) -> int:
     return total
 
 
+Row = tuple[str, tuple[int, ...]]
+
+
+def rows(lines: Iterable[str]) -> Iterator[Row]:
+    for line in lines:
+        springs, count_str = line.split(" ")
+        counts = [int(value) for value in count_str.split(",")]
+
+        yield springs, tuple(counts)
+
+
+@engines.dispatch
+@parser
+def parse(document: list[str]) -> tuple[Row, ...]:
+    """Each row's springs and counts of damaged springs."""
+    return tuple(rows(document))
+
+
+@parse.register("distinct")
+@parser
+def parse_distinct(document: list[str]) -> tuple[tuple[Row, int], ...]:
+    """Each distinct row, and how many times it's listed."""
+    return distinct(document, rows)
+
+
+def unfold(springs: str, counts: tuple[int, ...]) -> Row:
+    return "?".join([springs] * 5), counts * 5
+
+
+@engines.dispatch
+def part_1(rows: tuple[Row, ...]) -> int:
+    total = 0
+
+    for springs, counts in rows:
+        total += count_arrangements(springs, counts)
+
+    return total
+
+
+@part_1.register("distinct")
+def part_1_distinct(rows: tuple[tuple[Row, int], ...]) -> int:
+    total = 0
+
+    for (springs, counts), count in rows:
+        total += count_arrangements(springs, counts) * count
+
+    return total
+
+
+@engines.dispatch
+def part_2(rows: tuple[Row, ...]) -> int:
+    total = 0
+
+    for springs, counts in rows:
+        total += count_arrangements(*unfold(springs, counts))
+
+    return total
+
+
+@part_2.register("distinct")
+def part_2_distinct(rows: tuple[tuple[Row, int], ...]) -> int:
+    total = 0
+
+    for (springs, counts), count in rows:
+        total += count_arrangements(*unfold(springs, counts)) * count
+
+    return total
+
+
 @router.post("/part-1")
+@solver()
 async def year_2023_day_12_part_1(
     document: list[str] = Body(
         ...,
@@ -73,18 +150,11 @@ async def year_2023_day_12_part_1(
         examples=[DOCUMENT_EXAMPLE],
     ),
 ) -> int:
-    total = 0
-
-    for index, line in enumerate(document):
-        springs, count_str = line.split(" ")
-        counts = [int(value) for value in count_str.split(",")]
-
-        total += count_arrangements(springs, tuple(counts))
-
-    return total
+    return part_1(parse(document))
 
 
 @router.post("/part-2")
+@solver(offload=True)
 async def year_2023_day_12_part_2(
     document: list[str] = Body(
         ...,
@@ -92,15 +162,19 @@ async def year_2023_day_12_part_2(
         examples=[DOCUMENT_EXAMPLE],
     ),
 ) -> int:
-    total = 0
-
-    for index, line in enumerate(document):
-        springs, count_str = line.split(" ")
-        counts = [int(value) for value in count_str.split(",")]
+    return part_2(parse(document))
 
-        unfolded_counts = counts * 5
-        unfolded_springs = "?".join([springs] * 5)
 
-        total += count_arrangements(unfolded_springs, tuple(unfolded_counts))
+@router.post("/both")
+@solver(offload=True)
+async def year_2023_day_12_both(
+    document: list[str] = Body(
+        ...,
+        embed=True,
+        examples=[DOCUMENT_EXAMPLE],
+    ),
+) -> dict[str, int]:
+    """Both parts, parsing the document once."""
+    rows = parse(document)
 
-    return total
+    return {"part_1": part_1(rows), "part_2": part_2(rows)}
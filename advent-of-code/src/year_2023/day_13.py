@@ -1,16 +1,22 @@
 from dataclasses import dataclass, field
-from functools import cache
 from typing import Literal
 
 from fastapi import APIRouter, Body
 
-router = APIRouter(tags=["2023 - Day 13: Point of Incidence"])
+from src.cache import memoize, parser
+from src.executor import solver
+from src.ingest import DocumentRoute
+
+router = APIRouter(
+    tags=["2023 - Day 13: Point of Incidence"],
+    route_class=DocumentRoute,
+)
 
 
 DOCUMENT_EXAMPLE = []
 
 
-@cache
+@memoize(scoped=True)
 def differences(first: str, second: str) -> int:
     diffs = 0
 
@@ -84,71 +90,86 @@ class Grid:
         return 0
 
 
-@router.post("/part-1")
-async def year_2023_day_13_part_1(
-    document: list[str] = Body(
-        ...,
-        embed=True,
-        examples=[DOCUMENT_EXAMPLE],
-    ),
-) -> int:
-    total = 0
-
-    grid = Grid(smudges=0)
+@parser
+def parse(document: list[str]) -> tuple[tuple[str, ...], ...]:
+    """Each pattern's rows."""
+    patterns: list[tuple[str, ...]] = []
+    rows: list[str] = []
 
     for line in document:
         if not line:
-            # Calculate reflections
-            if row_count := grid.calculate_reflections("rows"):
-                total += row_count
-            else:
-                total += grid.calculate_reflections("columns")
-
-            # Reset grid
-            grid = Grid(smudges=0)
+            patterns.append(tuple(rows))
+            rows = []
 
         else:
-            grid.add(line)
+            rows.append(line)
 
-    # Last grid
-    if row_count := grid.calculate_reflections("rows"):
-        total += row_count
-    else:
-        total += grid.calculate_reflections("columns")
+    # Last pattern
+    patterns.append(tuple(rows))
+
+    return tuple(patterns)
+
+
+def summarize(patterns: tuple[tuple[str, ...], ...], smudges: int) -> int:
+    total = 0
+
+    for rows in patterns:
+        grid = Grid(smudges=smudges)
+
+        for row in rows:
+            grid.add(row)
+
+        # Calculate reflections
+        if row_count := grid.calculate_reflections("rows"):
+            total += row_count
+        else:
+            total += grid.calculate_reflections("columns")
 
     return total
 
 
-@router.post("/part-2")
-async def year_2023_day_13_part_2(
+def part_1(patterns: tuple[tuple[str, ...], ...]) -> int:
+    return summarize(patterns, smudges=0)
+
+
+def part_2(patterns: tuple[tuple[str, ...], ...]) -> int:
+    return summarize(patterns, smudges=1)
+
+
+@router.post("/part-1")
+@solver()
+async def year_2023_day_13_part_1(
     document: list[str] = Body(
         ...,
         embed=True,
         examples=[DOCUMENT_EXAMPLE],
     ),
 ) -> int:
-    total = 0
-
-    grid = Grid(smudges=1)
+    return part_1(parse(document))
 
-    for line in document:
-        if not line:
-            # Calculate reflections
-            if row_count := grid.calculate_reflections("rows"):
-                total += row_count
-            else:
-                total += grid.calculate_reflections("columns")
 
-            # Reset grid
-            grid = Grid(smudges=1)
+@router.post("/part-2")
+@solver()
+async def year_2023_day_13_part_2(
+    document: list[str] = Body(
+        ...,
+        embed=True,
+        examples=[DOCUMENT_EXAMPLE],
+    ),
+) -> int:
+    return part_2(parse(document))
 
-        else:
-            grid.add(line)
 
-    # Last grid
-    if row_count := grid.calculate_reflections("rows"):
-        total += row_count
-    else:
-        total += grid.calculate_reflections("columns")
+@router.post("/both")
+@solver()
+async def year_2023_day_13_both(
+    document: list[str] = Body(
+        ...,
+        embed=True,
+        examples=[DOCUMENT_EXAMPLE],
+    ),
+) -> dict[str, int]:
+    """Both parts, parsing the document once."""
+    patterns = parse(document)
 
-    return total
+    return {"part_1": part_1(patterns), "part_2": part_2(patterns)}
@@ -2,7 +2,12 @@ from collections import Counter
 
 from fastapi import APIRouter, Body
 
-router = APIRouter(tags=["2023 - Day 14: Title"])
+from src.cache import parser
+from src.executor import solver
+from src.ingest import DocumentRoute
+from src.utils import DOWN, LEFT, RIGHT, UP, Grid2D
+
+router = APIRouter(tags=["2023 - Day 14: Title"], route_class=DocumentRoute)
 
 
 DOCUMENT_EXAMPLE = []
@@ -37,7 +42,49 @@ def tilt_left(line: str) -> str:
     return "".join(rock_line)
 
 
+def roll_section(section: bytes, forwards: bool) -> bytes:
+    rocks = b"O" * section.count(b"O")
+    space = b"." * (len(section) - len(rocks))
+
+    return space + rocks if forwards else rocks + space
+
+
+def roll(line: bytearray, forwards: bool) -> bytes:
+    """Roll a row or column's round rocks as far as they go, towards its end if `forwards`."""
+    # Square rocks keep the round ones apart
+    return b"#".join(roll_section(section, forwards) for section in line.split(b"#"))
+
+
+def tilt(grid: Grid2D, direction: int) -> None:
+    if direction in (UP, DOWN):
+        for x in range(grid.width):
+            grid.set_column(x, roll(grid.column(x), forwards=direction == DOWN))
+
+    else:
+        for y in range(grid.height):
+            grid.set_row(y, roll(grid.row(y), forwards=direction == RIGHT))
+
+
+def load(grid: Grid2D) -> int:
+    """The total load on the north support beams."""
+    return sum(grid.row(y).count(b"O") * (grid.height - y) for y in range(grid.height))
+
+
+@parser
+def parse(document: list[str]) -> Grid2D:
+    """The platform's rocks."""
+    return Grid2D.from_lines(document)
+
+
+def part_1(grid: Grid2D) -> int:
+    grid = grid.copy()
+    tilt(grid, UP)
+
+    return load(grid)
+
+
 @router.post("/part-1")
+@solver()
 async def year_2023_day_14_part_1(
     document: list[str] = Body(
         ...,
@@ -45,29 +92,7 @@ async def year_2023_day_14_part_1(
         examples=[DOCUMENT_EXAMPLE],
     ),
 ) -> int:
-    total = 0
-
-    line_size = len(document[0])
-    lines: list[str] = ["" for _ in range(line_size)]
-
-    for line in document:
-        for index, character in enumerate(line):
-            lines[index] += character
-
-    for index, line in enumerate(lines):
-        lines[index] = tilt_left(line)
-
-    for row_index in range(line_size):
-        line_total = 0
-
-        for line in lines:
-            if line[row_index] == "O":
-                line_total += 1
-
-        line_total *= line_size - row_index
-        total += line_total
-
-    return total
+    return part_1(parse(document))
 
 
 def transpose_90(raw_lines: list[str]) -> list[str]:
@@ -82,25 +107,34 @@ def transpose_90(raw_lines: list[str]) -> list[str]:
     return lines
 
 
-def transpose_180(raw_lines: list[str]) -> list[str]:
-    new_lines = raw_lines.copy()
+def part_2(grid: Grid2D) -> int:
+    size = 1_000_000_000
+
+    grid = grid.copy()
+    loads: list[int] = []
+    cycle_counter: dict[bytes, int] = {}
 
-    for _ in range(2):
-        new_lines = transpose_90(new_lines)
+    while len(loads) < size:
+        for direction in (UP, LEFT, DOWN, RIGHT):
+            tilt(grid, direction)
 
-    return new_lines
+        cycle_key = bytes(grid.cells)
 
+        if cycle_key in cycle_counter:
+            # Every cycle from here on repeats an earlier one
+            cycle_start = cycle_counter[cycle_key]
+            cycle_length = len(loads) - cycle_start
 
-def transpose_270(raw_lines: list[str]) -> list[str]:
-    new_lines = raw_lines.copy()
+            return loads[cycle_start + (size - cycle_start - 1) % cycle_length]
 
-    for _ in range(3):
-        new_lines = transpose_90(new_lines)
+        cycle_counter[cycle_key] = len(loads)
+        loads.append(load(grid))
 
-    return new_lines
+    return loads[-1]
 
 
 @router.post("/part-2")
+@solver(offload=True)
 async def year_2023_day_14_part_2(
     document: list[str] = Body(
         ...,
@@ -108,46 +142,19 @@ async def year_2023_day_14_part_2(
         examples=[DOCUMENT_EXAMPLE],
     ),
 ) -> int:
-    size = 1_000_000_000
-
-    counter = 0
-    cycle_repeats: int | None = None
-    cycle_counter: dict[str, int] = {}
-    cycles: dict[int, list[str]] = {}
-
-    while counter < size:
-        north = [tilt_left(line) for line in transpose_90(document)]
-        west = [tilt_left(line) for line in transpose_270(north)]
-        south = [tilt_left(line) for line in transpose_270(west)]
-        east = [tilt_left(line) for line in transpose_270(south)]
+    return part_2(parse(document))
 
-        cycled = transpose_180(east)
 
-        cycles[counter] = cycled
-
-        cycle_key = "".join(cycled)
-
-        if cycle_key in cycle_counter:
-            cycle_repeats = cycle_counter[cycle_key]
-            break
-
-        else:
-            cycle_counter[cycle_key] = counter
-
-        counter += 1
-        document = cycled
-
-    if cycle_repeats is None:
-        last_cycle = cycles[counter - 1]
-    else:
-        final_cycle = (
-            cycle_repeats + (size - cycle_repeats) % (counter - cycle_repeats) - 1
-        )
-        last_cycle = cycles[final_cycle]
-
-    total = 0
-
-    for index, line in enumerate(last_cycle):
-        total += line.count("O") * (len(last_cycle) - index)
+@router.post("/both")
+@solver(offload=True)
+async def year_2023_day_14_both(
+    document: list[str] = Body(
+        ...,
+        embed=True,
+        examples=[DOCUMENT_EXAMPLE],
+    ),
+) -> dict[str, int]:
+    """Both parts, parsing the document once."""
+    grid = parse(document)
 
-    return total
+    return {"part_1": part_1(grid), "part_2": part_2(grid)}
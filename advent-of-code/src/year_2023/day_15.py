@@ -1,19 +1,24 @@
+from typing import Iterable, Iterator
+
 from fastapi import APIRouter, Body
 
-router = APIRouter(tags=["2023 - Day 15: Title"])
+from src.executor import solver
+from src.ingest import DocumentRoute
+from src.streaming import OPENAPI_EXTRA, streaming
+
+
+class StepsRoute(DocumentRoute):
+    # The initialization sequence is one line of comma separated steps
+    separator = ","
+
+
+router = APIRouter(tags=["2023 - Day 15: Title"], route_class=StepsRoute)
 
 
 DOCUMENT_EXAMPLE = []
 
 
-@router.post("/part-1")
-async def year_2023_day_15_part_1(
-    document: list[str] = Body(
-        ...,
-        embed=True,
-        examples=[DOCUMENT_EXAMPLE],
-    ),
-) -> int:
+def part_1(document: Iterable[str]) -> int:
     total = 0
 
     for line in document:
@@ -31,14 +36,19 @@ async def year_2023_day_15_part_1(
     return total
 
 
-@router.post("/part-2")
-async def year_2023_day_15_part_2(
+@router.post("/part-1")
+@solver()
+async def year_2023_day_15_part_1(
     document: list[str] = Body(
         ...,
         embed=True,
         examples=[DOCUMENT_EXAMPLE],
     ),
 ) -> int:
+    return part_1(document)
+
+
+def part_2(document: list[str]) -> int:
     boxes: list[list[str]] = [[] for _ in range(256)]
 
     for line in document:
@@ -97,3 +107,35 @@ async def year_2023_day_15_part_2(
                 total += (box_index + 1) * (lens_index + 1) * focal_length
 
     return total
+
+
+@router.post("/part-2")
+@solver()
+async def year_2023_day_15_part_2(
+    document: list[str] = Body(
+        ...,
+        embed=True,
+        examples=[DOCUMENT_EXAMPLE],
+    ),
+) -> int:
+    return part_2(document)
+
+
+@router.post("/both")
+@solver()
+async def year_2023_day_15_both(
+    document: list[str] = Body(
+        ...,
+        embed=True,
+        examples=[DOCUMENT_EXAMPLE],
+    ),
+) -> dict[str, int]:
+    """Both parts in one request."""
+    return {"part_1": part_1(document), "part_2": part_2(document)}
+
+
+@router.post("/part-1/stream", openapi_extra=OPENAPI_EXTRA)
+@streaming(separator=StepsRoute.separator)
+async def year_2023_day_15_part_1_stream(lines: Iterator[str]) -> int:
+    """Part 1, solved a step at a time as the document's uploaded."""
+    return part_1(lines)
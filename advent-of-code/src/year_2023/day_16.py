@@ -1,399 +1,91 @@
-from dataclasses import dataclass, field
-from typing import Literal
-
 from fastapi import APIRouter, Body
 
-router = APIRouter(tags=["2023 - Day 16: Title"])
-
-
-DOCUMENT_EXAMPLE = []
+from src import progress
+from src.cache import parser
+from src.executor import solver
+from src.ingest import DocumentRoute
+from src.utils import DOWN, LEFT, RIGHT, UP, Grid2D
 
+router = APIRouter(tags=["2023 - Day 16: Title"], route_class=DocumentRoute)
 
-@dataclass(frozen=True)
-class Coordinate:
-    x: int
-    y: int
 
+DOCUMENT_EXAMPLE = []
 
-@dataclass(frozen=True)
-class Beam:
-    x_direction: Literal[-1, 0, 1]
-    y_direction: Literal[-1, 0, 1]
 
-    def __post_init__(self) -> None:
-        assert abs(self.x_direction) != abs(self.y_direction)
+# Where a beam goes next, by tile and the direction it's heading
+TURNS: dict[int, tuple[tuple[int, ...], ...]] = {
+    # Empty space, keep going
+    ord("."): ((UP,), (RIGHT,), (DOWN,), (LEFT,)),
+    # Splitters, pass through the pointy end or split in two
+    ord("|"): ((UP,), (UP, DOWN), (DOWN,), (UP, DOWN)),
+    ord("-"): ((LEFT, RIGHT), (RIGHT,), (LEFT, RIGHT), (LEFT,)),
+    # Mirrors
+    ord("/"): ((RIGHT,), (UP,), (LEFT,), (DOWN,)),
+    ord("\\"): ((LEFT,), (DOWN,), (RIGHT,), (UP,)),
+}
 
 
-def default_beam_grid() -> dict[Coordinate, list[Beam]]:
-    return {
-        Coordinate(x=0, y=0): [
-            Beam(
-                x_direction=1,
-                y_direction=0,
-            )
-        ]
-    }
+@parser
+def parse(document: list[str]) -> Grid2D:
+    """The contraption's tiles."""
+    return Grid2D.from_lines(document)
 
 
-def default_energized_grid() -> dict[Coordinate, set[Beam]]:
-    return {Coordinate(x=0, y=0): set()}
-
-
-@dataclass
-class Grid:
-    grid: dict[Coordinate, str] = field(default_factory=dict)
-    beam_grid: dict[Coordinate, list[Beam]] = field(default_factory=default_beam_grid)
-    energized_grid: dict[Coordinate, set[Beam]] = field(
-        default_factory=default_energized_grid
-    )
-
-    max_x: int = 0
-    max_y: int = 0
-
-    def add_coordinate(self, *, x: int, y: int, character: str) -> None:
-        self.max_x = max(self.max_x, x + 1)
-        self.max_y = max(self.max_y, y + 1)
-
-        self.grid[Coordinate(x=x, y=y)] = character
-
-    def start(self, coordinate: Coordinate, beam: Beam) -> None:
-        self.beam_grid = {coordinate: [beam]}
-        self.energized_grid = {coordinate: set()}
-
-    def step(self) -> None:
-        new_beam_grid: dict[Coordinate, list[Beam]] = {}
-
-        for coordinate, beams in self.beam_grid.items():
-            if not beams:
-                # No beams left in coordinate, just skip
-                continue
-
-            if coordinate not in self.grid:
-                # Coordinate outside of the grid, beam has left the grid and can no longer return
-                continue
-
-            for beam in beams:
-                if self.grid[coordinate] == ".":
-                    # Move the beam in the direction it was going
-                    new_coordinate = Coordinate(
-                        x=coordinate.x + beam.x_direction,
-                        y=coordinate.y + beam.y_direction,
-                    )
-
-                    if new_coordinate not in new_beam_grid:
-                        new_beam_grid[new_coordinate] = []
-
-                    new_beam_grid[new_coordinate].append(beam)
-
-                elif self.grid[coordinate] == "|":
-                    if beam.y_direction in [-1, 1]:
-                        # Keep the beam moving
-                        new_coordinate = Coordinate(
-                            x=coordinate.x + beam.x_direction,
-                            y=coordinate.y + beam.y_direction,
-                        )
-
-                        if new_coordinate not in new_beam_grid:
-                            new_beam_grid[new_coordinate] = []
-
-                        new_beam_grid[new_coordinate].append(beam)
-
-                    elif beam.x_direction in [-1, 1]:
-                        # Split the beam to go up
-                        new_coordinate_up = Coordinate(
-                            x=coordinate.x,
-                            y=coordinate.y - 1,
-                        )
-
-                        if new_coordinate_up not in new_beam_grid:
-                            new_beam_grid[new_coordinate_up] = []
-
-                        new_beam_grid[new_coordinate_up].append(
-                            Beam(
-                                x_direction=0,
-                                y_direction=-1,
-                            )
-                        )
-
-                        # Split the beam to go down
-                        new_coordinate_down = Coordinate(
-                            x=coordinate.x,
-                            y=coordinate.y + 1,
-                        )
-
-                        if new_coordinate_down not in new_beam_grid:
-                            new_beam_grid[new_coordinate_down] = []
-
-                        new_beam_grid[new_coordinate_down].append(
-                            Beam(
-                                x_direction=0,
-                                y_direction=1,
-                            )
-                        )
-
-                elif self.grid[coordinate] == "-":
-                    if beam.x_direction in [-1, 1]:
-                        # Keep the beam moving
-                        new_coordinate = Coordinate(
-                            x=coordinate.x + beam.x_direction,
-                            y=coordinate.y + beam.y_direction,
-                        )
-
-                        if new_coordinate not in new_beam_grid:
-                            new_beam_grid[new_coordinate] = []
-
-                        new_beam_grid[new_coordinate].append(beam)
-
-                    elif beam.y_direction in [-1, 1]:
-                        # Split the beam to go left
-                        new_coordinate_up = Coordinate(
-                            x=coordinate.x - 1,
-                            y=coordinate.y,
-                        )
-
-                        if new_coordinate_up not in new_beam_grid:
-                            new_beam_grid[new_coordinate_up] = []
-
-                        new_beam_grid[new_coordinate_up].append(
-                            Beam(
-                                x_direction=-1,
-                                y_direction=0,
-                            )
-                        )
-
-                        # Split the beam to go right
-                        new_coordinate_down = Coordinate(
-                            x=coordinate.x + 1,
-                            y=coordinate.y,
-                        )
-
-                        if new_coordinate_down not in new_beam_grid:
-                            new_beam_grid[new_coordinate_down] = []
-
-                        new_beam_grid[new_coordinate_down].append(
-                            Beam(
-                                x_direction=1,
-                                y_direction=0,
-                            )
-                        )
-
-                elif self.grid[coordinate] == "/":
-                    if beam.x_direction == 1:
-                        # Move the beam up
-                        new_coordinate = Coordinate(
-                            x=coordinate.x,
-                            y=coordinate.y - 1,
-                        )
-
-                        if new_coordinate not in new_beam_grid:
-                            new_beam_grid[new_coordinate] = []
-
-                        new_beam_grid[new_coordinate].append(
-                            Beam(
-                                x_direction=0,
-                                y_direction=-1,
-                            )
-                        )
-
-                    elif beam.x_direction == -1:
-                        # Move the beam down
-                        new_coordinate = Coordinate(
-                            x=coordinate.x,
-                            y=coordinate.y + 1,
-                        )
-
-                        if new_coordinate not in new_beam_grid:
-                            new_beam_grid[new_coordinate] = []
-
-                        new_beam_grid[new_coordinate].append(
-                            Beam(
-                                x_direction=0,
-                                y_direction=1,
-                            )
-                        )
-
-                    elif beam.y_direction == 1:
-                        # Move the beam left
-                        new_coordinate = Coordinate(
-                            x=coordinate.x - 1,
-                            y=coordinate.y,
-                        )
-
-                        if new_coordinate not in new_beam_grid:
-                            new_beam_grid[new_coordinate] = []
-
-                        new_beam_grid[new_coordinate].append(
-                            Beam(
-                                x_direction=-1,
-                                y_direction=0,
-                            )
-                        )
-
-                    elif beam.y_direction == -1:
-                        # Move the beam right
-                        new_coordinate = Coordinate(
-                            x=coordinate.x + 1,
-                            y=coordinate.y,
-                        )
-
-                        if new_coordinate not in new_beam_grid:
-                            new_beam_grid[new_coordinate] = []
-
-                        new_beam_grid[new_coordinate].append(
-                            Beam(
-                                x_direction=1,
-                                y_direction=0,
-                            )
-                        )
-
-                elif self.grid[coordinate] == "\\":
-                    if beam.x_direction == 1:
-                        # Move the beam down
-                        new_coordinate = Coordinate(
-                            x=coordinate.x,
-                            y=coordinate.y + 1,
-                        )
-
-                        if new_coordinate not in new_beam_grid:
-                            new_beam_grid[new_coordinate] = []
-
-                        new_beam_grid[new_coordinate].append(
-                            Beam(
-                                x_direction=0,
-                                y_direction=1,
-                            )
-                        )
-
-                    elif beam.x_direction == -1:
-                        # Move the beam up
-                        new_coordinate = Coordinate(
-                            x=coordinate.x,
-                            y=coordinate.y - 1,
-                        )
-
-                        if new_coordinate not in new_beam_grid:
-                            new_beam_grid[new_coordinate] = []
-
-                        new_beam_grid[new_coordinate].append(
-                            Beam(
-                                x_direction=0,
-                                y_direction=-1,
-                            )
-                        )
-
-                    elif beam.y_direction == 1:
-                        # Move the beam right
-                        new_coordinate = Coordinate(
-                            x=coordinate.x + 1,
-                            y=coordinate.y,
-                        )
-
-                        if new_coordinate not in new_beam_grid:
-                            new_beam_grid[new_coordinate] = []
-
-                        new_beam_grid[new_coordinate].append(
-                            Beam(
-                                x_direction=1,
-                                y_direction=0,
-                            )
-                        )
-
-                    elif beam.y_direction == -1:
-                        # Move the beam left
-                        new_coordinate = Coordinate(
-                            x=coordinate.x - 1,
-                            y=coordinate.y,
-                        )
-
-                        if new_coordinate not in new_beam_grid:
-                            new_beam_grid[new_coordinate] = []
-
-                        new_beam_grid[new_coordinate].append(
-                            Beam(
-                                x_direction=-1,
-                                y_direction=0,
-                            )
-                        )
-
-        # If we've seen this beam at this coordinate before in the energized grid, remove it
-        cleaned_beam_grid: dict[Coordinate, list[Beam]] = {}
-
-        # self.show_energized()
-
-        for coordinate, beams in new_beam_grid.items():
-            cleaned_beam_grid[coordinate] = []
-
-            if coordinate in self.energized_grid:
-                for beam in beams:
-                    if beam in self.energized_grid[coordinate]:
-                        pass
-
-                    else:
-                        self.energized_grid[coordinate].add(beam)
-                        cleaned_beam_grid[coordinate].append(beam)
-
-            elif coordinate in self.grid:
-                if coordinate not in self.energized_grid:
-                    self.energized_grid[coordinate] = set()
+def energize(grid: Grid2D, start: int, direction: int) -> int:
+    """Count the tiles a beam entering `start` heading in `direction` passes through."""
+    cells = grid.cells
+    links = grid.links
 
-                self.energized_grid[coordinate].update(set(beams))
-                cleaned_beam_grid[coordinate] = beams
+    # The directions beams have already passed through each tile in, as bits
+    seen = bytearray(len(cells))
+    beams: list[tuple[int, int]] = [(start, direction)]
 
-        self.beam_grid = cleaned_beam_grid
-
-    def count_energized(self) -> int:
-        count = 0
+    while beams:
+        index, direction = beams.pop()
 
-        for coordinate in self.grid.keys():
-            if coordinate in self.energized_grid:
-                count += 1
+        # Beams that have been here before will only do the same thing again
+        if seen[index] & (1 << direction):
+            continue
 
-        return count
+        seen[index] |= 1 << direction
 
-    def show(self) -> None:
-        print()
+        for next_direction in TURNS[cells[index]][direction]:
+            next_index = links[4 * index + next_direction]
 
-        all_lines = ""
+            if next_index >= 0:
+                beams.append((next_index, next_direction))
 
-        for y in range(self.max_y):
-            line = ""
+    return len(seen) - seen.count(0)
 
-            for x in range(self.max_x):
-                coordinate = Coordinate(x=x, y=y)
 
-                if coordinate in self.beam_grid:
-                    line += "\033[31m#\033[0m"
-                elif coordinate in self.energized_grid:
-                    line += "\033[32m#\033[0m"
-                else:
-                    line += self.grid[coordinate]
+def part_1(grid: Grid2D) -> int:
+    return energize(grid, 0, RIGHT)
 
-            all_lines += line
-            all_lines += "\n"
 
-        print(all_lines)
+def part_2(grid: Grid2D) -> int:
+    starts: list[tuple[int, int]] = []
 
-    def show_energized(self) -> None:
-        print()
+    for y in range(grid.height):
+        # Start from left moving right, and from right moving left
+        starts.append((grid.index(0, y), RIGHT))
+        starts.append((grid.index(grid.width - 1, y), LEFT))
 
-        for y in range(self.max_y):
-            line = ""
+    for x in range(grid.width):
+        # Start from top moving down, and from bottom moving up
+        starts.append((grid.index(x, 0), DOWN))
+        starts.append((grid.index(x, grid.height - 1), UP))
 
-            for x in range(self.max_x):
-                coordinate = Coordinate(x=x, y=y)
+    energized = 0
 
-                if coordinate in self.beam_grid:
-                    line += f"\033[31m{self.grid[coordinate]}\033[0m"
-                elif coordinate in self.energized_grid:
-                    # line += f"\033[32m#\033[0m"
-                    line += f"\033[32m{self.grid[coordinate]}\033[0m"
-                else:
-                    line += self.grid[coordinate]
+    for index, (start, direction) in enumerate(starts):
+        progress.report(starts=index, total=len(starts))
+        energized = max(energized, energize(grid, start, direction))
 
-            print(line)
+    return energized
 
 
 @router.post("/part-1")
+@solver(offload=True)
 async def year_2023_day_16_part_1(
     document: list[str] = Body(
         ...,
@@ -401,21 +93,11 @@ async def year_2023_day_16_part_1(
         examples=[DOCUMENT_EXAMPLE],
     ),
 ) -> int:
-    grid = Grid()
-
-    for y_index, line in enumerate(document):
-        for x_index, character in enumerate(line):
-            grid.add_coordinate(x=x_index, y=y_index, character=character)
-
-    grid.start(Coordinate(x=0, y=0), Beam(x_direction=1, y_direction=0))
-
-    while grid.beam_grid:
-        grid.step()
-
-    return grid.count_energized()
+    return part_1(parse(document))
 
 
 @router.post("/part-2")
+@solver(offload=True)
 async def year_2023_day_16_part_2(
     document: list[str] = Body(
         ...,
@@ -423,51 +105,19 @@ async def year_2023_day_16_part_2(
         examples=[DOCUMENT_EXAMPLE],
     ),
 ) -> int:
-    grid = Grid()
-
-    max_x = len(document[0])
-    max_y = len(document)
-
-    for y_index, line in enumerate(document):
-        for x_index, character in enumerate(line):
-            grid.add_coordinate(x=x_index, y=y_index, character=character)
-
-    max_energized = 0
-
-    # Start from left moving right
-    for y in range(max_y):
-        grid.start(Coordinate(x=0, y=y), Beam(x_direction=1, y_direction=0))
-
-        while grid.beam_grid:
-            grid.step()
+    return part_2(parse(document))
 
-        max_energized = max(max_energized, grid.count_energized())
 
-    # Start from right moving left
-    for y in range(max_y):
-        grid.start(Coordinate(x=max_x, y=y), Beam(x_direction=-1, y_direction=0))
-
-        while grid.beam_grid:
-            grid.step()
-
-        max_energized = max(max_energized, grid.count_energized())
-
-    # Start from top moving down
-    for x in range(max_x):
-        grid.start(Coordinate(x=x, y=0), Beam(x_direction=0, y_direction=1))
-
-        while grid.beam_grid:
-            grid.step()
-
-        max_energized = max(max_energized, grid.count_energized())
-
-    # Start from bottom moving up
-    for x in range(max_x):
-        grid.start(Coordinate(x=x, y=max_y), Beam(x_direction=0, y_direction=-1))
-
-        while grid.beam_grid:
-            grid.step()
-
-        max_energized = max(max_energized, grid.count_energized())
+@router.post("/both")
+@solver(offload=True)
+async def year_2023_day_16_both(
+    document: list[str] = Body(
+        ...,
+        embed=True,
+        examples=[DOCUMENT_EXAMPLE],
+    ),
+) -> dict[str, int]:
+    """Both parts, parsing the document once."""
+    grid = parse(document)
 
-    return max_energized
+    return {"part_1": part_1(grid), "part_2": part_2(grid)}
@@ -1,161 +1,95 @@
-from dataclasses import dataclass, field
 from heapq import heappop, heappush
 
 from fastapi import APIRouter, Body
 
-router = APIRouter(tags=["2023 - Day 17: Title"])
+from src.cache import parser
+from src.executor import solver
+from src.ingest import DocumentRoute
+from src.utils import Grid2D, reverse
 
-
-DOCUMENT_EXAMPLE = []
-
-
-@dataclass(frozen=True)
-class Coordinate:
-    x: int
-    y: int
-
-    def __repr__(self) -> str:
-        return f"x: {self.x}, y: {self.y}"
-
-    def __lt__(self, other: "Coordinate") -> bool:
-        if self.x != other.x:
-            return self.x < other.x
-
-        return self.y < other.y
+router = APIRouter(tags=["2023 - Day 17: Title"], route_class=DocumentRoute)
 
 
-OFFSETS: list[Coordinate] = [
-    Coordinate(x=0, y=-1),  # Up
-    Coordinate(x=0, y=1),  # Down
-    Coordinate(x=1, y=0),  # Right
-    Coordinate(x=-1, y=0),  # Left
-]
-
-
-def do_180(coordinate: Coordinate) -> Coordinate:
-    return Coordinate(x=-coordinate.x, y=-coordinate.y)
-
-
-Edge = tuple[Coordinate, Coordinate | None, int]
-
+DOCUMENT_EXAMPLE = []
 
-@dataclass
-class Grid:
-    grid: dict[Coordinate, int]
 
-    minimum_distance: int
-    maximum_distance: int
+# A crucible's position, the direction it's heading (`-1` before it's moved), and how far it's gone that way
+State = tuple[int, int, int]
 
-    edges: dict[Edge, list[Edge]] = field(default_factory=dict)
 
-    max_x: int = 0
-    max_y: int = 0
+@parser
+def parse(document: list[str]) -> Grid2D:
+    """Each city block's heat loss."""
+    grid = Grid2D.from_lines(document)
 
-    def add_coordinate(self, coordinate: Coordinate, cost: int) -> None:
-        self.max_x = max(self.max_x, coordinate.x + 1)
-        self.max_y = max(self.max_y, coordinate.y + 1)
-        self.grid[coordinate] = cost
+    # Digits to their values
+    grid.cells = bytearray(cell - ord("0") for cell in grid.cells)
 
-    def run(self) -> int:
-        start = (Coordinate(x=0, y=0), None, 0)
+    return grid
 
-        # Build up our cost path
-        queue: list[tuple[int, Edge]] = [(0, start)]
-        checked: set[Edge] = {start}
 
-        while True:
-            current_cost, (point, backwards_offset, distance) = heappop(queue)
+def least_heat_loss(grid: Grid2D, minimum_distance: int, maximum_distance: int) -> int:
+    costs = grid.cells
+    links = grid.links
+    end = len(costs) - 1
 
-            if (
-                self.minimum_distance <= distance <= self.maximum_distance
-                and point.x == self.max_x - 1
-                and point.y == self.max_y - 1
-            ):
-                return current_cost
+    start: State = (0, -1, 0)
+    queue: list[tuple[int, State]] = [(0, start)]
+    checked: set[State] = set()
 
-            edges: list[Edge] = []
+    while queue:
+        current_cost, state = heappop(queue)
 
-            if backwards_offset is None:
-                for next_offset in OFFSETS:
-                    next_point = Coordinate(
-                        x=point.x + next_offset.x,
-                        y=point.y + next_offset.y,
-                    )
+        if state in checked:
+            continue
 
-                    if next_point not in self.grid:
-                        continue
+        checked.add(state)
+        index, direction, distance = state
 
-                    edges.append((next_point, next_offset, 1))
+        if index == end and minimum_distance <= distance:
+            return current_cost
 
-            elif distance < self.minimum_distance:
-                # Gotta keep moving in the same direction
-                next_point = Coordinate(
-                    x=point.x + backwards_offset.x,
-                    y=point.y + backwards_offset.y,
-                )
+        for next_direction in range(4):
+            if direction < 0:
+                next_distance = 1
 
-                if next_point not in self.grid:
+            elif next_direction == direction:
+                if distance >= maximum_distance:
+                    # Over the maximum, gotta turn
                     continue
 
-                edges.append((next_point, backwards_offset, distance + 1))
+                next_distance = distance + 1
 
-            elif distance < self.maximum_distance:
-                # Can turn now
-                for next_offset in OFFSETS:
-                    if next_offset == do_180(backwards_offset):
-                        # No 180 degree turns
-                        continue
+            elif next_direction == reverse(direction) or distance < minimum_distance:
+                # No 180 degree turns, and gotta keep moving until the minimum
+                continue
 
-                    next_point = Coordinate(
-                        x=point.x + next_offset.x,
-                        y=point.y + next_offset.y,
-                    )
-
-                    if next_point not in self.grid:
-                        continue
+            else:
+                next_distance = 1
 
-                    if next_offset == backwards_offset:
-                        edges.append((next_point, next_offset, distance + 1))
+            next_index = links[4 * index + next_direction]
 
-                    else:
-                        edges.append((next_point, next_offset, 1))
+            if next_index < 0:
+                continue
 
-            else:
-                # Over the maximum, gotta turn
-                for next_offset in OFFSETS:
-                    if next_offset == do_180(backwards_offset):
-                        # No 180 degree turns
-                        continue
+            next_state = (next_index, next_direction, next_distance)
 
-                    if next_offset == backwards_offset:
-                        # No going straight
-                        continue
+            if next_state not in checked:
+                heappush(queue, (current_cost + costs[next_index], next_state))
 
-                    next_point = Coordinate(
-                        x=point.x + next_offset.x,
-                        y=point.y + next_offset.y,
-                    )
+    raise ValueError("There's no way to the factory")
 
-                    if next_point not in self.grid:
-                        continue
 
-                    edges.append((next_point, next_offset, 1))
+def part_1(grid: Grid2D) -> int:
+    return least_heat_loss(grid, minimum_distance=0, maximum_distance=3)
 
-            for edge in edges:
-                if edge in checked:
-                    continue
 
-                checked.add(edge)
-                current_point = edge[0]
-
-                next_cost = current_cost + self.grid[current_point]
-                heappush(
-                    queue,
-                    (next_cost, edge),
-                )
+def part_2(grid: Grid2D) -> int:
+    return least_heat_loss(grid, minimum_distance=4, maximum_distance=10)
 
 
 @router.post("/part-1")
+@solver(offload=True)
 async def year_2023_day_17_part_1(
     document: list[str] = Body(
         ...,
@@ -163,20 +97,11 @@ async def year_2023_day_17_part_1(
         examples=[DOCUMENT_EXAMPLE],
     ),
 ) -> int:
-    grid = Grid(
-        grid={},
-        minimum_distance=0,
-        maximum_distance=3,
-    )
-
-    for y_index, line in enumerate(document):
-        for x_index, character in enumerate(line):
-            grid.add_coordinate(Coordinate(x=x_index, y=y_index), cost=int(character))
-
-    return grid.run()
+    return part_1(parse(document))
 
 
 @router.post("/part-2")
+@solver(offload=True)
 async def year_2023_day_17_part_2(
     document: list[str] = Body(
         ...,
@@ -184,14 +109,19 @@ async def year_2023_day_17_part_2(
         examples=[DOCUMENT_EXAMPLE],
     ),
 ) -> int:
-    grid = Grid(
-        grid={},
-        minimum_distance=4,
-        maximum_distance=10,
-    )
+    return part_2(parse(document))
 
-    for y_index, line in enumerate(document):
-        for x_index, character in enumerate(line):
-            grid.add_coordinate(Coordinate(x=x_index, y=y_index), cost=int(character))
 
-    return grid.run()
+@router.post("/both")
+@solver(offload=True)
+async def year_2023_day_17_both(
+    document: list[str] = Body(
+        ...,
+        embed=True,
+        examples=[DOCUMENT_EXAMPLE],
+    ),
+) -> dict[str, int]:
+    """Both parts, parsing the document once."""
+    grid = parse(document)
+
+    return {"part_1": part_1(grid), "part_2": part_2(grid)}
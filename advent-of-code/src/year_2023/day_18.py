@@ -3,7 +3,10 @@ from dataclasses import dataclass
 import numpy as np
 from fastapi import APIRouter, Body
 
-router = APIRouter(tags=["2023 - Day 18: Title"])
+from src.executor import solver
+from src.ingest import DocumentRoute
+
+router = APIRouter(tags=["2023 - Day 18: Title"], route_class=DocumentRoute)
 
 
 DOCUMENT_EXAMPLE = []
@@ -54,14 +57,7 @@ class BigGrid:
         self.path.append(self.current)
 
 
-@router.post("/part-1")
-async def year_2023_day_18_part_1(
-    document: list[str] = Body(
-        ...,
-        embed=True,
-        examples=[DOCUMENT_EXAMPLE],
-    ),
-) -> int:
+def part_1(document: list[str]) -> int:
     grid = BigGrid(
         current=Coordinate(x=0, y=0),
         path=[Coordinate(x=0, y=0)],
@@ -76,14 +72,19 @@ async def year_2023_day_18_part_1(
     return grid.enclosed_area
 
 
-@router.post("/part-2")
-async def year_2023_day_18_part_2(
+@router.post("/part-1")
+@solver()
+async def year_2023_day_18_part_1(
     document: list[str] = Body(
         ...,
         embed=True,
         examples=[DOCUMENT_EXAMPLE],
     ),
 ) -> int:
+    return part_1(document)
+
+
+def part_2(document: list[str]) -> int:
     grid = BigGrid(
         current=Coordinate(x=0, y=0),
         path=[Coordinate(x=0, y=0)],
@@ -107,3 +108,28 @@ async def year_2023_day_18_part_2(
         grid.move(x_offset * distance, y_offset * distance)
 
     return grid.enclosed_area
+
+
+@router.post("/part-2")
+@solver()
+async def year_2023_day_18_part_2(
+    document: list[str] = Body(
+        ...,
+        embed=True,
+        examples=[DOCUMENT_EXAMPLE],
+    ),
+) -> int:
+    return part_2(document)
+
+
+@router.post("/both")
+@solver()
+async def year_2023_day_18_both(
+    document: list[str] = Body(
+        ...,
+        embed=True,
+        examples=[DOCUMENT_EXAMPLE],
+    ),
+) -> dict[str, int]:
+    """Both parts in one request."""
+    return {"part_1": part_1(document), "part_2": part_2(document)}
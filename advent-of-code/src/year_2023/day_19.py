@@ -4,7 +4,11 @@ from dataclasses import dataclass
 
 from fastapi import APIRouter, Body
 
-router = APIRouter(tags=["2023 - Day 19: Title"])
+from src.cache import parser
+from src.executor import solver
+from src.ingest import DocumentRoute
+
+router = APIRouter(tags=["2023 - Day 19: Title"], route_class=DocumentRoute)
 
 
 DOCUMENT_EXAMPLE = []
@@ -98,17 +102,19 @@ class Workflow:
                 return result
 
 
-@router.post("/part-1")
-async def year_2023_day_19_part_1(
-    document: list[str] = Body(
-        ...,
-        embed=True,
-        examples=[DOCUMENT_EXAMPLE],
-    ),
-) -> int:
+@dataclass(frozen=True)
+class System:
+    workflows: dict[str, Workflow]
+    # Each part's ratings
+    ratings: tuple[dict[str, int], ...]
+
+
+@parser
+def parse(document: list[str]) -> System:
+    """The workflows, and each part's ratings."""
     reading_workflows = True
     workflows: dict[str, Workflow] = {}
-    parts: list[Part] = []
+    ratings: list[dict[str, int]] = []
 
     for line in document:
         # Switch modes
@@ -132,13 +138,14 @@ async def year_2023_day_19_part_1(
                 .replace("s", '"s"')
                 .replace("=", ":")
             )
-            data = json.loads(json_line)
-            parts.append(
-                Part(
-                    **data,
-                    raw=data,
-                ),
-            )
+            ratings.append(json.loads(json_line))
+
+    return System(workflows=workflows, ratings=tuple(ratings))
+
+
+def part_1(system: System) -> int:
+    workflows = system.workflows
+    parts = [Part(**data, raw=data) for data in system.ratings]
 
     for part in parts:
         next_workflow: Workflow | None = workflows["in"]
@@ -152,6 +159,18 @@ async def year_2023_day_19_part_1(
     return sum([part.total for part in parts if part.result == "A"])
 
 
+@router.post("/part-1")
+@solver()
+async def year_2023_day_19_part_1(
+    document: list[str] = Body(
+        ...,
+        embed=True,
+        examples=[DOCUMENT_EXAMPLE],
+    ),
+) -> int:
+    return part_1(parse(document))
+
+
 @dataclass
 class Range:
     lower: int
@@ -170,30 +189,8 @@ def range_combos(ranges: Ranges) -> int:
     return count
 
 
-@router.post("/part-2")
-async def year_2023_day_19_part_2(
-    document: list[str] = Body(
-        ...,
-        embed=True,
-        examples=[DOCUMENT_EXAMPLE],
-    ),
-) -> int:
-    reading_workflows = True
-    workflows: dict[str, Workflow] = {}
-
-    for line in document:
-        # Switch modes
-        if line == "":
-            reading_workflows = False
-            continue
-
-        if reading_workflows:
-            key, rest = line.split("{")
-            step_strings = rest.replace("}", "").split(",")
-
-            steps = [Step.from_str(value) for value in step_strings]
-
-            workflows[key] = Workflow(steps=steps)
+def part_2(system: System) -> int:
+    workflows = system.workflows
 
     def calculate_combos(ranges: Ranges, workflow_id: str) -> int:
         combos = 0
@@ -272,3 +269,30 @@ async def year_2023_day_19_part_2(
         },
         "in",
     )
+
+
+@router.post("/part-2")
+@solver()
+async def year_2023_day_19_part_2(
+    document: list[str] = Body(
+        ...,
+        embed=True,
+        examples=[DOCUMENT_EXAMPLE],
+    ),
+) -> int:
+    return part_2(parse(document))
+
+
+@router.post("/both")
+@solver()
+async def year_2023_day_19_both(
+    document: list[str] = Body(
+        ...,
+        embed=True,
+        examples=[DOCUMENT_EXAMPLE],
+    ),
+) -> dict[str, int]:
+    """Both parts, parsing the document once."""
+    system = parse(document)
+
+    return {"part_1": part_1(system), "part_2": part_2(system)}
@@ -1,6 +1,18 @@
+import math
+from dataclasses import dataclass
+from typing import Iterable, Iterator
+
+import numpy as np
 from fastapi import APIRouter, Body
 
-router = APIRouter(tags=["2023 - Day 2: Cube Conundrum"])
+from src import engines
+from src.cache import parser
+from src.executor import solver
+from src.ingest import DocumentRoute
+from src.streaming import OPENAPI_EXTRA, streaming
+from src.utils import ascii_digits, digit_values
+
+router = APIRouter(tags=["2023 - Day 2: Cube Conundrum"], route_class=DocumentRoute)
 
 
 DOCUMENT_EXAMPLE = [
@@ -12,23 +24,219 @@ DOCUMENT_EXAMPLE = [
 ]
 
 
-def is_possible(score: str, red: int, green: int, blue: int) -> bool:
-    if "red" in score:
-        if int(score.replace(" red", "")) > red:
-            return False
+# A game's number, and the most red, green and blue cubes shown at once
+Game = tuple[int, int, int, int]
+
+
+# Cells of the table of totals by bag, past which bags are compared with every game instead
+BAGS_TABLE_CELLS = 1 << 22
+
+# Bags compared with every game at once, bounding the memory of each comparison
+BAGS_CHUNK_CELLS = 1 << 22
+
+
+@dataclass(frozen=True)
+class Games:
+    """Every game's number and most red, green and blue cubes shown at once, as columns."""
+
+    numbers: np.ndarray
+    red: np.ndarray
+    green: np.ndarray
+    blue: np.ndarray
+
+
+# Games showing the same cubes: the total of their numbers, how many there are,
+# and the most red, green and blue cubes shown at once
+DistinctGames = tuple[int, int, int, int, int]
+
+
+def fewest_cubes(reveals: str) -> tuple[int, int, int]:
+    red = 0
+    green = 0
+    blue = 0
+
+    for scores in reveals.split(";"):
+        for score in scores.split(", "):
+            if "red" in score:
+                red = max(red, int(score.replace(" red", "")))
+
+            if "green" in score:
+                green = max(green, int(score.replace(" green", "")))
+
+            if "blue" in score:
+                blue = max(blue, int(score.replace(" blue", "")))
+
+    return red, green, blue
+
+
+def games(lines: Iterable[str]) -> Iterator[Game]:
+    for line in lines:
+        game_text, ball_text = line.split(": ")
+
+        # Extract game number
+        game_number = int(str(game_text).replace("Game ", ""))
+
+        yield game_number, *fewest_cubes(ball_text)
+
+
+@engines.dispatch
+@parser
+def parse(document: list[str]) -> tuple[Game, ...]:
+    """Each game's number and fewest cubes of each color."""
+    return tuple(games(document))
+
+
+@parse.register("distinct")
+@parser
+def parse_distinct(document: list[str]) -> tuple[DistinctGames, ...]:
+    """
+    The games showing the same cubes grouped together, each group's reveals parsed once.
+    Every line has its own game number, so it's the reveals after it that repeat.
+    """
+    numbers: dict[str, list[int]] = {}
+
+    for line in document:
+        game_text, ball_text = line.split(": ")
+
+        numbers.setdefault(ball_text, []).append(int(game_text.replace("Game ", "")))
+
+    return tuple(
+        (sum(game_numbers), len(game_numbers), *fewest_cubes(ball_text))
+        for ball_text, game_numbers in numbers.items()
+    )
+
+
+@parse.register("numpy")
+@parser
+def parse_columns(document: list[str]) -> Games:
+    """
+    Each game's number and fewest cubes of each color, tokenized as one byte buffer rather than line by line.
+    Every number is a game's if a colon follows it, otherwise cubes of the color starting two bytes on.
+    """
+    data = np.frombuffer(("\n".join(document) + "\n").encode(), dtype=np.uint8)
+
+    digits, is_digit = ascii_digits(data)
+
+    # Where each number starts, and ends (one past its last digit)
+    edges = np.diff(is_digit.astype(np.int8), prepend=0, append=0)
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    values = digit_values(digits, starts, ends)
+
+    lines = np.searchsorted(np.flatnonzero(data == ord("\n")), starts)
+    is_game = data[ends] == ord(":")
+
+    if not np.array_equal(lines[is_game], np.arange(len(document))):
+        raise ValueError("Every line needs to be one game")
+
+    numbers = values[is_game]
+    colors = data[np.minimum(ends + 1, len(data) - 1)]
+    columns: list[np.ndarray] = []
+
+    for color in b"rgb":
+        shown = ~is_game & (colors == color)
+        most = np.zeros(len(numbers), dtype=np.int64)
+        np.maximum.at(most, lines[shown], values[shown])
+
+        columns.append(most)
+
+    return Games(numbers, *columns)
+
+
+def possible_totals(games: Games, bags: np.ndarray) -> np.ndarray:
+    """The total of the possible games' numbers for each bag, a row of its red, green and blue cubes."""
+    # Bags holding more of a color than any game shows are as good as ones holding that many
+    shape = tuple(
+        int(column.max(initial=0)) + 1
+        for column in (games.red, games.green, games.blue)
+    )
+
+    if math.prod(shape) <= BAGS_TABLE_CELLS:
+        # The total of the games showing at most so many red, green and blue cubes
+        table = np.zeros(shape, dtype=np.int64)
+        np.add.at(table, (games.red, games.green, games.blue), games.numbers)
+        table = table.cumsum(axis=0).cumsum(axis=1).cumsum(axis=2)
+
+        clipped = np.minimum(bags, np.array(shape) - 1)
+        totals = table[clipped[:, 0], clipped[:, 1], clipped[:, 2]]
+
+        # Only a bag with fewer than none of a color has no possible games
+        return np.where((bags < 0).any(axis=1), 0, totals)
+
+    totals = np.zeros(len(bags), dtype=np.int64)
+    size = max(BAGS_CHUNK_CELLS // max(len(games.numbers), 1), 1)
+
+    for start in range(0, len(bags), size):
+        chunk = bags[start : start + size]
+
+        # Bags by games
+        possible = (
+            (games.red <= chunk[:, 0, None])
+            & (games.green <= chunk[:, 1, None])
+            & (games.blue <= chunk[:, 2, None])
+        )
+        totals[start : start + size] = possible @ games.numbers
+
+    return totals
+
+
+@engines.dispatch
+def part_1(games: Iterable[Game], red: int, green: int, blue: int) -> int:
+    total = 0
+
+    for game_number, most_red, most_green, most_blue in games:
+        # A game is possible if no reveal shows more cubes than the bag holds
+        if most_red <= red and most_green <= green and most_blue <= blue:
+            total += game_number
+
+    return total
+
+
+@part_1.register("distinct")
+def part_1_distinct(
+    games: Iterable[DistinctGames], red: int, green: int, blue: int
+) -> int:
+    total = 0
+
+    for game_numbers, _, most_red, most_green, most_blue in games:
+        if most_red <= red and most_green <= green and most_blue <= blue:
+            total += game_numbers
+
+    return total
+
+
+@part_1.register("numpy")
+def part_1_numpy(games: Games, red: int, green: int, blue: int) -> int:
+    return int(possible_totals(games, np.array([[red, green, blue]]))[0])
+
+
+@engines.dispatch
+def part_2(games: Iterable[Game]) -> int:
+    powers = 0
 
-    if "green" in score:
-        if int(score.replace(" green", "")) > green:
-            return False
+    for _, red, green, blue in games:
+        powers += red * green * blue
 
-    if "blue" in score:
-        if int(score.replace(" blue", "")) > blue:
-            return False
+    return powers
 
-    return True
+
+@part_2.register("distinct")
+def part_2_distinct(games: Iterable[DistinctGames]) -> int:
+    powers = 0
+
+    for _, count, red, green, blue in games:
+        powers += red * green * blue * count
+
+    return powers
+
+
+@part_2.register("numpy")
+def part_2_numpy(games: Games) -> int:
+    return int((games.red * games.green * games.blue).sum())
 
 
 @router.post("/part-1")
+@solver()
 async def year_2023_day_2_part_1(
     document: list[str] = Body(
         ...,
@@ -81,29 +289,11 @@ async def year_2023_day_2_part_1(
     Determine which games would have been possible if the bag had been loaded with only 12 red cubes, 13 green cubes, and 14 blue cubes.
     **What is the sum of the IDs of those games?**
     """
-    total = 0
-
-    for line in document:
-        possible = True
-
-        game_text, ball_text = line.split(": ")
-
-        # Extract game number
-        game_number = int(str(game_text).replace("Game ", ""))
-
-        # Check if scores are possible
-        for scores in ball_text.split(";"):
-            for score in scores.split(", "):
-                if not is_possible(score, red, green, blue):
-                    possible = False
-
-        if possible:
-            total += game_number
-
-    return total
+    return part_1(parse(document), red, green, blue)
 
 
 @router.post("/part-2")
+@solver()
 async def year_2023_day_2_part_2(
     document: list[str] = Body(
         ...,
@@ -142,26 +332,64 @@ async def year_2023_day_2_part_2(
     For each game, find the minimum set of cubes that must have been present.
     **What is the sum of the power of these sets?**
     """
-    powers = 0
+    return part_2(parse(document))
 
-    for line in document:
-        red = 0
-        green = 0
-        blue = 0
 
-        _, ball_text = line.split(": ")
+@router.post("/both")
+@solver()
+async def year_2023_day_2_both(
+    document: list[str] = Body(
+        ...,
+        embed=True,
+        examples=[DOCUMENT_EXAMPLE],
+    ),
+    red: int = Body(..., embed=True),
+    green: int = Body(..., embed=True),
+    blue: int = Body(..., embed=True),
+) -> dict[str, int]:
+    """Both parts, parsing the document once."""
+    games = parse(document)
+
+    return {"part_1": part_1(games, red, green, blue), "part_2": part_2(games)}
 
-        for scores in ball_text.split(";"):
-            for score in scores.split(", "):
-                if "red" in score:
-                    red = max(red, int(score.replace(" red", "")))
 
-                if "green" in score:
-                    green = max(green, int(score.replace(" green", "")))
+@router.post("/part-1/bags")
+@solver()
+async def year_2023_day_2_part_1_bags(
+    document: list[str] = Body(
+        ...,
+        embed=True,
+        examples=[DOCUMENT_EXAMPLE],
+    ),
+    bags: list[tuple[int, int, int]] = Body(
+        ...,
+        embed=True,
+        description="Each bag's red, green and blue cubes",
+        examples=[[[12, 13, 14], [20, 20, 20]]],
+    ),
+) -> list[int]:
+    """
+    Part 1 for every bag at once, the total of the possible games' numbers for each in order.
+    The document's parsed once, however many bags there are.
+    """
+    totals = possible_totals(
+        parse_columns(document), np.array(bags, dtype=np.int64).reshape(-1, 3)
+    )
 
-                if "blue" in score:
-                    blue = max(blue, int(score.replace(" blue", "")))
+    return totals.tolist()
 
-        powers += red * green * blue
 
-    return powers
+@router.post("/part-1/stream", openapi_extra=OPENAPI_EXTRA)
+@streaming()
+async def year_2023_day_2_part_1_stream(
+    lines: Iterator[str], red: int, green: int, blue: int
+) -> int:
+    """Part 1, solved a line at a time as the document's uploaded."""
+    return part_1(games(lines), red, green, blue)
+
+
+@router.post("/part-2/stream", openapi_extra=OPENAPI_EXTRA)
+@streaming()
+async def year_2023_day_2_part_2_stream(lines: Iterator[str]) -> int:
+    """Part 2, solved a line at a time as the document's uploaded."""
+    return part_2(games(lines))
@@ -1,11 +1,16 @@
 import abc
 import math
+from copy import deepcopy
 from dataclasses import dataclass, field
 from typing import Literal
 
 from fastapi import APIRouter, Body
 
-router = APIRouter(tags=["2023 - Day 20: Title"])
+from src.cache import parser
+from src.executor import solver
+from src.ingest import DocumentRoute
+
+router = APIRouter(tags=["2023 - Day 20: Title"], route_class=DocumentRoute)
 
 
 DOCUMENT_EXAMPLE = []
@@ -113,14 +118,9 @@ class Conjunction(BaseModule):
         ]
 
 
-@router.post("/part-1")
-async def year_2023_day_20_part_1(
-    document: list[str] = Body(
-        ...,
-        embed=True,
-        examples=[DOCUMENT_EXAMPLE],
-    ),
-) -> int:
+@parser
+def parse(document: list[str]) -> dict[str, BaseModule]:
+    """The modules by key, wired up and in their initial state."""
     module_map: dict[str, BaseModule] = {}
     conjunctions: set[str] = set()
 
@@ -155,6 +155,13 @@ async def year_2023_day_20_part_1(
                 assert isinstance(conjunction_module, Conjunction)
                 conjunction_module.add_input(key)
 
+    return module_map
+
+
+def part_1(modules: dict[str, BaseModule]) -> int:
+    # Pushing the button changes the modules' state, so work on a copy
+    module_map = deepcopy(modules)
+
     # Get the initial output state of all modules
     initial_state: dict[str, State] = {}
 
@@ -205,47 +212,8 @@ async def year_2023_day_20_part_1(
     return (pulses["Low"] * button_cycles * pulses["High"]) * button_cycles
 
 
-@router.post("/part-2")
-async def year_2023_day_20_part_2(
-    document: list[str] = Body(
-        ...,
-        embed=True,
-        examples=[DOCUMENT_EXAMPLE],
-    ),
-) -> int:
-    module_map: dict[str, BaseModule] = {}
-    conjunctions: set[str] = set()
-
-    # Parse inputs to a "module map"
-    # Also pull out the conjunction keys
-    for line in document:
-        key, output = line.split(" -> ")
-        outputs = [value.strip() for value in output.split(",")]
-
-        if key == "broadcaster":
-            module_map[key] = Broadcast(key=key, next_modules=outputs)
-
-        elif key.startswith("%"):
-            key = key.replace("%", "")
-            module_map[key] = FlipFlop(key=key, next_modules=outputs)
-
-        elif key.startswith("&"):
-            key = key.replace("&", "")
-            module_map[key] = Conjunction(key=key, next_modules=outputs)
-            conjunctions.add(key)
-
-        else:
-            raise ValueError
-
-    # Run through all modules
-    # If they have any conjunctions, update said conjunction
-    for key, module in module_map.items():
-        for next_module in module.next_modules:
-            if next_module in conjunctions:
-                # Add to module inputs
-                conjunction_module = module_map[next_module]
-                assert isinstance(conjunction_module, Conjunction)
-                conjunction_module.add_input(key)
+def part_2(modules: dict[str, BaseModule]) -> int:
+    module_map = deepcopy(modules)
 
     # Get the initial output state of all modules
     initial_state: dict[str, State] = {}
@@ -293,3 +261,42 @@ async def year_2023_day_20_part_2(
             break
 
     return math.lcm(*triggers.values())
+
+
+@router.post("/part-1")
+@solver()
+async def year_2023_day_20_part_1(
+    document: list[str] = Body(
+        ...,
+        embed=True,
+        examples=[DOCUMENT_EXAMPLE],
+    ),
+) -> int:
+    return part_1(parse(document))
+
+
+@router.post("/part-2")
+@solver(offload=True)
+async def year_2023_day_20_part_2(
+    document: list[str] = Body(
+        ...,
+        embed=True,
+        examples=[DOCUMENT_EXAMPLE],
+    ),
+) -> int:
+    return part_2(parse(document))
+
+
+@router.post("/both")
+@solver(offload=True)
+async def year_2023_day_20_both(
+    document: list[str] = Body(
+        ...,
+        embed=True,
+        examples=[DOCUMENT_EXAMPLE],
+    ),
+) -> dict[str, int]:
+    """Both parts, parsing the document once."""
+    modules = parse(document)
+
+    return {"part_1": part_1(modules), "part_2": part_2(modules)}
@@ -1,48 +1,87 @@
 from dataclasses import dataclass, field
-from functools import cache
 
 from fastapi import APIRouter, Body
 
-router = APIRouter(tags=["2023 - Day 21: Title"])
+from src.cache import memo_scope, memoize, parser
+from src.executor import solver
+from src.ingest import DocumentRoute
+from src.utils import DOWN, LEFT, RIGHT, UP, Grid2D
+
+router = APIRouter(tags=["2023 - Day 21: Title"], route_class=DocumentRoute)
 
 
 DOCUMENT_EXAMPLE = []
 
 
-OFFSETS: list[tuple[int, int]] = [
-    (0, 1),
-    (0, -1),
-    (1, 0),
-    (-1, 0),
-]
+# The order neighbours are searched in
+SEARCH_DIRECTIONS: list[int] = [DOWN, UP, RIGHT, LEFT]
+
+ROCK = ord("#")
 
 
 @dataclass(frozen=True)
-class Coordinate:
-    x: int
-    y: int
+class Garden:
+    grid: Grid2D
+    start: int
+
+
+@parser
+def parse(document: list[str]) -> Garden:
+    """The garden plots and rocks, and the starting position."""
+    grid = Grid2D.from_lines(document)
+    start = grid.find("S")
+
+    assert start >= 0
+
+    return Garden(grid=grid, start=start)
+
+
+# Compared (and memoized) by identity, each search is its own
+@dataclass(eq=False)
+class Search:
+    garden: Garden
+    visited_plots: dict[int, int] = field(default_factory=dict)
+
+
+@memoize(scoped=True)
+def count_steps(search: Search, position: int, remaining_steps: int) -> None:
+    if remaining_steps == 0:
+        return
+
+    cells = search.garden.grid.cells
+    links = search.garden.grid.links
+    visited_plots = search.visited_plots
+
+    for direction in SEARCH_DIRECTIONS:
+        new_position = links[4 * position + direction]
+
+        # Off the edge of the map, or a rock
+        if new_position < 0 or cells[new_position] == ROCK:
+            continue
+
+        if (
+            new_position in visited_plots
+            and visited_plots[new_position] > remaining_steps
+        ):
+            continue
 
-    def __repr__(self) -> str:
-        return f"x: {self.x}, y: {self.y}"
+        if remaining_steps % 2 == 0:
+            visited_plots[new_position] = remaining_steps
 
+        count_steps(search, new_position, remaining_steps - 1)
 
-@dataclass
-class Grid:
-    grid: dict[Coordinate, str] = field(default_factory=dict)
-    max_x: int = 0
-    max_y: int = 0
 
-    def add(self, coordinate: Coordinate, value: str) -> None:
-        self.max_x = max(self.max_x, coordinate.x)
-        self.max_y = max(self.max_y, coordinate.y)
+def part_1(garden: Garden, steps: int) -> int:
+    search = Search(garden=garden)
 
-        self.grid[coordinate] = value
+    with memo_scope():
+        count_steps(search, garden.start, steps + 1)
 
-    def get(self, coordinate: Coordinate, default=None) -> str | None:
-        return self.grid.get(coordinate, default)
+    return len(search.visited_plots)
 
 
 @router.post("/part-1")
+@solver(offload=True)
 async def year_2023_day_21_part_1(
     document: list[str] = Body(
         ...,
@@ -55,44 +94,4 @@ async def year_2023_day_21_part_1(
         examples=[6],
     ),
 ) -> int:
-    start: Coordinate | None = None
-    grid = Grid()
-
-    for y_index, line in enumerate(document):
-        for x_index, character in enumerate(line):
-            coordinate = Coordinate(x=x_index, y=y_index)
-
-            if character == "S":
-                start = coordinate
-
-            grid.add(coordinate, character)
-
-    assert start is not None
-
-    visited_plots: dict[Coordinate, int] = {}
-
-    @cache
-    def count_steps(*, position: Coordinate, remaining_steps: int) -> None:
-        if remaining_steps == 0:
-            return
-
-        for x_offset, y_offset in OFFSETS:
-            new_position = Coordinate(x=position.x + x_offset, y=position.y + y_offset)
-
-            if grid.get(new_position, "#") == "#":
-                continue
-
-            if (
-                new_position in visited_plots
-                and visited_plots[new_position] > remaining_steps
-            ):
-                continue
-
-            if remaining_steps % 2 == 0:
-                visited_plots[new_position] = remaining_steps
-
-            count_steps(position=new_position, remaining_steps=remaining_steps - 1)
-
-    count_steps(position=start, remaining_steps=steps + 1)
-
-    return len(visited_plots)
+    return part_1(parse(document), steps)
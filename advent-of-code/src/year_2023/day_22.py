@@ -1,11 +1,17 @@
 import bisect
+import heapq
 import uuid
 from copy import deepcopy
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 
 from fastapi import APIRouter, Body
 
-router = APIRouter(tags=["2023 - Day 22: Title"])
+from src import engines, progress
+from src.cache import parser
+from src.executor import solver
+from src.ingest import DocumentRoute
+
+router = APIRouter(tags=["2023 - Day 22: Title"], route_class=DocumentRoute)
 
 
 DOCUMENT_EXAMPLE = []
@@ -167,14 +173,19 @@ class CubeGrid:
         return len(self.bricks) - len(self.cannot_disintegrate)
 
 
-@router.post("/part-1")
-async def year_2023_day_22_part_1(
-    document: list[str] = Body(
-        ...,
-        embed=True,
-        examples=[DOCUMENT_EXAMPLE],
-    ),
-) -> int:
+@dataclass(frozen=True)
+class Supports:
+    """Which settled bricks rest on which, by the bricks' index from the lowest up."""
+
+    # The bricks resting on each brick, and those each brick rests on
+    above: list[set[int]]
+    below: list[set[int]]
+
+
+@engines.dispatch
+@parser
+def parse(document: list[str]) -> CubeGrid:
+    """The bricks, settled once they've all fallen."""
     grid = CubeGrid()
 
     for index, line in enumerate(document):
@@ -190,41 +201,155 @@ async def year_2023_day_22_part_1(
 
     grid.compact()
 
-    return grid.count_bricks_can_disintegrate()
+    return grid
 
 
-@router.post("/part-2")
-async def year_2023_day_22_part_2(
-    document: list[str] = Body(
-        ...,
-        embed=True,
-        examples=[DOCUMENT_EXAMPLE],
-    ),
-) -> int:
-    grid = CubeGrid()
+@parse.register("fast")
+@parser
+def parse_supports(document: list[str]) -> Supports:
+    """
+    The bricks settled in one pass from the lowest up, each landing on the highest of the bricks
+    already settled under it, found from the height (and top brick) of every column.
+    """
+    bricks = []
 
-    for index, line in enumerate(document):
+    for line in document:
         first, second = line.split("~")
+        start = [int(value) for value in first.split(",")]
+        end = [int(value) for value in second.split(",")]
+
+        bricks.append(
+            (
+                min(start[2], end[2]),
+                abs(end[2] - start[2]),
+                [
+                    (x, y)
+                    for x in range(min(start[0], end[0]), max(start[0], end[0]) + 1)
+                    for y in range(min(start[1], end[1]), max(start[1], end[1]) + 1)
+                ],
+            )
+        )
 
-        first_x, first_y, first_z = first.split(",")
-        second_x, second_y, second_z = second.split(",")
+    bricks.sort(key=lambda brick: brick[0])
 
-        start = BrickCoordinate(x=int(first_x), y=int(first_y), z=int(first_z))
-        end = BrickCoordinate(x=int(second_x), y=int(second_y), z=int(second_z))
+    # Column -> height of its top and the brick at the top
+    tops: dict[tuple[int, int], tuple[int, int]] = {}
+    supports = Supports(
+        above=[set() for _ in bricks],
+        below=[set() for _ in bricks],
+    )
 
-        grid.add(Brick(start=start, end=end))
+    for index, (_, height, columns) in enumerate(bricks):
+        top = max(tops.get(column, (0, -1))[0] for column in columns)
 
-    grid.compact()
+        for column in columns:
+            column_top, brick = tops.get(column, (0, -1))
+
+            if top > 0 and column_top == top:
+                supports.below[index].add(brick)
+                supports.above[brick].add(index)
+
+            tops[column] = (top + 1 + height, index)
+
+    return supports
+
+
+@engines.dispatch
+def part_1(tower: CubeGrid) -> int:
+    # Only the bricks that can't be disintegrated are tracked, on a fresh set
+    grid = replace(tower, cannot_disintegrate=set())
+
+    return grid.count_bricks_can_disintegrate()
+
+
+@part_1.register("fast")
+def part_1_fast(supports: Supports) -> int:
+    # A brick can go unless it's the only one holding up another
+    only_supports = {next(iter(below)) for below in supports.below if len(below) == 1}
+
+    return len(supports.below) - len(only_supports)
+
+
+@engines.dispatch
+def part_2(tower: CubeGrid) -> int:
+    grid = replace(tower, cannot_disintegrate=set())
     grid.count_bricks_can_disintegrate()
 
     # Get all the bricks that would cause other bricks to fall
     brick_ids = grid.cannot_disintegrate
     count = 0
 
-    for brick_id in brick_ids:
+    for index, brick_id in enumerate(brick_ids):
+        progress.report(bricks=index, total=len(brick_ids))
+
         new_grid = deepcopy(grid)
         new_grid.remove(brick_id)
         fall_count = new_grid.compact()
         count += fall_count
 
     return count
+
+
+@part_2.register("fast")
+def part_2_fast(supports: Supports) -> int:
+    count = 0
+
+    for removed in range(len(supports.below)):
+        progress.report(bricks=removed, total=len(supports.below))
+
+        # Bricks are settled lowest first, so everything under a brick is decided before it is
+        falling = {removed}
+        candidates = list(supports.above[removed])
+        heapq.heapify(candidates)
+
+        while candidates:
+            brick = heapq.heappop(candidates)
+
+            if brick not in falling and supports.below[brick] <= falling:
+                falling.add(brick)
+
+                for above in supports.above[brick]:
+                    heapq.heappush(candidates, above)
+
+        count += len(falling) - 1
+
+    return count
+
+
+@router.post("/part-1")
+@solver(offload=True)
+async def year_2023_day_22_part_1(
+    document: list[str] = Body(
+        ...,
+        embed=True,
+        examples=[DOCUMENT_EXAMPLE],
+    ),
+) -> int:
+    return part_1(parse(document))
+
+
+@router.post("/part-2")
+@solver(offload=True, cost="heavy")
+async def year_2023_day_22_part_2(
+    document: list[str] = Body(
+        ...,
+        embed=True,
+        examples=[DOCUMENT_EXAMPLE],
+    ),
+) -> int:
+    return part_2(parse(document))
+
+
+@router.post("/both")
+@solver(offload=True, cost="heavy")
+async def year_2023_day_22_both(
+    document: list[str] = Body(
+        ...,
+        embed=True,
+        examples=[DOCUMENT_EXAMPLE],
+    ),
+) -> dict[str, int]:
+    """Both parts, parsing the document once."""
+    tower = parse(document)
+
+    return {"part_1": part_1(tower), "part_2": part_2(tower)}
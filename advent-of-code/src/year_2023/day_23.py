@@ -1,112 +1,70 @@
-import math
 import sys
-import typing
 from dataclasses import dataclass, field
-from functools import cached_property
-from typing import Literal
 
 from fastapi import APIRouter, Body
 
+from src import progress
+from src.cache import parser
+from src.executor import solver
+from src.ingest import DocumentRoute
+from src.utils import DOWN, LEFT, RIGHT, UP, Grid2D
+
 sys.setrecursionlimit(5_000)
 
-router = APIRouter(tags=["2023 - Day 23: Title"])
+router = APIRouter(tags=["2023 - Day 23: Title"], route_class=DocumentRoute)
 
 
 DOCUMENT_EXAMPLE = []
 
 
-TILE = Literal[".", ">", "<", "^", "v"]
-TILES: set[TILE] = set(typing.get_args(TILE))
+FOREST = ord("#")
 
+# Slopes can only be walked down
+SLOPES: dict[int, int] = {
+    ord(">"): RIGHT,
+    ord("<"): LEFT,
+    ord("v"): DOWN,
+    ord("^"): UP,
+}
 
-@dataclass(frozen=True)
-class Coordinate:
-    x: int
-    y: int
+# The slopes aren't slippery after all
+DRY = bytes.maketrans(b"><v^", b"....")
 
-    @cached_property
-    def distance(self) -> float:
-        return math.sqrt(self.x**2 + self.y**2)
 
-    def __lt__(self, other: "Coordinate") -> bool:
-        return self.distance < other.distance
+@dataclass
+class Trails:
+    grid: Grid2D
 
-    def __repr__(self) -> str:
-        return f"({self.x}, {self.y})"
+    start: int = 1
+    end: int = 1
 
+    intersections: set[int] = field(default_factory=set)
+    intersection_edges: dict[int, dict[int, set[int]]] = field(default_factory=dict)
 
-@dataclass
-class Grid:
-    start: Coordinate = field(default_factory=lambda: Coordinate(x=1, y=0))
-    end: Coordinate = field(default_factory=lambda: Coordinate(x=1, y=0))
-
-    grid: dict[Coordinate, TILE] = field(default_factory=dict)
-
-    intersections: set[Coordinate] = field(default_factory=set)
-    intersection_edges: dict[Coordinate, dict[Coordinate, set[Coordinate]]] = field(
-        default_factory=dict
-    )
-
-    longest_intersections: set[Coordinate] = field(default_factory=set)
-    longest_full_path: set[Coordinate] = field(default_factory=set)
-
-    def add(self, coordinate: Coordinate, tile: TILE) -> None:
-        # `end` is the largest y-coordinate in the grid
-        if coordinate.y > self.end.y:
-            self.end = coordinate
-
-        # Add to internal grid
-        self.grid[coordinate] = tile
-
-    def adjacent(self, coordinate: Coordinate) -> list[Coordinate]:
-        # Check right downhill
-        if self.grid[coordinate] == ">":
-            return [
-                Coordinate(
-                    x=coordinate.x + 1,
-                    y=coordinate.y,
-                )
-            ]
-
-        # Check left downhill
-        if self.grid[coordinate] == "<":
-            return [
-                Coordinate(
-                    x=coordinate.x - 1,
-                    y=coordinate.y,
-                )
-            ]
-
-        # Check down downhill
-        if self.grid[coordinate] == "v":
-            return [
-                Coordinate(
-                    x=coordinate.x,
-                    y=coordinate.y + 1,
-                )
-            ]
-
-        # Check up downhill
-        if self.grid[coordinate] == "^":
-            return [
-                Coordinate(
-                    x=coordinate.x,
-                    y=coordinate.y - 1,
-                )
-            ]
+    longest_intersections: set[int] = field(default_factory=set)
+    longest_full_path: set[int] = field(default_factory=set)
 
-        new_coordinates: list[Coordinate] = []
+    def __post_init__(self) -> None:
+        # `end` is the path tile in the last row
+        last_row = self.grid.height - 1
+        self.end = self.grid.index(self.grid.row(last_row).find(b"."), last_row)
 
-        for x_offset, y_offset in ((1, 0), (-1, 0), (0, 1), (0, -1)):
-            new_coordinate = Coordinate(
-                x=coordinate.x + x_offset,
-                y=coordinate.y + y_offset,
-            )
+    def adjacent(self, index: int) -> list[int]:
+        tile = self.grid.cells[index]
+
+        # Check downhill
+        if tile in SLOPES:
+            return [self.grid.step(index, SLOPES[tile])]
+
+        new_indexes: list[int] = []
+
+        for direction in (RIGHT, LEFT, DOWN, UP):
+            new_index = self.grid.step(index, direction)
 
-            if new_coordinate in self.grid:
-                new_coordinates.append(new_coordinate)
+            if new_index >= 0 and self.grid.cells[new_index] != FOREST:
+                new_indexes.append(new_index)
 
-        return new_coordinates
+        return new_indexes
 
     def find_intersections(self) -> None:
         # We'll consider the start and end intersections
@@ -115,15 +73,15 @@ class Grid:
         self.intersections.add(self.end)
 
         # Check for more than 2 adjacent nodes
-        for coordinate in self.grid.keys():
-            if len(self.adjacent(coordinate)) > 2:
-                self.intersections.add(coordinate)
+        for index, tile in enumerate(self.grid.cells):
+            if tile != FOREST and len(self.adjacent(index)) > 2:
+                self.intersections.add(index)
 
     def path_to_intersections(
         self,
-        start: Coordinate,
-        current: Coordinate,
-        path: set[Coordinate],
+        start: int,
+        current: int,
+        path: set[int],
     ) -> None:
         # Hit an intersection, end this path here
         if current in self.intersections:
@@ -142,10 +100,7 @@ class Grid:
                 self.path_to_intersections(start, adjacent, next_path)
 
     def build_intersection_edges(self) -> None:
-        sorted_intersections = list(self.intersections)
-        sorted_intersections.sort()
-
-        for intersection in sorted_intersections:
+        for intersection in sorted(self.intersections):
             for adjacent in self.adjacent(intersection):
                 self.path_to_intersections(
                     intersection, adjacent, {intersection, adjacent}
@@ -153,9 +108,9 @@ class Grid:
 
     def find_longest_path(
         self,
-        current: Coordinate,
-        unique_path: set[Coordinate],
-        full_path: set[Coordinate],
+        current: int,
+        unique_path: set[int],
+        full_path: set[int],
     ) -> None:
         # Base cases
         # Reached the end
@@ -164,6 +119,8 @@ class Grid:
                 self.longest_intersections = unique_path
                 self.longest_full_path = full_path
 
+                progress.report(longest=len(full_path) - 1)
+
             return
 
         # Dead end
@@ -185,46 +142,49 @@ class Grid:
             self.find_longest_path(next_node, next_unqiue_path, next_full_path)
 
     def show(self) -> None:
+        self.show_path(self.intersections)
+
+    def show_path(self, path: set[int]) -> None:
         print()
 
-        for y in range(self.start.y, self.end.y + 1):
-            line = "#"
+        for y, row in enumerate(self.grid.lines()):
+            print(
+                "".join(
+                    "\033[31mX\033[0m" if self.grid.index(x, y) in path else tile
+                    for x, tile in enumerate(row)
+                )
+            )
 
-            for x in range(self.start.x, self.end.x + 1):
-                coordinate = Coordinate(x=x, y=y)
-                tile = self.grid.get(coordinate, "#")
 
-                if coordinate in self.intersections:
-                    line += "\033[31mX\033[0m"
+@parser
+def parse(document: list[str]) -> Grid2D:
+    """The trail map, slopes included."""
+    return Grid2D.from_lines(document)
 
-                else:
-                    line += tile
 
-            line += "#"
-            print(line)
+def longest_hike(grid: Grid2D) -> int:
+    trails = Trails(grid)
 
-    def show_path(self, path: set[Coordinate]) -> None:
-        print()
+    trails.find_intersections()
+    trails.build_intersection_edges()
+    trails.find_longest_path(trails.start, {trails.start}, {trails.start})
+
+    # trails.show_path(trails.longest_full_path)
 
-        for y in range(self.start.y, self.end.y + 1):
-            line = "#"
+    return len(trails.longest_full_path) - 1
 
-            for x in range(self.start.x, self.end.x + 1):
-                coordinate = Coordinate(x=x, y=y)
-                tile = self.grid.get(coordinate, "#")
 
-                if coordinate in path:
-                    line += "\033[31mX\033[0m"
+def part_1(grid: Grid2D) -> int:
+    return longest_hike(grid)
 
-                else:
-                    line += tile
 
-            line += "#"
-            print(line)
+def part_2(grid: Grid2D) -> int:
+    return longest_hike(Grid2D(grid.cells.translate(DRY), grid.width))
 
 
 # Start at 10:50
 @router.post("/part-1")
+@solver(offload=True)
 async def year_2023_day_23_part_1(
     document: list[str] = Body(
         ...,
@@ -232,23 +192,11 @@ async def year_2023_day_23_part_1(
         examples=[DOCUMENT_EXAMPLE],
     ),
 ) -> int:
-    grid = Grid()
-
-    for y_index, line in enumerate(document):
-        for x_index, character in enumerate(line):
-            if character in TILES:
-                grid.add(Coordinate(x=x_index, y=y_index), character)
-
-    grid.find_intersections()
-    grid.build_intersection_edges()
-    grid.find_longest_path(grid.start, {grid.start}, {grid.start})
-
-    # grid.show_path(set(grid.longest_full_path))
-
-    return len(grid.longest_full_path) - 1
+    return part_1(parse(document))
 
 
 @router.post("/part-2")
+@solver(offload=True, cost="heavy")
 async def year_2023_day_23_part_2(
     document: list[str] = Body(
         ...,
@@ -256,17 +204,19 @@ async def year_2023_day_23_part_2(
         examples=[DOCUMENT_EXAMPLE],
     ),
 ) -> int:
-    grid = Grid()
-
-    for y_index, line in enumerate(document):
-        for x_index, character in enumerate(line):
-            if character in TILES:
-                grid.add(Coordinate(x=x_index, y=y_index), ".")
+    return part_2(parse(document))
 
-    grid.find_intersections()
-    grid.build_intersection_edges()
-    grid.find_longest_path(grid.start, {grid.start}, {grid.start})
 
-    # grid.show_path(set(grid.longest_full_path))
+@router.post("/both")
+@solver(offload=True, cost="heavy")
+async def year_2023_day_23_both(
+    document: list[str] = Body(
+        ...,
+        embed=True,
+        examples=[DOCUMENT_EXAMPLE],
+    ),
+) -> dict[str, int]:
+    """Both parts, parsing the document once."""
+    grid = parse(document)
 
-    return len(grid.longest_full_path) - 1
+    return {"part_1": part_1(grid), "part_2": part_2(grid)}
@@ -5,7 +5,11 @@ from dataclasses import dataclass, field
 import z3
 from fastapi import APIRouter, Body
 
-router = APIRouter(tags=["2023 - Day 24: Title"])
+from src.cache import parser
+from src.executor import solver
+from src.ingest import DocumentRoute
+
+router = APIRouter(tags=["2023 - Day 24: Title"], route_class=DocumentRoute)
 
 
 DOCUMENT_EXAMPLE = []
@@ -72,24 +76,9 @@ class Hailstone:
         return f"{self.id} | ({self.start}, {self.velocity})"
 
 
-@router.post("/part-1")
-async def year_2023_day_24_part_1(
-    document: list[str] = Body(
-        ...,
-        embed=True,
-        examples=[DOCUMENT_EXAMPLE],
-    ),
-    lower: int = Body(
-        ...,
-        embed=True,
-        examples=[7],
-    ),
-    upper: int = Body(
-        ...,
-        embed=True,
-        examples=[27],
-    ),
-) -> int:
+@parser
+def parse(document: list[str]) -> tuple[Hailstone, ...]:
+    """Each hailstone's position and velocity."""
     hailstones: list[Hailstone] = []
 
     for index, line in enumerate(document):
@@ -110,6 +99,10 @@ async def year_2023_day_24_part_1(
             ),
         )
 
+    return tuple(hailstones)
+
+
+def part_1(hailstones: tuple[Hailstone, ...], lower: int, upper: int) -> int:
     collisions = 0
 
     for start in range(len(hailstones) - 1):
@@ -130,34 +123,7 @@ async def year_2023_day_24_part_1(
     return collisions
 
 
-@router.post("/part-2")
-async def year_2023_day_24_part_2(
-    document: list[str] = Body(
-        ...,
-        embed=True,
-        examples=[DOCUMENT_EXAMPLE],
-    ),
-) -> int:
-    hailstones: list[Hailstone] = []
-
-    for index, line in enumerate(document):
-        line = re.sub(" +", " ", line)
-        px, py, pz, _, vx, vy, vz = line.replace(",", "").split(" ")
-        hailstones.append(
-            Hailstone(
-                start=Coordinate(
-                    x=int(px),
-                    y=int(py),
-                    z=int(pz),
-                ),
-                velocity=Velocity(
-                    x=int(vx),
-                    y=int(vy),
-                    z=int(vz),
-                ),
-            ),
-        )
-
+def part_2(hailstones: tuple[Hailstone, ...]) -> int:
     solver = z3.Solver()
 
     px = z3.Real("px")
@@ -192,3 +158,65 @@ async def year_2023_day_24_part_2(
     z = model.eval(pz).as_long()
 
     return x + y + z
+
+
+@router.post("/part-1")
+@solver(offload=True)
+async def year_2023_day_24_part_1(
+    document: list[str] = Body(
+        ...,
+        embed=True,
+        examples=[DOCUMENT_EXAMPLE],
+    ),
+    lower: int = Body(
+        ...,
+        embed=True,
+        examples=[7],
+    ),
+    upper: int = Body(
+        ...,
+        embed=True,
+        examples=[27],
+    ),
+) -> int:
+    return part_1(parse(document), lower, upper)
+
+
+@router.post("/part-2")
+@solver(offload=True, cost="heavy")
+async def year_2023_day_24_part_2(
+    document: list[str] = Body(
+        ...,
+        embed=True,
+        examples=[DOCUMENT_EXAMPLE],
+    ),
+) -> int:
+    return part_2(parse(document))
+
+
+@router.post("/both")
+@solver(offload=True, cost="heavy")
+async def year_2023_day_24_both(
+    document: list[str] = Body(
+        ...,
+        embed=True,
+        examples=[DOCUMENT_EXAMPLE],
+    ),
+    lower: int = Body(
+        ...,
+        embed=True,
+        examples=[7],
+    ),
+    upper: int = Body(
+        ...,
+        embed=True,
+        examples=[27],
+    ),
+) -> dict[str, int]:
+    """Both parts, parsing the document once."""
+    hailstones = parse(document)
+
+    return {
+        "part_1": part_1(hailstones, lower, upper),
+        "part_2": part_2(hailstones),
+    }
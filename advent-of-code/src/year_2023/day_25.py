@@ -1,13 +1,17 @@
 import networkx as nx
 from fastapi import APIRouter, Body
 
-router = APIRouter(tags=["2023 - Day 25: Title"])
+from src.executor import solver
+from src.ingest import DocumentRoute
+
+router = APIRouter(tags=["2023 - Day 25: Title"], route_class=DocumentRoute)
 
 
 DOCUMENT_EXAMPLE = []
 
 
 @router.post("/part-1")
+@solver(offload=True, cost="heavy")
 async def year_2023_day_25_part_1(
     document: list[str] = Body(
         ...,
@@ -1,6 +1,19 @@
+import re
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Iterable, Iterator
+
+import numpy as np
 from fastapi import APIRouter, Body
 
-router = APIRouter(tags=["2023 - Day 3: Gear Ratios"])
+from src import engines
+from src.cache import parser
+from src.executor import solver
+from src.ingest import DocumentRoute
+from src.streaming import OPENAPI_EXTRA, streaming
+from src.utils import ascii_digits, digit_values
+
+router = APIRouter(tags=["2023 - Day 3: Gear Ratios"], route_class=DocumentRoute)
 
 
 DOCUMENT_EXAMPLE = [
@@ -16,63 +29,62 @@ DOCUMENT_EXAMPLE = [
     ".664.598..",
 ]
 
+NUMBER = re.compile(r"\d+")
+SYMBOL = re.compile(r"[^\d.]")
+GEAR = re.compile(r"\*")
 
-@router.post("/part-1")
-async def year_2023_day_3_part_1(
-    document: list[str] = Body(
-        ...,
-        embed=True,
-        examples=[DOCUMENT_EXAMPLE],
-    ),
-) -> int:
-    """
-    You and the Elf eventually reach a gondola lift station; he says the gondola lift will take you up to the **water source**, but this is as far as he can bring you.
-    You go inside.
 
-    It doesn't take long to find the gondolas, but there seems to be a problem: they're not moving.
+@dataclass(frozen=True)
+class Schematic:
+    # Part numbers by index, and the index of the number covering each coordinate
+    number_index: dict[int, int]
+    number_map: dict[tuple[int, int], int]
+    # Symbols by coordinate
+    symbol_coordinates: dict[tuple[int, int], str]
 
-    "Aaah!"
 
-    You turn around to see a slightly-greasy Elf with a wrench and a look of surprise.
-    "Sorry, I wasn't expecting anyone! The gondola lift isn't working right now; it'll still be a while before I can fix it."
-    You offer to help.
+@dataclass(frozen=True)
+class LabelledSchematic:
+    # The index of the number covering each cell (-1 for none), and each number's value
+    labels: np.ndarray
+    values: np.ndarray
+    # Cells holding a symbol, and a gear (`*`) in particular
+    symbols: np.ndarray
+    gears: np.ndarray
 
-    The engineer explains that an engine part seems to be missing from the engine, but nobody can figure out which one.
-    If you can **add up all the part numbers** in the engine schematic, it should be easy to work out which part is missing.
 
-    The engine schematic (your puzzle input) consists of a visual representation of the engine.
-    There are lots of numbers and symbols you don't really understand, but apparently **any number adjacent to a symbol**, even diagonally, is a "part number" and should be included in your sum.
-    (Periods (.) do not count as a symbol.)
+@dataclass(frozen=True)
+class Row:
+    text: str
+    # Each number's first column, the column after its last, and its value, left to right
+    numbers: list[tuple[int, int, int]]
 
-    Here is an example engine schematic:
+    @classmethod
+    def read(cls, line: str) -> "Row":
+        text = line.strip()
 
-    ```
-    467..114..
-    ...*......
-    ..35..633.
-    ......#...
-    617*......
-    .....+.58.
-    ..592.....
-    ......755.
-    ...$.*....
-    .664.598..
-    ```
+        return cls(
+            text=text,
+            numbers=[
+                (match.start(), match.end(), int(match.group()))
+                for match in NUMBER.finditer(text)
+            ],
+        )
 
-    In this schematic, two numbers are **not** part numbers because they are not adjacent to a symbol: `114` (top right) and `58` (middle right).
-    Every other number is adjacent to a symbol and so is a part number; their sum is **`4361`**.
 
-    Of course, the actual engine schematic is much larger.
-    **What is the sum of all of the part numbers in the engine schematic?**
-    """
-    total = 0
+EMPTY_ROW = Row(text="", numbers=[])
+
 
+@engines.dispatch
+@parser
+def parse(document: list[str]) -> Schematic:
+    """The schematic's numbers and symbols, by coordinate."""
     number_index: dict[int, int] = {}
     number_counter = 0
 
     number_map: dict[tuple[int, int], int] = {}
 
-    symbol_coordinates: set[tuple[int, int]] = set()
+    symbol_coordinates: dict[tuple[int, int], str] = {}
 
     for line_index, line in enumerate(document):
         character_indexes: list[int] = []
@@ -95,7 +107,7 @@ async def year_2023_day_3_part_1(
                 character_indexes = []
 
             else:
-                symbol_coordinates.add((line_index, character_index))
+                symbol_coordinates[(line_index, character_index)] = character
 
                 if running_number:
                     for inner_character_index in character_indexes:
@@ -114,12 +126,85 @@ async def year_2023_day_3_part_1(
             number_index[number_counter] = int(running_number)
             number_counter += 1
 
+    return Schematic(
+        number_index=number_index,
+        number_map=number_map,
+        symbol_coordinates=symbol_coordinates,
+    )
+
+
+def dilate(mask: np.ndarray) -> np.ndarray:
+    """The cells within a step (diagonals too) of any cell in `mask`, a 3x3 convolution of it."""
+    padded = np.pad(mask, 1)
+    height, width = mask.shape
+    dilated = np.zeros_like(mask)
+
+    for y in range(3):
+        for x in range(3):
+            dilated |= padded[y : y + height, x : x + width]
+
+    return dilated
+
+
+def around(cells: np.ndarray, where: np.ndarray, fill: int) -> np.ndarray:
+    """The 3x3 neighbourhood (itself included) of each cell in `where`, one per row, `fill` outside the grid."""
+    padded = np.pad(cells, 1, constant_values=fill)
+    ys, xs = np.nonzero(where)
+
+    return np.stack(
+        [padded[ys + y, xs + x] for y in range(3) for x in range(3)],
+        axis=-1,
+    )
+
+
+@parse.register("numpy")
+@parser
+def parse_labelled(document: list[str]) -> LabelledSchematic:
+    """
+    The schematic as arrays, with every number's cells labelled in one pass over the grid.
+    Only ASCII digits count as digits, anything else but `.` is a symbol.
+    """
+    lines = [line.strip() for line in document]
+    width = max(map(len, lines), default=0)
+
+    # Ragged lines are padded out with empty space
+    cells = np.frombuffer(
+        "".join(line.ljust(width, ".") for line in lines).encode("ascii", "replace"),
+        dtype=np.uint8,
+    ).reshape(len(lines), width)
+
+    digits, is_digit = ascii_digits(cells)
+
+    # A number starts at a digit without one before it on its line
+    starts = is_digit.copy()
+    starts[:, 1:] &= ~is_digit[:, :-1]
+
+    # Row by row, every digit is part of the last number to start
+    labels = np.where(is_digit, np.cumsum(starts).reshape(cells.shape) - 1, -1)
+
+    positions = np.flatnonzero(is_digit)
+    number_starts = np.flatnonzero(starts)
+    lengths = np.bincount(labels.ravel()[positions], minlength=len(number_starts))
+    values = digit_values(digits.ravel(), number_starts, number_starts + lengths)
+
+    return LabelledSchematic(
+        labels=labels,
+        values=values,
+        symbols=~is_digit & (cells != ord(".")),
+        gears=cells == ord("*"),
+    )
+
+
+@engines.dispatch
+def part_1(schematic: Schematic) -> int:
+    total = 0
+
     # Iterate over the number map
     # Check for any coordinates next to/diagnol from the the coordinate
     found_indexes: set[int] = set()
 
-    for coordinate, index in number_map.items():
-        number = number_index[index]
+    for coordinate, index in schematic.number_map.items():
+        number = schematic.number_index[index]
 
         for x in [-1, 0, 1]:
             if index in found_indexes:
@@ -132,14 +217,178 @@ async def year_2023_day_3_part_1(
                 new_coordinate = (coordinate[0] + y, coordinate[1] + x)
 
                 # Next to symbol
-                if new_coordinate in symbol_coordinates:
+                if new_coordinate in schematic.symbol_coordinates:
                     found_indexes.add(index)
                     total += number
 
     return total
 
 
+@part_1.register("numpy")
+def part_1_numpy(schematic: LabelledSchematic) -> int:
+    # Cells next to a symbol, the symbol mask dilated by a 3x3 square
+    near_symbol = dilate(schematic.symbols)
+
+    is_part = np.zeros(len(schematic.values), dtype=bool)
+    is_part[schematic.labels[near_symbol & (schematic.labels >= 0)]] = True
+
+    return int(schematic.values[is_part].sum())
+
+
+@engines.dispatch
+def part_2(schematic: Schematic) -> int:
+    total = 0
+
+    # Check for gears
+    for coordinate, symbol in schematic.symbol_coordinates.items():
+        if symbol != "*":
+            continue
+
+        gear_indexes: set[int] = set()
+
+        for x in [-1, 0, 1]:
+            for y in [-1, 0, 1]:
+                new_coordinate = (coordinate[0] + y, coordinate[1] + x)
+
+                if new_coordinate in schematic.number_map:
+                    gear_indexes.add(schematic.number_map[new_coordinate])
+
+        if len(gear_indexes) == 2:
+            first = gear_indexes.pop()
+            second = gear_indexes.pop()
+
+            # Add to total
+            total += schematic.number_index[first] * schematic.number_index[second]
+
+    return total
+
+
+@part_2.register("numpy")
+def part_2_numpy(schematic: LabelledSchematic) -> int:
+    # The numbers around each gear, sorted so the same number's cells are next to each other
+    numbers = np.sort(around(schematic.labels, schematic.gears, -1), axis=-1)
+
+    # Each number counted at its first cell
+    firsts = np.ones(numbers.shape, dtype=bool)
+    firsts[:, 1:] = numbers[:, 1:] != numbers[:, :-1]
+    counts = (firsts & (numbers >= 0)).sum(axis=-1)
+
+    # With exactly two numbers, they're the largest label and the smallest besides -1
+    pairs = numbers[counts == 2]
+    largest = pairs[:, -1]
+    smallest = np.where(pairs >= 0, pairs, largest[:, None]).min(axis=-1)
+
+    return int((schematic.values[largest] * schematic.values[smallest]).sum())
+
+
+def rows(lines: Iterable[str]) -> Iterator[tuple[Row, Row, Row]]:
+    """
+    Each row with the ones above and below it (empty past the edges), as soon as the one below is read.
+    Only those three rows are ever kept, so memory grows with the schematic's width but not its height.
+    """
+    above, current = EMPTY_ROW, None
+
+    for line in lines:
+        below = Row.read(line)
+
+        if current is not None:
+            yield above, current, below
+            above = current
+
+        current = below
+
+    if current is not None:
+        yield above, current, EMPTY_ROW
+
+
+def part_numbers(lines: Iterable[str]) -> Iterator[int]:
+    """The part numbers, row by row, a row's as soon as the one below it is read."""
+    for window in rows(lines):
+        _, current, _ = window
+
+        for start, end, value in current.numbers:
+            # Any symbol in the columns from before the number to after it, in any of the three rows
+            if any(
+                SYMBOL.search(row.text, max(start - 1, 0), end + 1) for row in window
+            ):
+                yield value
+
+
+def gear_ratios(lines: Iterable[str]) -> Iterator[int]:
+    """The gear ratios, row by row, a row's as soon as the one below it is read."""
+    for window in rows(lines):
+        _, current, _ = window
+
+        for match in GEAR.finditer(current.text):
+            column = match.start()
+            adjacent: list[int] = []
+
+            for row in window:
+                # Numbers don't overlap, so the ones ending at the gear's column or later are in order
+                index = bisect_left(row.numbers, column, key=lambda number: number[1])
+
+                while index < len(row.numbers) and row.numbers[index][0] <= column + 1:
+                    adjacent.append(row.numbers[index][2])
+                    index += 1
+
+            if len(adjacent) == 2:
+                yield adjacent[0] * adjacent[1]
+
+
+@router.post("/part-1")
+@solver()
+async def year_2023_day_3_part_1(
+    document: list[str] = Body(
+        ...,
+        embed=True,
+        examples=[DOCUMENT_EXAMPLE],
+    ),
+) -> int:
+    """
+    You and the Elf eventually reach a gondola lift station; he says the gondola lift will take you up to the **water source**, but this is as far as he can bring you.
+    You go inside.
+
+    It doesn't take long to find the gondolas, but there seems to be a problem: they're not moving.
+
+    "Aaah!"
+
+    You turn around to see a slightly-greasy Elf with a wrench and a look of surprise.
+    "Sorry, I wasn't expecting anyone! The gondola lift isn't working right now; it'll still be a while before I can fix it."
+    You offer to help.
+
+    The engineer explains that an engine part seems to be missing from the engine, but nobody can figure out which one.
+    If you can **add up all the part numbers** in the engine schematic, it should be easy to work out which part is missing.
+
+    The engine schematic (your puzzle input) consists of a visual representation of the engine.
+    There are lots of numbers and symbols you don't really understand, but apparently **any number adjacent to a symbol**, even diagonally, is a "part number" and should be included in your sum.
+    (Periods (.) do not count as a symbol.)
+
+    Here is an example engine schematic:
+
+    ```
+    467..114..
+    ...*......
+    ..35..633.
+    ......#...
+    617*......
+    .....+.58.
+    ..592.....
+    ......755.
+    ...$.*....
+    .664.598..
+    ```
+
+    In this schematic, two numbers are **not** part numbers because they are not adjacent to a symbol: `114` (top right) and `58` (middle right).
+    Every other number is adjacent to a symbol and so is a part number; their sum is **`4361`**.
+
+    Of course, the actual engine schematic is much larger.
+    **What is the sum of all of the part numbers in the engine schematic?**
+    """
+    return part_1(parse(document))
+
+
 @router.post("/part-2")
+@solver()
 async def year_2023_day_3_part_2(
     document: list[str] = Body(
         ...,
@@ -189,83 +438,33 @@ async def year_2023_day_3_part_2(
 
     **What is the sum of all of the gear ratios in your engine schematic?**
     """
-    total = 0
-
-    number_index: dict[int, int] = {}
-    number_counter = 0
-
-    number_map: dict[tuple[int, int], int] = {}
+    return part_2(parse(document))
 
-    symbol_coordinates: dict[tuple[int, int], bool] = {}
 
-    for line_index, line in enumerate(document):
-        character_indexes: list[int] = []
-        running_number = ""
-
-        for character_index, character in enumerate(line.strip()):
-            if character.isnumeric():
-                character_indexes.append(character_index)
-                running_number += character
-
-            elif character == ".":
-                if running_number:
-                    for inner_character_index in character_indexes:
-                        number_map[(line_index, inner_character_index)] = number_counter
-
-                    number_index[number_counter] = int(running_number)
-                    number_counter += 1
-
-                running_number = ""
-                character_indexes = []
-
-            else:
-                if character == "*":
-                    symbol_coordinates[(line_index, character_index)] = True
-                else:
-                    symbol_coordinates[(line_index, character_index)] = False
-
-                if running_number:
-                    for inner_character_index in character_indexes:
-                        number_map[(line_index, inner_character_index)] = number_counter
-
-                    number_index[number_counter] = int(running_number)
-                    number_counter += 1
-
-                running_number = ""
-                character_indexes = []
-
-        if running_number:
-            for inner_character_index in character_indexes:
-                number_map[(line_index, inner_character_index)] = number_counter
-
-            number_index[number_counter] = int(running_number)
-            number_counter += 1
-
-    # Check for gears
-    found_indexes: set[int] = set()
-
-    for coordinate, is_gear in symbol_coordinates.items():
-        if not is_gear:
-            continue
-
-        gear_indexes: set[int] = set()
-
-        for x in [-1, 0, 1]:
-            for y in [-1, 0, 1]:
-                new_coordinate = (coordinate[0] + y, coordinate[1] + x)
+@router.post("/both")
+@solver()
+async def year_2023_day_3_both(
+    document: list[str] = Body(
+        ...,
+        embed=True,
+        examples=[DOCUMENT_EXAMPLE],
+    ),
+) -> dict[str, int]:
+    """Both parts, parsing the document once."""
+    schematic = parse(document)
 
-                if new_coordinate in number_map:
-                    gear_indexes.add(number_map[new_coordinate])
+    return {"part_1": part_1(schematic), "part_2": part_2(schematic)}
 
-        if len(gear_indexes) == 2:
-            first = gear_indexes.pop()
-            second = gear_indexes.pop()
 
-            # Add to total
-            total += number_index[first] * number_index[second]
+@router.post("/part-1/stream", openapi_extra=OPENAPI_EXTRA)
+@streaming()
+async def year_2023_day_3_part_1_stream(lines: Iterator[str]) -> int:
+    """Part 1, solved three rows at a time as the document's uploaded."""
+    return sum(part_numbers(lines))
 
-            # Mark these as found
-            found_indexes.add(first)
-            found_indexes.add(second)
 
-    return total
+@router.post("/part-2/stream", openapi_extra=OPENAPI_EXTRA)
+@streaming()
+async def year_2023_day_3_part_2_stream(lines: Iterator[str]) -> int:
+    """Part 2, solved three rows at a time as the document's uploaded."""
+    return sum(gear_ratios(lines))
@@ -1,6 +1,14 @@
+from collections import deque
+from typing import Iterable, Iterator
+
 from fastapi import APIRouter, Body
 
-router = APIRouter(tags=["2023 - Day 4: Scratchcards"])
+from src.cache import parser
+from src.executor import solver
+from src.ingest import DocumentRoute
+from src.streaming import OPENAPI_EXTRA, streaming
+
+router = APIRouter(tags=["2023 - Day 4: Scratchcards"], route_class=DocumentRoute)
 
 
 DOCUMENT_EXAMPLE = [
@@ -13,7 +21,58 @@ DOCUMENT_EXAMPLE = [
 ]
 
 
+def card_matches(lines: Iterable[str]) -> Iterator[int]:
+    for line in lines:
+        rest = line.split(": ")[1]
+        winning_str, my_str = rest.split(" | ")
+
+        winning_numbers: set[int] = {
+            int(num) for num in winning_str.strip().split(" ") if num
+        }
+        my_numbers: list[int] = [int(num) for num in my_str.strip().split(" ") if num]
+
+        yield sum(1 for num in my_numbers if num in winning_numbers)
+
+
+@parser
+def parse(document: list[str]) -> tuple[int, ...]:
+    """Each card's count of winning numbers."""
+    return tuple(card_matches(document))
+
+
+def part_1(matches: Iterable[int]) -> int:
+    total = 0
+
+    for count in matches:
+        # The first match is worth one point, every match after doubles it
+        if count:
+            total += 2 ** (count - 1)
+
+    return total
+
+
+def part_2(matches: Iterable[int]) -> int:
+    total = 0
+
+    # Extra copies won of the cards coming up, the next card's first
+    won: deque[int] = deque()
+
+    for count in matches:
+        copies = 1 + (won.popleft() if won else 0)
+
+        for offset in range(count):
+            if offset < len(won):
+                won[offset] += copies
+            else:
+                won.append(copies)
+
+        total += copies
+
+    return total
+
+
 @router.post("/part-1")
+@solver()
 async def year_2023_day_4_part_1(
     document: list[str] = Body(
         ...,
@@ -78,32 +137,11 @@ async def year_2023_day_4_part_1(
     Take a seat in the large pile of colorful cards.
     **How many points are they worth in total?**
     """
-    total = 0
-
-    for line in document:
-        rest = line.split(": ")[1]
-        winning_str, my_str = rest.split(" | ")
-
-        winning_numbers: list[int] = [
-            int(num) for num in winning_str.strip().split(" ") if num
-        ]
-        my_numbers: list[int] = [int(num) for num in my_str.strip().split(" ") if num]
-
-        score = 0
-
-        for num in my_numbers:
-            if num in winning_numbers:
-                if score == 0:
-                    score = 1
-                else:
-                    score *= 2
-
-        total += score
-
-    return total
+    return part_1(parse(document))
 
 
 @router.post("/part-2")
+@solver()
 async def year_2023_day_4_part_2(
     document: list[str] = Body(
         ...,
@@ -150,27 +188,33 @@ async def year_2023_day_4_part_2(
     Process all of the original and copied scratchcards until no more scratchcards are won.
     Including the original set of scratchcards, **how many total scratchcards do you end up with?**
     """
-    total = 0
+    return part_2(parse(document))
 
-    # Map from index to count
-    copies: dict[int, int] = {index: 1 for index in range(len(document))}
 
-    for index, line in enumerate(document):
-        rest = line.split(": ")[1]
-        winning_str, my_str = rest.split(" | ")
+@router.post("/both")
+@solver()
+async def year_2023_day_4_both(
+    document: list[str] = Body(
+        ...,
+        embed=True,
+        examples=[DOCUMENT_EXAMPLE],
+    ),
+) -> dict[str, int]:
+    """Both parts, parsing the document once."""
+    matches = parse(document)
 
-        winning_numbers: list[int] = [
-            int(num) for num in winning_str.strip().split(" ") if num
-        ]
-        my_numbers: list[int] = [int(num) for num in my_str.strip().split(" ") if num]
+    return {"part_1": part_1(matches), "part_2": part_2(matches)}
 
-        matches = 0
 
-        for num in my_numbers:
-            if num in winning_numbers:
-                matches += 1
-                copies[index + matches] += copies[index]
+@router.post("/part-1/stream", openapi_extra=OPENAPI_EXTRA)
+@streaming()
+async def year_2023_day_4_part_1_stream(lines: Iterator[str]) -> int:
+    """Part 1, solved a line at a time as the document's uploaded."""
+    return part_1(card_matches(lines))
 
-        total += copies[index]
 
-    return total
+@router.post("/part-2/stream", openapi_extra=OPENAPI_EXTRA)
+@streaming()
+async def year_2023_day_4_part_2_stream(lines: Iterator[str]) -> int:
+    """Part 2, solved a line at a time as the document's uploaded."""
+    return part_2(card_matches(lines))
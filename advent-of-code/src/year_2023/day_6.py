@@ -2,10 +2,41 @@ import math
 
 from fastapi import APIRouter, Body
 
-router = APIRouter(tags=["2023 - Day 6: Wait For It"])
+from src.executor import solver
+from src.ingest import DocumentRoute
+
+router = APIRouter(tags=["2023 - Day 6: Wait For It"], route_class=DocumentRoute)
+
+
+def ways_to_win(time: int, distance: int) -> int:
+    # Hold times that beat the distance lie between the roots of `hold * (time - hold) = distance`
+    minimum_time = math.floor(
+        (-time + math.sqrt(time**2 - 4 * -1 * -distance)) / -2 + 1
+    )
+    maximum_time = math.ceil((-time - math.sqrt(time**2 - 4 * -1 * -distance)) / -2 - 1)
+
+    return maximum_time - minimum_time + 1
+
+
+def part_1(times: list[int], distances: list[int]) -> int:
+    total: int = 1
+
+    for time, distance in zip(times, distances):
+        total *= ways_to_win(time, distance)
+
+    return total
+
+
+def part_2(times: list[int], distances: list[int]) -> int:
+    # There's really only one race, the spaces between the numbers are bad kerning
+    time = int("".join(map(str, times)))
+    distance = int("".join(map(str, distances)))
+
+    return ways_to_win(time, distance)
 
 
 @router.post("/part-1")
+@solver()
 async def year_2023_day_6_part_1(
     times: list[int] = Body(
         ...,
@@ -77,22 +108,11 @@ async def year_2023_day_6_part_1(
     Determine the number of ways you could beat the record in each race.
     **What do you get if you multiply these numbers together?**
     """
-    total: int = 1
-
-    for time, distance in zip(times, distances):
-        minimum_time = math.floor(
-            (-time + math.sqrt(time**2 - 4 * -1 * -distance)) / -2 + 1
-        )
-        maximum_time = math.ceil(
-            (-time - math.sqrt(time**2 - 4 * -1 * -distance)) / -2 - 1
-        )
-
-        total *= maximum_time - minimum_time + 1
-
-    return total
+    return part_1(times, distances)
 
 
 @router.post("/part-2")
+@solver()
 async def year_2023_day_6_part_2(
     time: int = Body(
         ...,
@@ -129,9 +149,25 @@ async def year_2023_day_6_part_2(
 
     **How many ways can you beat the record in this one much longer race?**
     """
-    minimum_time = math.floor(
-        (-time + math.sqrt(time**2 - 4 * -1 * -distance)) / -2 + 1
-    )
-    maximum_time = math.ceil((-time - math.sqrt(time**2 - 4 * -1 * -distance)) / -2 - 1)
+    return ways_to_win(time, distance)
 
-    return maximum_time - minimum_time + 1
+
+@router.post("/both")
+@solver()
+async def year_2023_day_6_both(
+    times: list[int] = Body(
+        ...,
+        embed=True,
+        examples=[[7, 15, 30]],
+    ),
+    distances: list[int] = Body(
+        ...,
+        embed=True,
+        examples=[[9, 40, 200]],
+    ),
+) -> dict[str, int]:
+    """Both parts from the same sheet, reading part 2's race from `times` and `distances`."""
+    return {
+        "part_1": part_1(times, distances),
+        "part_2": part_2(times, distances),
+    }
@@ -3,7 +3,11 @@ from functools import cached_property
 
 from fastapi import APIRouter, Body
 
-router = APIRouter(tags=["2023 - Day 7: Camel Cards"])
+from src.cache import parser
+from src.executor import solver
+from src.ingest import DocumentRoute
+
+router = APIRouter(tags=["2023 - Day 7: Camel Cards"], route_class=DocumentRoute)
 
 DOCUMENT_EXAMPLE = [
     "32T3K 765",
@@ -30,6 +34,19 @@ CARD_ORDER_PART_ONE = [
 ]
 
 
+@parser
+def parse(document: list[str]) -> tuple[tuple[str, int], ...]:
+    """Each hand's cards and bid."""
+    hands: list[tuple[str, int]] = []
+
+    for line in document:
+        hand_str, bid_str = line.split(" ")
+
+        hands.append((hand_str, int(bid_str)))
+
+    return tuple(hands)
+
+
 def card_position_part_one(card: str) -> int:
     return CARD_ORDER_PART_ONE.index(card)
 
@@ -141,7 +158,26 @@ class HandPartOne:
         return self.points > other.points
 
 
+def part_1(parsed: tuple[tuple[str, int], ...]) -> int:
+    hands: list[HandPartOne] = []
+
+    for hand_str, bid in parsed:
+        hands.append(
+            HandPartOne(
+                cards=list(hand_str),
+                card_count={
+                    card: list(hand_str).count(card) for card in list(hand_str)
+                },
+                bid=bid,
+            ),
+        )
+
+    hands.sort(reverse=True)
+    return sum([hand.bid * (index + 1) for index, hand in enumerate(hands)])
+
+
 @router.post("/part-1")
+@solver()
 async def year_2023_day_7_part_1(
     document: list[str] = Body(
         ...,
@@ -226,23 +262,7 @@ async def year_2023_day_7_part_1(
     Find the rank of every hand in your set.
     **What are the total winnings?**
     """
-    hands: list[HandPartOne] = []
-
-    for line in document:
-        hand_str, bid_str = line.split(" ")
-
-        hands.append(
-            HandPartOne(
-                cards=list(hand_str),
-                card_count={
-                    card: list(hand_str).count(card) for card in list(hand_str)
-                },
-                bid=int(bid_str),
-            ),
-        )
-
-    hands.sort(reverse=True)
-    return sum([hand.bid * (index + 1) for index, hand in enumerate(hands)])
+    return part_1(parse(document))
 
 
 CARD_ORDER_PART_TWO = [
@@ -438,7 +458,25 @@ class HandPartTwo:
         return self.points > other.points
 
 
+def part_2(parsed: tuple[tuple[str, int], ...]) -> int:
+    hands: list[HandPartTwo] = []
+
+    for hand_str, bid in parsed:
+        hand = HandPartTwo(
+            cards=list(hand_str),
+            card_count={card: list(hand_str).count(card) for card in list(hand_str)},
+            bid=bid,
+        )
+
+        hands.append(hand)
+
+    hands.sort(reverse=True)
+
+    return sum([hand.bid * (index + 1) for index, hand in enumerate(hands)])
+
+
 @router.post("/part-2")
+@solver()
 async def year_2023_day_7_part_2(
     document: list[str] = Body(
         ...,
@@ -475,19 +513,19 @@ async def year_2023_day_7_part_2(
     Using the new joker rule, find the rank of every hand in your set.
     **What are the new total winnings?**
     """
-    hands: list[HandPartTwo] = []
+    return part_2(parse(document))
 
-    for line in document:
-        hand_str, bid_str = line.split(" ")
 
-        hand = HandPartTwo(
-            cards=list(hand_str),
-            card_count={card: list(hand_str).count(card) for card in list(hand_str)},
-            bid=int(bid_str),
-        )
-
-        hands.append(hand)
-
-    hands.sort(reverse=True)
+@router.post("/both")
+@solver()
+async def year_2023_day_7_both(
+    document: list[str] = Body(
+        ...,
+        embed=True,
+        examples=[DOCUMENT_EXAMPLE],
+    ),
+) -> dict[str, int]:
+    """Both parts, parsing the document once."""
+    hands = parse(document)
 
-    return sum([hand.bid * (index + 1) for index, hand in enumerate(hands)])
+    return {"part_1": part_1(hands), "part_2": part_2(hands)}
@@ -2,10 +2,79 @@ import math
 
 from fastapi import APIRouter, Body
 
-router = APIRouter(tags=["2023 - Day 8: Haunted Wasteland"])
+from src.cache import parser
+from src.executor import solver
+from src.ingest import DocumentRoute
+
+router = APIRouter(tags=["2023 - Day 8: Haunted Wasteland"], route_class=DocumentRoute)
+
+
+@parser
+def parse(document: list[str]) -> dict[str, tuple[str, str]]:
+    """Each node's left and right node."""
+    maps: dict[str, tuple[str, str]] = {}
+
+    for line in document:
+        start, rest = line.split(" = ")
+        left, right = rest.replace("(", "").replace(")", "").split(", ")
+
+        maps[start] = (left, right)
+
+    return maps
+
+
+def part_1(instructions: str, maps: dict[str, tuple[str, str]]) -> int:
+    steps = 0
+    current_step = "AAA"
+
+    while current_step != "ZZZ":
+        instruction = instructions[steps % len(instructions)]
+
+        if instruction == "L":
+            current_step = maps[current_step][0]
+        elif instruction == "R":
+            current_step = maps[current_step][1]
+        else:
+            raise AssertionError
+
+        steps += 1
+
+    return steps
+
+
+def part_2(instructions: str, maps: dict[str, tuple[str, str]]) -> int:
+    steps: list[str] = [start for start in maps if start.endswith("A")]
+
+    steps_index = 0
+    cycles = []
+
+    while True:
+        for index, previous_step in enumerate(steps):
+            current_step = maps[previous_step]
+            instruction = instructions[steps_index % len(instructions)]
+
+            if instruction == "L":
+                next_step = current_step[0]
+            elif instruction == "R":
+                next_step = current_step[1]
+            else:
+                raise AssertionError
+
+            if next_step.endswith("Z"):
+                cycles.append(steps_index + 1)
+
+            steps[index] = next_step
+
+        if len(cycles) == len(steps):
+            break
+
+        steps_index += 1
+
+    return math.lcm(*cycles)
 
 
 @router.post("/part-1")
+@solver()
 async def year_2023_day_8_part_1(
     instructions: str = Body(
         ...,
@@ -77,33 +146,11 @@ async def year_2023_day_8_part_1(
     Starting at `AAA`, follow the left/right instructions.
     **How many steps are required to reach ZZZ?**
     """
-    steps = 0
-    current_step = "AAA"
-
-    maps: dict[str, tuple[str, str]] = {}
-
-    for line in document:
-        start, rest = line.split(" = ")
-        left, right = rest.replace("(", "").replace(")", "").split(", ")
-
-        maps[start] = (left, right)
-
-    while current_step != "ZZZ":
-        instruction = instructions[steps % len(instructions)]
-
-        if instruction == "L":
-            current_step = maps[current_step][0]
-        elif instruction == "R":
-            current_step = maps[current_step][1]
-        else:
-            raise AssertionError
-
-        steps += 1
-
-    return steps
+    return part_1(instructions, parse(document))
 
 
 @router.post("/part-2")
+@solver()
 async def year_2023_day_8_part_2(
     instructions: str = Body(
         ...,
@@ -172,41 +219,37 @@ async def year_2023_day_8_part_2(
     Simultaneously start on every node that ends with `A`.
     **How many steps does it take before you're only on nodes that end with Z?**
     """
-    steps: list[str] = []
-    maps: dict[str, tuple[str, str]] = {}
-
-    for index, line in enumerate(document):
-        start, rest = line.split(" = ")
-        left, right = rest.replace("(", "").replace(")", "").split(", ")
+    return part_2(instructions, parse(document))
 
-        maps[start] = (left, right)
 
-        if start.endswith("A"):
-            steps.append(start)
-
-    steps_index = 0
-    cycles = []
-
-    while True:
-        for index, previous_step in enumerate(steps):
-            current_step = maps[previous_step]
-            instruction = instructions[steps_index % len(instructions)]
-
-            if instruction == "L":
-                next_step = current_step[0]
-            elif instruction == "R":
-                next_step = current_step[1]
-            else:
-                raise AssertionError
-
-            if next_step.endswith("Z"):
-                cycles.append(steps_index + 1)
-
-            steps[index] = next_step
-
-        if len(cycles) == len(steps):
-            break
-
-        steps_index += 1
-
-    return math.lcm(*cycles)
+@router.post("/both")
+@solver()
+async def year_2023_day_8_both(
+    instructions: str = Body(
+        ...,
+        embed=True,
+        examples=["RL"],
+    ),
+    document: list[str] = Body(
+        ...,
+        embed=True,
+        examples=[
+            [
+                "AAA = (BBB, CCC)",
+                "BBB = (DDD, EEE)",
+                "CCC = (ZZZ, GGG)",
+                "DDD = (DDD, DDD)",
+                "EEE = (EEE, EEE)",
+                "GGG = (GGG, GGG)",
+                "ZZZ = (ZZZ, ZZZ)",
+            ],
+        ],
+    ),
+) -> dict[str, int]:
+    """Both parts, parsing the document once."""
+    maps = parse(document)
+
+    return {
+        "part_1": part_1(instructions, maps),
+        "part_2": part_2(instructions, maps),
+    }
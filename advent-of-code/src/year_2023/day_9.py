@@ -1,8 +1,14 @@
 from dataclasses import dataclass
+from typing import Iterable, Iterator
 
 from fastapi import APIRouter, Body
 
-router = APIRouter(tags=["2023 - Day 9: Mirage Maintenance"])
+from src.cache import parser
+from src.executor import solver
+from src.ingest import DocumentRoute
+from src.streaming import OPENAPI_EXTRA, streaming
+
+router = APIRouter(tags=["2023 - Day 9: Mirage Maintenance"], route_class=DocumentRoute)
 
 
 DOCUMENT_EXAMPLE = [
@@ -54,7 +60,55 @@ class History:
             )
 
 
+def histories(lines: Iterable[str]) -> Iterator[tuple[int, ...]]:
+    for line in lines:
+        yield tuple(int(value.strip()) for value in line.split(" "))
+
+
+@parser
+def parse(document: list[str]) -> tuple[tuple[int, ...], ...]:
+    """Each history's values."""
+    return tuple(histories(document))
+
+
+def part_1(histories: Iterable[tuple[int, ...]]) -> int:
+    total = 0
+
+    for values in histories:
+        history = History(
+            values=[list(values)],
+        )
+
+        while not history.latest_all_zero:
+            history.calculate_next()
+
+        history.fill_in_forwards()
+
+        total += history.values[0][-1]
+
+    return total
+
+
+def part_2(histories: Iterable[tuple[int, ...]]) -> int:
+    total = 0
+
+    for values in histories:
+        history = History(
+            values=[list(values)],
+        )
+
+        while not history.latest_all_zero:
+            history.calculate_next()
+
+        history.fill_in_backwards()
+
+        total += history.values[0][0]
+
+    return total
+
+
 @router.post("/part-1")
+@solver()
 async def year_2023_day_9_part_1(
     document: list[str] = Body(
         ...,
@@ -169,24 +223,11 @@ async def year_2023_day_9_part_1(
     Analyze your OASIS report and extrapolate the next value for each history.
     **What is the sum of these extrapolated values?**
     """
-    total = 0
-
-    for line in document:
-        history = History(
-            values=[[int(value.strip()) for value in line.split(" ")]],
-        )
-
-        while not history.latest_all_zero:
-            history.calculate_next()
-
-        history.fill_in_forwards()
-
-        total += history.values[0][-1]
-
-    return total
+    return part_1(parse(document))
 
 
 @router.post("/part-2")
+@solver()
 async def year_2023_day_9_part_2(
     document: list[str] = Body(
         ...,
@@ -219,18 +260,33 @@ async def year_2023_day_9_part_2(
     Analyze your OASIS report again, this time extrapolating the previous value for each history.
     **What is the sum of these extrapolated values?**
     """
-    total = 0
+    return part_2(parse(document))
 
-    for line in document:
-        history = History(
-            values=[[int(value.strip()) for value in line.split(" ")]],
-        )
 
-        while not history.latest_all_zero:
-            history.calculate_next()
+@router.post("/both")
+@solver()
+async def year_2023_day_9_both(
+    document: list[str] = Body(
+        ...,
+        embed=True,
+        examples=[DOCUMENT_EXAMPLE],
+    ),
+) -> dict[str, int]:
+    """Both parts, parsing the document once."""
+    histories = parse(document)
 
-        history.fill_in_backwards()
+    return {"part_1": part_1(histories), "part_2": part_2(histories)}
 
-        total += history.values[0][0]
 
-    return total
+@router.post("/part-1/stream", openapi_extra=OPENAPI_EXTRA)
+@streaming()
+async def year_2023_day_9_part_1_stream(lines: Iterator[str]) -> int:
+    """Part 1, solved a line at a time as the document's uploaded."""
+    return part_1(histories(lines))
+
+
+@router.post("/part-2/stream", openapi_extra=OPENAPI_EXTRA)
+@streaming()
+async def year_2023_day_9_part_2_stream(lines: Iterator[str]) -> int:
+    """Part 2, solved a line at a time as the document's uploaded."""
+    return part_2(histories(lines))
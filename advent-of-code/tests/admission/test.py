@@ -0,0 +1,117 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+from src import admission
+from src.admission import CostClass, Limiter
+from src.executor import solver
+
+
+@solver(offload=True, cache=False, cost="runaway")
+async def spins() -> None:
+    while True:
+        pass
+
+
+@solver(offload=True, cache=False, cost="runaway")
+async def finishes() -> int:
+    return 1
+
+
+def test_limiter() -> None:
+    limiter = Limiter("test", concurrency=1, queue=2)
+    finished: list[int] = []
+
+    async def solve(index: int, release: asyncio.Event) -> None:
+        async with limiter.admit():
+            await release.wait()
+            finished.append(index)
+
+    async def burst() -> None:
+        releases = [asyncio.Event() for _ in range(3)]
+        tasks = [
+            asyncio.create_task(solve(index, release))
+            for index, release in enumerate(releases)
+        ]
+        await asyncio.sleep(0)
+
+        assert limiter.running == 1
+        assert limiter.waiting == 2
+
+        # The queue's full
+        with pytest.raises(HTTPException) as raised:
+            await limiter.acquire()
+
+        assert raised.value.status_code == 429
+        assert int(raised.value.headers["Retry-After"]) >= 1
+        assert limiter.rejected == 1
+
+        # Waiters go in order, whatever order they're ready in
+        for release in reversed(releases):
+            release.set()
+
+        await asyncio.gather(*tasks)
+
+    asyncio.run(burst())
+
+    assert finished == [0, 1, 2]
+    assert limiter.running == 0
+
+
+def test_limiter_cancelled_waiter() -> None:
+    limiter = Limiter("test", concurrency=1, queue=2)
+
+    async def burst() -> None:
+        await limiter.acquire()
+
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+
+        waiter.cancel()
+        await asyncio.sleep(0)
+
+        assert limiter.waiting == 0
+
+        # Nobody's waiting, so the slot's simply given back
+        limiter.release()
+
+    asyncio.run(burst())
+
+    assert limiter.running == 0
+
+
+def test_limiters_for(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(admission, "limiters", {})
+    monkeypatch.setattr(admission, "ROUTE_CONCURRENCY", {"capped": 1})
+
+    assert admission.limiters_for("light", "uncapped") == []
+
+    names = [limiter.name for limiter in admission.limiters_for("heavy", "capped")]
+
+    assert names == ["capped", "heavy"]
+
+
+def test_route_concurrency() -> None:
+    assert admission.route_concurrency("") == {}
+    assert admission.route_concurrency("a=1, b=2") == {"a": 1, "b": 2}
+
+
+def test_cpu_budget(
+    pooled_test_client: TestClient,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setitem(
+        admission.COST_CLASSES,
+        "runaway",
+        CostClass(concurrency=0, queue=0, cpu_seconds=1),
+    )
+
+    with pytest.raises(HTTPException) as raised:
+        asyncio.run(spins())
+
+    assert raised.value.status_code == 503
+
+    # The worker lives on, without the limit
+    assert asyncio.run(finishes()) == 1
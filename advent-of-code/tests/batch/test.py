@@ -0,0 +1,112 @@
+import json
+import logging
+from pathlib import Path
+from typing import Any
+
+import pytest
+from fastapi.testclient import TestClient
+
+TESTS = Path(__file__).parent.parent
+
+
+def read(path: Path) -> list[str]:
+    return path.read_text().splitlines()
+
+
+def outcomes(test_client: TestClient, batch: dict[str, Any]) -> list[dict[str, Any]]:
+    response = test_client.post("batch", json=batch)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+
+    # Results stream in completion order
+    return sorted(
+        (json.loads(line) for line in response.text.splitlines()),
+        key=lambda outcome: outcome["index"],
+    )
+
+
+def test_batch(test_client: TestClient) -> None:
+    batch = {
+        "documents": {
+            "day-1": read(TESTS / "year_2023" / "day_1" / "input.txt"),
+            "signal": read(TESTS / "year_2022" / "day_6" / "example.txt"),
+        },
+        "jobs": [
+            {"year": 2023, "day": 1, "part": 1, "input": "day-1"},
+            {"year": 2023, "day": 1, "part": 2, "input": "day-1"},
+            {
+                "year": 2023,
+                "day": 21,
+                "part": 1,
+                "document": read(TESTS / "year_2023" / "day_21" / "example.txt"),
+                "arguments": {"steps": 6},
+            },
+            {
+                "year": 2023,
+                "day": 6,
+                "part": 2,
+                "arguments": {"time": 71530, "distance": 940200},
+            },
+            # Parts that take the document as a single string get it joined
+            {"year": 2022, "day": 6, "part": 1, "input": "signal"},
+        ],
+    }
+
+    results = [outcome["result"] for outcome in outcomes(test_client, batch)]
+
+    assert results == [54338, 53389, 16, 71503, 7]
+
+
+def test_batch_pooled(pooled_test_client: TestClient) -> None:
+    document = read(TESTS / "year_2023" / "day_22" / "example-1.txt")
+
+    batch = {
+        "documents": {"day-22": document},
+        "jobs": [
+            {"year": 2023, "day": 22, "part": 1, "input": "day-22"},
+            {"year": 2023, "day": 22, "part": 2, "input": "day-22"},
+        ],
+    }
+
+    results = [outcome["result"] for outcome in outcomes(pooled_test_client, batch)]
+
+    assert results == [5, 7]
+
+
+def test_batch_errors(test_client: TestClient) -> None:
+    batch = {
+        "jobs": [
+            {"year": 2023, "day": 26, "part": 1, "document": []},
+            {"year": 2023, "day": 25, "part": 2, "document": []},
+            {"year": 2023, "day": 1, "part": 1, "input": "missing"},
+            {"year": 2023, "day": 21, "part": 1, "document": ["S"]},
+            {"year": 2023, "day": 1, "part": 1, "document": ["1abc2"]},
+        ],
+    }
+
+    errors = [outcome.get("error") for outcome in outcomes(test_client, batch)]
+
+    assert [error["status_code"] for error in errors[:4]] == [404, 404, 404, 422]
+    assert errors[3]["detail"][0]["loc"] == ["body", "steps"]
+
+    # One bad job doesn't fail the others
+    assert errors[4] is None
+
+
+def test_batch_failure(
+    test_client: TestClient, caplog: pytest.LogCaptureFixture
+) -> None:
+    # A line without a digit fails the solver itself
+    batch = {"jobs": [{"year": 2023, "day": 1, "part": 1, "document": ["abc"]}]}
+
+    with caplog.at_level(logging.ERROR, logger="src.batch"):
+        [outcome] = outcomes(test_client, batch)
+
+    assert outcome["error"] == {"status_code": 500, "detail": "Internal Server Error"}
+
+    # What went wrong is logged, not sent back
+    [record] = caplog.records
+
+    assert record.getMessage() == "Batch job 0 (2023 day 1 part 1) failed"
+    assert record.exc_info is not None
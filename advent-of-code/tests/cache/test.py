@@ -0,0 +1,204 @@
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src import cache
+from src.cache import MISSING, ResultCache, cache_key
+
+
+def test_key_normalizes_arguments() -> None:
+    first = cache_key("route", {"document": ["1", "2"], "steps": 6})
+    second = cache_key("route", {"steps": 6, "document": ["1", "2"]})
+
+    assert first == second
+    assert first != cache_key("other-route", {"document": ["1", "2"], "steps": 6})
+    assert first != cache_key("route", {"document": ["1", "2"], "steps": 7})
+
+
+def test_lru_eviction() -> None:
+    results = ResultCache(size=2)
+
+    results.put("a", 1)
+    results.put("b", 2)
+
+    # Touch "a" so "b" is the least recently used
+    assert results.get("a") == 1
+
+    results.put("c", 3)
+
+    assert results.get("b") is MISSING
+    assert results.get("a") == 1
+    assert results.get("c") == 3
+
+    assert results.stats.hits == 3
+    assert results.stats.misses == 1
+
+
+def test_disk_tier_survives_restart(tmp_path: Path) -> None:
+    path = str(tmp_path / "cache.sqlite3")
+
+    results = ResultCache(size=1, path=path)
+    results.put("a", 1)
+    results.put("b", None)
+
+    restarted = ResultCache(size=1, path=path)
+
+    assert restarted.get("a") == 1
+    assert restarted.get("b") is None
+    assert restarted.get("c") is MISSING
+
+    assert restarted.stats.disk_hits == 2
+    assert restarted.stats.misses == 1
+
+
+@pytest.fixture
+def results() -> Iterator[ResultCache]:
+    cache.results.clear()
+
+    yield cache.results
+
+    cache.results.clear()
+
+
+def test_repeat_request_hits_cache(
+    results: ResultCache, test_client: TestClient
+) -> None:
+    path = Path(__file__).parent.parent / "year_2023" / "day_1" / "example-1.txt"
+
+    with open(path, "r") as file:
+        document = file.read().splitlines()
+
+    for _ in range(3):
+        response = test_client.post("2023/day-1/part-1", json={"document": document})
+
+        assert response.status_code == 200
+        assert response.json() == 142
+
+    response = test_client.get("cache")
+
+    assert response.status_code == 200
+    assert response.json()["misses"] == 1
+    assert response.json()["hits"] == 2
+    assert response.json()["size"] == 1
+
+    response = test_client.delete("cache")
+
+    assert response.status_code == 200
+    assert len(results.memory) == 0
+
+
+def test_parser_shares_parsed_document() -> None:
+    calls: list[tuple[str, ...]] = []
+
+    @cache.parser
+    def parse(document: list[str]) -> tuple[str, ...]:
+        calls.append(tuple(document))
+
+        return tuple(document)
+
+    cache.parsed.clear()
+
+    assert parse(["1", "2"]) is parse(["1", "2"])
+    assert parse(["3"]) == ("3",)
+    assert calls == [("1", "2"), ("3",)]
+
+    cache.parsed.clear()
+
+
+def test_parts_parse_once(results: ResultCache, test_client: TestClient) -> None:
+    path = Path(__file__).parent.parent / "year_2023" / "day_4" / "example.txt"
+
+    with open(path, "r") as file:
+        document = file.read().splitlines()
+
+    cache.parsed.clear()
+
+    response = test_client.post("2023/day-4/part-1", json={"document": document})
+
+    assert response.status_code == 200
+    assert "parse;dur=" in response.headers["server-timing"]
+
+    # Part 2 reuses part 1's parsed document
+    response = test_client.post("2023/day-4/part-2", json={"document": document})
+
+    assert response.status_code == 200
+    assert "parse;dur=" not in response.headers["server-timing"]
+    assert cache.parsed.stats.hits == 1
+    assert test_client.get("cache").json()["parsed_size"] == 1
+
+    cache.parsed.clear()
+
+
+def test_memoize_is_bounded() -> None:
+    calls: list[int] = []
+
+    @cache.memoize(size=2)
+    def square(value: int) -> int:
+        calls.append(value)
+
+        return value * value
+
+    assert [square(value) for value in [1, 2, 1, 3, 2]] == [1, 4, 1, 9, 4]
+
+    # 2 was the least recently used when 3 came in
+    assert calls == [1, 2, 3, 2]
+
+    stats = square.memo.stats  # type: ignore[attr-defined]
+
+    assert (stats.hits, stats.misses, stats.evictions, stats.peak) == (1, 4, 2, 2)
+
+
+def test_memoize_scoped() -> None:
+    calls: list[int] = []
+
+    @cache.memoize(scoped=True)
+    def square(value: int) -> int:
+        calls.append(value)
+
+        return value * value
+
+    memo = square.memo  # type: ignore[attr-defined]
+
+    with cache.memo_scope() as scope:
+        assert square(2) == square(2) == 4
+
+        # Nested scopes start over, and are counted with the enclosing one
+        with cache.memo_scope():
+            assert square(2) == 4
+
+        assert len(scope.tables) == 1
+
+    # Dropped with the scope
+    assert not scope.tables
+    assert calls == [2, 2]
+
+    stats = cache.memo_stats[memo.name]
+
+    assert (stats.hits, stats.misses, stats.peak) == (1, 2, 1)
+
+
+def test_solve_memo_metrics(
+    results: ResultCache, pooled_test_client: TestClient
+) -> None:
+    path = Path(__file__).parent.parent / "year_2023" / "day_12" / "example.txt"
+
+    with open(path, "r") as file:
+        document = file.read().splitlines()
+
+    name = "src.year_2023.day_12.count_arrangements"
+    before = cache.memo_stats.get(name, cache.MemoStats()).misses
+
+    response = pooled_test_client.post(
+        "2023/day-12/part-2", json={"document": document}
+    )
+
+    assert response.status_code == 200
+
+    # Solved in a worker, its lookups are sent back
+    assert cache.memo_stats[name].misses > before
+
+    response = pooled_test_client.get("metrics")
+
+    assert f'aoc_memo_lookups_total{{function="{name}",result="miss"}}' in response.text
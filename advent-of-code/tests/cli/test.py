@@ -0,0 +1,107 @@
+from pathlib import Path
+
+import pytest
+
+from src.cli import main
+from src.ingest import map_lines
+
+TESTS = Path(__file__).parent.parent
+
+
+@pytest.mark.parametrize(
+    "target,filename,arguments,output",
+    [
+        ("2022/day-6/part-1", "year_2022/day_6/input.txt", [], "1134"),
+        (
+            "2023/day-2/part-1",
+            "year_2023/day_2/input.txt",
+            ["--argument", "red=12", "--argument", "green=13", "--argument", "blue=14"],
+            "2505",
+        ),
+        # One line of comma separated steps
+        ("2023/day-15/part-1", "year_2023/day_15/input.txt", [], "522547"),
+        ("2023/day-15/part-2", "year_2023/day_15/input.txt", [], "229271"),
+        (
+            "2023/21/1",
+            "year_2023/day_21/input.txt",
+            ["--argument", "steps=64"],
+            "3758",
+        ),
+        (
+            "2023/day-22/part-1",
+            "year_2023/day_22/input.txt",
+            ["--engine", "fast"],
+            "471",
+        ),
+    ],
+)
+def test_main(
+    target: str,
+    filename: str,
+    arguments: list[str],
+    output: str,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    main([target, str(TESTS / filename), "--repeat", "2", *arguments])
+
+    answer, parse, solve, total, memory = capsys.readouterr().out.splitlines()
+
+    assert answer == output
+    assert parse.startswith("parse")
+    assert solve.startswith("solve")
+    assert total.startswith("total")
+    assert memory.startswith("memory")
+
+
+@pytest.mark.parametrize(
+    "arguments",
+    [
+        ["2023/day-99/part-1"],
+        ["2023/day-21/part-3"],
+        ["2023/day-21"],
+        ["2023/day-21/part-1"],
+        ["2023/day-21/part-1", "--argument", "steps=many"],
+        ["2023/day-21/part-1", "--argument", "steps=64", "--argument", "seed=1"],
+        ["2023/day-21/part-1", "--argument", "steps=64", "--engine", "nope"],
+    ],
+)
+def test_main_usage(arguments: list[str]) -> None:
+    path = str(TESTS / "year_2023" / "day_21" / "input.txt")
+
+    with pytest.raises(SystemExit) as error:
+        main([arguments[0], path, *arguments[1:]])
+
+    assert error.value.code == 2
+
+
+@pytest.mark.parametrize("name", ["missing.txt", "."])
+def test_main_unreadable(
+    name: str, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    with pytest.raises(SystemExit) as error:
+        main(["2023/day-1/part-1", str(tmp_path / name)])
+
+    assert error.value.code == 2
+    assert "Can't read" in capsys.readouterr().err
+
+
+@pytest.mark.parametrize(
+    "text",
+    ["", "\n", "a", "a\nb", "a\nb\n", "a\r\nb\r\n", "\n\na\n\n", "ünï\ncødé\n"],
+)
+def test_map_lines(text: str, tmp_path: Path) -> None:
+    path = tmp_path / "input.txt"
+    path.write_bytes(text.encode())
+
+    expected = text.replace("\r\n", "\n").splitlines()
+
+    with map_lines(path) as lines:
+        assert len(lines) == len(expected)
+        assert list(lines) == expected
+        assert lines[1:] == expected[1:]
+
+        if expected:
+            assert lines[-1] == expected[-1]
+
+        with pytest.raises(IndexError):
+            lines[len(expected)]
@@ -0,0 +1,201 @@
+from pathlib import Path
+
+import pytest
+from benchmarks import distinct, generators, scaling, solvers
+from fastapi.testclient import TestClient
+
+from src import engines, manifest
+from src.manifest import Day
+from src.year_2023 import day_1, day_3
+
+TESTS = Path(__file__).parent.parent
+
+# Every solver case (real inputs) of the days with an engine besides the reference one
+CASES = [
+    case
+    for day in manifest.DAYS
+    for case in solvers.day_cases(day)
+    if case.engine != engines.REFERENCE and case.expected is not None
+]
+PARTS = [part for part in scaling.parts("*") if part[2] != engines.REFERENCE]
+
+
+@engines.dispatch
+def double(value: int) -> int:
+    return value + value
+
+
+@double.register("fast")
+def double_fast(value: int) -> int:
+    return value << 1
+
+
+def test_dispatch() -> None:
+    assert engines.current() == engines.REFERENCE
+    assert double.__name__ == "double"
+
+    with engines.using("fast"):
+        assert engines.current() == "fast"
+        assert double(4) == 8
+
+    assert engines.current() == engines.REFERENCE
+    assert double(4) == 8
+
+
+def test_dispatch_falls_back_to_reference() -> None:
+    with engines.using("missing"):
+        assert double(3) == 6
+
+
+def quadruple(value: int) -> int:
+    return double(double(value))
+
+
+def test_supported() -> None:
+    assert engines.supported(quadruple) == [engines.REFERENCE, "fast"]
+    assert engines.supported(test_supported) == [engines.REFERENCE]
+
+    # Only the engines all of a route's parts have
+    assert engines.supported(day_1.year_2023_day_1_part_1) == [
+        engines.REFERENCE,
+        "distinct",
+        "numpy",
+    ]
+    assert engines.supported(day_1.year_2023_day_1_part_2) == [
+        engines.REFERENCE,
+        "distinct",
+    ]
+    assert engines.supported(day_1.year_2023_day_1_both) == [
+        engines.REFERENCE,
+        "distinct",
+    ]
+
+
+@pytest.mark.parametrize("engine", [engines.REFERENCE, "fast"])
+def test_route_engine(engine: str, test_client: TestClient) -> None:
+    document = (TESTS / "year_2023" / "day_11" / "example.txt").read_text()
+
+    response = test_client.post(
+        "2023/day-11/part-1",
+        json={"document": document.splitlines(), "engine": engine},
+    )
+
+    assert response.status_code == 200
+    assert response.json() == 374
+
+    # Plain text documents take it as a query parameter
+    response = test_client.post(
+        "2023/day-11/part-1",
+        params={"engine": engine},
+        content=document,
+        headers={"Content-Type": "text/plain"},
+    )
+
+    assert response.status_code == 200
+    assert response.json() == 374
+
+
+def test_route_unknown_engine(test_client: TestClient) -> None:
+    response = test_client.post(
+        "2023/day-11/part-1", json={"document": ["#"], "engine": "missing"}
+    )
+
+    assert response.status_code == 422
+
+    # Days only have the engines they register
+    response = test_client.post(
+        "2022/day-1/part-1", json={"document": ["1"], "engine": "fast"}
+    )
+
+    assert response.status_code == 422
+
+    # Nor does a part take another part's engines
+    response = test_client.post(
+        "2023/day-1/part-2", json={"document": ["1"], "engine": "numpy"}
+    )
+
+    assert response.status_code == 422
+
+
+def test_pooled_route_engine(pooled_test_client: TestClient) -> None:
+    document = (TESTS / "year_2023" / "day_22" / "example-1.txt").read_text()
+
+    response = pooled_test_client.post(
+        "2023/day-22/both",
+        json={"document": document.splitlines(), "engine": "fast"},
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {"part_1": 5, "part_2": 7}
+
+
+@pytest.mark.parametrize("case", CASES, ids=[case.name for case in CASES])
+def test_real_input(case: solvers.Case) -> None:
+    # The expected answers are the reference engine's
+    with solvers.uncached():
+        assert solvers.solve_direct(case) == case.expected
+
+
+@pytest.mark.parametrize("seed", range(4))
+@pytest.mark.parametrize(
+    "day,part,engine",
+    [(day, part, engine) for day, part, engine, _ in PARTS],
+    ids=[
+        f"{day.year}/day-{day.day}/part-{part}@{engine}"
+        for day, part, engine, _ in PARTS
+    ],
+)
+def test_generated_input(day: Day, part: int, engine: str, seed: int) -> None:
+    size = max(generators.GENERATORS[day].start // 10, 4)
+
+    with solvers.uncached():
+        assert solvers.solve_direct(
+            scaling.case(day, part, size, seed, engine)
+        ) == solvers.solve_direct(scaling.case(day, part, size, seed))
+
+
+@pytest.mark.parametrize("part", [1, 2])
+@pytest.mark.parametrize(
+    "day", distinct.DAYS, ids=[f"{day.year}/day-{day.day}" for day in distinct.DAYS]
+)
+def test_duplicated_input(day: Day, part: int) -> None:
+    # Raises if the engines' answers differ
+    distinct.compare(day, part, size=200, fraction=0.1, repeat=1, seed=0)
+
+
+def test_numpy_calibration(monkeypatch: pytest.MonkeyPatch) -> None:
+    # Lines spanning several chunks
+    monkeypatch.setattr(day_1, "NUMPY_CHUNK_LINES", 2)
+    document = ["a1b2", "3", "x9y", "0z", "7\u00e98"]
+
+    with engines.using("numpy"):
+        assert day_1.part_1(document) == day_1.part_1_numpy(document) == 222
+        assert day_1.part_1([]) == 0
+
+        with pytest.raises(ValueError):
+            day_1.part_1(["1", "none"])
+
+    assert day_1.part_1(document) == 222
+
+
+@pytest.mark.parametrize(
+    "document",
+    [
+        [],
+        ["..."],
+        ["1*1"],
+        # The same number on both sides of a gear is still one number
+        ["12*", "..3", "45."],
+        ["1*2*3"],
+        # Ragged lines, and numbers touching the edges
+        ["467..", "...*......", "..35", "9"],
+    ],
+)
+def test_numpy_schematic(document: list[str]) -> None:
+    schematic = day_3.parse(document)
+    expected = day_3.part_1(schematic), day_3.part_2(schematic)
+
+    with engines.using("numpy"):
+        schematic = day_3.parse(document)
+
+        assert (day_3.part_1(schematic), day_3.part_2(schematic)) == expected
@@ -0,0 +1,94 @@
+import asyncio
+import os
+import uuid
+from pathlib import Path
+
+import pytest
+from app import app
+from fastapi.testclient import TestClient
+
+from src import executor
+from src.executor import run_coroutine, solver
+
+
+@solver(offload=True, cache=False)
+async def process_id() -> int:
+    return os.getpid()
+
+
+def test_inline_without_pool() -> None:
+    assert not executor.is_running()
+
+    assert asyncio.run(process_id()) == os.getpid()
+
+
+def test_offload_with_pool(pooled_test_client: TestClient) -> None:
+    assert executor.is_running()
+
+    assert asyncio.run(process_id()) != os.getpid()
+
+
+def test_pool_follows_app_lifespan(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(executor, "EXECUTOR_WORKERS", 1)
+
+    with TestClient(app=app):
+        assert executor.is_running()
+
+    assert not executor.is_running()
+
+
+@pytest.mark.parametrize(
+    "filename,output",
+    [
+        ("example-1.txt", 7),
+    ],
+)
+def test_offloaded_route(
+    filename: str,
+    output: int,
+    pooled_test_client: TestClient,
+) -> None:
+    path = Path(__file__).parent.parent / "year_2023" / "day_22" / filename
+
+    with open(path, "r") as file:
+        response = pooled_test_client.post(
+            "2023/day-22/part-2",
+            json={
+                "document": file.read().splitlines(),
+            },
+        )
+
+        assert response.status_code == 200
+        assert response.json() == output
+
+
+def test_run_coroutine_rejects_awaiting() -> None:
+    async def awaits() -> None:
+        await asyncio.sleep(0)
+
+    with pytest.raises(RuntimeError):
+        run_coroutine(awaits())
+
+
+solves: list[str] = []
+
+
+@solver(offload=True)
+async def counts_solves(key: str) -> int:
+    solves.append(key)
+
+    return len(key)
+
+
+def test_identical_solves_coalesce() -> None:
+    # Unique, so nothing's cached from an earlier run
+    key = uuid.uuid4().hex
+    coalesced = executor.coalesced()
+
+    async def burst() -> list[int]:
+        return await asyncio.gather(*[counts_solves(key=key) for _ in range(5)])
+
+    assert asyncio.run(burst()) == [32] * 5
+
+    assert solves.count(key) == 1
+    assert executor.coalesced() - coalesced == 4
@@ -1,7 +1,11 @@
+from typing import Iterator
+
 import pytest
 from app import PREFIX, app
 from fastapi.testclient import TestClient
 
+from src import executor
+
 
 @pytest.fixture
 def test_client() -> TestClient:
@@ -9,3 +13,15 @@ def test_client() -> TestClient:
         app=app,
         base_url=f"http://testserver/{PREFIX}",
     )
+
+
+@pytest.fixture
+def pooled_test_client(monkeypatch: pytest.MonkeyPatch) -> Iterator[TestClient]:
+    # Entering the client runs the app lifespan, which starts the process pool
+    monkeypatch.setattr(executor, "EXECUTOR_WORKERS", 2)
+
+    with TestClient(
+        app=app,
+        base_url=f"http://testserver/{PREFIX}",
+    ) as test_client:
+        yield test_client
@@ -0,0 +1,67 @@
+import random
+
+import pytest
+from benchmarks import generators, scaling, solvers
+
+from src import manifest
+from src.manifest import Day
+
+PARTS = list(scaling.parts("*"))
+
+
+@pytest.mark.parametrize(
+    "day,part,engine",
+    [(day, part, engine) for day, part, engine, _ in PARTS],
+    ids=[
+        f"{day.year}/day-{day.day}/part-{part}@{engine}"
+        for day, part, engine, _ in PARTS
+    ],
+)
+def test_generated_input_solves(day: Day, part: int, engine: str) -> None:
+    size = max(generators.GENERATORS[day].start // 10, 4)
+
+    with solvers.uncached():
+        assert (
+            solvers.solve_direct(scaling.case(day, part, size, seed=0, engine=engine))
+            is not None
+        )
+
+
+def test_every_day_has_a_generator() -> None:
+    assert {day for day, _, _, _ in PARTS} == set(manifest.DAYS)
+
+
+def test_generated_input_is_reproducible() -> None:
+    day = Day(year=2023, day=24)
+
+    assert generators.generate(day, 10, seed=1) == generators.generate(day, 10, seed=1)
+    assert generators.generate(day, 10, seed=1) != generators.generate(day, 10, seed=2)
+
+
+def test_tree_loop_is_closed() -> None:
+    loop = generators.tree_loop(random.Random(0), 5, 4)
+
+    # Every cell once, each next to the one after it
+    assert len(set(loop)) == len(loop) == 2 * 5 * 2 * 4
+    assert all(
+        abs(x - next_x) + abs(y - next_y) == 1
+        for (x, y), (next_x, next_y) in zip(loop, loop[1:] + loop[:1])
+    )
+
+
+@pytest.mark.parametrize(
+    "seconds,exponent,flagged",
+    [
+        ([0.01, 0.02, 0.04, 0.08], 1.0, False),
+        ([0.01, 0.04, 0.16, 0.64], 2.0, True),
+        # Too fast to tell
+        ([0.0001, 0.0002, 0.0004, 0.0008], None, False),
+    ],
+)
+def test_exponent(seconds: list[float], exponent: float | None, flagged: bool) -> None:
+    fitted = scaling.Scaling(
+        name="test", expected=1.0, sizes=[1, 2, 4, 8], seconds=seconds
+    )
+
+    assert fitted.exponent == (None if exponent is None else pytest.approx(exponent))
+    assert fitted.flagged(tolerance=0.25) == flagged
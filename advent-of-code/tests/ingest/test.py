@@ -0,0 +1,298 @@
+import asyncio
+import gzip
+import json
+from pathlib import Path
+from typing import AsyncIterator
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.ingest import iter_line_batches, read_lines, split_document
+
+TESTS = Path(__file__).parent.parent
+
+DAY_1 = TESTS / "year_2023" / "day_1" / "input.txt"
+DAY_15 = TESTS / "year_2023" / "day_15" / "input.txt"
+
+
+async def chunked(data: bytes, size: int) -> AsyncIterator[bytes]:
+    for start in range(0, len(data), size):
+        yield data[start : start + size]
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 1024])
+@pytest.mark.parametrize(
+    "text",
+    [
+        "",
+        "\n",
+        "a\nb",
+        "a\nb\n",
+        "a\r\nb\r\n",
+        "a\n\nb\n\n",
+    ],
+)
+def test_read_lines(text: str, size: int) -> None:
+    # Lines split across chunks (and across a `\r\n`) are joined back together
+    lines = asyncio.run(read_lines(chunked(text.encode(), size)))
+    compressed = asyncio.run(
+        read_lines(chunked(gzip.compress(text.encode()), size), "gzip")
+    )
+
+    assert lines == text.splitlines()
+    assert compressed == text.splitlines()
+
+
+@pytest.mark.parametrize(
+    "text", ["", "\n", "a,b", "a,b\n", "a,b,\n", "ab,,c,d=1\r\n", "a,\nb,c"]
+)
+def test_split_document(text: str) -> None:
+    async def items() -> list[str]:
+        batches = iter_line_batches(chunked(text.encode(), 1), separator=",")
+
+        return [item async for batch in batches for item in batch]
+
+    # The same items as a streaming route would see
+    assert split_document(text, ",") == asyncio.run(items())
+
+
+def test_text(test_client: TestClient) -> None:
+    response = test_client.post(
+        "2023/day-1/part-1",
+        content=DAY_1.read_bytes(),
+        headers={"Content-Type": "text/plain"},
+    )
+
+    assert response.status_code == 200
+    assert response.json() == 54338
+
+
+def test_text_gzip(test_client: TestClient) -> None:
+    response = test_client.post(
+        "2023/day-1/part-1",
+        content=gzip.compress(DAY_1.read_bytes()),
+        headers={"Content-Type": "text/plain", "Content-Encoding": "gzip"},
+    )
+
+    assert response.status_code == 200
+    assert response.json() == 54338
+
+
+def test_text_zstd(test_client: TestClient) -> None:
+    zstandard = pytest.importorskip("zstandard")
+
+    response = test_client.post(
+        "2023/day-1/part-1",
+        content=zstandard.ZstdCompressor().compress(DAY_1.read_bytes()),
+        headers={"Content-Type": "application/zstd"},
+    )
+
+    assert response.status_code == 200
+    assert response.json() == 54338
+
+
+def test_json_gzip(test_client: TestClient) -> None:
+    body = json.dumps({"document": DAY_1.read_text().splitlines()})
+
+    response = test_client.post(
+        "2023/day-1/part-1",
+        content=gzip.compress(body.encode()),
+        headers={"Content-Type": "application/json", "Content-Encoding": "gzip"},
+    )
+
+    assert response.status_code == 200
+    assert response.json() == 54338
+
+
+def test_multipart(test_client: TestClient) -> None:
+    response = test_client.post(
+        "2023/day-1/part-1",
+        files={"document": ("input.txt.gz", gzip.compress(DAY_1.read_bytes()))},
+    )
+
+    assert response.status_code == 200
+    assert response.json() == 54338
+
+
+@pytest.mark.parametrize(
+    "part,expected",
+    [
+        ("part-1", 522547),
+        ("part-2", 229271),
+        ("both", {"part_1": 522547, "part_2": 229271}),
+    ],
+)
+def test_text_separated(part: str, expected: object, test_client: TestClient) -> None:
+    # One line of comma separated steps, split on the day's separator rather than lines
+    response = test_client.post(
+        f"2023/day-15/{part}",
+        content=DAY_15.read_bytes(),
+        headers={"Content-Type": "text/plain"},
+    )
+
+    assert response.status_code == 200
+    assert response.json() == expected
+
+
+def test_multipart_separated(test_client: TestClient) -> None:
+    response = test_client.post(
+        "2023/day-15/part-2",
+        files={"document": ("input.txt.gz", gzip.compress(DAY_15.read_bytes()))},
+    )
+
+    assert response.status_code == 200
+    assert response.json() == 229271
+
+
+def test_multipart_fields(test_client: TestClient) -> None:
+    path = TESTS / "year_2023" / "day_21" / "example.txt"
+
+    with open(path, "rb") as file:
+        response = test_client.post(
+            "2023/day-21/part-1",
+            data={"steps": "6"},
+            files={"document": ("example.txt", file)},
+        )
+
+    assert response.status_code == 200
+    assert response.json() == 16
+
+
+def test_query_parameters(test_client: TestClient) -> None:
+    path = TESTS / "year_2023" / "day_21" / "example.txt"
+
+    response = test_client.post(
+        "2023/day-21/part-1",
+        params={"steps": 7},
+        content=path.read_bytes(),
+        headers={"Content-Type": "text/plain"},
+    )
+
+    assert response.status_code == 200
+    assert response.json() == 21
+
+
+def test_string_document(test_client: TestClient) -> None:
+    path = TESTS / "year_2022" / "day_6" / "example.txt"
+
+    response = test_client.post(
+        "2022/day-6/part-1",
+        content=path.read_bytes(),
+        headers={"Content-Type": "text/plain"},
+    )
+
+    assert response.status_code == 200
+    assert response.json() == 7
+
+
+def test_missing_parameter(test_client: TestClient) -> None:
+    path = TESTS / "year_2023" / "day_21" / "example.txt"
+
+    response = test_client.post(
+        "2023/day-21/part-1",
+        content=path.read_bytes(),
+        headers={"Content-Type": "text/plain"},
+    )
+
+    assert response.status_code == 422
+
+
+@pytest.mark.parametrize(
+    "content,headers",
+    [
+        # Not what its encoding says
+        (b"1abc2\n", {"Content-Type": "text/plain", "Content-Encoding": "gzip"}),
+        (b"1abc2\n", {"Content-Type": "application/gzip"}),
+        (b"{}", {"Content-Type": "application/json", "Content-Encoding": "gzip"}),
+        # Not its charset
+        (b"1abc2\n\xff\xfe\n", {"Content-Type": "text/plain"}),
+        (b"1abc2\n\xff\xfe\n", {"Content-Type": "text/plain; charset=ascii"}),
+        (
+            gzip.compress(b'{"document": ["\xff"]}', mtime=0),
+            {"Content-Type": "application/json", "Content-Encoding": "gzip"},
+        ),
+    ],
+)
+def test_invalid_body(
+    content: bytes, headers: dict[str, str], test_client: TestClient
+) -> None:
+    response = test_client.post("2023/day-1/part-1", content=content, headers=headers)
+
+    assert response.status_code == 400
+
+
+def test_invalid_body_zstd(test_client: TestClient) -> None:
+    pytest.importorskip("zstandard")
+
+    response = test_client.post(
+        "2023/day-1/part-1",
+        content=b"1abc2\n",
+        headers={"Content-Type": "application/zstd"},
+    )
+
+    assert response.status_code == 400
+
+
+def test_invalid_body_stream(test_client: TestClient) -> None:
+    # Streaming routes read the body the same way
+    response = test_client.post(
+        "2023/day-1/part-1/stream",
+        content=b"1abc2\n",
+        headers={"Content-Type": "text/plain", "Content-Encoding": "gzip"},
+    )
+
+    assert response.status_code == 400
+
+    response = test_client.post(
+        "2023/day-1/part-1/stream",
+        content=b"1abc2\n\xff\n",
+        headers={"Content-Type": "text/plain"},
+    )
+
+    assert response.status_code == 400
+
+
+def test_invalid_multipart(test_client: TestClient) -> None:
+    response = test_client.post(
+        "2023/day-1/part-1",
+        files={"document": ("input.txt.gz", b"1abc2\n")},
+    )
+
+    assert response.status_code == 400
+
+
+def test_invalid_json_gzip(test_client: TestClient) -> None:
+    compressed = test_client.post(
+        "2023/day-1/part-1",
+        content=gzip.compress(b'{"document": ['),
+        headers={"Content-Type": "application/json", "Content-Encoding": "gzip"},
+    )
+    plain = test_client.post(
+        "2023/day-1/part-1",
+        content=b'{"document": [',
+        headers={"Content-Type": "application/json"},
+    )
+
+    # The same as an uncompressed body that isn't JSON
+    assert compressed.status_code == 422
+    assert compressed.json() == plain.json()
+
+
+def test_unknown_charset(test_client: TestClient) -> None:
+    response = test_client.post(
+        "2023/day-1/part-1",
+        content=b"1abc2\n",
+        headers={"Content-Type": "text/plain; charset=unknown"},
+    )
+
+    assert response.status_code == 415
+
+
+def test_unsupported_encoding(test_client: TestClient) -> None:
+    response = test_client.post(
+        "2023/day-1/part-1",
+        content=DAY_1.read_bytes(),
+        headers={"Content-Type": "text/plain", "Content-Encoding": "br"},
+    )
+
+    assert response.status_code == 415
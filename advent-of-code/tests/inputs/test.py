@@ -0,0 +1,190 @@
+import json
+import pickle
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src import ingest
+from src.ingest import InputReference
+
+TESTS = Path(__file__).parent.parent
+
+
+@pytest.fixture(autouse=True)
+def inputs_path(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    monkeypatch.setattr(ingest, "INPUTS_PATH", tmp_path)
+    monkeypatch.setattr(ingest, "loaded_inputs", ingest.ResultCache(size=16))
+
+    return tmp_path
+
+
+def register(test_client: TestClient, path: Path) -> str:
+    response = test_client.post(
+        "inputs",
+        content=path.read_bytes(),
+        headers={"Content-Type": "text/plain"},
+    )
+
+    assert response.status_code == 201
+
+    return response.json()["id"]
+
+
+def test_register(test_client: TestClient) -> None:
+    path = TESTS / "year_2023" / "day_1" / "example-1.txt"
+    input_id = register(test_client, path)
+
+    # Content-addressed, however it's sent
+    response = test_client.post(
+        "inputs", json={"document": path.read_text().splitlines()}
+    )
+
+    assert response.json()["id"] == input_id
+
+    response = test_client.get(f"inputs/{input_id}")
+
+    assert response.json() == {
+        "id": input_id,
+        # Stored a line at a time, each ending in a newline
+        "bytes": sum(len(line) + 1 for line in path.read_text().splitlines()),
+        "lines": 4,
+    }
+    assert [item["id"] for item in test_client.get("inputs").json()] == [input_id]
+
+    assert test_client.delete(f"inputs/{input_id}").status_code == 200
+    assert test_client.get(f"inputs/{input_id}").status_code == 404
+
+
+@pytest.mark.parametrize(
+    "document", [[], [""], ["1", "", "2", ""], ["", ""], ["a", "b"], ["a", "", ""]]
+)
+def test_round_trip(document: list[str], test_client: TestClient) -> None:
+    response = test_client.post("inputs", json={"document": document})
+    input_id = response.json()["id"]
+
+    # Blank lines, trailing ones too, come back as they were sent
+    assert response.json()["lines"] == len(document)
+    assert ingest.load_input(input_id) == document
+
+    ingest.loaded_inputs.memory.clear()
+
+    assert ingest.load_input(input_id) == document
+
+
+def test_list_without_loading(test_client: TestClient, inputs_path: Path) -> None:
+    path = TESTS / "year_2023" / "day_1" / "input.txt"
+    input_id = register(test_client, path)
+
+    # Counted when registered, listing doesn't read the inputs back
+    [item] = test_client.get("inputs").json()
+
+    assert item["lines"] == len(path.read_text().splitlines())
+    assert input_id not in ingest.loaded_inputs.memory
+
+    # Nor does an input registered before counts were kept
+    (inputs_path / f"{input_id}.lines").unlink()
+
+    assert test_client.get(f"inputs/{input_id}").json() == item
+    assert input_id not in ingest.loaded_inputs.memory
+
+    test_client.delete(f"inputs/{input_id}")
+
+    assert list(inputs_path.iterdir()) == []
+
+
+def test_loaded_once(test_client: TestClient) -> None:
+    input_id = register(test_client, TESTS / "year_2023" / "day_1" / "example-1.txt")
+    lines = ingest.load_input(input_id)
+
+    assert ingest.load_input(input_id) is lines
+
+    # Workers' solvers get a copy of their own to mutate
+    reference = InputReference(ingest.input_path(input_id), joined=False)
+
+    assert reference.load() == lines
+    assert reference.load() is not lines
+
+
+@pytest.mark.parametrize(
+    "route,filename,params,body,output",
+    [
+        ("2023/day-1/part-1", "year_2023/day_1/input.txt", {}, None, 54338),
+        ("2023/day-21/part-1", "year_2023/day_21/example.txt", {"steps": 6}, None, 16),
+        # Other parameters can be in a JSON body too
+        ("2023/day-21/part-1", "year_2023/day_21/example.txt", {}, {"steps": 6}, 16),
+        # Days taking a single string get the lines joined back up
+        ("2022/day-6/part-1", "year_2022/day_6/example.txt", {}, None, 7),
+    ],
+)
+def test_solve_by_id(
+    route: str,
+    filename: str,
+    params: dict[str, int],
+    body: dict[str, int] | None,
+    output: int,
+    test_client: TestClient,
+) -> None:
+    input_id = register(test_client, TESTS / filename)
+
+    response = test_client.post(
+        route, params={"input_id": input_id, **params}, json=body
+    )
+
+    assert response.status_code == 200
+    assert response.json() == output
+
+
+def test_solve_by_id_pooled(pooled_test_client: TestClient) -> None:
+    input_id = register(
+        pooled_test_client, TESTS / "year_2023" / "day_22" / "example-1.txt"
+    )
+
+    response = pooled_test_client.post(
+        "2023/day-22/part-2", params={"input_id": input_id}
+    )
+
+    assert response.status_code == 200
+    assert response.json() == 7
+
+
+def test_unknown_input(test_client: TestClient) -> None:
+    for input_id in ["0" * 64, "../../etc/passwd"]:
+        response = test_client.post("2023/day-1/part-1", params={"input_id": input_id})
+
+        assert response.status_code == 404
+
+
+def test_reference(test_client: TestClient) -> None:
+    path = TESTS / "year_2023" / "day_1" / "input.txt"
+    input_id = register(test_client, path)
+    reference = InputReference(ingest.input_path(input_id), joined=False)
+
+    # Workers get the id, not the document
+    assert len(pickle.dumps(reference)) < 256
+    assert pickle.loads(pickle.dumps(reference)).load() == path.read_text().splitlines()
+
+
+def test_batch_by_id(test_client: TestClient) -> None:
+    input_id = register(test_client, TESTS / "year_2023" / "day_1" / "input.txt")
+
+    response = test_client.post(
+        "batch",
+        json={"jobs": [{"year": 2023, "day": 1, "part": 2, "input_id": input_id}]},
+    )
+
+    assert [line for line in response.text.splitlines() if '"result": 53389' in line]
+
+
+@pytest.mark.parametrize("part,output", [(1, 522547), (2, 229271)])
+def test_batch_by_id_separated(part: int, output: int, test_client: TestClient) -> None:
+    # One line of comma separated steps, split the way the route splits it
+    input_id = register(test_client, TESTS / "year_2023" / "day_15" / "input.txt")
+
+    response = test_client.post(
+        "batch",
+        json={"jobs": [{"year": 2023, "day": 15, "part": part, "input_id": input_id}]},
+    )
+    [outcome] = [json.loads(line) for line in response.text.splitlines()]
+
+    assert outcome["result"] == output
@@ -0,0 +1,206 @@
+import asyncio
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Any, Iterator
+
+import pytest
+from app import PREFIX, app
+from fastapi.testclient import TestClient
+
+from src import executor, ingest, jobs, progress
+from src.executor import solver
+
+TESTS = Path(__file__).parent.parent
+
+
+@solver(offload=True, cache=False)
+async def reports_progress() -> int:
+    progress.report(done=1, total=2)
+
+    return 2
+
+
+@pytest.fixture
+def jobs_test_client(monkeypatch: pytest.MonkeyPatch) -> Iterator[TestClient]:
+    # Jobs run on the client's event loop, which only outlives a request inside `with`
+    monkeypatch.setattr(executor, "EXECUTOR_WORKERS", 0)
+
+    with TestClient(
+        app=app,
+        base_url=f"http://testserver/{PREFIX}",
+    ) as test_client:
+        yield test_client
+
+
+def wait(test_client: TestClient, job_id: str) -> dict[str, Any]:
+    deadline = time.monotonic() + 30
+
+    while time.monotonic() < deadline:
+        job = test_client.get(f"jobs/{job_id}").json()
+
+        if job["status"] in jobs.FINISHED:
+            return job
+
+        time.sleep(0.01)
+
+    raise TimeoutError(job_id)
+
+
+def test_report_outside_job() -> None:
+    # Nothing to report to, and nothing breaks
+    progress.report(done=1)
+
+    assert progress.current() is None
+
+
+def test_report_inline() -> None:
+    reported: list[progress.Counters] = []
+    progress.subscribe("job", reported.append)
+
+    try:
+        with progress.tracking("job"):
+            progress.report(done=1, total=2)
+            # Too soon after the last one
+            progress.report(done=2, total=2)
+
+    finally:
+        progress.unsubscribe("job")
+
+    assert reported == [{"done": 1, "total": 2}]
+
+
+def test_report_from_pool(pooled_test_client: TestClient) -> None:
+    reported = threading.Event()
+    progress.subscribe("job", lambda counters: reported.set())
+
+    try:
+        with progress.tracking("job"):
+            assert asyncio.run(reports_progress()) == 2
+
+        assert reported.wait(timeout=10)
+
+    finally:
+        progress.unsubscribe("job")
+
+
+def test_job(jobs_test_client: TestClient) -> None:
+    response = jobs_test_client.post("jobs", json=jobs.JOB_EXAMPLE)
+
+    assert response.status_code == 202
+    assert response.json()["status"] in ("queued", "running", "done")
+
+    job = wait(jobs_test_client, response.json()["id"])
+
+    assert job["status"] == "done"
+    assert job["result"] == 71503
+
+    assert job["id"] in [job["id"] for job in jobs_test_client.get("jobs").json()]
+
+
+def test_job_by_id(
+    jobs_test_client: TestClient, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(ingest, "INPUTS_PATH", tmp_path)
+
+    # One line of comma separated steps, split the way the route splits it
+    response = jobs_test_client.post(
+        "inputs",
+        content=(TESTS / "year_2023" / "day_15" / "input.txt").read_bytes(),
+        headers={"Content-Type": "text/plain"},
+    )
+    input_id = response.json()["id"]
+
+    response = jobs_test_client.post(
+        "jobs", json={"year": 2023, "day": 15, "part": 2, "input_id": input_id}
+    )
+    job = wait(jobs_test_client, response.json()["id"])
+
+    assert job["status"] == "done"
+    assert job["result"] == 229271
+
+
+def test_job_events(pooled_test_client: TestClient) -> None:
+    document = (TESTS / "year_2023" / "day_22" / "example-1.txt").read_text()
+
+    response = pooled_test_client.post(
+        "jobs",
+        json={"year": 2023, "day": 22, "part": 2, "document": document.splitlines()},
+    )
+    job_id = response.json()["id"]
+
+    # The stream ends once the job's finished
+    response = pooled_test_client.get(f"jobs/{job_id}/events")
+
+    assert response.headers["content-type"].startswith("text/event-stream")
+
+    events = [
+        line.removeprefix("event: ")
+        for line in response.text.splitlines()
+        if line.startswith("event: ")
+    ]
+
+    assert events[-1] == "done"
+    assert set(events[:-1]) <= {"progress"}
+
+    job = pooled_test_client.get(f"jobs/{job_id}").json()
+
+    assert job["result"] == 7
+
+
+def test_job_errors(
+    jobs_test_client: TestClient, caplog: pytest.LogCaptureFixture
+) -> None:
+    # Problems with the job itself fail the submission
+    response = jobs_test_client.post("jobs", json={"year": 2023, "day": 26, "part": 1})
+
+    assert response.status_code == 404
+
+    response = jobs_test_client.post(
+        "jobs", json={"year": 2023, "day": 21, "part": 1, "document": ["S"]}
+    )
+
+    assert response.status_code == 422
+
+    assert jobs_test_client.get("jobs/missing").status_code == 404
+
+    # Problems solving fail the job
+    with caplog.at_level(logging.ERROR, logger="src.jobs"):
+        response = jobs_test_client.post(
+            "jobs", json={"year": 2023, "day": 1, "part": 1, "document": ["abc"]}
+        )
+        job = wait(jobs_test_client, response.json()["id"])
+
+    assert job["status"] == "failed"
+    assert job["error"]["status_code"] == 500
+    assert job["error"]["exception"] == "IndexError"
+
+    # With the traceback logged
+    [record] = caplog.records
+
+    assert record.getMessage() == f"Job {job['id']} (2023 day 1 part 1) failed"
+    assert record.exc_info is not None
+
+
+def test_job_cancel(
+    jobs_test_client: TestClient,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    # Nothing starts, so the job waits its turn
+    monkeypatch.setattr(jobs, "JOB_CONCURRENCY", 0)
+
+    response = jobs_test_client.post("jobs", json=jobs.JOB_EXAMPLE)
+    job_id = response.json()["id"]
+
+    assert response.json()["status"] == "queued"
+
+    response = jobs_test_client.delete(f"jobs/{job_id}")
+
+    assert response.json()["status"] == "cancelled"
+    assert jobs_test_client.get(f"jobs/{job_id}").json()["status"] == "cancelled"
+
+    metrics = jobs_test_client.get("metrics").text
+
+    assert 'aoc_jobs{status="cancelled"}' in metrics
+    assert 'aoc_jobs{status="queued"} 0' in metrics
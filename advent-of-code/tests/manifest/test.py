@@ -0,0 +1,49 @@
+import subprocess
+import sys
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from src.manifest import DAYS, LazyRouter
+
+ROOT = Path(__file__).parent.parent.parent
+
+
+def test_app_import_is_lazy() -> None:
+    output = subprocess.run(
+        [sys.executable, "-c", "import app, sys; print(' '.join(sys.modules))"],
+        cwd=ROOT,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout.split()
+
+    for module in ["numpy", "z3", "networkx", *[day.module for day in DAYS]]:
+        assert module not in output
+
+
+def test_router_loads_once() -> None:
+    day = DAYS[0]
+    lazy_router = LazyRouter(day)
+
+    assert lazy_router.router is None
+
+    assert lazy_router.load() is lazy_router.load()
+    assert lazy_router.router is not None
+
+
+def test_openapi_includes_every_day(test_client: TestClient) -> None:
+    response = test_client.get("openapi.json")
+
+    assert response.status_code == 200
+
+    paths = response.json()["paths"]
+
+    for day in DAYS:
+        assert f"/advent-of-code{day.prefix}/part-1" in paths
+
+
+def test_unknown_part(test_client: TestClient) -> None:
+    response = test_client.post("2023/day-1/part-3", json={"document": []})
+
+    assert response.status_code == 404
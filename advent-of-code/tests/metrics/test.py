@@ -0,0 +1,69 @@
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+TESTS = Path(__file__).parent.parent
+
+
+def samples(test_client: TestClient) -> dict[str, float]:
+    response = test_client.get("metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+
+    return {
+        sample: float(value)
+        for sample, value in (
+            line.rsplit(" ", 1)
+            for line in response.text.splitlines()
+            if not line.startswith("#")
+        )
+    }
+
+
+def test_route_metrics(test_client: TestClient) -> None:
+    path = TESTS / "year_2023" / "day_1" / "example-1.txt"
+    route = 'route="/advent-of-code/2023/day-1/part-1"'
+
+    before = samples(test_client)
+
+    response = test_client.post(
+        "2023/day-1/part-1",
+        content=path.read_bytes(),
+        headers={"Content-Type": "text/plain"},
+    )
+
+    assert response.status_code == 200
+
+    after = samples(test_client)
+
+    def delta(sample: str) -> float:
+        return after[sample] - before.get(sample, 0)
+
+    assert delta(f'aoc_requests_total{{{route},status="200"}}') == 1
+    assert delta(f"aoc_request_duration_seconds_count{{{route}}}") == 1
+    assert delta(f"aoc_input_bytes_total{{{route}}}") == len(path.read_bytes())
+    assert delta(f"aoc_input_lines_total{{{route}}}") == 4
+
+    # Buckets are cumulative, and the last one counts every request
+    buckets = [
+        value
+        for sample, value in after.items()
+        if sample.startswith(f"aoc_request_duration_seconds_bucket{{{route}")
+    ]
+
+    assert buckets == sorted(buckets)
+    assert buckets[-1] == after[f"aoc_request_duration_seconds_count{{{route}}}"]
+
+
+def test_executor_metrics(pooled_test_client: TestClient) -> None:
+    after = samples(pooled_test_client)
+
+    assert after["aoc_executor_workers"] == 2
+    assert after["aoc_executor_queue_depth"] == 0
+
+    workers = [sample for sample in after if 'process="worker"' in sample]
+
+    # Workers are started on demand, warm-up tasks can share one
+    assert 1 <= len(workers) <= 2
+    assert all(after[sample] > 0 for sample in workers)
@@ -0,0 +1,141 @@
+import asyncio
+import gzip
+from pathlib import Path
+from typing import AsyncIterator, Iterator
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.ingest import iter_line_batches
+
+TESTS = Path(__file__).parent.parent
+
+# Every streaming route, with the parameters it takes besides the document
+ROUTES = [
+    ("2022/day-1/part-1", {}),
+    ("2022/day-1/part-2", {}),
+    ("2022/day-2/part-1", {}),
+    ("2022/day-2/part-2", {}),
+    ("2022/day-4/part-1", {}),
+    ("2022/day-4/part-2", {}),
+    ("2023/day-1/part-1", {}),
+    ("2023/day-1/part-2", {}),
+    ("2023/day-2/part-1", {"red": 12, "green": 13, "blue": 14}),
+    ("2023/day-2/part-2", {}),
+    ("2023/day-3/part-1", {}),
+    ("2023/day-3/part-2", {}),
+    ("2023/day-4/part-1", {}),
+    ("2023/day-4/part-2", {}),
+    ("2023/day-9/part-1", {}),
+    ("2023/day-9/part-2", {}),
+]
+
+
+def input_path(route: str) -> Path:
+    year, day, _ = route.split("/")
+
+    return TESTS / f"year_{year}" / f"day_{day.removeprefix('day-')}" / "input.txt"
+
+
+async def chunked(data: bytes, size: int) -> AsyncIterator[bytes]:
+    for start in range(0, len(data), size):
+        yield data[start : start + size]
+
+
+def upload(data: bytes, size: int) -> Iterator[bytes]:
+    # Sent with chunked transfer encoding, a piece at a time
+    for start in range(0, len(data), size):
+        yield data[start : start + size]
+
+
+async def collect(batches: AsyncIterator[list[str]]) -> list[str]:
+    return [item async for batch in batches for item in batch]
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 1024])
+@pytest.mark.parametrize(
+    "text,items",
+    [
+        ("", []),
+        ("\n", []),
+        ("a,b", ["a", "b"]),
+        ("a,b\n", ["a", "b"]),
+        ("ab,,c,d=1\r\n", ["ab", "", "c", "d=1"]),
+    ],
+)
+def test_iter_line_batches_separator(text: str, items: list[str], size: int) -> None:
+    batches = iter_line_batches(chunked(text.encode(), size), separator=",")
+
+    assert asyncio.run(collect(batches)) == items
+
+
+@pytest.mark.parametrize("route,parameters", ROUTES, ids=[route for route, _ in ROUTES])
+def test_stream(
+    route: str, parameters: dict[str, int], test_client: TestClient
+) -> None:
+    data = input_path(route).read_bytes()
+
+    expected = test_client.post(
+        route, json={"document": data.decode().splitlines(), **parameters}
+    )
+
+    assert expected.status_code == 200
+
+    response = test_client.post(
+        f"{route}/stream",
+        params=parameters,
+        content=upload(data, 4096),
+        headers={"Content-Type": "text/plain"},
+    )
+
+    assert response.status_code == 200
+    assert response.json() == expected.json()
+
+
+def test_stream_separator(test_client: TestClient) -> None:
+    data = input_path("2023/day-15/part-1").read_bytes()
+
+    response = test_client.post(
+        "2023/day-15/part-1/stream",
+        content=upload(data, 1000),
+        headers={"Content-Type": "text/plain"},
+    )
+
+    assert response.status_code == 200
+    assert response.json() == 522547
+
+
+def test_stream_gzip(test_client: TestClient) -> None:
+    data = gzip.compress(input_path("2023/day-1/part-1").read_bytes())
+
+    response = test_client.post(
+        "2023/day-1/part-1/stream",
+        content=upload(data, 1000),
+        headers={"Content-Type": "text/plain", "Content-Encoding": "gzip"},
+    )
+
+    assert response.status_code == 200
+    assert response.json() == 54338
+
+    assert "solve;dur=" in response.headers["server-timing"]
+
+
+def test_stream_missing_parameter(test_client: TestClient) -> None:
+    response = test_client.post(
+        "2023/day-2/part-1/stream",
+        params={"red": 12},
+        content=b"Game 1: 3 blue\n",
+        headers={"Content-Type": "text/plain"},
+    )
+
+    assert response.status_code == 422
+
+
+def test_stream_unsupported_encoding(test_client: TestClient) -> None:
+    response = test_client.post(
+        "2023/day-1/part-1/stream",
+        content=b"1abc2\n",
+        headers={"Content-Type": "text/plain", "Content-Encoding": "br"},
+    )
+
+    assert response.status_code == 415
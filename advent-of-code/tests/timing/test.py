@@ -0,0 +1,138 @@
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src import cache, timing
+from src.timing import collect, span
+
+TESTS = Path(__file__).parent.parent
+
+
+@pytest.fixture(autouse=True)
+def reset() -> Iterator[None]:
+    # Cached results skip solving, and so the spans
+    cache.results.clear()
+    timing.profiles.resize(0)
+
+    yield
+
+    cache.results.clear()
+    timing.profiles.resize(0)
+    timing.profiles.clear()
+
+
+def server_timing(header: str) -> dict[str, float]:
+    metrics = [metric.split(";dur=") for metric in header.split(", ")]
+
+    return {name: float(duration) for name, duration in metrics}
+
+
+def test_spans() -> None:
+    # Outside of a request, spans do nothing
+    with span("parse"):
+        pass
+
+    with collect() as timings:
+        with span("parse"):
+            pass
+
+        with span("parse"):
+            pass
+
+        with span("solve"):
+            pass
+
+    assert list(timings.spans) == ["parse", "solve"]
+    assert timings.seconds >= sum(timings.spans.values())
+
+
+def test_server_timing(test_client: TestClient) -> None:
+    path = TESTS / "year_2023" / "day_1" / "example-1.txt"
+
+    response = test_client.post(
+        "2023/day-1/part-1",
+        content=path.read_bytes(),
+        headers={"Content-Type": "text/plain"},
+    )
+
+    assert response.status_code == 200
+
+    metrics = server_timing(response.headers["server-timing"])
+
+    assert list(metrics) == ["read", "solve", "total"]
+    assert metrics["total"] >= metrics["read"] + metrics["solve"]
+
+
+def test_route_stats(test_client: TestClient) -> None:
+    path = TESTS / "year_2023" / "day_1" / "example-1.txt"
+
+    response = test_client.get("timing")
+    before = response.json().get("/advent-of-code/2023/day-1/part-2", {"count": 0})
+
+    for _ in range(3):
+        test_client.post(
+            "2023/day-1/part-2",
+            json={"document": path.read_text().splitlines()},
+        )
+
+    response = test_client.get("timing")
+    after = response.json()["/advent-of-code/2023/day-1/part-2"]
+
+    assert after["count"] == before["count"] + 3
+    assert sum(after["buckets"].values()) == after["count"]
+
+    # Unknown paths are aggregated together
+    unmatched = response.json().get("unmatched", {"count": 0})
+
+    test_client.post("2023/day-1/part-3", json={"document": []})
+
+    response = test_client.get("timing")
+
+    assert "/advent-of-code/2023/day-1/part-3" not in response.json()
+    assert response.json()["unmatched"]["count"] == unmatched["count"] + 1
+
+
+def test_route_stats_template(test_client: TestClient) -> None:
+    for input_id in ("0" * 64, "1" * 64):
+        test_client.get(f"inputs/{input_id}")
+
+    stats = test_client.get("timing").json()
+
+    # Every id's requests are the route's
+    assert stats["/advent-of-code/inputs/{input_id}"]["statuses"]["404"] >= 2
+    assert not any("0" * 64 in path for path in stats)
+
+
+def test_profiles(pooled_test_client: TestClient) -> None:
+    path = TESTS / "year_2023" / "day_22" / "example-1.txt"
+
+    response = pooled_test_client.put("timing/profiles", params={"slowest": 1})
+
+    assert response.status_code == 200
+
+    # Day 22 is offloaded, so its profile comes back from a pool worker
+    response = pooled_test_client.post(
+        "2023/day-22/part-2",
+        json={"document": path.read_text().splitlines()},
+    )
+
+    assert response.status_code == 200
+    assert response.json() == 7
+
+    response = pooled_test_client.get("timing/profiles")
+    profiles = response.json()
+
+    assert [profile["path"] for profile in profiles] == [
+        "/advent-of-code/2023/day-22/part-2"
+    ]
+
+    response = pooled_test_client.get(f"timing/profiles/{profiles[0]['id']}")
+
+    assert response.status_code == 200
+    assert "day_22.py" in response.text
+
+    response = pooled_test_client.get("timing/profiles/0")
+
+    assert response.status_code == 404
@@ -0,0 +1,193 @@
+import random
+import re
+
+import numpy as np
+import pytest
+
+from src.utils import (
+    DOWN,
+    LEFT,
+    RIGHT,
+    UP,
+    Grid2D,
+    PatternMatcher,
+    ascii_digits,
+    digit_values,
+    distinct,
+    reverse,
+)
+
+LINES = [
+    "ab",
+    "cd",
+    "ef",
+]
+
+
+def test_grid_from_lines() -> None:
+    grid = Grid2D.from_lines(LINES)
+
+    assert grid.width == 2
+    assert grid.height == 3
+    assert len(grid) == 6
+    assert grid.lines() == LINES
+
+    assert grid[grid.index(1, 2)] == "f"
+    assert grid.position(grid.index(1, 2)) == (1, 2)
+
+
+def test_grid_rejects_ragged_cells() -> None:
+    with pytest.raises(ValueError):
+        Grid2D(bytearray(b"abcde"), 2)
+
+
+@pytest.mark.parametrize(
+    "x,y,direction,output",
+    [
+        (0, 0, RIGHT, (1, 0)),
+        (0, 0, DOWN, (0, 1)),
+        (1, 1, UP, (1, 0)),
+        (1, 1, LEFT, (0, 1)),
+        # Off the edge
+        (0, 0, UP, None),
+        (0, 0, LEFT, None),
+        (1, 2, RIGHT, None),
+        (1, 2, DOWN, None),
+    ],
+)
+def test_grid_step(
+    x: int,
+    y: int,
+    direction: int,
+    output: tuple[int, int] | None,
+) -> None:
+    grid = Grid2D.from_lines(LINES)
+    index = grid.step(grid.index(x, y), direction)
+
+    if output is None:
+        assert index == -1
+    else:
+        assert grid.position(index) == output
+        assert grid.step(index, reverse(direction)) == grid.index(x, y)
+
+
+def test_grid_neighbours() -> None:
+    grid = Grid2D.from_lines(LINES)
+
+    assert sorted(grid[index] for index in grid.neighbours(grid.index(0, 0))) == [
+        "b",
+        "c",
+    ]
+    assert sorted(grid[index] for index in grid.neighbours(grid.index(1, 1))) == [
+        "b",
+        "c",
+        "f",
+    ]
+
+
+def test_grid_views() -> None:
+    grid = Grid2D.from_lines(LINES)
+
+    assert grid.row(1) == b"cd"
+    assert grid.column(1) == b"bdf"
+
+    # Views are copies, writes go through the setters
+    copy = grid.copy()
+    copy.set_column(0, b"xyz")
+    copy.set_row(2, b"zz")
+    copy[copy.index(1, 0)] = "#"
+
+    assert copy.lines() == ["x#", "yd", "zz"]
+    assert grid.lines() == LINES
+    assert copy != grid
+
+
+def test_grid_find() -> None:
+    grid = Grid2D.from_lines(LINES)
+
+    assert grid.find("d") == grid.index(1, 1)
+    assert grid.find("S") == -1
+
+    filled = Grid2D.filled(3, 2, ".")
+
+    assert filled.lines() == ["...", "..."]
+    assert filled.contains(2, 1)
+    assert not filled.contains(3, 1)
+
+
+def test_distinct() -> None:
+    assert distinct(["b", "a", "b", "b"], iter) == (("b", 3), ("a", 1))
+    assert distinct(["1", "2", "1"], lambda lines: map(int, lines)) == ((1, 2), (2, 1))
+    assert distinct([], iter) == ()
+
+
+@pytest.mark.parametrize(
+    "text,first,last",
+    [
+        ("twone", (0, 2), (2, 1)),
+        ("eightwothree", (0, 8), (7, 3)),
+        ("7pqrstsixteen", (0, 7), (6, 6)),
+        ("abc", None, None),
+        ("", None, None),
+    ],
+)
+def test_pattern_matcher(
+    text: str,
+    first: tuple[int, int] | None,
+    last: tuple[int, int] | None,
+) -> None:
+    matcher = PatternMatcher(
+        {"1": 1, "2": 2, "3": 3, "6": 6, "7": 7, "8": 8}
+        | {"one": 1, "two": 2, "three": 3, "six": 6, "eight": 8}
+    )
+
+    assert matcher.first(text) == first
+    assert matcher.last(text) == last
+
+
+@pytest.mark.parametrize(
+    "patterns",
+    [
+        # Patterns inside, overlapping and starting other patterns
+        ["a", "ab", "bab", "abcab", "c", "bca"],
+        ["he", "she", "his", "hers"],
+        ["a", "aa", "aaa"],
+        # Characters special to regular expressions
+        ["]", "^-", "\\", "[a]"],
+    ],
+)
+def test_pattern_matcher_finds_like_find(patterns: list[str]) -> None:
+    matcher = PatternMatcher({pattern: pattern for pattern in patterns})
+    alphabet = "".join(sorted(set("".join(patterns)))) + "xy"
+    rng = random.Random(0)
+
+    for _ in range(2000):
+        text = "".join(rng.choices(alphabet, k=rng.randint(0, 16)))
+
+        # The longest pattern wins between matches starting at the same character
+        firsts = [(text.find(pattern), -len(pattern), pattern) for pattern in patterns]
+        lasts = [(text.rfind(pattern), len(pattern), pattern) for pattern in patterns]
+
+        found = [(start, pattern) for start, _, pattern in sorted(firsts) if start >= 0]
+        assert matcher.first(text) == (found[0] if found else None)
+
+        found = [(start, pattern) for start, _, pattern in sorted(lasts) if start >= 0]
+        assert matcher.last(text) == (found[-1] if found else None)
+
+
+def test_pattern_matcher_rejects_empty_patterns() -> None:
+    with pytest.raises(ValueError):
+        PatternMatcher({"": 0})
+
+
+@pytest.mark.parametrize("text", ["", "a", "7", "ab12c/345:0 9876543210", "00:1\n23\n"])
+def test_digit_values(text: str) -> None:
+    digits, is_digit = ascii_digits(np.frombuffer(text.encode(), dtype=np.uint8))
+    runs = list(re.finditer(r"[0-9]+", text))
+    starts = np.array([run.start() for run in runs], dtype=np.int64)
+    ends = np.array([run.end() for run in runs], dtype=np.int64)
+
+    assert is_digit.tolist() == [char.isdigit() for char in text]
+    assert digit_values(digits, starts, ends).tolist() == [
+        int(run.group()) for run in runs
+    ]
@@ -42,3 +42,28 @@ def test_part_2(filename: str, total: int, test_client: TestClient) -> None:
 
         assert response.status_code == 200
         assert response.json() == total
+
+
+@pytest.mark.parametrize(
+    "filename,part_1,part_2",
+    [
+        ("example.txt", 2, 4),
+        ("input.txt", 530, 903),
+    ],
+)
+def test_both(
+    filename: str,
+    part_1: int,
+    part_2: int,
+    test_client: TestClient,
+) -> None:
+    with open(Path(__file__).with_name(filename), "r") as file:
+        response = test_client.post(
+            "2022/day-4/both",
+            json={
+                "document": file.read().splitlines(),
+            },
+        )
+
+        assert response.status_code == 200
+        assert response.json() == {"part_1": part_1, "part_2": part_2}
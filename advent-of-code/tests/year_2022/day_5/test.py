@@ -98,3 +98,54 @@ def test_part_2(
 
         assert response.status_code == 200
         assert response.json() == message
+
+
+@pytest.mark.parametrize(
+    "filename,stacks,part_1,part_2",
+    [
+        (
+            "example.txt",
+            {
+                "1": ["N", "Z"],
+                "2": ["D", "C", "M"],
+                "3": ["P"],
+            },
+            "CMZ",
+            "MCD",
+        ),
+        (
+            "input.txt",
+            {
+                "1": ["D", "H", "R", "Z", "S", "P", "W", "Q"],
+                "2": ["F", "H", "Q", "W", "R", "B", "V"],
+                "3": ["H", "S", "V", "C"],
+                "4": ["G", "F", "H"],
+                "5": ["Z", "B", "J", "G", "P"],
+                "6": ["L", "F", "W", "H", "J", "T", "Q"],
+                "7": ["N", "J", "V", "L", "D", "W", "T", "Z"],
+                "8": ["F", "H", "G", "J", "C", "Z", "T", "D"],
+                "9": ["H", "B", "M", "V", "P", "W"],
+            },
+            "ZWHVFWQWW",
+            "HZFZCCWWV",
+        ),
+    ],
+)
+def test_both(
+    filename: str,
+    stacks: dict[str, list[str]],
+    part_1: str,
+    part_2: str,
+    test_client: TestClient,
+) -> None:
+    with open(Path(__file__).with_name(filename), "r") as file:
+        response = test_client.post(
+            "2022/day-5/both",
+            json={
+                "document": file.read().splitlines(),
+                "stacks": stacks,
+            },
+        )
+
+        assert response.status_code == 200
+        assert response.json() == {"part_1": part_1, "part_2": part_2}
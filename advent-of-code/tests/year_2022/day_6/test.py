@@ -62,3 +62,28 @@ def test_part_2(
 
         assert response.status_code == 200
         assert response.json() == output
+
+
+@pytest.mark.parametrize(
+    "filename,part_1,part_2",
+    [
+        ("example.txt", 7, 19),
+        ("input.txt", 1134, 2263),
+    ],
+)
+def test_both(
+    filename: str,
+    part_1: int,
+    part_2: int,
+    test_client: TestClient,
+) -> None:
+    with open(Path(__file__).with_name(filename), "r") as file:
+        response = test_client.post(
+            "2022/day-6/both",
+            json={
+                "document": file.read().splitlines()[0],
+            },
+        )
+
+        assert response.status_code == 200
+        assert response.json() == {"part_1": part_1, "part_2": part_2}
@@ -52,3 +52,28 @@ def test_part_2(
 
         assert response.status_code == 200
         assert response.json() == output
+
+
+@pytest.mark.parametrize(
+    "filename,part_1,part_2",
+    [
+        ("example-2.txt", 23, 4),
+        ("input.txt", 6968, 413),
+    ],
+)
+def test_both(
+    filename: str,
+    part_1: int,
+    part_2: int,
+    test_client: TestClient,
+) -> None:
+    with open(Path(__file__).with_name(filename), "r") as file:
+        response = test_client.post(
+            "2023/day-10/both",
+            json={
+                "document": file.read().splitlines(),
+            },
+        )
+
+        assert response.status_code == 200
+        assert response.json() == {"part_1": part_1, "part_2": part_2}
@@ -3,6 +3,8 @@ from pathlib import Path
 import pytest
 from fastapi.testclient import TestClient
 
+from src.year_2023 import day_2
+
 
 @pytest.mark.parametrize(
     "filename,total",
@@ -45,3 +47,77 @@ def test_part_2(filename: str, total: int, test_client: TestClient) -> None:
 
         assert response.status_code == 200
         assert response.json() == total
+
+
+@pytest.mark.parametrize(
+    "filename,part_1,part_2",
+    [
+        ("example.txt", 8, 2286),
+        ("input.txt", 2505, 70265),
+    ],
+)
+def test_both(
+    filename: str,
+    part_1: int,
+    part_2: int,
+    test_client: TestClient,
+) -> None:
+    with open(Path(__file__).with_name(filename), "r") as file:
+        response = test_client.post(
+            "2023/day-2/both",
+            json={
+                "document": file.read().splitlines(),
+                "red": 12,
+                "green": 13,
+                "blue": 14,
+            },
+        )
+
+        assert response.status_code == 200
+        assert response.json() == {"part_1": part_1, "part_2": part_2}
+
+
+@pytest.mark.parametrize("table_cells", [1 << 22, 0])
+@pytest.mark.parametrize("filename", ["example.txt", "input.txt"])
+def test_bags(
+    filename: str,
+    table_cells: int,
+    test_client: TestClient,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    # Comparing every bag with every game too, as bags showing too many cubes for a table would
+    monkeypatch.setattr(day_2, "BAGS_TABLE_CELLS", table_cells)
+    bags = [
+        (12, 13, 14),
+        (0, 0, 0),
+        (-1, 20, 20),
+        (20, 20, 20),
+        (4, 3, 6),
+        (100, 1, 100),
+    ]
+
+    with open(Path(__file__).with_name(filename), "r") as file:
+        document = file.read().splitlines()
+
+    response = test_client.post(
+        "2023/day-2/part-1/bags",
+        json={"document": document, "bags": bags},
+    )
+
+    assert response.status_code == 200
+    assert response.json() == [
+        test_client.post(
+            "2023/day-2/part-1",
+            json={"document": document, "red": red, "green": green, "blue": blue},
+        ).json()
+        for red, green, blue in bags
+    ]
+
+
+def test_bags_validation(test_client: TestClient) -> None:
+    response = test_client.post(
+        "2023/day-2/part-1/bags",
+        json={"document": ["Game 1: 3 red"], "bags": [[1, 2]]},
+    )
+
+    assert response.status_code == 422
@@ -54,3 +54,32 @@ def test_part_2(
 
         assert response.status_code == 200
         assert response.json() == output
+
+
+@pytest.mark.parametrize(
+    "filename,lower,upper,part_1,part_2",
+    [
+        ("example-1.txt", 7, 27, 2, 47),
+        ("input.txt", 200000000000000, 400000000000000, 15558, 765636044333842),
+    ],
+)
+def test_both(
+    filename: str,
+    lower: int,
+    upper: int,
+    part_1: int,
+    part_2: int,
+    test_client: TestClient,
+) -> None:
+    with open(Path(__file__).with_name(filename), "r") as file:
+        response = test_client.post(
+            "2023/day-24/both",
+            json={
+                "document": file.read().splitlines(),
+                "lower": lower,
+                "upper": upper,
+            },
+        )
+
+        assert response.status_code == 200
+        assert response.json() == {"part_1": part_1, "part_2": part_2}
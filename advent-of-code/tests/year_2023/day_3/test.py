@@ -1,8 +1,12 @@
+import random
 from pathlib import Path
+from typing import Iterator
 
 import pytest
 from fastapi.testclient import TestClient
 
+from src.year_2023.day_3 import gear_ratios, parse, part_1, part_2, part_numbers
+
 
 @pytest.mark.parametrize(
     "filename,total",
@@ -50,3 +54,69 @@ def test_part_2(
 
         assert response.status_code == 200
         assert response.json() == total
+
+
+@pytest.mark.parametrize(
+    "filename,part_1,part_2",
+    [
+        ("example.txt", 4361, 467835),
+        ("input.txt", 512794, 67779080),
+    ],
+)
+def test_both(
+    filename: str,
+    part_1: int,
+    part_2: int,
+    test_client: TestClient,
+) -> None:
+    with open(Path(__file__).with_name(filename), "r") as file:
+        response = test_client.post(
+            "2023/day-3/both",
+            json={
+                "document": file.read().splitlines(),
+            },
+        )
+
+        assert response.status_code == 200
+        assert response.json() == {"part_1": part_1, "part_2": part_2}
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_rows(seed: int) -> None:
+    rng = random.Random(seed)
+    width = rng.randint(1, 12)
+    # Mostly empty space, with enough gears and numbers to touch
+    document = [
+        "".join(rng.choices("....123456789*#", k=width))
+        for _ in range(rng.randint(0, 12))
+    ]
+    schematic = parse(document)
+
+    assert sum(part_numbers(document)) == part_1(schematic)
+    assert sum(gear_ratios(document)) == part_2(schematic)
+
+
+def test_rows_read_ahead() -> None:
+    read = 0
+
+    def lines() -> Iterator[str]:
+        nonlocal read
+
+        # Endless, every other row a gear between two numbers
+        while True:
+            read += 1
+            yield "1*2" if read % 2 else "..."
+
+    # Each row's answers come out once the row below is read, without waiting for the rest
+    numbers = part_numbers(lines())
+
+    for row in range(1, 100, 2):
+        assert [next(numbers), next(numbers)] == [1, 2]
+        assert read == row + 1
+
+    read = 0
+    ratios = gear_ratios(lines())
+
+    for row in range(1, 100, 2):
+        assert next(ratios) == 2
+        assert read == row + 1
@@ -98,3 +98,56 @@ def test_part_2(
 
         assert response.status_code == 200
         assert response.json() == total
+
+
+@pytest.mark.parametrize(
+    "filename,seeds,part_1,part_2",
+    [
+        ("example.txt", [79, 14, 55, 13], 35, 46),
+        (
+            "input.txt",
+            [
+                1972667147,
+                405592018,
+                1450194064,
+                27782252,
+                348350443,
+                61862174,
+                3911195009,
+                181169206,
+                626861593,
+                138786487,
+                2886966111,
+                275299008,
+                825403564,
+                478003391,
+                514585599,
+                6102091,
+                2526020300,
+                15491453,
+                3211013652,
+                546191739,
+            ],
+            662197086,
+            52510809,
+        ),
+    ],
+)
+def test_both(
+    filename: str,
+    seeds: list[int],
+    part_1: int,
+    part_2: int,
+    test_client: TestClient,
+) -> None:
+    with open(Path(__file__).with_name(filename), "r") as file:
+        response = test_client.post(
+            "2023/day-5/both",
+            json={
+                "document": file.read().splitlines(),
+                "seeds": seeds,
+            },
+        )
+
+        assert response.status_code == 200
+        assert response.json() == {"part_1": part_1, "part_2": part_2}
@@ -42,3 +42,29 @@ def test_part_2(time: int, distance: int, output: int, test_client: TestClient)
 
     assert response.status_code == 200
     assert response.json() == output
+
+
+@pytest.mark.parametrize(
+    "times,distances,part_1,part_2",
+    [
+        ([7, 15, 30], [9, 40, 200], 288, 71503),
+        ([47, 98, 66, 98], [400, 1213, 1011, 1540], 1660968, 26499773),
+    ],
+)
+def test_both(
+    times: list[int],
+    distances: list[int],
+    part_1: int,
+    part_2: int,
+    test_client: TestClient,
+) -> None:
+    response = test_client.post(
+        "2023/day-6/both",
+        json={
+            "times": times,
+            "distances": distances,
+        },
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {"part_1": part_1, "part_2": part_2}